@@ -1,7 +1,15 @@
 #!/usr/bin/env python3
-"""Cross-check diagonal/vortex identity layers for structural overlap."""
+"""Cross-check diagonal/vortex identity layers for structural overlap.
+
+Besides the diagonal/vortex bundles, the full Layer-3 corpus (56-char identity
+bodies) is probed against every 56-char window of the indexed matrix paths
+(forward and reversed) with a blockwise top-k Hamming search.
+"""
 from __future__ import annotations
 
+import argparse
+import json
+from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Sequence, Tuple
@@ -9,45 +17,44 @@ from typing import Dict, List, Sequence, Tuple
 import numpy as np
 
 from analysis.utils.data_loader import load_anna_matrix, ensure_directory
+from analysis.utils.matrix_views import MatrixViews, matrix_views
+from analysis.utils.similarity import encode, hamming_topk, windows
+from scripts.core.matrix_path_index import LINE_FAMILIES, PathIndex
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 REPORT_PATH = BASE_DIR / "outputs" / "reports" / "layer_crossprobe.md"
+LAYER3_PATH = BASE_DIR / "outputs" / "derived" / "layer3_derivation_23k_complete.json"
+BODY_LENGTH = 56
+TOP_K = 3
+REPORT_ROWS = 25
 
 @dataclass
 class SequenceBundle:
  label: str
  body: str
 
-def to_char(val: float) -> str:
- return chr(ord("A") + int(abs(val)) % 26)
-
-def diag_sequences(matrix: np.ndarray) -> List[SequenceBundle]:
+def diag_sequences(views: MatrixViews) -> List[SequenceBundle]:
+ size, width = views.shape
  bundles: List[SequenceBundle] = []
- for idx, gs in enumerate(range(0, matrix.shape[0], 32), 1):
- chars: List[str] = []
- for block in range(4):
- r = gs + (block // 2) * 16
- c = (block % 2) * 16
- for offset in range(14):
- row = r + offset
- col = c + offset
- if row < matrix.shape[0] and col < matrix.shape[1]:
- chars.append(to_char(matrix[row, col]))
- bundles.append(SequenceBundle(label=f"Diag#{idx}", body="".join(chars)))
+ for idx, gs in enumerate(range(0, size, 32), 1):
+ coords = [
+ (gs + (block // 2) * 16 + offset, (block % 2) * 16 + offset)
+ for block in range(4)
+ for offset in range(14)
+ ]
+ coords = [(row, col) for row, col in coords if row < size and col < width]
+ bundles.append(SequenceBundle(label=f"Diag#{idx}", body=views.text(views.letters_abs, coords)))
  return bundles
 
-def vortex_sequences(matrix: np.ndarray) -> List[SequenceBundle]:
- center = (matrix.shape[0] - 1) / 2
+def vortex_sequences(views: MatrixViews) -> List[SequenceBundle]:
+ rows, cols = np.indices(views.shape)
+ center = (views.shape[0] - 1) / 2
+ dist = np.hypot(rows - center, cols - center)
  targets = [18, 44, 66, 82]
  bundles: List[SequenceBundle] = []
  for idx, radius in enumerate(targets, 1):
- chars: List[str] = []
- for row in range(matrix.shape[0]):
- for col in range(matrix.shape[1]):
- dist = np.hypot(row - center, col - center)
- if abs(dist - radius) < 0.5:
- chars.append(to_char(matrix[row, col]))
- bundles.append(SequenceBundle(label=f"Vortex#{idx}", body="".join(chars)))
+ ring = np.argwhere(np.abs(dist - radius) < 0.5)  # row-major order
+ bundles.append(SequenceBundle(label=f"Vortex#{idx}", body=views.text(views.letters_abs, ring)))
  return bundles
 
 def hamming(a: str, b: str) -> Tuple[int, float]:
@@ -75,7 +82,86 @@ def summarize_pairs(lhs: SequenceBundle, rhs: SequenceBundle) -> str:
  f"{mismatches} | {similarity:.2%} | {ternary_sim:.2%} |"
  )
 
-def write_report(diag_raw: List[SequenceBundle], diag_trim: List[SequenceBundle], vortex: List[SequenceBundle]) -> None:
+@dataclass
+class CorpusProbe:
+ queries: List[str]
+ labels: List[str]  # one per path window
+ distances: np.ndarray  # (len(queries), TOP_K)
+ neighbours: np.ndarray  # window indices, same shape
+
+def load_layer3_bodies(path: Path = LAYER3_PATH) -> List[str]:
+ if not path.exists():
+ return []
+ with path.open() as f:
+ results = json.load(f).get("results", [])
+ bodies = {entry.get("layer3_identity", "")[:BODY_LENGTH] for entry in results}
+ return sorted(body for body in bodies if len(body) == BODY_LENGTH and body.isalpha())
+
+def path_windows(matrix: np.ndarray, families: Sequence[str] | None = None) -> Tuple[np.ndarray, List[str]]:
+ """All BODY_LENGTH windows of the indexed matrix paths, read forward and reversed."""
+ index = PathIndex.from_matrix(matrix, encoding="abs", families=families)
+ lines = index.lines
+ texts = [line.text for line in lines] + [line.text[::-1] for line in lines]
+ codes, owners, offsets = windows(texts, BODY_LENGTH, [line.cyclic for line in lines] * 2)
+ labels = []
+ for owner, offset in zip(owners.tolist(), offsets.tolist()):
+ line = lines[owner % len(lines)]
+ direction = "rev" if owner >= len(lines) else "fwd"
+ labels.append(f"{line.family}[{line.key}]@{offset}/{direction}")
+ return codes, labels
+
+def probe_corpus(matrix: np.ndarray, queries: List[str], families: Sequence[str] | None = None,
+ workers: int = 1) -> CorpusProbe:
+ refs, labels = path_windows(matrix, families)
+ distances, neighbours = hamming_topk(encode(queries, BODY_LENGTH), refs, k=TOP_K, workers=workers)
+ return CorpusProbe(queries=queries, labels=labels, distances=distances, neighbours=neighbours)
+
+def corpus_lines(probe: CorpusProbe) -> List[str]:
+ lines = [
+ "",
+ "## Korpus: Layer-3-Identitäten vs. Matrix-Pfadfenster",
+ "",
+ f"{len(probe.queries)} Identitätskörper gegen {len(probe.labels)} Pfadfenster "
+ f"(Länge {BODY_LENGTH}, vorwärts und rückwärts). Zufallserwartung: "
+ f"{BODY_LENGTH * 25 / 26:.1f} Mismatches.",
+ "",
+ ]
+ if not probe.queries:
+ return lines + ["Keine Layer-3-Daten gefunden.", ""]
+ best = probe.distances[:, 0]
+ lines.extend(
+ [
+ f"- Minimum: {int(best.min())}, Median: {float(np.median(best)):.1f}, Mittel: {float(best.mean()):.2f}",
+ "",
+ "| Beste Distanz | Identitäten |",
+ "| --- | --- |",
+ ]
+ )
+ for distance, count in sorted(Counter(best.tolist()).items()):
+ lines.append(f"| {distance} | {count} |")
+
+ family_counts = Counter(probe.labels[idx].split("[", 1)[0] for idx in probe.neighbours[:, 0].tolist())
+ lines.extend(["", "| Pfadfamilie (nächster Treffer) | Identitäten |", "| --- | --- |"])
+ for family, count in family_counts.most_common():
+ lines.append(f"| {family} | {count} |")
+
+ lines.extend(
+ [
+ "",
+ f"### Top {REPORT_ROWS} nächste Paare",
+ "",
+ "| Identität (Body) | Pfadfenster | Hamming | Similarität |",
+ "| --- | --- | --- | --- |",
+ ]
+ )
+ for row in np.argsort(best, kind="stable")[:REPORT_ROWS].tolist():
+ distance = int(probe.distances[row, 0])
+ label = probe.labels[int(probe.neighbours[row, 0])]
+ lines.append(f"| `{probe.queries[row]}` | {label} | {distance} | {1 - distance / BODY_LENGTH:.2%} |")
+ return lines
+
+def write_report(diag_raw: List[SequenceBundle], diag_trim: List[SequenceBundle], vortex: List[SequenceBundle],
+ corpus: CorpusProbe | None = None) -> None:
  ensure_directory(REPORT_PATH.parent)
  lines = [
  "# Layer Crossprobe",
@@ -102,17 +188,30 @@ def write_report(diag_raw: List[SequenceBundle], diag_trim: List[SequenceBundle]
  for diag_bundle, vortex_bundle in zip(diag_raw, vortex):
  lines.append(summarize_pairs(diag_bundle, vortex_bundle))
 
+ if corpus is not None:
+ lines.extend(corpus_lines(corpus))
+
  REPORT_PATH.write_text("\n".join(lines), encoding="utf-8")
  print(f"[layer-crossprobe] ✓ report -> {REPORT_PATH}")
 
 def main() -> None:
+ parser = argparse.ArgumentParser(description=__doc__)
+ parser.add_argument("--no-corpus", action="store_true", help="Nur Diagonal/Vortex-Bündel vergleichen")
+ parser.add_argument("--families", nargs="+", choices=sorted(LINE_FAMILIES), help="Pfadfamilien einschränken")
+ parser.add_argument("--workers", type=int, default=1, help="Prozesse für die Top-k-Suche")
+ args = parser.parse_args()
+
  payload = load_anna_matrix()
  mat = payload.matrix
- diag_raw = diag_sequences(mat)
+ views = matrix_views(mat)
+ diag_raw = diag_sequences(views)
  trimmed = mat[1:, 1:] if mat.shape[0] == 129 else mat
- diag_trim = diag_sequences(trimmed)
- vortex = vortex_sequences(mat)
- write_report(diag_raw, diag_trim, vortex)
+ diag_trim = diag_sequences(matrix_views(trimmed))
+ vortex = vortex_sequences(views)
+ corpus = None
+ if not args.no_corpus:
+ corpus = probe_corpus(mat, load_layer3_bodies(), args.families, args.workers)
+ write_report(diag_raw, diag_trim, vortex, corpus)
 
 if __name__ == "__main__":
  main()
@@ -10,6 +10,8 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 from analysis.utils.data_loader import ensure_directory, load_anna_matrix
+from analysis.utils.matrix_views import MatrixViews, matrix_views
+from analysis.utils.similarity import encode, similarity_matrix, ternary
 
 PLOT_PATH = Path(__file__).resolve().parents[1] / "outputs" / "plots" / "layer_crossprobe.png"
 
@@ -18,68 +20,36 @@ class SequenceBundle:
  label: str
  body: str
 
-def to_char(val: float) -> str:
- return chr(ord("A") + int(abs(val)) % 26)
-
-def diag_sequences(matrix: np.ndarray) -> List[SequenceBundle]:
+def diag_sequences(views: MatrixViews) -> List[SequenceBundle]:
+ size, width = views.shape
  bundles: List[SequenceBundle] = []
- for idx, gs in enumerate(range(0, matrix.shape[0], 32), 1):
- chars: List[str] = []
- for block in range(4):
- r = gs + (block // 2) * 16
- c = (block % 2) * 16
- for offset in range(14):
- row = r + offset
- col = c + offset
- if row < matrix.shape[0] and col < matrix.shape[1]:
- chars.append(to_char(matrix[row, col]))
- bundles.append(SequenceBundle(label=f"Diag#{idx}", body="".join(chars)))
+ for idx, gs in enumerate(range(0, size, 32), 1):
+ coords = [
+ (gs + (block // 2) * 16 + offset, (block % 2) * 16 + offset)
+ for block in range(4)
+ for offset in range(14)
+ ]
+ coords = [(row, col) for row, col in coords if row < size and col < width]
+ bundles.append(SequenceBundle(label=f"Diag#{idx}", body=views.text(views.letters_abs, coords)))
  return bundles
 
-def vortex_sequences(matrix: np.ndarray) -> List[SequenceBundle]:
- center = (matrix.shape[0] - 1) / 2
+def vortex_sequences(views: MatrixViews) -> List[SequenceBundle]:
+ rows, cols = np.indices(views.shape)
+ center = (views.shape[0] - 1) / 2
+ dist = np.hypot(rows - center, cols - center)
  radii = [18, 44, 66, 82]
  bundles: List[SequenceBundle] = []
  for idx, radius in enumerate(radii, 1):
- chars: List[str] = []
- for row in range(matrix.shape[0]):
- for col in range(matrix.shape[1]):
- dist = np.hypot(row - center, col - center)
- if abs(dist - radius) < 0.5:
- chars.append(to_char(matrix[row, col]))
- bundles.append(SequenceBundle(label=f"Vortex#{idx}", body="".join(chars)))
+ ring = np.argwhere(np.abs(dist - radius) < 0.5)  # row-major order
+ bundles.append(SequenceBundle(label=f"Vortex#{idx}", body=views.text(views.letters_abs, ring)))
  return bundles
 
-def similarity(a: str, b: str) -> float:
- length = min(len(a), len(b))
- if length == 0:
- return 0.0
- matches = sum(ch1 == ch2 for ch1, ch2 in zip(a[:length], b[:length]))
- return matches / length
-
-def ternary_profile(seq: str) -> List[int]:
- return [((ord(ch) - ord("A")) % 3) - 1 for ch in seq]
-
-def ternary_similarity(a: str, b: str) -> float:
- ta = ternary_profile(a)
- tb = ternary_profile(b)
- length = min(len(ta), len(tb))
- if length == 0:
- return 0.0
- matches = sum(1 for i in range(length) if ta[i] == tb[i])
- return matches / length
-
 def build_matrices(diag_raw: List[SequenceBundle], diag_trim: List[SequenceBundle], vortex: List[SequenceBundle]) -> Tuple[np.ndarray, np.ndarray]:
- diag_matrix = np.zeros((len(diag_raw), len(diag_trim)))
- for i, raw in enumerate(diag_raw):
- for j, trimmed in enumerate(diag_trim):
- diag_matrix[i, j] = similarity(raw.body, trimmed.body)
-
- cross_matrix = np.zeros((len(diag_raw), len(vortex)))
- for i, raw in enumerate(diag_raw):
- for j, vortex_bundle in enumerate(vortex):
- cross_matrix[i, j] = ternary_similarity(raw.body, vortex_bundle.body)
-
+ raw_codes = encode(bundle.body for bundle in diag_raw)
+ trim_codes = encode(bundle.body for bundle in diag_trim)
+ vortex_codes = encode(bundle.body for bundle in vortex)
+ diag_matrix = similarity_matrix(raw_codes, trim_codes)
+ cross_matrix = similarity_matrix(ternary(raw_codes), ternary(vortex_codes), symbols=3)
  return diag_matrix, cross_matrix
 
 def plot_matrices(diag_matrix: np.ndarray, cross_matrix: np.ndarray, diag_labels: List[str], vortex_labels: List[str]) -> None:
@@ -110,10 +80,11 @@ def plot_matrices(diag_matrix: np.ndarray, cross_matrix: np.ndarray, diag_labels
 def main() -> None:
  payload = load_anna_matrix()
  mat = payload.matrix
- diag_raw = diag_sequences(mat)
+ views = matrix_views(mat)
+ diag_raw = diag_sequences(views)
  trimmed_mat = mat[1:, 1:] if mat.shape[0] == 129 else mat
- diag_trim = diag_sequences(trimmed_mat)
- vortex = vortex_sequences(mat)
+ diag_trim = diag_sequences(matrix_views(trimmed_mat))
+ vortex = vortex_sequences(views)
  diag_matrix, cross_matrix = build_matrices(diag_raw, diag_trim, vortex)
  plot_matrices(diag_matrix, cross_matrix, [bundle.label for bundle in diag_raw], [bundle.label for bundle in vortex])
 
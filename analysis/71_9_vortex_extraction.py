@@ -3,7 +3,9 @@
 Extract Base-26 identities along the four 9-Vortex rings (18, 44, 66, 82).
 
 This extracts identities by sampling cells in a circular pattern at specific radii.
-The "9-Vortex" name comes from using digital root (mod 9) of matrix values.
+The "9-Vortex" name comes from using digital root (mod 9) of matrix values
+(`MatrixViews.digital_root`); the ring letters are read from the shared
+`MatrixViews.letters_abs` view.
 
 Usage:
  python -m analysis.71_9_vortex_extraction
@@ -29,11 +31,11 @@ from analysis.utils.data_loader import load_anna_matrix, ensure_directory
 from analysis.utils.identity_tools import (
  IDENTITY_BODY_LENGTH,
  IdentityRecord,
- base26_char,
  identity_from_body,
  matrix_hash,
  public_key_from_identity,
 )
+from analysis.utils.matrix_views import MatrixViews, matrix_views
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 REPORT_PATH = BASE_DIR / "outputs" / "reports" / "9_vortex_identity_report.md"
@@ -47,12 +49,6 @@ class RingExtraction:
  letters: str
  checksum_valid: bool
 
-def _digital_root(matrix: np.ndarray) -> np.ndarray:
- vals = np.abs(matrix) % 9
- vals = np.where(vals == 0, 9, vals)
- vals[matrix == 0] = 0
- return vals
-
 def _prepare_matrix() -> Tuple[np.ndarray, Path]:
  payload = load_anna_matrix()
  matrix = payload.matrix
@@ -84,11 +80,11 @@ def _ring_positions(matrix: np.ndarray, radius: int, tolerance: float = 1.5) ->
  ordered = [pos for _, pos in sorted(zip(angles, positions))]
  return ordered
 
-def extract_rings(matrix: np.ndarray) -> List[RingExtraction]:
+def extract_rings(views: MatrixViews) -> List[RingExtraction]:
  results: List[RingExtraction] = []
 
  for radius in TARGET_RADII:
- positions = _ring_positions(matrix, radius)
+ positions = _ring_positions(views.letters_abs, radius)
  if len(positions) < IDENTITY_BODY_LENGTH:
  results.append(
  RingExtraction(
@@ -100,7 +96,7 @@ def extract_rings(matrix: np.ndarray) -> List[RingExtraction]:
  )
  continue
 
- letters = "".join(base26_char(matrix[r, c]) for r, c in positions[:IDENTITY_BODY_LENGTH])
+ letters = views.text(views.letters_abs, positions[:IDENTITY_BODY_LENGTH])
  body = letters[:IDENTITY_BODY_LENGTH]
  identity_str = identity_from_body(body, msb_first=True)
  pk_hex, checksum_valid = public_key_from_identity(identity_str)
@@ -183,7 +179,7 @@ def _write_report(matrix: np.ndarray, source_path: Path, data: Sequence[RingExtr
 def main() -> None:
  """Main extraction routine."""
  matrix, source_path = _prepare_matrix()
- extractions = extract_rings(matrix)
+ extractions = extract_rings(matrix_views(matrix))
  
  valid_count = sum(1 for e in extractions if e.identity is not None)
  if valid_count == 0:
@@ -1,20 +1,30 @@
-"""Helper utilities for loading the Anna Matrix and related data."""
+"""Helper utilities for loading the Anna Matrix and related data.
+
+numpy and pandas are imported inside the functions that need them, so that
+importing this module (e.g. only for `ensure_directory`) stays cheap.
+
+Parsing the Excel file is by far the slowest part of loading the matrix, so the
+parsed array is kept as .npz in outputs/cache/matrix/, keyed by the source's
+path, mtime and size.
+"""
 from __future__ import annotations
 
 import json
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import TYPE_CHECKING, Iterable, List, Tuple
 
-import numpy as np
-import pandas as pd
+if TYPE_CHECKING:
+ import numpy as np
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 DEFAULT_MATRIX_PATHS: Tuple[Path, ...] = (
  BASE_DIR / "data" / "anna-matrix" / "Anna_Matrix.xlsx",
 )
 DEFAULT_COMPUTOR_PATH = BASE_DIR / "data" / "computor-data" / "computors.json"
+MATRIX_CACHE_DIR = BASE_DIR / "outputs" / "cache" / "matrix"
+MATRIX_CACHE_VERSION = 1
 
 @dataclass(frozen=True)
 class MatrixPayload:
@@ -37,16 +47,47 @@ def load_anna_matrix(candidate_paths: Iterable[Path] | None = None) -> MatrixPay
  FileNotFoundError: when no matrix file is available.
  
  The matrix is loaded as float32. Non-numeric cells are coerced to 0.0.
+ The Excel file is only parsed when its binary cache is missing or stale.
  """
  paths = tuple(candidate_paths) if candidate_paths else DEFAULT_MATRIX_PATHS
  for path in paths:
  if path.exists():
+ matrix = _load_cached_matrix(path)
+ return MatrixPayload(matrix=matrix, source_path=path, loaded_at=datetime.utcnow())
+ raise FileNotFoundError("Anna_Matrix.xlsx not found under data/anna-matrix/")
+
+def _read_excel_matrix(path: Path) -> np.ndarray:
+ import pandas as pd
+
  df = pd.read_excel(path, header=None)
  # Convert to numeric, coerce errors to NaN, then fill NaN with 0.0
  numeric = df.apply(pd.to_numeric, errors="coerce").fillna(0.0)
- matrix = numeric.to_numpy(dtype=float)
- return MatrixPayload(matrix=matrix, source_path=path, loaded_at=datetime.utcnow())
- raise FileNotFoundError("Anna_Matrix.xlsx not found under data/anna-matrix/")
+ return numeric.to_numpy(dtype=float)
+
+def _load_cached_matrix(path: Path) -> np.ndarray:
+ """Parsed matrix from outputs/cache/matrix/, re-parsing the Excel file when it changed."""
+
+ import numpy as np
+
+ st = path.stat()
+ key = json.dumps([MATRIX_CACHE_VERSION, str(path.resolve()), st.st_mtime_ns, st.st_size])
+ cache_file = MATRIX_CACHE_DIR / f"{path.stem}.npz"
+ if cache_file.exists():
+ try:
+ with np.load(cache_file) as cached:
+ if str(cached["key"]) == key:
+ return cached["matrix"]
+ except (OSError, ValueError, KeyError):
+ pass
+ matrix = _read_excel_matrix(path)
+ try:
+ ensure_directory(MATRIX_CACHE_DIR)
+ tmp = cache_file.with_suffix(".tmp.npz")
+ np.savez(tmp, matrix=matrix, key=np.array(key))
+ tmp.replace(cache_file)
+ except OSError:
+ pass  # read-only checkout: parse again next time
+ return matrix
 
 def load_or_generate_computor_positions(count: int = 676, seed: int = 42) -> List[dict]:
  """Load Computor GPS coordinates or generate deterministic placeholders."""
@@ -57,6 +98,8 @@ def load_or_generate_computor_positions(count: int = 676, seed: int = 42) -> Lis
  data = json.load(handle)
  return data
 
+ import numpy as np
+
  rng = np.random.default_rng(seed)
  lats = rng.uniform(-65.0, 65.0, size=count)
  lons = rng.uniform(-170.0, 170.0, size=count)
@@ -71,6 +114,8 @@ def load_or_generate_computor_positions(count: int = 676, seed: int = 42) -> Lis
 def normalize_coordinates(values: np.ndarray, min_val: float, max_val: float) -> np.ndarray:
  """Linearly scale values to the range [0, 127]."""
 
+ import numpy as np
+
  clipped = np.clip(values, min_val, max_val)
  normed = (clipped - min_val) / (max_val - min_val)
  return normed * 127.0
@@ -82,6 +127,7 @@ def ensure_directory(path: Path) -> Path:
  return path
 
 __all__ = [
+ "MATRIX_CACHE_DIR",
  "MatrixPayload",
  "load_anna_matrix",
  "load_or_generate_computor_positions",
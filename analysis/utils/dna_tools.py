@@ -1,9 +1,10 @@
 """Utility helpers for matrix→DNA→amino-acid conversions."""
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
 
-import numpy as np
+if TYPE_CHECKING:
+ import numpy as np
 
 NUCLEOTIDES = ("A", "C", "G", "T")
 
@@ -75,9 +76,11 @@ CODON_TABLE: Dict[str, str] = {
 }
 
 def matrix_to_dna(matrix: np.ndarray) -> str:
- mapper = np.vectorize(lambda v: NUCLEOTIDES[int(abs(v)) % 4])
- seq = mapper(matrix).flatten()
- return "".join(seq)
+ """Row-major nucleotide string (`NUCLEOTIDES[int(abs(v)) % 4]` per cell)."""
+
+ from analysis.utils.matrix_views import matrix_views
+
+ return matrix_views(matrix, cache_dir=None).dna()
 
 def translate(sequence: str, frame: int) -> str:
  amino = []
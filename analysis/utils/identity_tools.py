@@ -3,11 +3,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from hashlib import sha256
-from typing import Iterable, List, Sequence, Tuple
+from typing import TYPE_CHECKING, Iterable, List, Sequence, Tuple
 
-import numpy as np
 import struct
 
+if TYPE_CHECKING:
+ import numpy as np
+
 ALPHABET_OFFSET = ord("A")
 IDENTITY_BODY_LENGTH = 56
 IDENTITY_LENGTH = 60
@@ -34,6 +36,8 @@ def base26_char(value: float) -> str:
 def matrix_hash(matrix: np.ndarray) -> str:
  """Return a stable SHA-256 hash for the numeric matrix."""
 
+ import numpy as np
+
  normalized = np.asarray(matrix, dtype=np.float32)
  return sha256(normalized.tobytes()).hexdigest()
 
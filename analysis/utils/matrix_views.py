@@ -0,0 +1,148 @@
+"""Per-cell views of the Anna matrix, computed once and shared across analyses.
+
+The probes used to convert matrix cells one at a time, each with its own
+helper (`base26_char`, `to_char`, `base26_to_char`, `_digital_root`,
+`matrix_to_dna`'s vectorized lambda). `MatrixViews` holds every such view
+as a small integer array, so extraction code indexes into it instead:
+
+- `letters_abs`: `int(abs(v)) % 26` (identity_tools.base26_char, cross-probes),
+- `letters_mod`: `int(v) % 26` with Python's sign convention (extraction scripts),
+- `nucleotides`: `int(abs(v)) % 4`, an index into dna_tools.NUCLEOTIDES,
+- `digital_root`: 1..9 for non-zero cells, 0 for zero cells (9-vortex),
+- `ternary`: `letters_abs % 3 - 1` as -1/0/1 (cross-probe ternary profile),
+- `zero_mask`: cells equal to 0.
+
+Views are cached per matrix content: in-process, and as .npz next to the
+binary matrix cache (outputs/cache/matrix/).
+
+    views = load_matrix_views()
+    views.text(views.letters_abs, [(0, 0), (1, 1), (2, 2)])
+
+numpy is imported inside the functions, like the other helpers in this package.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from hashlib import sha256
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Sequence, Tuple
+
+from analysis.utils.data_loader import MATRIX_CACHE_DIR, load_anna_matrix
+
+if TYPE_CHECKING:
+    import numpy as np
+
+VIEWS_VERSION = 1
+NUCLEOTIDE_LETTERS = b"ACGT"  # same order as dna_tools.NUCLEOTIDES
+
+_VIEWS_CACHE: Dict[str, "MatrixViews"] = {}
+_MAX_CACHED = 8  # synthetic matrices (Monte-Carlo, benchmarks) must not pile up
+
+@dataclass(frozen=True)
+class MatrixViews:
+    letters_abs: np.ndarray  # uint8, 0..25
+    letters_mod: np.ndarray  # uint8, 0..25
+    nucleotides: np.ndarray  # uint8, 0..3
+    digital_root: np.ndarray  # uint8, 0..9
+    ternary: np.ndarray  # int8, -1..1
+    zero_mask: np.ndarray  # bool
+
+    @classmethod
+    def from_matrix(cls, matrix: np.ndarray) -> "MatrixViews":
+        import numpy as np
+
+        values = np.trunc(np.asarray(matrix, dtype=np.float64)).astype(np.int64)  # int(v)
+        magnitude = np.abs(values)
+        letters_abs = (magnitude % 26).astype(np.uint8)
+        root = magnitude % 9
+        root = np.where(root == 0, 9, root)
+        root[magnitude == 0] = 0
+        return cls(
+            letters_abs=letters_abs,
+            letters_mod=(values % 26).astype(np.uint8),  # numpy's % follows Python's sign
+            nucleotides=(magnitude % 4).astype(np.uint8),
+            digital_root=root.astype(np.uint8),
+            ternary=(letters_abs % 3).astype(np.int8) - 1,
+            zero_mask=np.asarray(matrix) == 0,
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.letters_abs.shape
+
+    def text(self, view: np.ndarray, coords: Sequence[Tuple[int, int]] | np.ndarray | None = None) -> str:
+        """Letters of a 0..25 view at `coords` ((row, col) pairs, numpy indexing), or of all cells."""
+        import numpy as np
+
+        codes = view.ravel() if coords is None else view[_index(coords)]
+        return (codes.astype(np.uint8) + ord("A")).tobytes().decode("ascii")
+
+    def dna(self, coords: Sequence[Tuple[int, int]] | np.ndarray | None = None) -> str:
+        """Nucleotide string at `coords`, or of all cells in row-major order."""
+        import numpy as np
+
+        codes = self.nucleotides.ravel() if coords is None else self.nucleotides[_index(coords)]
+        return np.frombuffer(NUCLEOTIDE_LETTERS, dtype=np.uint8)[codes].tobytes().decode("ascii")
+
+    def save(self, path: Path) -> None:
+        import numpy as np
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp.npz")
+        np.savez(tmp, **{field.name: getattr(self, field.name) for field in fields(self)})
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "MatrixViews":
+        import numpy as np
+
+        with np.load(path) as data:
+            return cls(**{field.name: data[field.name] for field in fields(cls)})
+
+def _index(coords: Sequence[Tuple[int, int]] | np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    import numpy as np
+
+    coords = np.asarray(coords, dtype=np.intp).reshape(-1, 2)
+    return coords[:, 0], coords[:, 1]
+
+def matrix_digest(matrix: np.ndarray) -> str:
+    """Same digest as identity_tools.matrix_hash."""
+    import numpy as np
+
+    return sha256(np.asarray(matrix, dtype=np.float32).tobytes()).hexdigest()
+
+def matrix_views(matrix: np.ndarray, cache_dir: Optional[Path] = MATRIX_CACHE_DIR) -> MatrixViews:
+    """Views of `matrix`, computed once per matrix content (`cache_dir=None`: in-process only)."""
+    digest = matrix_digest(matrix)
+    views = _VIEWS_CACHE.get(digest)
+    if views is not None:
+        return views
+    cache_file = cache_dir / f"views_v{VIEWS_VERSION}_{digest[:16]}.npz" if cache_dir is not None else None
+    if cache_file is not None and cache_file.exists():
+        try:
+            views = MatrixViews.load(cache_file)
+        except (OSError, ValueError, KeyError):
+            views = None
+    if views is None:
+        views = MatrixViews.from_matrix(matrix)
+        if cache_file is not None:
+            try:
+                views.save(cache_file)
+            except OSError:
+                pass
+    if len(_VIEWS_CACHE) >= _MAX_CACHED:
+        _VIEWS_CACHE.pop(next(iter(_VIEWS_CACHE)))
+    _VIEWS_CACHE[digest] = views
+    return views
+
+def load_matrix_views(candidate_paths: Iterable[Path] | None = None) -> MatrixViews:
+    """Views of the Anna matrix as returned by `load_anna_matrix`."""
+    return matrix_views(load_anna_matrix(candidate_paths).matrix)
+
+__all__ = [
+    "MatrixViews",
+    "NUCLEOTIDE_LETTERS",
+    "load_matrix_views",
+    "matrix_digest",
+    "matrix_views",
+]
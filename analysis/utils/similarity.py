@@ -0,0 +1,234 @@
+"""Vectorized approximate matching between sets of letter sequences.
+
+Sequences are encoded as uint8 arrays (A-Z -> 0..25, case-insensitive,
+`PAD` after the end of shorter strings). All-pairs comparisons run block by
+block so memory stays bounded for corpus-sized inputs (e.g. 23k Layer-3
+identities against every matrix path window):
+
+- Hamming: matches are counted with a one-hot matrix product (BLAS, uses all
+  cores), mismatches are taken over the common length of each pair - the same
+  convention as the cross-probe scripts (`min(len(a), len(b))`),
+- top-k retrieval keeps the k nearest references per query across blocks,
+- banded edit distance (Levenshtein restricted to |i - j| <= band) is computed
+  for many pairs at once, one DP row per position.
+
+`workers > 1` splits the queries across processes in addition to BLAS threads.
+
+numpy is imported inside the functions, like the other helpers in this package.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+ALPHABET = 26
+PAD = 255
+DEFAULT_BLOCK = 2048
+
+def encode(sequences: Iterable[str], length: Optional[int] = None) -> np.ndarray:
+    """(n, length) uint8 codes; non-letters and positions past the end are PAD."""
+    import numpy as np
+
+    sequences = list(sequences)
+    if length is None:
+        length = max((len(seq) for seq in sequences), default=0)
+    raw = np.frombuffer(
+        "".join(seq.upper()[:length].ljust(length, "\0") for seq in sequences).encode("latin-1", "replace"), dtype=np.uint8
+    ).reshape(len(sequences), length)
+    codes = raw.astype(np.int16) - ord("A")
+    return np.where((codes >= 0) & (codes < ALPHABET), codes, PAD).astype(np.uint8)
+
+def decode(codes: np.ndarray) -> List[str]:
+    import numpy as np
+
+    letters = np.where(codes == PAD, 0, codes + ord("A")).astype(np.uint8)
+    return [row.tobytes().decode("latin-1").rstrip("\0") for row in letters]
+
+def ternary(codes: np.ndarray) -> np.ndarray:
+    """Letters folded to the ternary profile used by the cross-probes ((code % 3) as 0..2)."""
+    import numpy as np
+
+    return np.where(codes == PAD, PAD, codes % 3).astype(np.uint8)
+
+def lengths(codes: np.ndarray) -> np.ndarray:
+    """Number of leading non-PAD positions per row."""
+    import numpy as np
+
+    pad = codes == PAD
+    return np.where(pad.any(axis=1), pad.argmax(axis=1), codes.shape[1])
+
+def windows(texts: Sequence[str], length: int, cyclic: Sequence[bool] = ()) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """All `length`-windows of `texts` as codes, with (text index, offset) per window."""
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    blocks, owners, offsets = [], [], []
+    for idx, text in enumerate(texts):
+        wrap = idx < len(cyclic) and cyclic[idx] and len(text) >= length
+        source = text + text[:length - 1] if wrap else text
+        if len(source) < length:
+            continue
+        codes = encode([source])[0]
+        view = sliding_window_view(codes, length)
+        count = len(text) if wrap else len(view)
+        blocks.append(view[:count])
+        owners.append(np.full(count, idx, dtype=np.int32))
+        offsets.append(np.arange(count, dtype=np.int32))
+    if not blocks:
+        return np.zeros((0, length), dtype=np.uint8), np.zeros(0, np.int32), np.zeros(0, np.int32)
+    return np.concatenate(blocks), np.concatenate(owners), np.concatenate(offsets)
+
+def _one_hot(codes: np.ndarray, symbols: int) -> np.ndarray:
+    """(n, length * symbols) float32; PAD rows are all zero so they never match."""
+    import numpy as np
+
+    n, length = codes.shape
+    out = np.zeros((n, length, symbols), dtype=np.float32)
+    rows, cols = np.nonzero(codes != PAD)
+    out[rows, cols, codes[rows, cols]] = 1.0
+    return out.reshape(n, length * symbols)
+
+def _common_length(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    if a.shape[1] != b.shape[1]:
+        width = max(a.shape[1], b.shape[1])
+        a = _pad_to(a, width)
+        b = _pad_to(b, width)
+    return a, b
+
+def _pad_to(codes: np.ndarray, width: int) -> np.ndarray:
+    import numpy as np
+
+    if codes.shape[1] == width:
+        return codes
+    out = np.full((codes.shape[0], width), PAD, dtype=np.uint8)
+    out[:, :codes.shape[1]] = codes
+    return out
+
+def match_matrix(a: np.ndarray, b: np.ndarray, symbols: int = ALPHABET) -> np.ndarray:
+    """(len(a), len(b)) number of equal positions (int32)."""
+    import numpy as np
+
+    a, b = _common_length(a, b)
+    return np.rint(_one_hot(a, symbols) @ _one_hot(b, symbols).T).astype(np.int32)
+
+def hamming_matrix(a: np.ndarray, b: np.ndarray, symbols: int = ALPHABET) -> np.ndarray:
+    """(len(a), len(b)) mismatches over the common length of each pair."""
+    import numpy as np
+
+    common = np.minimum.outer(lengths(a), lengths(b))
+    return (common - match_matrix(a, b, symbols)).astype(np.int32)
+
+def similarity_matrix(a: np.ndarray, b: np.ndarray, symbols: int = ALPHABET) -> np.ndarray:
+    """(len(a), len(b)) fraction of equal positions over the common length (0.0 if empty)."""
+    import numpy as np
+
+    common = np.minimum.outer(lengths(a), lengths(b))
+    matches = match_matrix(a, b, symbols)
+    return np.divide(matches, common, out=np.zeros(matches.shape, dtype=np.float64), where=common > 0)
+
+def _topk_block(args: Tuple[np.ndarray, np.ndarray, int, int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    import numpy as np
+
+    queries, refs, k, block, symbols = args
+    query_hot = _one_hot(queries, symbols)
+    query_len = lengths(queries)
+    # distance and reference index packed into one key, so ties resolve by index
+    scale = np.int64(len(refs) + 1)
+    best = np.full((len(queries), k), np.iinfo(np.int64).max, dtype=np.int64)
+    for start in range(0, len(refs), block):
+        chunk = refs[start:start + block]
+        common = np.minimum.outer(query_len, lengths(chunk))
+        dist = common - np.rint(query_hot @ _one_hot(chunk, symbols).T).astype(np.int64)
+        keys = np.concatenate([best, dist * scale + np.arange(start, start + len(chunk))], axis=1)
+        best = np.partition(keys, k - 1, axis=1)[:, :k] if keys.shape[1] > k else keys
+    best = np.sort(best, axis=1)
+    unused = best == np.iinfo(np.int64).max
+    dist = np.where(unused, -1, best // scale).astype(np.int32)
+    idx = np.where(unused, -1, best % scale)
+    return dist, idx
+
+def hamming_topk(queries: np.ndarray, refs: np.ndarray, k: int = 5, block: int = DEFAULT_BLOCK,
+                 workers: int = 1, symbols: int = ALPHABET) -> Tuple[np.ndarray, np.ndarray]:
+    """k nearest references per query: (distances, reference indices), each (len(queries), k).
+
+    Ties are broken by reference index; unused slots (fewer than k references)
+    have distance and index -1.
+    """
+    import numpy as np
+
+    queries, refs = _common_length(queries, refs)
+    k = max(1, k)
+    parts = [
+        (queries[start:start + block], refs, k, block, symbols) for start in range(0, len(queries), block)
+    ]
+    if not parts:
+        return np.zeros((0, k), dtype=np.int32), np.zeros((0, k), dtype=np.int64)
+    if workers > 1 and len(parts) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_topk_block, parts))
+    else:
+        results = [_topk_block(part) for part in parts]
+    return np.concatenate([d for d, _ in results]), np.concatenate([i for _, i in results])
+
+def banded_edit_distance(a: np.ndarray, b: np.ndarray, band: int = 2) -> np.ndarray:
+    """Levenshtein distance of aligned pairs (a[i], b[i]) within a diagonal band.
+
+    Exact whenever the distance is <= band; larger distances are reported as
+    band + 1. Both arrays must have the same shape (use a common width); each
+    row ends at its first PAD, and the result for a pair is read at
+    D[len(a[i])][len(b[i])], so rows of different lengths compare correctly.
+    """
+    import numpy as np
+
+    if a.shape != b.shape:
+        raise ValueError(f"Shapes differ: {a.shape} vs {b.shape}")
+    pairs, length = a.shape
+    cap = band + 1
+    width = 2 * band + 1
+    len_a, len_b = lengths(a), lengths(b)
+    # Column of D[len_a][len_b] in the banded row len_a; outside the band the distance is > band
+    target = len_b - len_a + band
+    in_band = (target >= 0) & (target < width)
+    result = np.full(pairs, cap, dtype=np.int32)
+    done = in_band & (len_a == 0)
+    result[done] = len_b[done]  # D[0][j] = j
+    inf = np.int32(length + width)
+    prev = np.full((pairs, width), inf, dtype=np.int32)
+    for d in range(band, width):  # row 0: D[0][j] = j
+        prev[:, d] = d - band
+    for i in range(1, int(len_a.max(initial=0)) + 1):
+        row = np.full((pairs, width), inf, dtype=np.int32)
+        for d in range(width):
+            j = i + d - band
+            if j < 0 or j > length:
+                continue
+            if j == 0:
+                row[:, d] = i
+                continue
+            cost = (a[:, i - 1] != b[:, j - 1]).astype(np.int32)
+            best = prev[:, d] + cost  # diagonal: D[i-1][j-1]
+            if d + 1 < width:
+                best = np.minimum(best, prev[:, d + 1] + 1)  # D[i-1][j]
+            if d > 0:
+                best = np.minimum(best, row[:, d - 1] + 1)  # D[i][j-1]
+            row[:, d] = best
+        prev = row
+        done = np.flatnonzero(in_band & (len_a == i))
+        result[done] = row[done, target[done]]
+    return np.minimum(result, cap)
+
+def edit_distance_matrix(a: np.ndarray, b: np.ndarray, band: int = 2, block: int = 256) -> np.ndarray:
+    """(len(a), len(b)) banded edit distances (see `banded_edit_distance`); lengths may differ."""
+    import numpy as np
+
+    a, b = _common_length(a, b)
+    out = np.empty((len(a), len(b)), dtype=np.int32)
+    for start in range(0, len(a), block):
+        chunk = a[start:start + block]
+        left = np.repeat(chunk, len(b), axis=0)
+        right = np.tile(b, (len(chunk), 1))
+        out[start:start + len(chunk)] = banded_edit_distance(left, right, band).reshape(len(chunk), len(b))
+    return out
@@ -0,0 +1,96 @@
+"""Seed -> identity derivation: seed_candidate_scan, the qubipy chain and the portable chain."""
+
+from __future__ import annotations
+
+from benchmarks.fixtures import Cycle, require, seed_corpus
+from benchmarks.harness import benchmark
+
+def _scan():
+    from scripts.core import seed_candidate_scan
+
+    return seed_candidate_scan, Cycle(seed_corpus(10_000))
+
+@benchmark("derivation", setup=_scan)
+def seed_candidate_scan(state):
+    scan, seeds = state
+    scan.derive_identity_from_seed(seeds.next())
+
+def _qubipy():
+    require("qubipy")
+    from scripts.core.derivation_backends import QubipyBackend
+
+    return QubipyBackend(), Cycle(seed_corpus(10_000))
+
+@benchmark("derivation", setup=_qubipy)
+def qubipy_chain(state):
+    backend, seeds = state
+    backend.derive(seeds.next())
+
+def _portable():
+    from scripts.core.derivation_backends import PortableBackend
+    from scripts.core.qubic_crypto import scalar_mul_base
+
+    scalar_mul_base(1)  # fixed-base table is built once per process
+    return PortableBackend(), Cycle(seed_corpus(10_000))
+
+@benchmark("derivation", setup=_portable)
+def portable_chain(state):
+    backend, seeds = state
+    backend.derive(seeds.next())
+
+def _portable_batch():
+    require("numpy")
+    backend, _ = _portable()
+    return backend, seed_corpus(1_000)
+
+@benchmark("derivation", setup=_portable_batch, items=1_000, min_calls=1)
+def portable_batch_1k(state):
+    backend, seeds = state
+    backend.derive_batch(seeds)
+
+def _qubipy_stages():
+    """Inputs for every stage, precomputed so each stage is timed alone."""
+    require("qubipy")
+    from scripts.core.derivation_backends import _load_qubipy
+
+    fn = _load_qubipy()
+    inputs = {"subseed": [], "private_key": [], "public_key": [], "identity": []}
+    for seed in seed_corpus(10_000)[:1000]:
+        value = seed.encode("utf-8")
+        for stage in ("subseed", "private_key", "public_key", "identity"):
+            inputs[stage].append(value)
+            value = fn[stage](value)
+    return fn, {stage: Cycle(values) for stage, values in inputs.items()}
+
+def _register_stages() -> None:
+    for stage in ("subseed", "private_key", "public_key", "identity"):
+
+        def run(state, stage=stage):
+            fn, inputs = state
+            fn[stage](inputs[stage].next())
+
+        benchmark("derivation", f"qubipy_{stage}", setup=_qubipy_stages)(run)
+
+def _register_batches() -> None:
+    for size, large in ((10_000, False), (100_000, True)):
+        label = f"{size // 1000}k"
+
+        def setup(size=size):
+            require("qubipy")
+            from scripts.core.derivation_backends import PoolBackend
+
+            return PoolBackend(), seed_corpus(size)
+
+        def run(state):
+            backend, seeds = state
+            backend.derive_batch(seeds)
+
+        def teardown(state):
+            if state:
+                state[0].close()
+
+        benchmark("derivation", f"pool_batch_{label}", setup=setup, teardown=teardown, items=size, min_calls=1,
+                  large=large)(run)
+
+_register_stages()
+_register_batches()
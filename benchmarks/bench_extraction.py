@@ -0,0 +1,67 @@
+"""Matrix pattern extraction and the per-matrix cost of the Monte-Carlo simulation."""
+
+from __future__ import annotations
+
+from benchmarks.fixtures import FIXTURE_SEED, Cycle, require, synthetic_matrices
+from benchmarks.harness import benchmark
+
+# Same fallback the simulation uses without the Excel file; keeps the run deterministic
+UNIFORM_DISTRIBUTION = {"value_range": (-128, 127), "distribution": "uniform"}
+
+def _monte_carlo():
+    require("numpy")
+    from scripts.verify import monte_carlo_full_simulation
+
+    return monte_carlo_full_simulation, Cycle(synthetic_matrices(32))
+
+@benchmark("extraction", setup=_monte_carlo)
+def diagonal_identities(state):
+    mc, matrices = state
+    mc.extract_diagonal_identities(matrices.next())
+
+@benchmark("extraction", setup=_monte_carlo)
+def vortex_identities(state):
+    mc, matrices = state
+    mc.extract_vortex_identities(matrices.next())
+
+def _dna():
+    require("numpy")
+    from analysis.utils import dna_tools
+
+    return dna_tools, Cycle(synthetic_matrices(4))
+
+@benchmark("extraction", setup=_dna)
+def matrix_to_dna(state):
+    tools, matrices = state
+    tools.matrix_to_dna(matrices.next())
+
+def _views():
+    require("numpy")
+    from analysis.utils.matrix_views import MatrixViews
+
+    return MatrixViews, Cycle(synthetic_matrices(4))
+
+@benchmark("extraction", setup=_views)
+def matrix_views(state):
+    """All per-cell views of one matrix (letters, nucleotides, digital roots, ternary)."""
+    views, matrices = state
+    views.from_matrix(matrices.next())
+
+def _simulation():
+    np = require("numpy")
+    from scripts.verify import monte_carlo_full_simulation
+
+    return monte_carlo_full_simulation, np.random.default_rng(FIXTURE_SEED)
+
+@benchmark("monte_carlo", setup=_simulation)
+def per_matrix(state):
+    """One loop iteration of run_monte_carlo_simulation without RPC."""
+    mc, rng = state
+    matrix = mc.generate_random_matrix(UNIFORM_DISTRIBUTION, rng)
+    mc.extract_diagonal_identities(matrix)
+    mc.extract_vortex_identities(matrix)
+
+@benchmark("monte_carlo", setup=_simulation)
+def generate_matrix(state):
+    mc, rng = state
+    mc.generate_random_matrix(UNIFORM_DISTRIBUTION, rng)
@@ -0,0 +1,49 @@
+"""Identity encoding and checksum (analysis/utils/identity_tools.py)."""
+
+from __future__ import annotations
+
+from benchmarks.fixtures import Cycle, body_corpus, identity_corpus
+from benchmarks.harness import benchmark
+
+def _identity_tools():
+    from analysis.utils import identity_tools
+
+    return identity_tools
+
+def _bodies():
+    return _identity_tools(), Cycle(body_corpus(10_000))
+
+def _identities():
+    return _identity_tools(), Cycle(identity_corpus(10_000))
+
+@benchmark("identity", setup=_bodies)
+def identity_from_body(state):
+    tools, bodies = state
+    tools.identity_from_body(bodies.next())
+
+@benchmark("identity", setup=_bodies)
+def checksum_letters(state):
+    tools, bodies = state
+    tools.checksum_letters(tools._pack_body(bodies.next()))
+
+@benchmark("identity", setup=_identities)
+def public_key_from_identity(state):
+    tools, identities = state
+    tools.public_key_from_identity(identities.next())
+
+def _register_batches() -> None:
+    for size, large in ((10_000, False), (100_000, True)):
+        label = f"{size // 1000}k"
+
+        def setup(size=size):
+            return _identity_tools(), body_corpus(size)
+
+        def run(state):
+            tools, bodies = state
+            for body in bodies:
+                tools.identity_from_body(body)
+
+        benchmark("identity", f"identity_from_body_batch_{label}", setup=setup, items=size, min_calls=3,
+                  large=large)(run)
+
+_register_batches()
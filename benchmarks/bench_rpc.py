@@ -0,0 +1,50 @@
+"""RPC round trips against the local mock node (no network, no rate limits)."""
+
+from __future__ import annotations
+
+import http.client
+import json
+from urllib.parse import urlsplit
+
+from benchmarks.fixtures import Cycle, MockRPCServer, identity_corpus, require
+from benchmarks.harness import benchmark
+
+def _stop(state) -> None:
+    if state:
+        state[0].stop()
+
+def _http_client():
+    server = MockRPCServer().start()
+    url = urlsplit(server.url)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=10)
+    return server, conn, url.path, Cycle(identity_corpus(1000))
+
+@benchmark("rpc", setup=_http_client, teardown=_stop)
+def balance_http_client(state):
+    """Floor: one keep-alive GET + JSON decode with the standard library."""
+    _, conn, base, identities = state
+    conn.request("GET", f"{base}/balances/{identities.next()}")
+    json.loads(conn.getresponse().read())
+
+def _requests_session():
+    requests = require("requests")
+    server = MockRPCServer().start()
+    return server, requests.Session(), server.url, Cycle(identity_corpus(1000))
+
+@benchmark("rpc", setup=_requests_session, teardown=_stop)
+def balance_requests(state):
+    _, session, base, identities = state
+    session.get(f"{base}/balances/{identities.next()}", timeout=10).json()
+
+def _qubipy_rpc():
+    require("qubipy")
+    from qubipy.rpc import rpc_client
+
+    server = MockRPCServer().start()
+    return server, rpc_client.QubiPy_RPC(rpc_url=server.url), Cycle(identity_corpus(1000))
+
+@benchmark("rpc", setup=_qubipy_rpc, teardown=_stop)
+def balance_qubipy(state):
+    """What the validation scripts do per identity (QubiPy_RPC.get_balance)."""
+    _, rpc, identities = state
+    rpc.get_balance(identities.next())
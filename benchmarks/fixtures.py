@@ -0,0 +1,124 @@
+"""
+Fixed-seed fixtures for the benchmarks.
+
+Everything here is deterministic (same seed, same data) so runs on different
+commits are comparable. Corpora are cached per process because building a
+100k-seed corpus takes longer than some of the benchmarks using it.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import string
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List, Optional, Tuple
+
+from benchmarks.harness import SkipBenchmark
+
+FIXTURE_SEED = 20251122
+SEED_LENGTH = 55
+IDENTITY_LENGTH = 60
+MATRIX_SIZE = 128
+
+def require(module: str) -> Any:
+    """Import an optional dependency or skip the benchmark."""
+    import importlib
+
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise SkipBenchmark(f"{module} not installed ({e})")
+
+@lru_cache(maxsize=None)
+def seed_corpus(size: int, seed: int = FIXTURE_SEED) -> Tuple[str, ...]:
+    """`size` random 55-letter lowercase seeds."""
+    rng = random.Random(seed)
+    letters = string.ascii_lowercase
+    return tuple("".join(rng.choices(letters, k=SEED_LENGTH)) for _ in range(size))
+
+@lru_cache(maxsize=None)
+def identity_corpus(size: int, seed: int = FIXTURE_SEED) -> Tuple[str, ...]:
+    """`size` random 60-letter uppercase identities (checksums not valid)."""
+    rng = random.Random(seed + 1)
+    letters = string.ascii_uppercase
+    return tuple("".join(rng.choices(letters, k=IDENTITY_LENGTH)) for _ in range(size))
+
+@lru_cache(maxsize=None)
+def body_corpus(size: int, seed: int = FIXTURE_SEED) -> Tuple[str, ...]:
+    """56-letter identity bodies."""
+    return tuple(identity[:56] for identity in identity_corpus(size, seed))
+
+def synthetic_matrices(count: int, seed: int = FIXTURE_SEED) -> List[Any]:
+    """`count` float32 128x128 matrices with values in [-128, 127] (numpy)."""
+    np = require("numpy")
+    rng = np.random.default_rng(seed)
+    return [
+        rng.integers(-128, 128, size=(MATRIX_SIZE, MATRIX_SIZE), dtype=np.int16).astype(np.float32)
+        for _ in range(count)
+    ]
+
+class Cycle:
+    """Hands out corpus items round-robin, one per benchmark call."""
+
+    def __init__(self, items) -> None:
+        self.items = items
+        self.index = 0
+
+    def next(self):
+        item = self.items[self.index]
+        self.index = (self.index + 1) % len(self.items)
+        return item
+
+class _BalanceHandler(BaseHTTPRequestHandler):
+    """Answers like rpc.qubic.org: GET /v1/balances/<identity>, GET /v1/tick-info."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like a pooled client against the real node
+    wbufsize = 1 << 16  # headers and body in one segment (no Nagle/delayed-ACK stalls)
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802 (http.server API)
+        parts = self.path.strip("/").split("/")
+        if len(parts) == 3 and parts[:2] == ["v1", "balances"]:
+            body = {"balance": {"id": parts[2], "balance": "0", "validForTick": 17_000_000,
+                                "latestIncomingTransferTick": 0, "latestOutgoingTransferTick": 0}}
+            self._send(200, body)
+        elif parts == ["v1", "tick-info"]:
+            self._send(200, {"tickInfo": {"tick": 17_000_000, "duration": 1, "epoch": 150}})
+        else:
+            self._send(404, {"code": 5, "message": "Not Found"})
+
+    def _send(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:  # silence per-request logging
+        pass
+
+class MockRPCServer:
+    """Local stand-in for the Qubic RPC node, so round trips measure our client code."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = ThreadingHTTPServer((host, port), _BalanceHandler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockRPCServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-rpc", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
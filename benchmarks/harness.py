@@ -0,0 +1,215 @@
+"""
+Minimal benchmark harness (asv/pytest-benchmark style, no extra dependency).
+
+Benchmarks are plain functions registered with `@benchmark`. A benchmark
+takes the object returned by its `setup` (fixtures are built once and not
+timed) and performs one operation per call. The harness times every call
+individually and reports ops/sec, p50/p99 latency and peak traced memory.
+
+    @benchmark("identity", setup=lambda: fixtures.seed_corpus(10_000), items=1)
+    def checksum(corpus):
+        ...
+
+Results can be saved as a named baseline and later compared against it.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+project_root = Path(__file__).parent.parent
+
+BASELINE_DIR = project_root / "outputs" / "benchmarks"
+
+class SkipBenchmark(Exception):
+    """Raised by a setup when a dependency (qubipy, numpy, docker ...) is missing."""
+
+@dataclass
+class Benchmark:
+    name: str
+    group: str
+    func: Callable[[Any], Any]
+    setup: Optional[Callable[[], Any]] = None
+    teardown: Optional[Callable[[Any], None]] = None
+    items: int = 1  # items processed per call; ops/sec counts items
+    min_calls: int = 5
+    large: bool = False  # 100k-corpus variants, only run with --large
+
+    @property
+    def key(self) -> str:
+        return f"{self.group}.{self.name}"
+
+@dataclass
+class Result:
+    key: str
+    status: str = "ok"  # ok | skipped | error
+    calls: int = 0
+    items: int = 1
+    ops_per_sec: float = 0.0
+    mean_ms: float = 0.0
+    p50_ms: float = 0.0
+    p99_ms: float = 0.0
+    min_ms: float = 0.0
+    peak_kib: float = 0.0
+    note: str = ""
+
+REGISTRY: Dict[str, Benchmark] = {}
+
+def benchmark(
+    group: str,
+    name: Optional[str] = None,
+    setup: Optional[Callable[[], Any]] = None,
+    teardown: Optional[Callable[[Any], None]] = None,
+    items: int = 1,
+    min_calls: int = 5,
+    large: bool = False,
+) -> Callable[[Callable[[Any], Any]], Callable[[Any], Any]]:
+    """Register `func` as benchmark `<group>.<name>`."""
+
+    def register(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        bench = Benchmark(name or func.__name__, group, func, setup, teardown, items, min_calls, large)
+        if bench.key in REGISTRY:
+            raise ValueError(f"Duplicate benchmark: {bench.key}")
+        REGISTRY[bench.key] = bench
+        return func
+
+    return register
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(q / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+def measure(bench: Benchmark, min_time: float = 1.0, max_calls: int = 100_000, warmup: int = 1) -> Result:
+    """Run one benchmark: setup, warmup, timed calls, then a traced pass for memory."""
+    result = Result(bench.key, items=bench.items)
+    try:
+        state = bench.setup() if bench.setup else None
+    except SkipBenchmark as e:
+        result.status, result.note = "skipped", str(e)
+        return result
+    except Exception as e:
+        result.status, result.note = "error", f"setup: {type(e).__name__}: {e}"
+        return result
+
+    func = bench.func
+    try:
+        for _ in range(warmup):
+            func(state)
+
+        samples: List[int] = []
+        clock = time.perf_counter_ns
+        deadline = clock() + int(min_time * 1e9)
+        gc_was_enabled = gc.isenabled()
+        gc.collect()
+        gc.disable()
+        try:
+            while len(samples) < max_calls and (len(samples) < bench.min_calls or clock() < deadline):
+                start = clock()
+                func(state)
+                samples.append(clock() - start)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        # Separate pass: tracemalloc slows allocation-heavy code down
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func(state)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    except SkipBenchmark as e:
+        result.status, result.note = "skipped", str(e)
+        return result
+    except Exception as e:
+        result.status, result.note = "error", f"{type(e).__name__}: {e}"
+        return result
+    finally:
+        if bench.teardown:
+            bench.teardown(state)
+
+    ordered = sorted(ns / 1e6 for ns in samples)
+    total_s = sum(samples) / 1e9
+    result.calls = len(samples)
+    result.ops_per_sec = bench.items * len(samples) / total_s if total_s else 0.0
+    result.mean_ms = sum(ordered) / len(ordered)
+    result.p50_ms = percentile(ordered, 50)
+    result.p99_ms = percentile(ordered, 99)
+    result.min_ms = ordered[0]
+    result.peak_kib = max(0, peak - baseline) / 1024
+    return result
+
+def machine_info() -> Dict[str, Any]:
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def save_baseline(results: List[Result], name: str, directory: Path = BASELINE_DIR) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{name}.json"
+    payload = {
+        "name": name,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "results": {r.key: asdict(r) for r in results if r.status == "ok"},
+    }
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    tmp_path.replace(path)
+    return path
+
+def load_baseline(name: str, directory: Path = BASELINE_DIR) -> Dict[str, Any]:
+    path = Path(name) if name.endswith(".json") else directory / f"{name}.json"
+    return json.loads(path.read_text(encoding="utf-8"))
+
+@dataclass
+class Comparison:
+    key: str
+    base_p50_ms: float
+    p50_ms: float
+    base_ops: float
+    ops: float
+    verdict: str = "same"  # faster | slower | same
+    notes: List[str] = field(default_factory=list)
+
+    @property
+    def ratio(self) -> float:
+        """p50 now / p50 baseline (< 1 is faster)."""
+        return self.p50_ms / self.base_p50_ms if self.base_p50_ms else 0.0
+
+def compare(results: List[Result], baseline: Dict[str, Any], threshold: float = 0.10) -> List[Comparison]:
+    """Compare p50 latency with the baseline; beyond ±threshold counts as a change."""
+    base = baseline.get("results", {})
+    comparisons: List[Comparison] = []
+    for result in results:
+        old = base.get(result.key)
+        if result.status != "ok" or old is None:
+            continue
+        comp = Comparison(result.key, old["p50_ms"], result.p50_ms, old["ops_per_sec"], result.ops_per_sec)
+        if comp.ratio > 1 + threshold:
+            comp.verdict = "slower"
+        elif comp.ratio and comp.ratio < 1 - threshold:
+            comp.verdict = "faster"
+        if old.get("peak_kib") and result.peak_kib > old["peak_kib"] * (1 + threshold) + 64:
+            comp.notes.append(f"peak memory {old['peak_kib']:.0f} -> {result.peak_kib:.0f} KiB")
+        comparisons.append(comp)
+    return comparisons
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Run the benchmark suite.
+
+Usage:
+    python3 benchmarks/run.py                          # all benchmarks (10k corpora)
+    python3 benchmarks/run.py -k derivation -k rpc     # filter by substring
+    python3 benchmarks/run.py --large                  # include 100k-corpus batches
+    python3 benchmarks/run.py --save-baseline before   # outputs/benchmarks/before.json
+    python3 benchmarks/run.py --compare before         # exit 1 on regressions
+    python3 benchmarks/run.py --list
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.harness import REGISTRY, Benchmark, Result, compare, load_baseline, measure, save_baseline
+
+BENCH_MODULES = ["bench_identity", "bench_derivation", "bench_extraction", "bench_rpc"]
+
+def load_benchmarks() -> None:
+    for name in BENCH_MODULES:
+        importlib.import_module(f"benchmarks.{name}")
+
+def select(filters: Sequence[str], large: bool) -> List[Benchmark]:
+    selected = []
+    for key, bench in REGISTRY.items():
+        if bench.large and not large:
+            continue
+        if filters and not any(f in key for f in filters):
+            continue
+        selected.append(bench)
+    return selected
+
+def format_result(result: Result) -> str:
+    if result.status != "ok":
+        return f"  {result.key:<44} {result.status}: {result.note}"
+    return (
+        f"  {result.key:<44} {result.ops_per_sec:>12,.1f}/s  p50 {result.p50_ms:>9.3f} ms"
+        f"  p99 {result.p99_ms:>9.3f} ms  peak {result.peak_kib:>9.1f} KiB  (n={result.calls})"
+    )
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmarks for the identity, derivation, extraction and RPC paths")
+    parser.add_argument("-k", dest="filters", action="append", default=[], help="Only benchmarks containing this")
+    parser.add_argument("--large", action="store_true", help="Include 100k-corpus benchmarks")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds per benchmark (default: 1.0)")
+    parser.add_argument("--save-baseline", metavar="NAME", help="Save results as a named baseline")
+    parser.add_argument("--compare", metavar="NAME", help="Compare with a saved baseline (name or .json path)")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative p50 change that counts (default: 0.10)")
+    parser.add_argument("--json", metavar="PATH", help="Also write raw results as JSON")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    load_benchmarks()
+    benches = select(args.filters, args.large)
+
+    if args.list:
+        for bench in benches:
+            print(f"  {bench.key:<44} items/call: {bench.items}")
+        return 0
+
+    print("=" * 80)
+    print("BENCHMARKS")
+    print("=" * 80)
+    results: List[Result] = []
+    for bench in benches:
+        result = measure(bench, min_time=args.min_time)
+        results.append(result)
+        print(format_result(result), flush=True)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps([asdict(r) for r in results], indent=2), encoding="utf-8")
+    if args.save_baseline:
+        print(f"\nBaseline saved: {save_baseline(results, args.save_baseline)}")
+
+    exit_code = 1 if any(r.status == "error" for r in results) else 0
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        print()
+        print(f"Compared with baseline '{baseline.get('name')}' ({baseline.get('created')}):")
+        symbols = {"faster": "⬆️", "slower": "⬇️", "same": "  "}
+        comparisons = compare(results, baseline, args.threshold)
+        for comp in comparisons:
+            notes = f"  [{'; '.join(comp.notes)}]" if comp.notes else ""
+            print(f"  {symbols[comp.verdict]} {comp.key:<44} p50 {comp.base_p50_ms:9.3f} -> {comp.p50_ms:9.3f} ms"
+                  f"  ({comp.ratio:.2f}x){notes}")
+        if any(comp.verdict == "slower" for comp in comparisons):
+            exit_code = 1
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,8 @@
 # - Reads: data/anna-matrix/Anna_Matrix.xlsx
 # - Creates: outputs/ directory and subdirectories
 # - Runs: Python scripts in analysis/ and scripts/
+#   (steps 2-5 via scripts/analysis/run_all_analyses.py --group verify: parallel,
+#   unchanged steps reused from outputs/cache/; pass --force to rerun them all)
 # - Writes: Reports to outputs/reports/, plots to outputs/plots/
 # - Optional: Docker container for on-chain verification (connects to Qubic RPC)
 #
@@ -76,65 +78,24 @@ echo " Hash: $MATRIX_HASH"
 echo " File integrity confirmed - the matrix is authentic."
 echo ""
 
-echo -e "${YELLOW}Step 2: Extract identities (diagonal patterns)...${NC}"
-echo " Extracting 4 identities using diagonal traversal patterns"
-echo " Method: Base-26 encoding along diagonal paths in the matrix"
-echo " This replicates the original discovery method."
+echo -e "${YELLOW}Steps 2-5: Extraction, control group and statistics...${NC}"
+echo " 2. Diagonal identity extraction (base-26 along diagonal paths, 4 identities)"
+echo " 3. Vortex identity extraction (base-26 along 9-vortex rings, 4 identities)"
+echo " 4. Control group test (200 random matrices, expected: 0 on-chain hits)"
+echo " 5. Statistical significance (probability of the findings by chance)"
 echo ""
-python3 -m analysis.21_base26_identity_extraction || {
- echo -e "${RED}[ERROR] Error: Diagonal extraction failed${NC}"
- exit 1
-}
-echo -e "${GREEN}[OK] Diagonal identities extracted${NC}"
-echo " Report saved to: outputs/reports/base26_identity_report.md"
-echo " Plot saved to: outputs/plots/base26_identity_paths.png (if matplotlib installed)"
-echo " Found 4 identities from diagonal patterns"
-echo ""
-
-echo -e "${YELLOW}Step 3: Extract identities (vortex patterns)...${NC}"
-echo " Extracting 4 identities using 9-vortex ring patterns"
-echo " Method: Base-26 encoding along circular vortex paths"
-echo " This is the second extraction method that found identities."
-echo ""
-python3 -m analysis.71_9_vortex_extraction || {
- echo -e "${RED}[ERROR] Error: Vortex extraction failed${NC}"
- exit 1
-}
-echo -e "${GREEN}[OK] Vortex identities extracted${NC}"
-echo " Report saved to: outputs/reports/9_vortex_identity_report.md"
-echo " Plot saved to: outputs/plots/9_vortex_paths.png (if matplotlib installed)"
-echo " Found 4 identities from vortex ring patterns"
-echo ""
-
-echo -e "${YELLOW}Step 4: Run control group test...${NC}"
-echo " Testing the extraction method on 200 random matrices"
-echo " Purpose: Verify that random data doesn't produce on-chain identities"
-echo " This proves the Anna Matrix results are not due to chance."
-echo " Expected result: 0 on-chain hits from random matrices"
-echo ""
-PYTHONPATH="$PWD" python3 scripts/verify/control_group.py --matrices 200 --no-rpc || {
- echo -e "${RED}[ERROR] Error: Control group test failed${NC}"
- exit 1
-}
-echo -e "${GREEN}[OK] Control group test complete${NC}"
-echo " Report saved to: outputs/reports/control_group_report.md"
-echo " Result: Random matrices produced 0 on-chain identities (as expected)"
-echo " This confirms the Anna Matrix results are statistically significant."
-echo ""
-
-echo -e "${YELLOW}Step 5: Calculate statistical significance...${NC}"
-echo " Analyzing the probability of finding identities by chance"
-echo " Calculating: How likely is it to find 8 on-chain identities in a random matrix?"
-echo " This addresses the 'multiple-testing problem' and validates our findings."
+echo " Independent steps run in parallel. Steps whose code and inputs are unchanged"
+echo " since the last run are reused from cache (use --force to rerun everything)."
 echo ""
-PYTHONPATH="$PWD" python3 scripts/verify/statistical_significance.py || {
- echo -e "${RED}[ERROR] Error: Statistical analysis failed${NC}"
+PYTHONPATH="$PWD" python3 scripts/analysis/run_all_analyses.py --group verify "$@" || {
+ echo -e "${RED}[ERROR] Error: Verification steps failed (logs: outputs/cache/pipeline_logs/)${NC}"
  exit 1
 }
-echo -e "${GREEN}[OK] Statistical analysis complete${NC}"
-echo " Report saved to: outputs/reports/statistical_significance.md"
-echo " Data saved to: outputs/reports/statistical_significance.json"
-echo " This analysis shows the mathematical probability of our findings."
+echo -e "${GREEN}[OK] Extraction, control group and statistics complete${NC}"
+echo " Reports saved to: outputs/reports/"
+echo " - base26_identity_report.md, 9_vortex_identity_report.md"
+echo " - control_group_report.md, statistical_significance.md/.json"
+echo " Plots saved to: outputs/plots/ (if matplotlib installed)"
 echo ""
 
 # Check if Docker is available for RPC verification
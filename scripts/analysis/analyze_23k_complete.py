@@ -1,17 +1,38 @@
 #!/usr/bin/env python3
-"""Komplette Analyse der 23k Derivation Ergebnisse."""
+"""Komplette Analyse der 23k Derivation Ergebnisse.
 
+Die Ergebnisse werden gestreamt (ein Eintrag nach dem anderen), der Speicher
+bleibt auch bei Millionen Identities konstant; `--workers` verteilt die
+Auswertung auf mehrere Prozesse.
+"""
+
+import argparse
 import json
+import sys
 from pathlib import Path
 from collections import Counter, defaultdict
 from typing import Dict, List
 
 project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.analysis.mapping_stream import iter_json_items
+from scripts.analysis.streaming_stats import HyperLogLog, PositionLetters, StatsBundle, accumulate
+
 COMPLETE_FILE = project_root / "outputs" / "derived" / "layer3_derivation_23k_complete.json"
 RPC_RESULTS_FILE = project_root / "outputs" / "derived" / "rpc_sample_results.json"
 REPORTS_DIR = project_root / "outputs" / "reports"
 
-def analyze_23k_complete():
+def new_bundle() -> StatsBundle:
+ return StatsBundle(positions=PositionLetters(), distinct=HyperLogLog())
+
+def feed_entry(bundle: StatsBundle, entry: Dict) -> None:
+ identity = entry.get("layer3_identity", "")
+ bundle["positions"].add(identity.upper())
+ if identity:
+ bundle["distinct"].add(identity)
+
+def analyze_23k_complete(workers: int = 1):
  """Analyze 23k Derivation komplett."""
  print("=" * 80)
  print("23K DERIVATION COMPLETE ANALYSIS")
@@ -23,25 +44,17 @@ def analyze_23k_complete():
  print("❌ 23k Derivation file not found!")
  return
  
- with COMPLETE_FILE.open() as f:
- data = json.load(f)
- 
- results = data.get("results", [])
- total = len(results)
+ bundle = accumulate(new_bundle, feed_entry, iter_json_items(COMPLETE_FILE, "results.item"), workers=workers)
+ total = bundle["positions"].strings
  
  print(f"✅ Total Identities: {total}")
+ print(f" Distinct (HyperLogLog): ~{bundle['distinct'].estimate()}")
  print()
  
  # Position 30/4 Distribution
- pos30_dist = Counter()
- pos4_dist = Counter()
- 
- for entry in results:
- identity = entry.get("layer3_identity", "")
- if len(identity) > 30:
- pos30_dist[identity[30].upper()] += 1
- if len(identity) > 4:
- pos4_dist[identity[4].upper()] += 1
+ positions = bundle["positions"]
+ pos30_dist = positions.distribution(30)
+ pos4_dist = positions.distribution(4)
  
  print("## Position 30 Distribution (All 26 Characters)")
  for char in sorted(pos30_dist.keys()):
@@ -125,5 +138,7 @@ def analyze_23k_complete():
  print(f"📝 Report gespeichert: {report_file}")
 
 if __name__ == "__main__":
- analyze_23k_complete()
+ parser = argparse.ArgumentParser(description="Komplette Analyse der 23k Derivation Ergebnisse")
+ parser.add_argument("--workers", type=int, default=1, help="Prozesse für die Auswertung")
+ analyze_23k_complete(parser.parse_args().workers)
 
@@ -1,48 +1,69 @@
 #!/usr/bin/env python3
 """
 Analyze Layer-4 Patterns auf vollständigem Datensatz (alle 23.765 Identities)
+
+Layer-3 wird gestreamt und paarweise in mergebare Akkumulatoren gezählt
+(keine Paar-Liste im Speicher); `--workers` verteilt die Zählung.
 """
 
+import argparse
 import json
+import sys
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Tuple
 from collections import Counter, defaultdict
 from datetime import datetime
 
 project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.analysis.mapping_stream import iter_json_items
+from scripts.analysis.streaming_stats import Counts, StatsBundle, accumulate
+
 LAYER3_FILE = project_root / "outputs" / "derived" / "layer3_derivation_23k_complete.json"
 LAYER4_FILE = project_root / "outputs" / "derived" / "layer4_derivation_full_23k.json"
 OUTPUT_DIR = project_root / "outputs" / "derived"
 REPORTS_DIR = project_root / "outputs" / "reports"
 
-def analyze_layer4_patterns() -> Dict:
- """Analyze Layer-4 Patterns."""
- 
- print("📂 Load Layer-3 und Layer-4 Daten...")
- with LAYER3_FILE.open() as f:
- layer3_data = json.load(f)
- layer3_results = layer3_data.get("results", [])
- 
- with LAYER4_FILE.open() as f:
- layer4_data = json.load(f)
- layer4_results = layer4_data.get("results", [])
- 
- # Erstelle Mapping
+def new_bundle() -> StatsBundle:
+ return StatsBundle(
+ l3_chars=Counts(), # Character -> Anzahl (Layer-3)
+ l4_chars=Counts(), # Character -> Anzahl (Layer-4)
+ stability=Counts(), # (Position, gleich?) -> Anzahl
+ changes=Counts(), # (Position, "X->Y") -> Anzahl
+ )
+
+def feed_pair(bundle: StatsBundle, pair: Tuple[str, str]) -> None:
+ l3_id, l4_id = pair[0].upper(), pair[1].upper()
+ bundle["l3_chars"].update(l3_id[:60])
+ bundle["l4_chars"].update(l4_id[:60])
+ bundle["stability"].update((pos, a == b) for pos, (a, b) in enumerate(zip(l3_id[:60], l4_id[:60])))
+ bundle["changes"].update((pos, f"{a}->{b}") for pos, (a, b) in enumerate(zip(l3_id[:60], l4_id[:60])) if a != b)
+
+def iter_pairs() -> Iterator[Tuple[str, str]]:
+ """Layer-3/Layer-4 Paare in Layer-3-Reihenfolge (nur die Layer-4-Zuordnung liegt im Speicher)."""
  layer4_map = {}
- for entry in layer4_results:
+ for entry in iter_json_items(LAYER4_FILE, "results.item"):
  l3_id = entry.get("layer3_identity", "")
  l4_id = entry.get("layer4_identity", "")
  if l3_id and l4_id and len(l3_id) == 60 and len(l4_id) == 60:
  layer4_map[l3_id] = l4_id
  
- pairs = []
- for l3_entry in layer3_results:
+ for l3_entry in iter_json_items(LAYER3_FILE, "results.item"):
  l3_id = l3_entry.get("layer3_identity", "")
  l4_id = layer4_map.get(l3_id)
  if l3_id and l4_id:
- pairs.append({"layer3": l3_id, "layer4": l4_id})
+ yield l3_id, l4_id
+
+def analyze_layer4_patterns(workers: int = 1) -> Dict:
+ """Analyze Layer-4 Patterns."""
  
- print(f"✅ {len(pairs)} Paare geloadn")
+ print("📂 Load Layer-3 und Layer-4 Daten...")
+ bundle = accumulate(new_bundle, feed_pair, iter_pairs(), workers=workers)
+ stability = bundle["stability"].counter
+ pair_count = stability[(0, True)] + stability[(0, False)]
+ 
+ print(f"✅ {pair_count} Paare geloadn")
  print()
  
  # Analyze verschiedene Patterns
@@ -50,19 +71,9 @@ def analyze_layer4_patterns() -> Dict:
  
  # 1. Character Distribution
  print("🔍 Analyze Character Distribution...")
- l3_chars_all = Counter()
- l4_chars_all = Counter()
- 
- for pair in pairs:
- l3_id = pair["layer3"]
- l4_id = pair["layer4"]
- for i in range(60):
- l3_chars_all[l3_id[i].upper()] += 1
- l4_chars_all[l4_id[i].upper()] += 1
- 
  analyses["character_distribution"] = {
- "layer3": dict(l3_chars_all.most_common(26)),
- "layer4": dict(l4_chars_all.most_common(26))
+ "layer3": dict(bundle["l3_chars"].most_common(26)),
+ "layer4": dict(bundle["l4_chars"].most_common(26))
  }
  print("✅ Character Distribution analysiert")
  
@@ -70,22 +81,13 @@ def analyze_layer4_patterns() -> Dict:
  print("🔍 Analyze Position-spezifische Patterns...")
  position_stability = {}
  position_changes = {}
+ changes_by_position = defaultdict(Counter)
+ for (pos, change), count in bundle["changes"].counter.items():
+ changes_by_position[pos][change] = count
  
  for pos in range(60):
- same_count = 0
- different_count = 0
- char_changes = Counter()
- 
- for pair in pairs:
- l3_id = pair["layer3"]
- l4_id = pair["layer4"]
- 
- if l3_id[pos].upper() == l4_id[pos].upper():
- same_count += 1
- else:
- different_count += 1
- change = f"{l3_id[pos].upper()}->{l4_id[pos].upper()}"
- char_changes[change] += 1
+ same_count = stability[(pos, True)]
+ different_count = stability[(pos, False)]
  
  total = same_count + different_count
  stability_rate = same_count / total if total > 0 else 0
@@ -96,7 +98,7 @@ def analyze_layer4_patterns() -> Dict:
  "different_count": different_count
  }
  
- position_changes[pos] = dict(char_changes.most_common(10))
+ position_changes[pos] = dict(changes_by_position[pos].most_common(10))
  
  analyses["position_stability"] = position_stability
  analyses["position_changes"] = position_changes
@@ -108,18 +110,8 @@ def analyze_layer4_patterns() -> Dict:
  block_ranges = [(0, 14), (14, 28), (28, 42), (42, 56)]
  
  for block_idx, (start, end) in enumerate(block_ranges):
- same_count = 0
- different_count = 0
- 
- for pair in pairs:
- l3_id = pair["layer3"]
- l4_id = pair["layer4"]
- 
- for pos in range(start, end):
- if l3_id[pos].upper() == l4_id[pos].upper():
- same_count += 1
- else:
- different_count += 1
+ same_count = sum(position_stability[pos]["same_count"] for pos in range(start, end))
+ different_count = sum(position_stability[pos]["different_count"] for pos in range(start, end))
  
  total = same_count + different_count
  stability_rate = same_count / total if total > 0 else 0
@@ -147,7 +139,7 @@ def analyze_layer4_patterns() -> Dict:
  
  return analyses
 
-def main():
+def main(workers: int = 1):
  """Hauptfunktion."""
  print("=" * 80)
  print("LAYER-4 PATTERNS ANALYSE (Alle 23.765 Identities)")
@@ -155,7 +147,7 @@ def main():
  print()
  
  # Analyze Patterns
- analyses = analyze_layer4_patterns()
+ analyses = analyze_layer4_patterns(workers)
  print()
  
  # Zeige Ergebnisse
@@ -239,5 +231,7 @@ def main():
  print(f"📝 Report gespeichert: {report_file}")
 
 if __name__ == "__main__":
- main()
+ parser = argparse.ArgumentParser(description="Layer-4 Patterns auf dem vollständigen Datensatz")
+ parser.add_argument("--workers", type=int, default=1, help="Prozesse für die Zählung")
+ main(parser.parse_args().workers)
 
@@ -14,6 +14,14 @@ Beispiel:
 Ergebnis: Eine JSON-Datei, die neben dem regulären Neuraxon-Export
 zusätzliche Metadaten (Real-IDs, Seeds, Hashes) sowie ein
 Visualisierungs-Manifest enthält.
+
+Vollständige Datenbank (23k+ Seeds) mit flachem Speicherverbrauch:
+ python scripts/analysis/build_neuraxon_visualization.py \
+ --mapping-database outputs/analysis/complete_mapping_database.json \
+ --output data/neuraxon_exports/full_network.json --stream
+
+--stream liest die Datenbank inkrementell (ijson, falls installiert), staged sie
+in SQLite und schreibt die Frames progressiv in die Ausgabedatei.
 """
 
 from __future__ import annotations
@@ -21,9 +29,11 @@ from __future__ import annotations
 import argparse
 import datetime as dt
 import hashlib
+import heapq
 import json
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Any, Optional
 
 import sys
 
@@ -32,7 +42,17 @@ NEURAXON_PATH = REPO_ROOT / "repos" / "neuraxon"
 if str(NEURAXON_PATH) not in sys.path:
  sys.path.insert(0, str(NEURAXON_PATH))
 
+if str(REPO_ROOT) not in sys.path:
+ sys.path.insert(0, str(REPO_ROOT))
+
 from neuraxon import NeuraxonNetwork, NetworkParameters
+from scripts.analysis.mapping_stream import (
+ LazyValue,
+ MappingStage,
+ StreamedList,
+ iter_chunks,
+ write_json_stream,
+)
 
 def parse_simple_mapping(path: Path, max_entries: int | None = None) -> List[Dict[str, Any]]:
  """Liest eine einfache Mapping-Datei ein und normalisiert sie zu einer Liste."""
@@ -132,12 +152,13 @@ def chunk_entries(entries: List[Dict[str, Any]], chunk_size: int) -> List[List[D
 def extract_top_connections(
  network: NeuraxonNetwork, node_ids: List[int], top_n: int
 ) -> List[Dict[str, Any]]:
- """Return the strongest synapses within the given node set."""
+ """Return the strongest synapses within the given node set (bounded heap, O(top_n) memory)."""
  if top_n <= 0:
  return []
 
  node_set = set(node_ids)
- connections: List[Dict[str, Any]] = []
+
+ def _candidates() -> Iterator[Dict[str, Any]]:
  for synapse in network.synapses:
  if synapse.pre_id in node_set and synapse.post_id in node_set:
  weight = abs(
@@ -147,7 +168,7 @@ def extract_top_connections(
  )
  if weight <= 0:
  continue
- connections.append(
+ yield (
  {
  "pre_id": synapse.pre_id,
  "post_id": synapse.post_id,
@@ -159,14 +180,10 @@ def extract_top_connections(
  }
  )
 
- connections.sort(key=lambda c: c["weight"], reverse=True)
- return connections[:top_n]
+ # nlargest is equivalent to sorted(..., reverse=True)[:top_n], ties included
+ return heapq.nlargest(top_n, _candidates(), key=lambda c: c["weight"])
 
-def build_network(
- args: argparse.Namespace, entries: List[Dict[str, Any]]
-) -> Tuple[NeuraxonNetwork, List[Dict[str, Any]]]:
- """Erstellt ein Neuraxon-Netzwerk und generiert Frame-Annotationen."""
- chunk_size = min(args.chunk_size, len(entries))
+def create_network(args: argparse.Namespace, chunk_size: int) -> NeuraxonNetwork:
  params = NetworkParameters(
  network_name=args.network_name,
  num_input_neurons=chunk_size,
@@ -175,10 +192,18 @@ def build_network(
  connection_probability=args.connection_probability,
  dt=args.dt,
  )
- network = NeuraxonNetwork(params)
+ return NeuraxonNetwork(params)
 
- frames: List[Dict[str, Any]] = []
- chunks = chunk_entries(entries, chunk_size)
+def iter_frames(
+ network: NeuraxonNetwork,
+ chunks: Iterable[List[Dict[str, Any]]],
+ chunk_size: int,
+ top_n: int,
+) -> Iterator[Dict[str, Any]]:
+ """Erzeugt Frame-Annotationen chunkweise (ein Frame pro Chunk)."""
+ # Volle Chunks belegen dieselben Input-Neuronen → Top-Verbindungen nur einmal berechnen
+ cached_key: Optional[Tuple[int, ...]] = None
+ cached_connections: List[Dict[str, Any]] = []
  for chunk_idx, chunk in enumerate(chunks):
  annotations: Dict[int, Dict[str, Any]] = {}
  states: List[int] = []
@@ -203,18 +228,29 @@ def build_network(
  else:
  states.append(0)
 
- frames.append(
- {
+ key = tuple(node_ids)
+ if key != cached_key:
+ cached_key = key
+ cached_connections = extract_top_connections(network, node_ids, top_n)
+
+ yield {
  "frame_id": f"chunk_{chunk_idx}",
  "start_index": chunk_idx * chunk_size,
  "end_index": chunk_idx * chunk_size + len(chunk) - 1,
  "annotations": annotations,
  "states": states,
  "node_ids": node_ids,
- "top_connections": extract_top_connections(
- network, node_ids, args.top_connections
- ),
+ "top_connections": [dict(conn) for conn in cached_connections],
  }
+
+def build_network(
+ args: argparse.Namespace, entries: List[Dict[str, Any]]
+) -> Tuple[NeuraxonNetwork, List[Dict[str, Any]]]:
+ """Erstellt ein Neuraxon-Netzwerk und generiert Frame-Annotationen."""
+ chunk_size = min(args.chunk_size, len(entries))
+ network = create_network(args, chunk_size)
+ frames = list(
+ iter_frames(network, chunk_entries(entries, chunk_size), chunk_size, args.top_connections)
  )
 
  if frames:
@@ -284,8 +320,40 @@ def parse_args() -> argparse.Namespace:
  parser.add_argument("--chunk-size", type=int, default=512, help="Seeds pro Visualisierungsframe")
  parser.add_argument("--top-connections", type=int, default=30, help="Anzahl starker Verbindungen pro Frame")
  parser.add_argument("--seed", type=int, default=7, help="RNG-Seed for deterministische Netze")
+ parser.add_argument(
+ "--stream",
+ action="store_true",
+ help="Datenbank inkrementell lesen und Frames progressiv schreiben (flacher Speicher)",
+ )
+ parser.add_argument("--stage-dir", type=Path, default=None, help="Verzeichnis for die temporäre SQLite-Staging-DB")
  return parser.parse_args()
 
+def stream_export(args: argparse.Namespace) -> Tuple[int, int]:
+ """Streaming-Export der Mapping-Datenbank; gibt (Frames, Einträge) zurück."""
+ with MappingStage(args.mapping_database, args.stage_dir) as stage:
+ total_entries = stage.count(args.max_mapping)
+ if args.chunk_size > total_entries:
+ args.chunk_size = total_entries
+
+ network = create_network(args, args.chunk_size)
+ chunks = iter_chunks(stage.iter_entries(args.max_mapping), args.chunk_size)
+ frames = iter_frames(network, chunks, args.chunk_size, args.top_connections)
+ first_frame = next(frames)
+ network.set_input_states(first_frame["states"])
+
+ payload = export_payload(network, [first_frame], args, stage.statistics, total_entries)
+ streamed = StreamedList(chain([first_frame], frames))
+ payload["metadata"]["frames"] = streamed
+ global_stats = payload["metadata"]["global_stats"]
+ payload["metadata"]["global_stats"] = LazyValue(lambda: {**global_stats, "frame_count": streamed.count})
+
+ ensure_output_dir(args.output)
+ tmp_path = args.output.with_name(args.output.name + ".tmp")
+ with tmp_path.open("w") as fh:
+ write_json_stream(fh, payload, indent=2)
+ tmp_path.replace(args.output)
+ return streamed.count, total_entries
+
 def main() -> None:
  args = parse_args()
 
@@ -294,6 +362,12 @@ def main() -> None:
 
  random.seed(args.seed)
 
+ if args.stream and not args.mapping_file:
+ frame_count, total_entries = stream_export(args)
+ print(f"[OK] Export gespeichert unter: {args.output}")
+ print(f" Frames: {frame_count} mit je {args.chunk_size} Seeds (gesamt {total_entries})")
+ return
+
  if args.mapping_file:
  entries = parse_simple_mapping(args.mapping_file, args.max_mapping)
  global_stats = {}
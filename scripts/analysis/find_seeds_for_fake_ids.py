@@ -96,6 +96,26 @@ def test_seed_transformations(false_seed: str, target_identity: str) -> List[Dic
  
  return results
 
+def nearest_path_patterns(target_identity: str, matrix: np.ndarray, k: int = 3) -> List[tuple]:
+ """Koordinaten der k Matrixpfad-Fenster (55 Zeichen), die dem Identity-Body am nächsten sind."""
+ from analysis.utils.similarity import encode, hamming_topk, windows
+ from scripts.core.matrix_path_index import WINDOW, PathIndex
+ 
+ patterns = []
+ query = encode([target_identity[:WINDOW]], WINDOW)
+ for encoding in ("mod", "abs"):
+ lines = PathIndex.from_matrix(matrix, encoding=encoding).lines
+ refs, owners, offsets = windows([line.text for line in lines], WINDOW, [line.cyclic for line in lines])
+ distances, neighbours = hamming_topk(query, refs, k=k)
+ for distance, ref in zip(distances[0].tolist(), neighbours[0].tolist()):
+ if ref < 0:
+ continue
+ line = lines[int(owners[ref])]
+ start = int(offsets[ref])
+ coords = [line.coords[(start + i) % len(line.coords)] for i in range(WINDOW)]
+ patterns.append((f"Nearest_{encoding}_{line.family}_{line.key}@{start}_d{distance}", coords))
+ return patterns
+
 def find_seed_in_matrix(target_identity: str, matrix: np.ndarray) -> List[Dict]:
  """Versuche den Seed in der Matrix zu finden."""
  results = []
@@ -107,6 +127,7 @@ def find_seed_in_matrix(target_identity: str, matrix: np.ndarray) -> List[Dict]:
  ("Diagonal_0_64", [(i, (i + 64) % 128) for i in range(55)]),
  ("Block_0_0", [(r, c) for r in range(8) for c in range(7)][:55]),
  ]
+ patterns.extend(nearest_path_patterns(target_identity, matrix))
  
  for pattern_name, coords in patterns:
  # Extract raw values
@@ -0,0 +1,593 @@
+#!/usr/bin/env python3
+"""
+Identity graph store for the multi-layer derivation chains.
+
+Layer-N+1 is derived from `identity.lower()[:55]` of Layer-N. The analyses
+used to rebuild Layer-1 -> Layer-2 -> ... chains by joining the JSON outputs
+in memory on every run; this module does it once:
+
+- every identity becomes an integer node id; per-node attributes are NumPy
+  arrays (`layer`, `onchain` -1/0/1, `balance` and `valid_tick`, -1 if unknown),
+- derivation edges are stored as CSR adjacency in both directions
+  (`out_ptr`/`out_idx` for children, `in_ptr`/`in_idx` for parents),
+- traversals (descendants, ancestors, chains) advance a whole frontier per
+  step with array gathers, cycle detection peels sources and sinks
+  vectorized, and per-layer aggregates are `bincount`s,
+- the graph is built from every known output (pipeline columns, layer result
+  files, mapper outputs, mapping database) and cached as .npz in
+  outputs/cache/identity_graph/, keyed by the sources' mtime/size.
+
+Usage:
+    python3 scripts/analysis/identity_graph.py summary
+    python3 scripts/analysis/identity_graph.py chain IDENTITY
+    python3 scripts/analysis/identity_graph.py cycles
+
+    from scripts.analysis.identity_graph import load_graph
+
+    graph = load_graph()
+    paths = graph.chains(graph.nodes_in_layer(1))      # (n, length) node ids, -1 padded
+    graph.layer_summary()
+    graph.transition_counts(27, parent_layer=2)        # "A→B" letter transitions
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+DERIVED_DIR = project_root / "outputs" / "derived"
+MAPPING_FILE = project_root / "outputs" / "analysis" / "complete_mapping_database.json"
+CACHE_DIR = project_root / "outputs" / "cache" / "identity_graph"
+GRAPH_VERSION = 1
+
+IDENTITY_LENGTH = 60
+UNKNOWN = -1
+
+def identity_to_seed(identity: str) -> str:
+    return identity.lower()[:55]
+
+def _valid(identity: Any) -> bool:
+    return isinstance(identity, str) and len(identity) == IDENTITY_LENGTH and identity.isalpha() and identity.isupper()
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return UNKNOWN
+
+def _neighbors(ptr: np.ndarray, idx: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """Concatenated CSR rows of `nodes` (one gather, no Python loop)."""
+    starts = ptr[nodes]
+    counts = ptr[nodes + 1] - starts
+    total = int(counts.sum())
+    if not total:
+        return np.empty(0, dtype=idx.dtype)
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+    return idx[offsets]
+
+def _csr(src: np.ndarray, dst: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.lexsort((dst, src))
+    ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=ptr[1:])
+    return ptr, dst[order].astype(np.int32)
+
+class IdentityGraph:
+    """Identities as integer nodes, derivation edges as CSR, attributes as arrays."""
+
+    def __init__(self, identities: Sequence[str], src: np.ndarray, dst: np.ndarray,
+                 attributes: Dict[str, np.ndarray]) -> None:
+        self.identities = list(identities)
+        self.index = {identity: node for node, identity in enumerate(self.identities)}
+        self.size = len(self.identities)
+        self.src = np.asarray(src, dtype=np.int32)
+        self.dst = np.asarray(dst, dtype=np.int32)
+        self.layer = attributes["layer"]
+        self.onchain = attributes["onchain"]
+        self.balance = attributes["balance"]
+        self.valid_tick = attributes["valid_tick"]
+        self.out_ptr, self.out_idx = _csr(self.src, self.dst, self.size)
+        self.in_ptr, self.in_idx = _csr(self.dst, self.src, self.size)
+        self._letters: Optional[np.ndarray] = None
+
+    # --- lookup -------------------------------------------------------------
+
+    def node(self, identity: str) -> int:
+        return self.index[identity]
+
+    def identity(self, node: int) -> str:
+        return self.identities[node]
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.out_ptr)
+
+    def in_degree(self) -> np.ndarray:
+        return np.diff(self.in_ptr)
+
+    def children(self, node: int) -> np.ndarray:
+        return self.out_idx[self.out_ptr[node]:self.out_ptr[node + 1]]
+
+    def parents(self, node: int) -> np.ndarray:
+        return self.in_idx[self.in_ptr[node]:self.in_ptr[node + 1]]
+
+    def nodes_in_layer(self, layer: int) -> np.ndarray:
+        return np.flatnonzero(self.layer == layer)
+
+    @property
+    def letters(self) -> np.ndarray:
+        """(size, 60) uint8 letter matrix, A = 0."""
+        if self._letters is None:
+            raw = "".join(self.identities).encode("ascii")
+            self._letters = (np.frombuffer(raw, dtype=np.uint8).reshape(self.size, IDENTITY_LENGTH) - ord("A"))
+        return self._letters
+
+    # --- traversal ------------------------------------------------------------
+
+    def _traverse(self, ptr: np.ndarray, idx: np.ndarray, start: Iterable[int],
+                  max_depth: Optional[int]) -> np.ndarray:
+        seen = np.zeros(self.size, dtype=bool)
+        frontier = np.unique(np.asarray(list(start), dtype=np.int64))
+        seen[frontier] = True
+        found = []
+        depth = 0
+        while frontier.size and (max_depth is None or depth < max_depth):
+            nxt = _neighbors(ptr, idx, frontier)
+            nxt = np.unique(nxt[~seen[nxt]])
+            seen[nxt] = True
+            found.append(nxt)
+            frontier = nxt.astype(np.int64)
+            depth += 1
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int32)
+
+    def descendants(self, nodes: Iterable[int], max_depth: Optional[int] = None) -> np.ndarray:
+        """All nodes reachable from `nodes` (excluding them unless on a cycle back)."""
+        return self._traverse(self.out_ptr, self.out_idx, nodes, max_depth)
+
+    def ancestors(self, nodes: Iterable[int], max_depth: Optional[int] = None) -> np.ndarray:
+        return self._traverse(self.in_ptr, self.in_idx, nodes, max_depth)
+
+    def chains(self, start: Optional[Iterable[int]] = None, max_length: int = 16) -> np.ndarray:
+        """Paths following the first child from each start node: (n, <= max_length), -1 padded.
+
+        Defaults to every root (no parent, at least one child). All paths advance
+        together, one gather per step; a path stops at a node without children
+        or when it would revisit a node (cycle).
+        """
+        if start is None:
+            start = np.flatnonzero((self.in_degree() == 0) & (self.out_degree() > 0))
+        current = np.asarray(list(start) if not isinstance(start, np.ndarray) else start, dtype=np.int64)
+        paths = np.full((current.size, max_length), UNKNOWN, dtype=np.int32)
+        if not current.size:
+            return paths
+        paths[:, 0] = current
+        has_child = self.out_degree() > 0
+        first_child = np.full(self.size, UNKNOWN, dtype=np.int64)
+        first_child[has_child] = self.out_idx[self.out_ptr[:-1][has_child]]
+        active = np.ones(current.size, dtype=bool)
+        for step in range(1, max_length):
+            active &= current >= 0
+            nxt = np.where(active, first_child[np.maximum(current, 0)], UNKNOWN)
+            # stop before revisiting a node already on the same path
+            active &= nxt >= 0
+            active &= ~(paths[:, :step] == nxt[:, None]).any(axis=1)
+            if not active.any():
+                break
+            paths[active, step] = nxt[active]
+            current = np.where(active, nxt, UNKNOWN)
+        width = int((paths >= 0).sum(axis=1).max())
+        return paths[:, :width]
+
+    def chain(self, identity: str, max_length: int = 32) -> List[str]:
+        """Full chain through `identity`: first-parent ancestors, the identity, first-child descendants."""
+        node = self.node(identity)
+        upward = [node]
+        while len(upward) < max_length:
+            parents = self.parents(upward[-1])
+            if not parents.size or int(parents[0]) in upward:
+                break
+            upward.append(int(parents[0]))
+        root = upward[-1]
+        path = self.chains([root], max_length=max_length)[0]
+        return [self.identities[n] for n in path if n >= 0]
+
+    # --- cycles ----------------------------------------------------------------
+
+    def _peel(self, degree: np.ndarray, ptr: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        degree = degree.copy()
+        alive = np.ones(self.size, dtype=bool)
+        frontier = np.flatnonzero(degree == 0)
+        while frontier.size:
+            alive[frontier] = False
+            succ = _neighbors(ptr, idx, frontier)
+            degree -= np.bincount(succ, minlength=self.size)
+            candidates = np.unique(succ)
+            frontier = candidates[alive[candidates] & (degree[candidates] == 0)]
+        return alive
+
+    def cycle_nodes(self) -> np.ndarray:
+        """Nodes on a cycle: what survives peeling all sources and all sinks."""
+        no_sources = self._peel(self.in_degree(), self.out_ptr, self.out_idx)
+        no_sinks = self._peel(self.out_degree(), self.in_ptr, self.in_idx)
+        return np.flatnonzero(no_sources & no_sinks)
+
+    def cycles(self) -> List[List[int]]:
+        """One cycle per cyclic component, following edges inside the cyclic node set."""
+        cyclic = np.zeros(self.size, dtype=bool)
+        cyclic[self.cycle_nodes()] = True
+        done = np.zeros(self.size, dtype=bool)
+        found = []
+        for start in np.flatnonzero(cyclic):
+            if done[start]:
+                continue
+            path, position = [], {}
+            node = int(start)
+            while node not in position and not done[node]:
+                position[node] = len(path)
+                path.append(node)
+                inside = [int(child) for child in self.children(node) if cyclic[child]]
+                if not inside:
+                    break
+                node = inside[0]
+            if node in position:
+                found.append(path[position[node]:])
+            done[path] = True
+        return found
+
+    # --- aggregation ------------------------------------------------------------
+
+    def aggregate(self, values: np.ndarray, mask: Optional[np.ndarray] = None) -> Dict[int, float]:
+        """Sum of `values` per layer (over `mask` if given)."""
+        layers = self.layer.clip(min=0)
+        weights = np.asarray(values, dtype=np.float64)
+        if mask is not None:
+            weights = np.where(mask, weights, 0.0)
+        sums = np.bincount(layers, weights=weights)
+        return {layer: float(total) for layer, total in enumerate(sums)}
+
+    def layer_summary(self) -> Dict[int, Dict[str, int]]:
+        """Per layer: nodes, derived children, on-chain / checked, known balances and their sum."""
+        layers = self.layer.clip(min=0)
+        width = int(layers.max()) + 1 if self.size else 0
+
+        def count(mask: np.ndarray) -> np.ndarray:
+            return np.bincount(layers[mask], minlength=width)
+
+        nodes = np.bincount(layers, minlength=width)
+        derived = count(self.out_degree() > 0)
+        onchain = count(self.onchain == 1)
+        checked = count(self.onchain >= 0)
+        known_balance = self.balance >= 0
+        balances = count(known_balance)
+        balance_sum = np.bincount(layers[known_balance], weights=self.balance[known_balance], minlength=width)
+        return {
+            layer: {
+                "nodes": int(nodes[layer]),
+                "with_child": int(derived[layer]),
+                "onchain": int(onchain[layer]),
+                "onchain_checked": int(checked[layer]),
+                "balances_known": int(balances[layer]),
+                "balance_sum": int(balance_sum[layer]),
+            }
+            for layer in range(width)
+            if nodes[layer]
+        }
+
+    def transition_counts(self, position: int, parent_layer: Optional[int] = None) -> Counter:
+        """Letter at `position` of parent -> child over all edges (optionally from one layer)."""
+        src, dst = self.src, self.dst
+        if parent_layer is not None:
+            keep = self.layer[src] == parent_layer
+            src, dst = src[keep], dst[keep]
+        codes = self.letters[src, position].astype(np.int32) * 26 + self.letters[dst, position]
+        values, counts = np.unique(codes, return_counts=True)
+        return Counter({
+            f"{chr(ord('A') + value // 26)}→{chr(ord('A') + value % 26)}": int(count)
+            for value, count in zip(values, counts)
+        })
+
+    # --- persistence -------------------------------------------------------------
+
+    def save(self, path: Path, key: Any = None) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp.npz")
+        np.savez_compressed(
+            tmp,
+            identities=np.array(self.identities, dtype=f"S{IDENTITY_LENGTH}"),
+            src=self.src, dst=self.dst, layer=self.layer, onchain=self.onchain,
+            balance=self.balance, valid_tick=self.valid_tick,
+            key=np.array(json.dumps(key)),
+        )
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Tuple["IdentityGraph", Any]:
+        with np.load(path) as data:
+            identities = [raw.decode("ascii") for raw in data["identities"]]
+            attributes = {name: data[name] for name in ("layer", "onchain", "balance", "valid_tick")}
+            graph = cls(identities, data["src"], data["dst"], attributes)
+            return graph, json.loads(str(data["key"]))
+
+class GraphBuilder:
+    """Collects nodes, attributes and edges from the various outputs."""
+
+    def __init__(self) -> None:
+        self.index: Dict[str, int] = {}
+        self.identities: List[str] = []
+        self.layer: List[int] = []
+        self.onchain: List[int] = []
+        self.balance: List[int] = []
+        self.valid_tick: List[int] = []
+        self.src: List[int] = []
+        self.dst: List[int] = []
+
+    def add_node(self, identity: Any, layer: Optional[int] = None, onchain: Optional[bool] = None,
+                 balance: Any = None, valid_tick: Any = None) -> Optional[int]:
+        """Node id of `identity` (None if it is not a valid identity); known attributes win."""
+        if not _valid(identity):
+            return None
+        node = self.index.get(identity)
+        if node is None:
+            node = self.index[identity] = len(self.identities)
+            self.identities.append(identity)
+            for column in (self.layer, self.onchain, self.balance, self.valid_tick):
+                column.append(UNKNOWN)
+        if layer is not None and layer > 0 and (self.layer[node] < 0 or layer < self.layer[node]):
+            self.layer[node] = layer
+        if onchain is not None:
+            self.onchain[node] = max(self.onchain[node], int(bool(onchain)))
+        if balance is not None and _to_int(balance) >= 0:
+            self.balance[node] = _to_int(balance)
+        if valid_tick is not None and _to_int(valid_tick) >= 0:
+            self.valid_tick[node] = _to_int(valid_tick)
+        return node
+
+    def add_edge(self, parent: Any, child: Any, parent_layer: Optional[int] = None,
+                 child_onchain: Optional[bool] = None) -> None:
+        a = self.add_node(parent, parent_layer)
+        b = self.add_node(child, parent_layer + 1 if parent_layer else None, child_onchain)
+        if a is not None and b is not None:
+            self.src.append(a)
+            self.dst.append(b)
+
+    def link_derivations(self, nodes: Optional[Iterable[int]] = None, backend: str = "auto") -> int:
+        """Derive the child of every node (of `nodes`) that has none yet, in one batch; returns new edges."""
+        from scripts.core.derivation_backends import make_backend
+
+        has_child = set(self.src)
+        candidates = range(len(self.identities)) if nodes is None else nodes
+        todo = [node for node in candidates if node not in has_child]
+        if not todo:
+            return 0
+        engine = make_backend(backend)
+        try:
+            derived = engine.derive_batch([identity_to_seed(self.identities[node]) for node in todo])
+        finally:
+            engine.close()
+        added = 0
+        for node, child in zip(todo, derived):
+            if child:
+                layer = self.layer[node]
+                self.add_edge(self.identities[node], child, layer if layer > 0 else None)
+                added += 1
+        return added
+
+    def build(self) -> IdentityGraph:
+        n = len(self.identities)
+        if self.src:
+            pairs = np.unique(np.array(self.src, dtype=np.int64) * n + np.array(self.dst, dtype=np.int64))
+            src, dst = (pairs // n).astype(np.int32), (pairs % n).astype(np.int32)
+        else:
+            src = dst = np.empty(0, dtype=np.int32)
+        attributes = {
+            "layer": np.array(self.layer, dtype=np.int8),
+            "onchain": np.array(self.onchain, dtype=np.int8),
+            "balance": np.array(self.balance, dtype=np.int64),
+            "valid_tick": np.array(self.valid_tick, dtype=np.int64),
+        }
+        return IdentityGraph(self.identities, src, dst, attributes)
+
+# --- sources -------------------------------------------------------------------------
+
+def _read_columns(path: Path, builder: GraphBuilder) -> None:
+    """layer_pipeline output: row-aligned layerN columns (+ onchain_layerN)."""
+    from scripts.core.layer_pipeline import iter_rows, read_manifest
+
+    names = read_manifest(path)["columns"]
+    layers = sorted(int(name[len("layer"):]) for name in names if name.startswith("layer"))
+    for row in iter_rows(path):
+        for layer in layers:
+            builder.add_node(row[f"layer{layer}"], layer, row.get(f"onchain_layer{layer}"))
+        for parent, child in zip(layers, layers[1:]):
+            builder.add_edge(row[f"layer{parent}"], row[f"layer{child}"], parent)
+
+def _result_reader(parent_key: str, child_key: str, parent_layer: int, onchain_key: str,
+                   prefix: str = "results.item") -> Callable[[Path, GraphBuilder], None]:
+    def read(path: Path, builder: GraphBuilder) -> None:
+        from scripts.analysis.mapping_stream import iter_json_items
+
+        for entry in iter_json_items(path, prefix):
+            builder.add_node(entry.get(child_key), parent_layer + 1, entry.get(onchain_key))
+            builder.add_edge(entry.get(parent_key), entry.get(child_key), parent_layer)
+    return read
+
+def _read_layer4_layer5(path: Path, builder: GraphBuilder) -> None:
+    _result_reader("layer3_identity", "layer4_identity", 3, "layer4_onchain", "layer4_results.item")(path, builder)
+    _result_reader("layer4_identity", "layer5_identity", 4, "layer5_onchain", "layer5_results.item")(path, builder)
+
+def _read_mapping(path: Path, builder: GraphBuilder) -> None:
+    from scripts.analysis.mapping_stream import MappingStage
+
+    with MappingStage(path) as stage:
+        for entry in stage.iter_entries():
+            builder.add_node(entry["real_id"], 1)
+
+def _load_json(path: Path) -> Any:
+    with path.open() as f:
+        return json.load(f)
+
+def _read_layer_map(path: Path, builder: GraphBuilder) -> None:
+    """complete_layer_map.json: chains of LayerInfo (balance, tick, next layer)."""
+    for chain in _load_json(path).get("chains", []):
+        for layer in chain.get("layers", []):
+            builder.add_node(layer.get("identity"), layer.get("layer_num"), True,
+                             layer.get("balance"), layer.get("valid_tick"))
+            if layer.get("next_layer_identity"):
+                builder.add_edge(layer["identity"], layer["next_layer_identity"], layer.get("layer_num"), True)
+
+def _read_layer_structure(path: Path, builder: GraphBuilder) -> None:
+    """complete_layer_structure.json: identity -> layer, parent, balance, tick."""
+    structure = _load_json(path).get("mapped_structure", {}).get("structure", {})
+    for identity, info in structure.items():
+        builder.add_node(identity, info.get("layer"), True, info.get("balance"), info.get("valid_for_tick"))
+    for identity, info in structure.items():
+        if info.get("parent_identity"):
+            builder.add_edge(info["parent_identity"], identity, info.get("layer", 0) - 1 or None, True)
+
+def _read_identity_structure(path: Path, builder: GraphBuilder) -> None:
+    """complete_identity_structure.json: BFS parent map (depth is not the layer)."""
+    data = _load_json(path)
+    for identity in data.get("all_identities", []):
+        builder.add_node(identity)
+    for child, parent in data.get("parent_map", {}).items():
+        builder.add_edge(parent, child, None, True)
+
+def _read_scans(path: Path, builder: GraphBuilder) -> None:
+    """The exploration outputs complete_identity_structure_mapper used to join."""
+    data = _load_json(path)
+    if not isinstance(data, dict):
+        return
+    for key in ("known_8_exploration", "new_seeds_exploration"):
+        exploration = data.get(key) or {}
+        for identity in exploration.get("all_identities", []):
+            builder.add_node(identity)
+        for layer, identities in (exploration.get("layer_map") or {}).items():
+            for identity in identities:
+                builder.add_node(identity, _to_int(layer) if _to_int(layer) > 0 else None)
+    for record in data.get("records", []):
+        builder.add_node(record.get("identity"))
+    for chain in data.get("chains", []):
+        for layer in chain.get("layers", []):
+            builder.add_node(layer.get("identity"))
+    for record in data.get("layer3_records", []):
+        builder.add_edge(record.get("layer3_identity"), record.get("layer4_identity"), 3)
+    for item in data.get("tested_identities", []):
+        builder.add_node(item.get("identity"))
+        builder.add_edge(item.get("original_identity"), item.get("derived_identity"))
+
+# The five exploration outputs complete_identity_structure_mapper starts from
+SCAN_SOURCES: List[Tuple[Path, Callable[[Path, GraphBuilder], None]]] = [
+    (DERIVED_DIR / "recursive_layer_map.json", _read_scans),
+    (DERIVED_DIR / "identity_deep_scan.json", _read_scans),
+    (DERIVED_DIR / "deep_layer_exploration.json", _read_scans),
+    (DERIVED_DIR / "layer3_complete_analysis.json", _read_scans),
+    (DERIVED_DIR / "seed_derivation_mass_scan.json", _read_scans),
+]
+
+SOURCES: List[Tuple[Path, Callable[[Path, GraphBuilder], None]]] = [
+    (MAPPING_FILE, _read_mapping),
+    (DERIVED_DIR / "layer_columns" / "manifest.json", lambda p, b: _read_columns(p.parent, b)),
+    (DERIVED_DIR / "layer4_columns" / "manifest.json", lambda p, b: _read_columns(p.parent, b)),
+    (DERIVED_DIR / "layer4_layer5_columns" / "manifest.json", lambda p, b: _read_columns(p.parent, b)),
+    (DERIVED_DIR / "layer3_derivation_complete.json", _result_reader("layer2_identity", "layer3_identity", 2, "layer3_onchain")),
+    (DERIVED_DIR / "layer3_derivation_23k_complete.json", _result_reader("layer2_identity", "layer3_identity", 2, "layer3_onchain")),
+    (DERIVED_DIR / "layer4_derivation_fast.json", _result_reader("layer3_identity", "layer4_identity", 3, "layer4_onchain")),
+    (DERIVED_DIR / "layer4_derivation_full_23k.json", _result_reader("layer3_identity", "layer4_identity", 3, "layer4_onchain")),
+    (DERIVED_DIR / "layer4_layer5_derivation_complete.json", _read_layer4_layer5),
+    (DERIVED_DIR / "complete_layer_map.json", _read_layer_map),
+    (DERIVED_DIR / "complete_layer_structure.json", _read_layer_structure),
+    (DERIVED_DIR / "complete_identity_structure.json", _read_identity_structure),
+    *SCAN_SOURCES,
+]
+
+def _signature(path: Path) -> Optional[List[Any]]:
+    if not path.exists():
+        return None
+    st = path.stat()
+    return [str(path), st.st_mtime_ns, st.st_size]
+
+def build_graph(sources: Sequence[Tuple[Path, Callable]] = SOURCES, link_layer1: bool = True,
+                verbose: bool = False) -> IdentityGraph:
+    """Read every existing source; optionally derive the missing Layer-1 -> Layer-2 links."""
+    builder = GraphBuilder()
+    for path, reader in sources:
+        if not path.exists():
+            continue
+        try:
+            reader(path, builder)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Error loading {path}: {e}", file=sys.stderr)
+            continue
+        if verbose:
+            print(f"  {path.relative_to(project_root) if path.is_relative_to(project_root) else path}: "
+                  f"{len(builder.identities):,} nodes, {len(builder.src):,} edges")
+    if link_layer1:
+        # The Layer-3 outputs carry Layer-2 identities but not their Layer-1 parent
+        added = builder.link_derivations([node for node, layer in enumerate(builder.layer) if layer == 1])
+        if verbose and added:
+            print(f"  derived {added:,} Layer-1 -> Layer-2 links")
+    return builder.build()
+
+@lru_cache(maxsize=2)
+def _load_cached(key: str, use_disk: bool, link_layer1: bool) -> IdentityGraph:
+    cache_file = CACHE_DIR / f"graph{'' if link_layer1 else '_unlinked'}.npz"
+    if use_disk and cache_file.exists():
+        try:
+            graph, cached_key = IdentityGraph.load(cache_file)
+            if cached_key == key:
+                return graph
+        except (OSError, ValueError, KeyError):
+            pass
+    graph = build_graph(link_layer1=link_layer1)
+    if use_disk:
+        graph.save(cache_file, key)
+    return graph
+
+def load_graph(use_disk: bool = True, link_layer1: bool = True) -> IdentityGraph:
+    """Graph over every existing source, rebuilt only when a source changed."""
+    key = json.dumps([GRAPH_VERSION, [_signature(path) for path, _ in SOURCES]])
+    return _load_cached(key, use_disk, link_layer1)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["build", "summary", "chain", "cycles"])
+    parser.add_argument("identity", nargs="?")
+    parser.add_argument("--no-link", action="store_true", help="Do not derive missing Layer-1 -> Layer-2 links.")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        graph = build_graph(link_layer1=not args.no_link, verbose=True)
+        key = json.dumps([GRAPH_VERSION, [_signature(path) for path, _ in SOURCES]])
+        graph.save(CACHE_DIR / f"graph{'_unlinked' if args.no_link else ''}.npz", key)
+    else:
+        graph = load_graph(link_layer1=not args.no_link)
+    print(f"✅ {graph.size:,} identities, {len(graph.src):,} derivation edges")
+
+    if args.command in ("build", "summary"):
+        print(f"{'Layer':>6} {'Nodes':>9} {'w/ child':>9} {'on-chain':>9} {'checked':>9} {'balance':>14}")
+        for layer, row in graph.layer_summary().items():
+            print(f"{layer or '?':>6} {row['nodes']:>9,} {row['with_child']:>9,} {row['onchain']:>9,} "
+                  f"{row['onchain_checked']:>9,} {row['balance_sum']:>14,}")
+    elif args.command == "chain":
+        if not args.identity or args.identity not in graph.index:
+            sys.exit("❌ Unknown identity")
+        for identity in graph.chain(args.identity):
+            node = graph.node(identity)
+            marker = "  <-" if identity == args.identity else ""
+            print(f"  L{graph.layer[node]:>2} {identity} onchain={graph.onchain[node]}{marker}")
+    elif args.command == "cycles":
+        cycles = graph.cycles()
+        print(f"{len(cycles)} cycles, {len(graph.cycle_nodes())} nodes on cycles")
+        for cycle in cycles[:20]:
+            print("  " + " -> ".join(graph.identity(node)[:12] for node in cycle))
+
+if __name__ == "__main__":
+    main()
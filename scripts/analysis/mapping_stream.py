@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Streaming helpers for exporting the full mapping database.
+
+`complete_mapping_database.json` holds `seed_to_real_id`, `seed_to_doc_id` and
+`statistics` for 23k+ seeds (more with multi-layer data). Instead of
+`json.load` on the whole file this module:
+
+- reads the sections incrementally with ijson when it is installed
+  (falls back to a single `json.load` otherwise),
+- stages the entries in a temporary SQLite table so they can be iterated in
+  sorted seed order with the doc-id join, without holding them in memory,
+- writes large JSON payloads progressively (`StreamedList`, `LazyValue`),
+- iterates any array in a JSON file item by item (`iter_json_items`, e.g. the
+  `results` of the derivation outputs).
+
+Usage:
+    from scripts.analysis.mapping_stream import MappingStage, iter_chunks
+
+    with MappingStage(Path("outputs/analysis/complete_mapping_database.json")) as stage:
+        for chunk in iter_chunks(stage.iter_entries(), 512):
+            ...
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import tempfile
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import ijson
+except ImportError:  # optional: pip install ijson
+    ijson = None
+
+INSERT_BATCH = 5000
+
+def iter_chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to `size` items from any iterable."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def iter_json_items(path: Path, prefix: str = "results.item") -> Iterator[Any]:
+    """Items of the array at `prefix` (ijson syntax), streamed when ijson is installed."""
+    if ijson is not None:
+        with path.open("rb") as fh:
+            yield from ijson.items(fh, prefix, use_float=True)
+        return
+    with path.open("r") as fh:
+        data = json.load(fh)
+    keys = prefix.split(".")
+    if keys and keys[-1] == "item":
+        keys = keys[:-1]
+    for key in keys:
+        data = data.get(key, []) if isinstance(data, dict) else []
+    yield from data
+
+def _batched(items: Iterable[Tuple], size: int = INSERT_BATCH) -> Iterator[List[Tuple]]:
+    return iter_chunks(items, size)
+
+class MappingStage:
+    """Stages a mapping database in SQLite for sorted, low-memory iteration."""
+
+    def __init__(self, path: Path, stage_dir: Optional[Path] = None) -> None:
+        if not path.exists():
+            raise FileNotFoundError(f"Mapping-Datenbank nicht gefunden: {path}")
+        self.path = path
+        self.stage_dir = stage_dir
+        self.statistics: Dict[str, Any] = {}
+        self._tmp: Optional[tempfile.TemporaryDirectory] = None
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> "MappingStage":
+        self._tmp = tempfile.TemporaryDirectory(prefix="mapping_stage_", dir=self.stage_dir)
+        self._conn = sqlite3.connect(str(Path(self._tmp.name) / "mapping.sqlite"))
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE entries (seed TEXT PRIMARY KEY, real_id TEXT, doc_id TEXT) WITHOUT ROWID"
+        )
+        self._load()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._tmp is not None:
+            self._tmp.cleanup()
+            self._tmp = None
+
+    def _sections(self) -> Tuple[Iterable[Tuple[str, Any]], Callable[[], Iterable[Tuple[str, Any]]], Callable[[], Dict]]:
+        if ijson is None:
+            with self.path.open("r") as fh:
+                data = json.load(fh)
+            return (
+                data.get("seed_to_real_id", {}).items(),
+                lambda: data.get("seed_to_doc_id", {}).items(),
+                lambda: data.get("statistics", {}),
+            )
+
+        def kvitems(prefix: str) -> Iterator[Tuple[str, Any]]:
+            with self.path.open("rb") as fh:
+                yield from ijson.kvitems(fh, prefix, use_float=True)
+
+        def statistics() -> Dict[str, Any]:
+            with self.path.open("rb") as fh:
+                return next(ijson.items(fh, "statistics", use_float=True), {})
+
+        return kvitems("seed_to_real_id"), lambda: kvitems("seed_to_doc_id"), statistics
+
+    def _load(self) -> None:
+        real_items, doc_items, statistics = self._sections()
+        conn = self._conn
+        for batch in _batched((str(seed), json.dumps(real_id)) for seed, real_id in real_items):
+            conn.executemany("INSERT OR REPLACE INTO entries (seed, real_id) VALUES (?, ?)", batch)
+        if not self.count():
+            raise ValueError("Mapping-Datenbank enthält keine 'seed_to_real_id'-Einträge.")
+        for batch in _batched((json.dumps(doc_id), str(seed)) for seed, doc_id in doc_items()):
+            conn.executemany("UPDATE entries SET doc_id = ? WHERE seed = ?", batch)
+        conn.commit()
+        self.statistics = statistics()
+
+    def count(self, max_entries: Optional[int] = None) -> int:
+        (total,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        return min(total, max_entries) if max_entries else total
+
+    def iter_entries(self, max_entries: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield entries in sorted seed order, like `parse_mapping_database`."""
+        query = "SELECT seed, real_id, doc_id FROM entries ORDER BY seed"
+        params: Tuple = ()
+        if max_entries:
+            query += " LIMIT ?"
+            params = (max_entries,)
+        cursor = self._conn.execute(query, params)
+        for idx, (seed, real_id, doc_id) in enumerate(cursor):
+            yield {
+                "seed": seed,
+                "real_id": json.loads(real_id),
+                "doc_id": json.loads(doc_id) if doc_id is not None else None,
+                "index": idx,
+            }
+
+class StreamedList:
+    """Iterator written as a JSON array by `write_json_stream`; counts its items."""
+
+    def __init__(self, items: Iterable[Any]) -> None:
+        self.items = items
+        self.count = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        for item in self.items:
+            self.count += 1
+            yield item
+
+class LazyValue:
+    """Value computed when the writer reaches it (e.g. counts after a stream)."""
+
+    def __init__(self, compute: Callable[[], Any]) -> None:
+        self.compute = compute
+
+def _indent_dump(value: Any, indent: int, level: int) -> str:
+    text = json.dumps(value, indent=indent)
+    return text.replace("\n", "\n" + " " * (indent * level))
+
+def write_json_stream(fh: IO[str], value: Any, indent: int = 2, level: int = 0) -> None:
+    """json.dump that streams `StreamedList` items and resolves `LazyValue`s in place."""
+    pad = " " * (indent * (level + 1))
+    if isinstance(value, LazyValue):
+        value = value.compute()
+    if isinstance(value, dict):
+        if not value:
+            fh.write("{}")
+            return
+        fh.write("{")
+        for pos, (key, item) in enumerate(value.items()):
+            fh.write(("," if pos else "") + "\n" + pad + json.dumps(str(key)) + ": ")
+            write_json_stream(fh, item, indent, level + 1)
+        fh.write("\n" + " " * (indent * level) + "}")
+    elif isinstance(value, StreamedList):
+        fh.write("[")
+        wrote = False
+        for item in value:
+            fh.write(("," if wrote else "") + "\n" + pad)
+            write_json_stream(fh, item, indent, level + 1)
+            wrote = True
+        fh.write(("\n" + " " * (indent * level) if wrote else "") + "]")
+    else:
+        fh.write(_indent_dump(value, indent, level))
@@ -4,8 +4,11 @@ Multiple Testing Correction for Position Analysis
 - Applies Bonferroni and FDR (Benjamini-Hochberg) corrections
 - Documents all tested positions and their p-values
 - Provides corrected significance levels
+- Compares with permutation-based max-T FWER p-values for all 60 positions
+  (from scripts/analysis/permutation_tests.py, if its output exists)
 
-RUN: python3 scripts/analysis/multiple_testing_correction.py
+RUN: python3 scripts/analysis/permutation_tests.py --label onchain --permutations 100000 --workers 8
+     python3 scripts/analysis/multiple_testing_correction.py
 """
 
 import json
@@ -13,12 +16,12 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 import numpy as np
-from scipy import stats
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 OUTPUT_FILE = project_root / "outputs" / "reports" / "MULTIPLE_TESTING_CORRECTION.md"
+PERMUTATION_FILE = project_root / "outputs" / "derived" / "permutation_positions_onchain.json"
 
 def bonferroni_correction(p_values: List[float], alpha: float = 0.05) -> Tuple[float, List[bool]]:
  """
@@ -58,6 +61,45 @@ def fdr_correction(p_values: List[float], alpha: float = 0.05) -> Tuple[List[flo
  significant = final_corrected_p < alpha
  return final_corrected_p.tolist(), significant.tolist()
 
+def load_permutation_results() -> Dict:
+ """Permutation p-values per position (written by permutation_tests.py), or {}."""
+ if not PERMUTATION_FILE.exists():
+ return {}
+ with PERMUTATION_FILE.open() as f:
+ return json.load(f)
+
+def permutation_section(permutation: Dict, alpha: float = 0.05) -> str:
+ """Report section: Bonferroni/FDR on permutation p-values vs. max-T over all positions."""
+ positions = sorted(permutation["positions"], key=int)
+ raw = [permutation["positions"][pos]["p_raw"] for pos in positions]
+ maxt = [permutation["positions"][pos]["p_maxt"] for pos in positions]
+ bonferroni_alpha, bonferroni_sig = bonferroni_correction(raw, alpha)
+ fdr_p, fdr_sig = fdr_correction(raw, alpha)
+ 
+ section = f"""
+---
+
+## Permutation-Based Correction (All {len(positions)} Positions)
+
+**Data:** {permutation['n_rows']:,} identities, {permutation['n_permutations']:,} label permutations (seed {permutation['seed']}), statistic: {permutation['statistic']}
+**Method:** Westfall-Young max-T - each position is compared against the maximum statistic over all positions in every permutation, so the selection of the "best" position is part of the null distribution.
+
+- **Significant (uncorrected permutation p < {alpha}):** {sum(p < alpha for p in raw)}
+- **Significant (Bonferroni, α = {bonferroni_alpha:.6f}):** {sum(bonferroni_sig)}
+- **Significant (FDR):** {sum(fdr_sig)}
+- **Significant (max-T FWER):** {sum(p < alpha for p in maxt)}
+
+| Position | p (permutation) | Bonferroni | FDR p | p (max-T) |
+|----------|-----------------|------------|-------|-----------|
+"""
+ order = sorted(range(len(positions)), key=lambda i: raw[i])[:15]
+ for i in order:
+ section += (
+ f"| {positions[i]} | {raw[i]:.6f} | {'✅' if bonferroni_sig[i] else '❌'} | "
+ f"{fdr_p[i]:.6f} | {maxt[i]:.6f} |\n"
+ )
+ return section
+
 def main():
  """Main function."""
  print("=" * 80)
@@ -277,6 +319,14 @@ FDR is **less conservative**:
 **Method:** Bonferroni and FDR (Benjamini-Hochberg) corrections
 """
  
+ permutation = load_permutation_results()
+ if permutation:
+ report += permutation_section(permutation)
+ significant = permutation.get("significant_positions", [])
+ print(f"Permutation max-T (all positions): significant = {significant or 'none'}")
+ else:
+ print(f"ℹ️ No permutation results ({PERMUTATION_FILE.name}); run permutation_tests.py for max-T p-values")
+ 
  # Save report
  OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
  OUTPUT_FILE.write_text(report)
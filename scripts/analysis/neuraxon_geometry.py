@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Array-based geometry helpers for visualize_neuraxon_3d.
+
+- Layouts are cached on disk (`.npz`) keyed by a hash of the graph structure
+  plus the layout seed, so `nx.spring_layout(dim=3)` runs once per graph.
+- `GraphArrays` holds node positions and edge endpoints/weights as NumPy arrays;
+  edge selection and the NaN-separated line coordinates Plotly expects
+  (NaN is serialized as null, i.e. a line break) are built with array ops
+  instead of per-edge list appends.
+- `frame_deltas` reduces animation frames to the trace attributes that vary
+  between frames (node colors/sizes/hover text, highlights, packets), so the
+  static edge geometry is serialized once in the base figure.
+- `write_frame_chunks` writes one JSON chunk per frame (UI tables + trace
+  deltas, optionally gzip-compressed and with float arrays packed as base64
+  typed arrays) for the lazily-loading HTML mode, plus a compact
+  neuron -> frame index so the page's search works for frames not loaded yet.
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+DEFAULT_LAYOUT_CACHE_DIR = Path("outputs/cache/neuraxon_layouts")
+LAYOUT_CACHE_VERSION = 1
+FRAME_CHUNK_PATTERN = "frame_{index:05d}{suffix}"
+
+# Normalized-weight thresholds used for weak / medium / strong edge traces
+EDGE_BUCKETS: Tuple[Tuple[str, float, float], ...] = (
+    ("weak", 0.0, 0.33),
+    ("medium", 0.33, 0.67),
+    ("strong", 0.67, np.inf),
+)
+
+Layout = Dict[int, Tuple[float, float, float]]
+
+def graph_fingerprint(g: nx.Graph) -> str:
+    """Stable SHA-256 over node ids and weighted edges."""
+    nodes = np.array(sorted(g.nodes()), dtype=np.int64)
+    edges = sorted((int(u), int(v), round(float(d.get("weight", 0.0)), 6)) for u, v, d in g.edges(data=True))
+    digest = hashlib.sha256()
+    digest.update(f"v{LAYOUT_CACHE_VERSION}|{int(g.is_directed())}|".encode())
+    digest.update(nodes.tobytes())
+    if edges:
+        digest.update(np.array([(u, v) for u, v, _ in edges], dtype=np.int64).tobytes())
+        digest.update(np.array([w for _, _, w in edges], dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+def load_or_compute_layout(
+    g: nx.Graph,
+    seed: int,
+    compute: Callable[[nx.Graph, int], Layout],
+    cache_dir: Optional[Path] = DEFAULT_LAYOUT_CACHE_DIR,
+) -> Layout:
+    """Return the layout for `g`, computing and caching it on a miss.
+
+    Passing `cache_dir=None` disables the cache.
+    """
+    if cache_dir is None or g.number_of_nodes() == 0:
+        return compute(g, seed)
+
+    cache_path = Path(cache_dir) / f"{graph_fingerprint(g)[:32]}_seed{seed}.npz"
+    if cache_path.exists():
+        try:
+            with np.load(cache_path) as cached:
+                node_ids = cached["node_ids"]
+                positions = cached["positions"]
+            return {int(nid): tuple(float(c) for c in pos) for nid, pos in zip(node_ids, positions)}
+        except (OSError, KeyError, ValueError):
+            pass  # Corrupt cache entry: recompute below
+
+    layout = compute(g, seed)
+    node_ids = np.array(list(layout.keys()), dtype=np.int64)
+    positions = np.array([layout[int(nid)] for nid in node_ids], dtype=np.float64).reshape(-1, 3)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".tmp.npz")
+    np.savez_compressed(tmp_path, node_ids=node_ids, positions=positions)
+    tmp_path.replace(cache_path)
+    return layout
+
+def segment_coords(starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Interleave (start, end, NaN) rows for Plotly line traces.
+
+    `starts` and `ends` are `(E, 3)` arrays; the result is three `(3E,)` arrays.
+    """
+    count = len(starts)
+    out = np.full((count, 3, 3), np.nan, dtype=np.float64)
+    out[:, 0, :] = starts
+    out[:, 1, :] = ends
+    flat = out.reshape(count * 3, 3)
+    return flat[:, 0], flat[:, 1], flat[:, 2]
+
+@dataclass
+class GraphArrays:
+    """Node positions and edge lists of a graph as NumPy arrays."""
+
+    node_ids: np.ndarray  # (N,) sorted neuron ids
+    positions: np.ndarray  # (N, 3)
+    edge_src: np.ndarray  # (E,) indices into node_ids
+    edge_dst: np.ndarray  # (E,)
+    edge_weight: np.ndarray  # (E,)
+
+    @classmethod
+    def from_graph(cls, g: nx.Graph, layout: Layout) -> "GraphArrays":
+        node_ids = np.array(sorted(g.nodes()), dtype=np.int64)
+        positions = np.array([layout.get(int(nid), (0.0, 0.0, 0.0)) for nid in node_ids], dtype=np.float64)
+        positions = positions.reshape(-1, 3)
+        edges = list(g.edges(data="weight", default=0.0))
+        if edges:
+            src_ids = np.fromiter((u for u, _, _ in edges), dtype=np.int64, count=len(edges))
+            dst_ids = np.fromiter((v for _, v, _ in edges), dtype=np.int64, count=len(edges))
+            weights = np.fromiter((w for _, _, w in edges), dtype=np.float64, count=len(edges))
+        else:
+            src_ids = dst_ids = np.empty(0, dtype=np.int64)
+            weights = np.empty(0, dtype=np.float64)
+        return cls(
+            node_ids=node_ids,
+            positions=positions,
+            edge_src=np.searchsorted(node_ids, src_ids),
+            edge_dst=np.searchsorted(node_ids, dst_ids),
+            edge_weight=weights,
+        )
+
+    def indices_of(self, ids: Iterable[int]) -> np.ndarray:
+        """Map neuron ids to row indices, dropping ids not in the graph."""
+        wanted = np.asarray(list(ids), dtype=np.int64)
+        if wanted.size == 0:
+            return wanted
+        idx = np.searchsorted(self.node_ids, wanted)
+        idx = np.clip(idx, 0, max(len(self.node_ids) - 1, 0))
+        return idx[self.node_ids[idx] == wanted]
+
+    def select_edges(self, node_idx: np.ndarray, max_edges: int, weight_percentile: float) -> np.ndarray:
+        """Vectorized `filter_edges` over the subgraph induced by `node_idx`.
+
+        Keeps edges with both endpoints in the node set, sorted by weight
+        (descending), cut at the weight percentile and limited to `max_edges`.
+        """
+        member = np.zeros(len(self.node_ids), dtype=bool)
+        member[node_idx] = True
+        candidates = np.flatnonzero(member[self.edge_src] & member[self.edge_dst])
+        if candidates.size == 0:
+            return candidates
+        order = candidates[np.argsort(-self.edge_weight[candidates], kind="stable")]
+        if weight_percentile:
+            weights = self.edge_weight[order]
+            cutoff_idx = int(len(weights) * weight_percentile)
+            cutoff = weights[cutoff_idx] if cutoff_idx < len(weights) else weights[-1]
+            order = order[weights >= cutoff]
+        return order[:max_edges] if max_edges else order
+
+    def decimate_edges(self, edge_idx: np.ndarray, lod: float) -> np.ndarray:
+        """Level-of-detail decimation: keep a `lod` fraction of weight-sorted edges.
+
+        Samples evenly along the weight ranking instead of truncating it, so the
+        weak / medium / strong buckets all stay represented at low detail.
+        """
+        if lod >= 1.0 or edge_idx.size == 0:
+            return edge_idx
+        keep = max(int(round(edge_idx.size * max(lod, 0.0))), 1)
+        picks = np.unique(np.linspace(0, edge_idx.size - 1, keep).round().astype(np.int64))
+        return edge_idx[picks]
+
+    def edge_buckets(self, edge_idx: np.ndarray) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Split edges into weak / medium / strong line coordinates by normalized weight."""
+        if edge_idx.size == 0:
+            return {}
+        weights = self.edge_weight[edge_idx]
+        min_w, max_w = weights.min(), weights.max()
+        weight_range = max_w - min_w if max_w > min_w else 1.0
+        norm = (weights - min_w) / weight_range
+        buckets = {}
+        for name, low, high in EDGE_BUCKETS:
+            mask = (norm >= low) & (norm < high)
+            if mask.any():
+                chosen = edge_idx[mask]
+                buckets[name] = segment_coords(
+                    self.positions[self.edge_src[chosen]],
+                    self.positions[self.edge_dst[chosen]],
+                )
+        return buckets
+
+    def pair_segments(self, pairs: List[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Line coordinates for explicit (pre_id, post_id) neuron pairs."""
+        if not pairs:
+            empty = np.empty(0, dtype=np.float64)
+            return empty, empty, empty
+        pair_ids = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        return segment_coords(self._positions_for(pair_ids[:, 0]), self._positions_for(pair_ids[:, 1]))
+
+    def _positions_for(self, ids: np.ndarray) -> np.ndarray:
+        """Positions for neuron ids; unknown ids map to the origin like `layout.get`."""
+        out = np.zeros((len(ids), 3), dtype=np.float64)
+        if len(self.node_ids) == 0:
+            return out
+        idx = np.clip(np.searchsorted(self.node_ids, ids), 0, len(self.node_ids) - 1)
+        known = self.node_ids[idx] == ids
+        out[known] = self.positions[idx[known]]
+        return out
+
+def _same_value(a: Any, b: Any) -> bool:
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        try:
+            return np.array_equal(np.asarray(a, dtype=float), np.asarray(b, dtype=float), equal_nan=True)
+        except (TypeError, ValueError):
+            return np.array_equal(np.asarray(a, dtype=object), np.asarray(b, dtype=object))
+    return a == b
+
+def flatten_trace(trace: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Flatten nested trace dicts (`marker.color`, ...); lists/arrays stay leaves."""
+    flat: Dict[str, Any] = {}
+    for key, value in trace.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_trace(value, f"{path}."))
+        else:
+            flat[path] = value
+    return flat
+
+def unflatten_trace(flat: Dict[str, Any]) -> Dict[str, Any]:
+    nested: Dict[str, Any] = {}
+    for path, value in flat.items():
+        node = nested
+        *parents, leaf = path.split(".")
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = value
+    return nested
+
+def frame_deltas(frame_traces: List[List[Dict[str, Any]]]) -> List[List[Dict[str, Any]]]:
+    """Reduce per-frame trace dicts to the attributes that actually vary.
+
+    `frame_traces[f][t]` is the full plotly JSON of trace `t` in frame `f`
+    (the same trace slots in every frame). An attribute is shipped in every
+    frame if it differs from frame 0 in *any* frame; attributes identical
+    across all frames stay in the base figure only. Diffing against a fixed
+    baseline (not the previous frame) keeps random frame jumps correct.
+    """
+    if not frame_traces:
+        return []
+    flat = [[flatten_trace(trace) for trace in traces] for traces in frame_traces]
+    base = flat[0]
+    varying: List[set] = [set() for _ in base]
+    for traces in flat[1:]:
+        for slot, trace in enumerate(traces):
+            reference = base[slot]
+            for key in set(trace) | set(reference):
+                if key not in varying[slot] and not _same_value(trace.get(key), reference.get(key)):
+                    varying[slot].add(key)
+    deltas = []
+    for traces in flat:
+        frame_delta = []
+        for slot, trace in enumerate(traces):
+            partial = {key: trace.get(key) for key in varying[slot]}
+            partial["type"] = trace.get("type", base[slot].get("type"))
+            frame_delta.append(unflatten_trace(partial))
+        deltas.append(frame_delta)
+    return deltas
+
+def pack_typed_arrays(value: Any) -> Any:
+    """Replace float ndarrays with plotly.js typed-array specs (`{dtype, bdata}`).
+
+    Requires plotly.js >= 2.28 on the page; NaN line breaks survive as float32 NaN.
+    """
+    if isinstance(value, dict):
+        return {key: pack_typed_arrays(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [pack_typed_arrays(item) for item in value]
+    if isinstance(value, np.ndarray) and value.dtype.kind == "f":
+        data = np.ascontiguousarray(value, dtype="<f4")
+        return {"dtype": "f4", "bdata": base64.b64encode(data.tobytes()).decode("ascii")}
+    return value
+
+def frame_chunk_name(index: int, compress: bool) -> str:
+    return FRAME_CHUNK_PATTERN.format(index=index, suffix=".json.gz" if compress else ".json")
+
+def encode_frame_chunk(ui_frame: Dict[str, Any], plot_frame: Dict[str, Any], pack_arrays: bool = False) -> str:
+    """Serialize one frame (UI tables + trace delta) to JSON."""
+    from plotly.utils import PlotlyJSONEncoder
+
+    plot = pack_typed_arrays(plot_frame) if pack_arrays else plot_frame
+    return json.dumps({"ui": ui_frame, "plot": plot}, cls=PlotlyJSONEncoder, separators=(",", ":"))
+
+def neuron_frame_ranges(ui_frames: List[Dict[str, Any]]) -> List[List[int]]:
+    """`[first_id, last_id, frame]` runs of consecutive neuron ids, in frame order.
+
+    A neuron listed in several frames belongs to the first one, as in the
+    page's own node index. Frames cover contiguous id ranges, so this stays a
+    handful of entries even for the full 23k-neuron export.
+    """
+    seen: set = set()
+    ranges: List[List[int]] = []
+    for index, frame in enumerate(ui_frames):
+        ids = []
+        for key in frame.get("nodes") or {}:
+            try:
+                ids.append(int(key))
+            except (TypeError, ValueError):
+                continue
+        for neuron_id in sorted(set(ids) - seen):
+            if ranges and ranges[-1][2] == index and ranges[-1][1] + 1 == neuron_id:
+                ranges[-1][1] = neuron_id
+            else:
+                ranges.append([neuron_id, neuron_id, index])
+        seen.update(ids)
+    return ranges
+
+def write_frame_chunks(
+    chunk_dir: Path,
+    ui_frames: List[Dict[str, Any]],
+    plot_frames: List[Dict[str, Any]],
+    compress: bool = False,
+    pack_arrays: bool = False,
+) -> Dict[str, Any]:
+    """Write one chunk per frame into `chunk_dir` and return the page-side chunk config."""
+    chunk_dir.mkdir(parents=True, exist_ok=True)
+    for stale in chunk_dir.glob("frame_*.json*"):
+        stale.unlink()
+    total_bytes = 0
+    for index, (ui_frame, plot_frame) in enumerate(zip(ui_frames, plot_frames)):
+        encoded = encode_frame_chunk(ui_frame, plot_frame, pack_arrays).encode("utf-8")
+        if compress:
+            encoded = gzip.compress(encoded, compresslevel=6)
+        target = chunk_dir / frame_chunk_name(index, compress)
+        tmp_path = target.with_name(target.name + ".tmp")
+        tmp_path.write_bytes(encoded)
+        tmp_path.replace(target)
+        total_bytes += len(encoded)
+    return {
+        "base": chunk_dir.name,
+        "count": len(ui_frames),
+        "suffix": ".json.gz" if compress else ".json",
+        "gzip": compress,
+        "bytes": total_bytes,
+        "neuron_ranges": neuron_frame_ranges(ui_frames),
+    }
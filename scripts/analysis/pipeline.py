@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware analysis runner with result caching.
+
+Each step declares the files it reads (`inputs`), the files it writes
+(`outputs`) and the code it depends on (`code`, globs allowed). From that the
+runner
+
+- derives a DAG (a step depends on every step that produces one of its inputs),
+- runs independent steps in parallel (each in its own interpreter, as before),
+- skips a step when the hashes of its code, inputs and command are unchanged
+  and its outputs are still the files it wrote last time.
+
+State lives in outputs/cache/pipeline_state.json, step logs in
+outputs/cache/pipeline_logs/<step>.log.
+
+Usage:
+    from scripts.analysis.pipeline import Pipeline, Step
+
+    pipeline = Pipeline([
+        Step("mapping_db", [sys.executable, "scripts/analysis/create_complete_mapping_database.py"],
+             inputs=["outputs/derived/complete_24846_seeds_to_real_ids_mapping.json"],
+             outputs=["outputs/analysis/complete_mapping_database.json"]),
+        ...
+    ])
+    results = pipeline.run(jobs=4)
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+project_root = Path(__file__).parent.parent.parent
+
+STATE_FILE = project_root / "outputs" / "cache" / "pipeline_state.json"
+LOG_DIR = project_root / "outputs" / "cache" / "pipeline_logs"
+
+# Step outcomes
+CACHED = "cached"
+RAN = "ran"
+FAILED = "failed"
+BLOCKED = "blocked"  # an upstream step failed
+
+@dataclass
+class Step:
+    """One analysis step. Paths are relative to the project root."""
+
+    name: str
+    command: Optional[Sequence[str]] = None
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    code: List[str] = field(default_factory=list)
+    after: List[str] = field(default_factory=list)  # explicit ordering without a shared file
+    func: Optional[Callable[[], None]] = None  # in-process alternative to `command`
+    env: Dict[str, str] = field(default_factory=dict)
+    cache: bool = True  # False for steps with side effects (network, ...)
+    description: str = ""
+
+    def __post_init__(self) -> None:
+        if (self.command is None) == (self.func is None):
+            raise ValueError(f"Step {self.name}: exactly one of command/func is required")
+        if not self.code and self.command:
+            # Default: every project file named on the command line
+            self.code = [arg for arg in self.command if not os.path.isabs(arg) and (project_root / arg).is_file()]
+
+@dataclass
+class StepResult:
+    name: str
+    status: str
+    seconds: float = 0.0
+    log: Optional[Path] = None
+    error: str = ""
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _expand(patterns: Iterable[str]) -> List[Path]:
+    paths: Set[Path] = set()
+    for pattern in patterns:
+        matches = glob.glob(str(project_root / pattern), recursive=True)
+        paths.update(Path(m) for m in matches if Path(m).is_file())
+        if not matches:
+            paths.add(project_root / pattern)  # hashed as missing
+    return sorted(paths)
+
+class HashCache:
+    """File hashes memoized on (mtime, size) for the duration of a run."""
+
+    def __init__(self) -> None:
+        self._hashes: Dict[Path, tuple] = {}
+
+    def __call__(self, path: Path) -> str:
+        try:
+            st = path.stat()
+        except OSError:
+            return "missing"
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._hashes.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        digest = hash_file(path)
+        self._hashes[path] = (stamp, digest)
+        return digest
+
+class Pipeline:
+    """A set of steps with dependencies inferred from inputs/outputs."""
+
+    def __init__(
+        self,
+        steps: Sequence[Step],
+        state_file: Path = STATE_FILE,
+        log_dir: Path = LOG_DIR,
+        warm_socket: Optional[Path] = None,
+    ) -> None:
+        self.steps: Dict[str, Step] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Duplicate step name: {step.name}")
+            self.steps[step.name] = step
+        self.state_file = state_file
+        self.log_dir = log_dir
+        self.warm_socket = warm_socket  # run Python steps on a warm_server instead of new interpreters
+        self.deps = self._dependencies()
+        self.order = self._topological_order()
+        self._hash = HashCache()
+
+    def _dependencies(self) -> Dict[str, Set[str]]:
+        producers: Dict[str, str] = {}
+        for step in self.steps.values():
+            for output in step.outputs:
+                if output in producers:
+                    raise ValueError(f"{output} is produced by both {producers[output]} and {step.name}")
+                producers[output] = step.name
+        deps: Dict[str, Set[str]] = {}
+        for step in self.steps.values():
+            unknown = [name for name in step.after if name not in self.steps]
+            if unknown:
+                raise ValueError(f"Step {step.name}: unknown step(s) in after: {', '.join(unknown)}")
+            deps[step.name] = {producers[i] for i in step.inputs if i in producers and producers[i] != step.name}
+            deps[step.name].update(step.after)
+        return deps
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str, chain: List[str]) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError("Dependency cycle: " + " -> ".join(chain + [name]))
+            state[name] = 1
+            for dep in sorted(self.deps[name]):
+                visit(dep, chain + [name])
+            state[name] = 2
+            order.append(name)
+
+        for name in self.steps:
+            visit(name, [])
+        return order
+
+    def select(self, names: Iterable[str]) -> List[str]:
+        """`names` plus everything upstream of them, in run order."""
+        wanted: Set[str] = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in self.steps:
+                raise KeyError(f"Unknown step: {name}")
+            if name not in wanted:
+                wanted.add(name)
+                stack.extend(self.deps[name])
+        return [name for name in self.order if name in wanted]
+
+    def step_key(self, step: Step) -> str:
+        """Hash of command, code and inputs: equal key ⇒ same result expected."""
+        digest = hashlib.sha256()
+        digest.update(json.dumps([step.name, list(step.command or []), step.env], sort_keys=True).encode())
+        for label, patterns in (("code", step.code), ("input", step.inputs)):
+            for path in _expand(patterns):
+                digest.update(f"{label}:{path.relative_to(project_root)}:{self._hash(path)}\n".encode())
+        return digest.hexdigest()
+
+    def _outputs_intact(self, step: Step, recorded: Dict[str, str]) -> bool:
+        return all(recorded.get(out) == self._hash(project_root / out) for out in step.outputs)
+
+    def _load_state(self) -> Dict[str, Dict]:
+        try:
+            return json.loads(self.state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state: Dict[str, Dict]) -> None:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+        tmp_path.replace(self.state_file)
+
+    def _execute(self, step: Step) -> StepResult:
+        start = time.perf_counter()
+        log_path = self.log_dir / f"{step.name}.log"
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            if step.func is not None:
+                step.func()
+            elif self.warm_socket is not None and step.command[0] == sys.executable:
+                from scripts.analysis.warm_server import run_script
+
+                argv = list(step.command[1:])
+                module = argv[:1] == ["-m"]
+                target, args = (argv[1], argv[2:]) if module else (argv[0], argv[1:])
+                with log_path.open("w", encoding="utf-8") as log:
+                    code = run_script(target, args, module=module, env=step.env, socket_path=self.warm_socket,
+                                      write=log.write, cwd=project_root)
+                if code != 0:
+                    return StepResult(step.name, FAILED, time.perf_counter() - start, log_path, f"exit code {code}")
+            else:
+                env = {**os.environ, "PYTHONPATH": str(project_root), **step.env}
+                with log_path.open("w", encoding="utf-8") as log:
+                    proc = subprocess.run(
+                        list(step.command), cwd=project_root, env=env, stdout=log, stderr=subprocess.STDOUT
+                    )
+                if proc.returncode != 0:
+                    return StepResult(step.name, FAILED, time.perf_counter() - start, log_path,
+                                      f"exit code {proc.returncode}")
+        except Exception as e:
+            return StepResult(step.name, FAILED, time.perf_counter() - start, log_path, str(e))
+        return StepResult(step.name, RAN, time.perf_counter() - start, log_path)
+
+    def run(
+        self,
+        names: Optional[Iterable[str]] = None,
+        jobs: Optional[int] = None,
+        force: bool = False,
+        dry_run: bool = False,
+        on_result: Optional[Callable[[StepResult], None]] = None,
+    ) -> Dict[str, StepResult]:
+        """Run the selected steps (default: all); returns results by step name.
+
+        With `dry_run` nothing is executed; steps are reported as `cached` or
+        as `ran` (= would run, judged on the current inputs).
+        """
+        selected = self.select(names) if names else list(self.order)
+        state = self._load_state()
+        results: Dict[str, StepResult] = {}
+        pending = list(selected)
+        running: Dict[Future, tuple] = {}
+
+        def finish(result: StepResult) -> None:
+            results[result.name] = result
+            if on_result:
+                on_result(result)
+
+        def is_fresh(step: Step, key: str) -> bool:
+            entry = state.get(step.name)
+            return (
+                step.cache and not force and entry is not None and entry.get("key") == key
+                and self._outputs_intact(step, entry.get("outputs", {}))
+            )
+
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+            while pending or running:
+                for name in list(pending):
+                    deps = self.deps[name] & set(selected)
+                    if any(results.get(d, StepResult(d, "")).status in (FAILED, BLOCKED) for d in deps):
+                        pending.remove(name)
+                        finish(StepResult(name, BLOCKED))
+                        continue
+                    if not all(d in results for d in deps):
+                        continue
+                    pending.remove(name)
+                    step = self.steps[name]
+                    # Inputs are hashed only now, after upstream steps rewrote them
+                    key = self.step_key(step)
+                    if is_fresh(step, key):
+                        finish(StepResult(name, CACHED))
+                    elif dry_run:
+                        finish(StepResult(name, RAN))
+                    else:
+                        running[pool.submit(self._execute, step)] = (step, key)
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step, key = running.pop(future)
+                    result = future.result()
+                    if result.status == RAN and step.cache:
+                        missing = [o for o in step.outputs if not (project_root / o).exists()]
+                        if missing:
+                            result = StepResult(step.name, FAILED, result.seconds, result.log,
+                                                "missing outputs: " + ", ".join(missing))
+                        else:
+                            state[step.name] = {
+                                "key": key,
+                                "outputs": {o: self._hash(project_root / o) for o in step.outputs},
+                            }
+                            self._save_state(state)
+                    finish(result)
+
+        return results
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Positional bitmap index for seed/identity constraint queries.
+
+For every `(field, position, letter)` the index holds a bitmap over the corpus
+rows (a Python int, bit r = row r), so a conjunction of positional
+constraints is a handful of ANDs plus a popcount instead of a pass over all
+identities:
+
+- fields are `identity` (layer-3 identity), `seed` (identity.lower()[:55])
+  and optional further layers (e.g. `layer4`, joined on the layer-3 identity),
+- letters are stored upper-case; rows where a field is missing or too short
+  match no letter at that position,
+- `combination_counts` counts the letter tuples at k positions for all rows
+  (or a bitmap of rows) in one pass.
+
+The index built from `layer3_derivation_23k_complete.json` is cached in
+outputs/cache/positional_index/ (keyed by source mtime/size) and per process.
+
+Usage:
+    from scripts.analysis.positional_index import load_layer_index
+
+    index = load_layer_index()
+    rows = index.select({27: "A", 54: "C"})            # identity field
+    print(index.count(rows), index.values(rows)[:3])
+    index.combination_counts("seed", [27, 54]).most_common(5)
+"""
+
+from __future__ import annotations
+
+import json
+import pickle
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+project_root = Path(__file__).parent.parent.parent
+
+LAYER3_FILE = project_root / "outputs" / "derived" / "layer3_derivation_23k_complete.json"
+LAYER4_FILE = project_root / "outputs" / "derived" / "layer4_derivation_full_23k.json"
+CACHE_DIR = project_root / "outputs" / "cache" / "positional_index"
+INDEX_VERSION = 1
+
+MISSING = "."  # column filler for absent fields / positions, matches no letter
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+Constraint = Tuple[str, int, str]
+Constraints = Union[Mapping[int, str], Iterable[Constraint]]
+
+def _letter_bitmap(column: str, letter: str) -> int:
+    """Bitmap of rows whose column character is `letter` (C-speed via int(..., 2))."""
+    if letter not in column:
+        return 0
+    table = {ord(c): "0" for c in set(column)}
+    table[ord(letter)] = "1"
+    return int(column.translate(table)[::-1], 2)
+
+def iter_rows(bitmap: int) -> Iterator[int]:
+    """Row numbers set in `bitmap`, ascending."""
+    bits = bin(bitmap)[:1:-1]  # least significant bit first
+    start = bits.find("1")
+    while start >= 0:
+        yield start
+        start = bits.find("1", start + 1)
+
+class PositionalIndex:
+    """`(field, position, letter) -> bitmap` over a fixed list of rows."""
+
+    def __init__(self, values: Dict[str, List[Optional[str]]], columns: Dict[str, List[str]],
+                 bitmaps: Dict[Constraint, int]) -> None:
+        self._values = values
+        self.columns = columns
+        self.bitmaps = bitmaps
+        self.size = len(next(iter(values.values()), []))
+        self.all_rows = (1 << self.size) - 1
+        self.present = {
+            name: int("".join("1" if value else "0" for value in reversed(vals)) or "0", 2)
+            for name, vals in values.items()
+        }
+
+    @classmethod
+    def build(cls, values: Mapping[str, Sequence[Optional[str]]]) -> "PositionalIndex":
+        """Index equally long per-field value lists (None = field missing in that row)."""
+        sizes = {len(vals) for vals in values.values()}
+        if len(sizes) > 1:
+            raise ValueError(f"Unterschiedliche Zeilenzahlen pro Feld: {sizes}")
+        stored = {name: list(vals) for name, vals in values.items()}
+        columns: Dict[str, List[str]] = {}
+        bitmaps: Dict[Constraint, int] = {}
+        for name, vals in stored.items():
+            upper = [(value or "").upper() for value in vals]
+            width = max((len(value) for value in upper), default=0)
+            padded = [value.ljust(width, MISSING) for value in upper]
+            columns[name] = ["".join(column) for column in zip(*padded)] if padded else []
+            for pos, column in enumerate(columns[name]):
+                for letter in set(column) - {MISSING}:
+                    bitmaps[(name, pos, letter)] = _letter_bitmap(column, letter)
+        return cls(stored, columns, bitmaps)
+
+    # --- queries ------------------------------------------------------------
+
+    def bitmap(self, field: str, position: int, letter: str) -> int:
+        return self.bitmaps.get((field, position, letter.upper()), 0)
+
+    def select(self, constraints: Constraints, field: str = "identity", within: Optional[int] = None) -> int:
+        """Rows matching all constraints: `{position: letter}` on `field`, or (field, position, letter) tuples."""
+        if isinstance(constraints, Mapping):
+            constraints = [(field, pos, letter) for pos, letter in constraints.items()]
+        result = self.all_rows if within is None else within
+        for name, pos, letter in constraints:
+            result &= self.bitmap(name, pos, letter)
+            if not result:
+                break
+        return result
+
+    def any_of(self, field: str, position: int, letters: Iterable[str]) -> int:
+        """Rows whose letter at `position` is one of `letters`."""
+        result = 0
+        for letter in letters:
+            result |= self.bitmap(field, position, letter)
+        return result
+
+    def equal(self, field_a: str, pos_a: int, field_b: str, pos_b: int) -> int:
+        """Rows where `field_a[pos_a] == field_b[pos_b]` (e.g. a position stable across layers)."""
+        result = 0
+        for letter in LETTERS:
+            result |= self.bitmap(field_a, pos_a, letter) & self.bitmap(field_b, pos_b, letter)
+        return result
+
+    @staticmethod
+    def count(bitmap: int) -> int:
+        return bitmap.bit_count()
+
+    def rows(self, bitmap: int) -> List[int]:
+        return list(iter_rows(bitmap))
+
+    def values(self, bitmap: int, field: str = "identity") -> List[Optional[str]]:
+        vals = self._values[field]
+        return [vals[row] for row in iter_rows(bitmap)]
+
+    def letter_counts(self, field: str, position: int, within: Optional[int] = None) -> Counter:
+        """Letter -> row count at one position."""
+        counts = Counter()
+        for letter in LETTERS:
+            bits = self.bitmap(field, position, letter)
+            if within is not None:
+                bits &= within
+            if bits:
+                counts[letter] = bits.bit_count()
+        return counts
+
+    def combination_counts(self, field: str, positions: Sequence[int], within: Optional[int] = None) -> Counter:
+        """Letter tuple at `positions` -> row count (one pass over the rows, any k)."""
+        columns = [self.columns[field][pos] if pos < len(self.columns[field]) else "" for pos in positions]
+        if any(not column for column in columns):
+            return Counter()
+        if within is None:
+            counts = Counter(zip(*columns))
+        else:
+            rows = self.rows(within)
+            counts = Counter(tuple(column[row] for column in columns) for row in rows)
+        for key in [key for key in counts if MISSING in key]:
+            del counts[key]
+        return counts
+
+def _signature(path: Path) -> Tuple[str, int, int]:
+    st = path.stat()
+    return (str(path.resolve()), st.st_mtime_ns, st.st_size)
+
+def _read_layer_values(layer3_file: Path, layer4_file: Optional[Path]) -> Dict[str, List[Optional[str]]]:
+    with layer3_file.open() as f:
+        results = json.load(f).get("results", [])
+    identities = [entry.get("layer3_identity", "") for entry in results]
+    identities = [identity for identity in identities if len(identity) == 60]
+    values: Dict[str, List[Optional[str]]] = {
+        "identity": identities,
+        "seed": [identity.lower()[:55] for identity in identities],
+    }
+    if layer4_file is not None:
+        with layer4_file.open() as f:
+            layer4_map = {
+                entry.get("layer3_identity", ""): entry.get("layer4_identity", "")
+                for entry in json.load(f).get("results", [])
+            }
+        values["layer4"] = [
+            layer4 if layer4 and len(layer4) == 60 else None
+            for layer4 in (layer4_map.get(identity) for identity in identities)
+        ]
+    return values
+
+@lru_cache(maxsize=4)
+def _load_cached(layer3_sig: Tuple[str, int, int], layer4_sig: Optional[Tuple[str, int, int]],
+                 use_disk: bool) -> PositionalIndex:
+    layer3_file = Path(layer3_sig[0])
+    layer4_file = Path(layer4_sig[0]) if layer4_sig else None
+    key = (INDEX_VERSION, layer3_sig, layer4_sig)
+    cache_file = CACHE_DIR / f"{layer3_file.stem}{'+layer4' if layer4_file else ''}.pkl"
+    if use_disk and cache_file.exists():
+        try:
+            with cache_file.open("rb") as f:
+                cached = pickle.load(f)
+            if cached.get("key") == key:
+                return cached["index"]
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            pass
+    index = PositionalIndex.build(_read_layer_values(layer3_file, layer4_file))
+    if use_disk:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump({"key": key, "index": index}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(cache_file)
+    return index
+
+def load_layer_index(layer3_file: Path = LAYER3_FILE, layer4_file: Optional[Path] = None,
+                     use_disk: bool = True) -> PositionalIndex:
+    """Index over the valid (60-char) layer-3 identities, optionally joined with layer 4."""
+    return _load_cached(_signature(layer3_file), _signature(layer4_file) if layer4_file else None, use_disk)
@@ -2,63 +2,211 @@
 """
 Run All Analyses
 
-Führt alle Analysen nacheinander aus:
+Führt alle Analysen als Abhängigkeitsgraph aus (scripts/analysis/pipeline.py):
 1. Pattern Analysis
 2. Seed Finding for Fake IDs
 3. Complete Mapping Database
 4. Pattern Discovery
+
+plus die Verifikationsschritte aus run_all_verifications.sh (Gruppe "verify")
+und, nur auf Wunsch, Performance-Budgets (Gruppe "perf").
+
+Unabhängige Schritte laufen parallel; Schritte, deren Code, Inputs und Outputs
+unverändert sind, werden übersprungen.
+
+Usage:
+ python3 scripts/analysis/run_all_analyses.py # alle Analysen
+ python3 scripts/analysis/run_all_analyses.py --group verify # Verifikation
+ python3 scripts/analysis/run_all_analyses.py --group perf # Import-Zeit-Budget
+ python3 scripts/analysis/run_all_analyses.py --only pattern_discovery --jobs 2
+ python3 scripts/analysis/run_all_analyses.py --list | --dry-run | --force
+ python3 scripts/analysis/run_all_analyses.py --warm # über warm_server.py (vorgeladen)
 """
 
-import subprocess
+import argparse
+import hashlib
 import sys
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-SCRIPTS = [
- "scripts/analysis/create_complete_mapping_database.py",
- "scripts/analysis/analyze_documented_vs_real_patterns.py",
- "scripts/analysis/pattern_discovery_engine.py",
- "scripts/analysis/find_seeds_for_fake_ids.py",
+from scripts.analysis.pipeline import BLOCKED, CACHED, FAILED, RAN, Pipeline, Step
+
+PY = sys.executable
+MATRIX_FILE = "data/anna-matrix/Anna_Matrix.xlsx"
+EXPECTED_MATRIX_HASH = "bdee333b4006c1b7ab24a0dc61de76b60210c2db7bd8822c50e8509aff907c45"
+MAPPING_FILE = "outputs/derived/complete_24846_seeds_to_real_ids_mapping.json"
+LAYER_FILES = [
+ "github_export/100_seeds_and_identities.json",
+ "outputs/derived/layer2_derivation_complete.json",
+ "outputs/derived/layer3_derivation_complete.json",
+]
+ANALYSIS_UTILS = "analysis/utils/*.py"
+
+def verify_matrix_hash():
+ """Abort the verification group if the matrix file was modified."""
+ digest = hashlib.sha256((project_root / MATRIX_FILE).read_bytes()).hexdigest()
+ if digest != EXPECTED_MATRIX_HASH:
+ raise RuntimeError(f"Matrix hash mismatch: expected {EXPECTED_MATRIX_HASH}, got {digest}")
+
+ANALYSIS_STEPS = [
+ Step(
+ "mapping_database",
+ [PY, "scripts/analysis/create_complete_mapping_database.py"],
+ inputs=[MAPPING_FILE] + LAYER_FILES,
+ outputs=["outputs/analysis/complete_mapping_database.json", "outputs/analysis/mapping_database_summary.md"],
+ description="Complete Mapping Database",
+ ),
+ Step(
+ "documented_vs_real",
+ [PY, "scripts/analysis/analyze_documented_vs_real_patterns.py"],
+ inputs=[MAPPING_FILE] + LAYER_FILES[1:],
+ outputs=["outputs/analysis/documented_vs_real_pattern_analysis.json"],
+ description="Pattern Analysis",
+ ),
+ Step(
+ "pattern_discovery",
+ [PY, "scripts/analysis/pattern_discovery_engine.py"],
+ inputs=["outputs/analysis/complete_mapping_database.json"],
+ outputs=["outputs/analysis/pattern_discovery_results.json"],
+ description="Pattern Discovery",
+ ),
+ Step(
+ "seeds_for_fake_ids",
+ [PY, "scripts/analysis/find_seeds_for_fake_ids.py"],
+ inputs=[MAPPING_FILE, MATRIX_FILE],
+ outputs=["outputs/analysis/seeds_for_fake_ids_analysis.json"],
+ description="Seed Finding for Fake IDs",
+ ),
+]
+
+VERIFY_STEPS = [
+ Step(
+ "matrix_hash",
+ func=verify_matrix_hash,
+ inputs=[MATRIX_FILE],
+ cache=False,
+ description="Matrix file integrity (SHA256)",
+ ),
+ Step(
+ "base26_identities",
+ [PY, "-m", "analysis.21_base26_identity_extraction"],
+ inputs=[MATRIX_FILE],
+ outputs=["outputs/reports/base26_identity_report.md"],
+ code=["analysis/21_base26_identity_extraction.py", ANALYSIS_UTILS],
+ after=["matrix_hash"],
+ description="Diagonal identity extraction",
+ ),
+ Step(
+ "vortex_identities",
+ [PY, "-m", "analysis.71_9_vortex_extraction"],
+ inputs=[MATRIX_FILE],
+ outputs=["outputs/reports/9_vortex_identity_report.md"],
+ code=["analysis/71_9_vortex_extraction.py", ANALYSIS_UTILS],
+ after=["matrix_hash"],
+ description="Vortex identity extraction",
+ ),
+ Step(
+ "control_group",
+ [PY, "scripts/verify/control_group.py", "--matrices", "200", "--no-rpc"],
+ outputs=["outputs/reports/control_group_report.md", "outputs/reports/control_group_report.json"],
+ code=["scripts/verify/control_group.py", ANALYSIS_UTILS],
+ description="Control group (200 random matrices)",
+ ),
+ Step(
+ "statistical_significance",
+ [PY, "scripts/verify/statistical_significance.py"],
+ outputs=["outputs/reports/statistical_significance.md", "outputs/reports/statistical_significance.json"],
+ description="Statistical significance",
+ ),
+ Step(
+ "similarity_reference",
+ [PY, "scripts/verify/validate_similarity.py"],
+ code=["scripts/verify/validate_similarity.py", "analysis/utils/similarity.py"],
+ description="Vectorized Hamming/edit distances vs. plain DP reference",
+ ),
 ]
 
+# Opt-in (--group perf): wall-clock budgets depend on the machine and its load,
+# so they must not fail the public verification run.
+PERF_STEPS = [
+ Step(
+ "import_budget",
+ [PY, "scripts/utils/import_budget.py"],
+ code=["scripts/utils/import_budget.py", ANALYSIS_UTILS, "scripts/core/*.py"],
+ cache=False,
+ description="Import-time budget of light utility modules",
+ ),
+]
+
+GROUPS = {
+ "analysis": ANALYSIS_STEPS,
+ "verify": VERIFY_STEPS,
+ "perf": PERF_STEPS,
+ "all": ANALYSIS_STEPS + VERIFY_STEPS,
+}
+
+def parse_args() -> argparse.Namespace:
+ parser = argparse.ArgumentParser(description="Run analyses as a cached dependency graph")
+ parser.add_argument("--group", choices=sorted(GROUPS), default="analysis", help="Step group (default: analysis)")
+ parser.add_argument("--only", nargs="+", metavar="STEP", help="Run only these steps (plus their dependencies)")
+ parser.add_argument("--jobs", type=int, default=None, help="Parallel steps (default: CPU count)")
+ parser.add_argument("--force", action="store_true", help="Ignore cached results")
+ parser.add_argument("--dry-run", action="store_true", help="Show what would run")
+ parser.add_argument("--list", action="store_true", help="List steps and dependencies")
+ parser.add_argument("--warm", action="store_true", help="Run steps on a running warm_server.py (no per-script startup)")
+ return parser.parse_args()
+
 def main():
  """Main function."""
+ args = parse_args()
+ warm_socket = None
+ if args.warm:
+ from scripts.analysis.warm_server import DEFAULT_SOCKET, is_running
+ if is_running(DEFAULT_SOCKET):
+ warm_socket = DEFAULT_SOCKET
+ else:
+ print("No warm server running (python3 scripts/analysis/warm_server.py serve); using fresh interpreters")
+ pipeline = Pipeline(GROUPS[args.group], warm_socket=warm_socket)
+
  print("=" * 80)
  print("RUN ALL ANALYSES")
  print("=" * 80)
  print()
- 
- for i, script_path in enumerate(SCRIPTS, 1):
- script = project_root / script_path
- if not script.exists():
- print(f"❌ Script not found: {script}")
- continue
- 
- print(f"{i}/{len(SCRIPTS)}. Running {script.name}...")
- print()
- 
- result = subprocess.run(
- [sys.executable, str(script)],
- cwd=project_root,
- capture_output=True,
- text=True
- )
- 
- if result.returncode == 0:
- print(f" ✅ Completed")
- if result.stdout:
- print(result.stdout[-500:]) # Last 500 chars
- else:
- print(f" ❌ Failed: {result.stderr[:200]}")
- 
+
+ if args.list:
+ for name in pipeline.order:
+ step = pipeline.steps[name]
+ deps = ", ".join(sorted(pipeline.deps[name])) or "-"
+ print(f" {name:<26} after: {deps:<30} {step.description}")
+ return 0
+
+ labels = {CACHED: "⏭️ unchanged", RAN: "✅ Completed", FAILED: "❌ Failed", BLOCKED: "⛔ Skipped (dependency failed)"}
+ if args.dry_run:
+ labels[RAN] = "▶️ would run"
+
+ def report(result):
+ step = pipeline.steps[result.name]
+ timing = f" ({result.seconds:.1f}s)" if result.seconds else ""
+ print(f" {labels[result.status]}: {result.name} - {step.description}{timing}")
+ if result.status == FAILED:
+ print(f" {result.error}")
+ if result.log and result.log.exists():
+ tail = result.log.read_text(encoding="utf-8", errors="ignore")[-500:]
+ print(f" log: {result.log}")
+ print(tail)
+
+ results = pipeline.run(args.only, jobs=args.jobs, force=args.force, dry_run=args.dry_run, on_result=report)
+
  print()
- 
  print("=" * 80)
- print("ALL ANALYSES COMPLETE")
+ counts = {}
+ for result in results.values():
+ counts[result.status] = counts.get(result.status, 0) + 1
+ print("ALL ANALYSES COMPLETE: " + ", ".join(f"{status}: {n}" for status, n in sorted(counts.items())))
  print("=" * 80)
+ return 1 if counts.get(FAILED) or counts.get(BLOCKED) else 0
 
 if __name__ == "__main__":
- main()
-
+ sys.exit(main())
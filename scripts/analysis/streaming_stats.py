@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+Mergeable streaming accumulators for corpus statistics.
+
+Every accumulator consumes values one at a time (`add`, `update`), keeps
+constant (or alphabet-bounded) memory, can be merged with another
+accumulator of the same kind (`merge`), and round-trips through JSON
+(`to_dict` / `from_dict`). That makes analyses over multi-million-identity
+derivation outputs a single pass over a generator, and parallel runs a
+matter of merging the per-worker results:
+
+- `Counts`: counter of hashable keys (tuples allowed),
+- `PositionLetters`: per-position letter histograms with entropy,
+- `Bigrams`: adjacent character pairs,
+- `RunLengths`: runs of repeated characters (histogram, longest run),
+- `Moments`: count / mean / variance / min / max (Chan et al. merge),
+- `HyperLogLog`: approximate distinct count (2^p registers, ~1.04/sqrt(2^p) error),
+- `Reservoir`: uniform random sample of fixed size,
+- `StatsBundle`: named accumulators fed by one function, merged/saved together.
+
+Usage:
+    from scripts.analysis.mapping_stream import iter_json_items
+    from scripts.analysis.streaming_stats import PositionLetters, StatsBundle, accumulate
+
+    def new_bundle():                      # module level, so workers can unpickle it
+        return StatsBundle(positions=PositionLetters())
+
+    def feed(bundle, entry):
+        bundle["positions"].add(entry["layer3_identity"])
+
+    bundle = accumulate(new_bundle, feed, iter_json_items(LAYER3_FILE), workers=4)
+    print(bundle["positions"].entropy(27))
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from abc import ABC, abstractmethod
+import random
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from hashlib import blake2b
+from itertools import groupby
+from operator import add as _concat
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Type
+
+ACCUMULATORS: Dict[str, Type["Accumulator"]] = {}
+
+def _register(cls: Type["Accumulator"]) -> Type["Accumulator"]:
+    ACCUMULATORS[cls.__name__] = cls
+    return cls
+
+def _to_key(value: Any) -> Hashable:
+    """JSON lists back to tuples so serialized tuple keys compare equal again."""
+    return tuple(_to_key(item) for item in value) if isinstance(value, list) else value
+
+class Accumulator(ABC):
+    """Base class: `add` one value, `merge` another instance, `to_dict` / `from_dict`."""
+
+    @abstractmethod
+    def add(self, value: Any) -> None:
+        ...
+
+    def update(self, values: Iterable[Any]) -> "Accumulator":
+        for value in values:
+            self.add(value)
+        return self
+
+    @abstractmethod
+    def merge(self, other: "Accumulator") -> "Accumulator":
+        ...
+
+    def _check(self, other: "Accumulator") -> None:
+        if type(other) is not type(self):
+            raise TypeError(f"Cannot merge {type(other).__name__} into {type(self).__name__}")
+
+    @abstractmethod
+    def state(self) -> Dict[str, Any]:
+        ...
+
+    @classmethod
+    @abstractmethod
+    def from_state(cls, state: Dict[str, Any]) -> "Accumulator":
+        ...
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": type(self).__name__, **self.state()}
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "Accumulator":
+        data = dict(data)
+        kind = data.pop("kind")
+        if kind not in ACCUMULATORS:
+            raise ValueError(f"Unknown accumulator kind: {kind}")
+        return ACCUMULATORS[kind].from_state(data)
+
+@_register
+class Counts(Accumulator):
+    """Counter of hashable keys."""
+
+    def __init__(self) -> None:
+        self.counter: Counter = Counter()
+
+    def add(self, value: Hashable, count: int = 1) -> None:
+        self.counter[value] += count
+
+    def update(self, values: Iterable[Hashable]) -> "Counts":
+        self.counter.update(values)  # C-level counting loop
+        return self
+
+    def merge(self, other: "Counts") -> "Counts":
+        self._check(other)
+        self.counter.update(other.counter)
+        return self
+
+    @property
+    def total(self) -> int:
+        return sum(self.counter.values())
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        return self.counter.most_common(n)
+
+    def state(self) -> Dict[str, Any]:
+        return {"items": [[list(key) if isinstance(key, tuple) else key, count] for key, count in self.counter.items()]}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "Counts":
+        acc = cls()
+        acc.counter.update({_to_key(key): count for key, count in state["items"]})
+        return acc
+
+@_register
+class PositionLetters(Accumulator):
+    """Letter histogram per position over strings (positions past a string's end are skipped)."""
+
+    def __init__(self) -> None:
+        self.counter: Counter = Counter()  # (position, letter) -> count
+        self.strings = 0
+
+    def add(self, value: str) -> None:
+        self.counter.update(enumerate(value))
+        self.strings += 1
+
+    def merge(self, other: "PositionLetters") -> "PositionLetters":
+        self._check(other)
+        self.counter.update(other.counter)
+        self.strings += other.strings
+        return self
+
+    def distribution(self, position: int) -> Counter:
+        return Counter({letter: count for (pos, letter), count in self.counter.items() if pos == position})
+
+    def overall(self) -> Counter:
+        total: Counter = Counter()
+        for (_, letter), count in self.counter.items():
+            total[letter] += count
+        return total
+
+    def positions(self) -> List[int]:
+        return sorted({pos for pos, _ in self.counter})
+
+    def entropy(self, position: int) -> float:
+        """Shannon entropy (bits) of the letter distribution at `position`."""
+        return entropy(self.distribution(position).values())
+
+    def state(self) -> Dict[str, Any]:
+        return {"strings": self.strings, "items": [[pos, letter, count] for (pos, letter), count in self.counter.items()]}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "PositionLetters":
+        acc = cls()
+        acc.strings = state["strings"]
+        acc.counter.update({(pos, letter): count for pos, letter, count in state["items"]})
+        return acc
+
+@_register
+class Bigrams(Counts):
+    """Adjacent character pairs of each string, keyed as two-character strings."""
+
+    def add(self, value: str, count: int = 1) -> None:
+        pairs = map(_concat, value, value[1:])
+        if count == 1:
+            self.counter.update(pairs)
+        else:
+            for pair in pairs:
+                self.counter[pair] += count
+
+    def update(self, values: Iterable[str]) -> "Bigrams":
+        for value in values:
+            self.add(value)
+        return self
+
+@_register
+class RunLengths(Accumulator):
+    """Lengths of runs of identical consecutive characters."""
+
+    def __init__(self) -> None:
+        self.histogram: Counter = Counter()
+        self.longest = 0
+        self.longest_example = ""
+
+    def add(self, value: str) -> None:
+        for char, run in groupby(value):
+            length = sum(1 for _ in run)
+            self.histogram[length] += 1
+            if length > self.longest:
+                self.longest = length
+                self.longest_example = char * length
+
+    def merge(self, other: "RunLengths") -> "RunLengths":
+        self._check(other)
+        self.histogram.update(other.histogram)
+        if other.longest > self.longest:
+            self.longest, self.longest_example = other.longest, other.longest_example
+        return self
+
+    def mean(self) -> float:
+        runs = sum(self.histogram.values())
+        return sum(length * count for length, count in self.histogram.items()) / runs if runs else 0.0
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            "histogram": {str(length): count for length, count in sorted(self.histogram.items())},
+            "longest": self.longest,
+            "longest_example": self.longest_example,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "RunLengths":
+        acc = cls()
+        acc.histogram.update({int(length): count for length, count in state["histogram"].items()})
+        acc.longest = state["longest"]
+        acc.longest_example = state["longest_example"]
+        return acc
+
+@_register
+class Moments(Accumulator):
+    """Running count, mean, variance (Welford), min and max of numbers."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "Moments") -> "Moments":
+        self._check(other)
+        if not other.count:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (n - 1)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.mean if self.count else 0.0,
+            "std": self.std,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+        }
+
+    def state(self) -> Dict[str, Any]:
+        return {"count": self.count, "mean": self.mean, "m2": self.m2,
+                "min": self.min if self.count else None, "max": self.max if self.count else None}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "Moments":
+        acc = cls()
+        acc.count, acc.mean, acc.m2 = state["count"], state["mean"], state["m2"]
+        acc.min = state["min"] if state["min"] is not None else math.inf
+        acc.max = state["max"] if state["max"] is not None else -math.inf
+        return acc
+
+@_register
+class HyperLogLog(Accumulator):
+    """Approximate number of distinct values (strings or anything with a stable str())."""
+
+    def __init__(self, precision: int = 14) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: Any) -> None:
+        digest = int.from_bytes(blake2b(str(value).encode("utf-8"), digest_size=8).digest(), "big")
+        index = digest >> (64 - self.precision)
+        rest = digest & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        self._check(other)
+        if other.precision != self.precision:
+            raise ValueError(f"Precision differs: {self.precision} vs {other.precision}")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        raw = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))  # linear counting for small cardinalities
+        return round(raw)
+
+    def __len__(self) -> int:
+        return self.estimate()
+
+    def state(self) -> Dict[str, Any]:
+        return {"precision": self.precision, "registers": self.registers.hex()}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "HyperLogLog":
+        acc = cls(state["precision"])
+        acc.registers = bytearray.fromhex(state["registers"])
+        return acc
+
+@_register
+class Reservoir(Accumulator):
+    """Uniform sample of `size` values from a stream of unknown length (algorithm R)."""
+
+    def __init__(self, size: int = 100, seed: Optional[int] = None) -> None:
+        self.size = size
+        self.seen = 0
+        self.items: List[Any] = []
+        self._rng = random.Random(seed)
+
+    def add(self, value: Any) -> None:
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(value)
+            return
+        slot = self._rng.randrange(self.seen)
+        if slot < self.size:
+            self.items[slot] = value
+
+    def merge(self, other: "Reservoir") -> "Reservoir":
+        """Uniform sample of the union: draw from each side in proportion to what it has seen."""
+        self._check(other)
+        remaining = [self.seen, other.seen]
+        pools = [list(self.items), list(other.items)]
+        for pool in pools:
+            self._rng.shuffle(pool)
+        merged = []
+        for _ in range(min(self.size, self.seen + other.seen)):
+            side = 0 if self._rng.randrange(remaining[0] + remaining[1]) < remaining[0] else 1
+            merged.append(pools[side].pop())
+            remaining[side] -= 1
+        self.items = merged
+        self.seen += other.seen
+        return self
+
+    def state(self) -> Dict[str, Any]:
+        return {"size": self.size, "seen": self.seen, "items": self.items}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "Reservoir":
+        acc = cls(state["size"])
+        acc.seen = state["seen"]
+        acc.items = list(state["items"])
+        return acc
+
+@_register
+class StatsBundle(Accumulator):
+    """Named accumulators that are merged and serialized together."""
+
+    def __init__(self, **accumulators: Accumulator) -> None:
+        self.accumulators: Dict[str, Accumulator] = dict(accumulators)
+
+    def __getitem__(self, name: str) -> Accumulator:
+        return self.accumulators[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.accumulators
+
+    def add(self, value: Any) -> None:
+        for acc in self.accumulators.values():
+            acc.add(value)
+
+    def merge(self, other: "StatsBundle") -> "StatsBundle":
+        self._check(other)
+        for name, acc in other.accumulators.items():
+            if name in self.accumulators:
+                self.accumulators[name].merge(acc)
+            else:
+                self.accumulators[name] = acc
+        return self
+
+    def state(self) -> Dict[str, Any]:
+        return {"accumulators": {name: acc.to_dict() for name, acc in self.accumulators.items()}}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "StatsBundle":
+        return cls(**{name: Accumulator.from_dict(data) for name, data in state["accumulators"].items()})
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "StatsBundle":
+        bundle = Accumulator.from_dict(json.loads(path.read_text(encoding="utf-8")))
+        if not isinstance(bundle, cls):
+            raise TypeError(f"{path} does not contain a StatsBundle")
+        return bundle
+
+def entropy(counts: Iterable[int]) -> float:
+    """Shannon entropy in bits of a histogram."""
+    counts = [count for count in counts if count > 0]
+    total = sum(counts)
+    return -sum(count / total * math.log2(count / total) for count in counts) if total else 0.0
+
+# --- feeding ----------------------------------------------------------------------
+
+Feed = Callable[[Accumulator, Any], None]
+
+def _iter_chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    chunk: List[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _accumulate_chunk(task: Tuple[Callable[[], Accumulator], Feed, List[Any]]) -> Dict[str, Any]:
+    factory, feed, chunk = task
+    acc = factory()
+    for item in chunk:
+        feed(acc, item)
+    return acc.to_dict()
+
+def accumulate(factory: Callable[[], Accumulator], feed: Feed, items: Iterable[Any], workers: int = 1,
+               chunk_size: int = 10_000) -> Accumulator:
+    """Feed `items` into accumulators made by `factory` and merge the results.
+
+    With `workers > 1`, chunks of items are processed in a process pool
+    (`factory` and `feed` must be picklable, i.e. module-level); at most
+    2 * workers chunks are in flight, so memory stays flat for any corpus size.
+    """
+    result = factory()
+    if workers <= 1:
+        for item in items:
+            feed(result, item)
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk in _iter_chunks(items, chunk_size):
+            pending.add(pool.submit(_accumulate_chunk, (factory, feed, chunk)))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result.merge(Accumulator.from_dict(future.result()))
+        for future in pending:
+            result.merge(Accumulator.from_dict(future.result()))
+    return result
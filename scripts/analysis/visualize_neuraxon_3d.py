@@ -6,18 +6,39 @@ Example:
  python scripts/analysis/visualize_neuraxon_3d.py \
  --network-json data/neuraxon_exports/real_ids_network.json \
  --output-html outputs/neuraxon_visualization.html
+
+Layouts are cached in outputs/cache/neuraxon_layouts/ (keyed by graph hash + seed);
+pass --no-layout-cache to force a fresh spring layout.
+
+Large exports: --frame-chunks writes the base figure (frame 0) into the HTML and
+every frame as a separate JSON chunk in <output>_frames/, fetched on demand while
+scrubbing (add --gzip-chunks / --pack-arrays to shrink them, --edge-lod to thin
+edges). Chunks are fetched via HTTP, e.g. `python -m http.server` in the output dir.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Optional
 
 import networkx as nx
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from plotly.utils import PlotlyJSONEncoder
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.analysis.neuraxon_geometry import (
+ DEFAULT_LAYOUT_CACHE_DIR,
+ GraphArrays,
+ frame_deltas,
+ load_or_compute_layout,
+ write_frame_chunks,
+)
 
 TABLE_COLUMNS = ["Neuron ID", "Real ID", "Seed (priv)", "Seed Hash", "Doc ID", "State"]
 CONNECTION_COLUMNS = ["From → To", "|weight|", "Type", "w_fast", "w_slow", "w_meta"]
@@ -47,7 +68,15 @@ def build_graph(payload: Dict[str, Any]) -> nx.DiGraph:
  )
  return g
 
-def compute_layout(g: nx.Graph, seed: int) -> Dict[int, Tuple[float, float, float]]:
+def compute_layout(
+ g: nx.Graph,
+ seed: int,
+ cache_dir: Optional[Path] = DEFAULT_LAYOUT_CACHE_DIR,
+) -> Dict[int, Tuple[float, float, float]]:
+ """Spherical 3D layout, served from the on-disk layout cache when possible."""
+ return load_or_compute_layout(g, seed, _spring_layout, cache_dir)
+
+def _spring_layout(g: nx.Graph, seed: int) -> Dict[int, Tuple[float, float, float]]:
  """Compute spherical 3D layout for neural network visualization."""
  if g.number_of_nodes() == 0:
  return {}
@@ -247,6 +276,8 @@ def build_page_html(
  summary_text: str,
  performance_mode: bool,
  table_batch: int,
+ chunk_config: Optional[Dict[str, Any]] = None,
+ plot_frames: Optional[List[Dict[str, Any]]] = None,
 ) -> str:
  initial_frame = ui_frames[0] if ui_frames else {}
  total_count = (
@@ -262,7 +293,13 @@ def build_page_html(
  )
  summary_html = "<br>".join(summary_text.splitlines())
  performance_js = "true" if performance_mode else "false"
+ if chunk_config:
+ # Only frame 0 is inlined; the page creates stubs for the rest and fetches them lazily
+ inline = [dict(ui_frames[0], plot=plot_frames[0])] if ui_frames else []
+ frames_json = json.dumps(inline, cls=PlotlyJSONEncoder)
+ else:
  frames_json = json.dumps(ui_frames)
+ chunks_json = json.dumps(chunk_config) if chunk_config else "null"
  # Use verified on-chain count from RESEARCH_STATUS.md: 23,477 of 23,765 = 98.79%
  # If not in metadata, use verified numbers
  default_onchain = 23477 # Verified on-chain count from research
@@ -1079,6 +1116,14 @@ def build_page_html(
 
  <script>
  const FRAME_DATA = {frames_json};
+ // Chunked mode: {{base, count, suffix, gzip, neuron_ranges}}; frames beyond the inlined first one are stubs
+ const FRAME_CHUNKS = {chunks_json};
+ if (FRAME_CHUNKS) {{
+ for (let i = FRAME_DATA.length; i < FRAME_CHUNKS.count; i++) {{
+ FRAME_DATA.push({{index: i, pending: true}});
+ }}
+ }}
+ const FRAME_CHUNK_REQUESTS = {{}};
  const PERFORMANCE_MODE = {performance_js};
  const TABLE_BATCH_SIZE = {table_batch};
  let tablesExpanded = true; // Always show full view
@@ -1095,6 +1140,7 @@ def build_page_html(
  const NODE_FRAME_INDEX = buildNodeFrameIndex();
 
  let currentFrameIndex = 0;
+ let requestedFrameIndex = 0;
  let selectedNode = null;
  let pendingNeuronSelection = null;
  const selectionToast = document.getElementById('selection-toast');
@@ -1571,6 +1617,14 @@ def build_page_html(
  if (typeof NODE_FRAME_INDEX[neuronId] !== 'undefined') {{
  return NODE_FRAME_INDEX[neuronId];
  }}
+ // Chunked mode: frames not fetched yet are covered by the shipped [first, last, frame] ranges
+ if (FRAME_CHUNKS && Array.isArray(FRAME_CHUNKS.neuron_ranges)) {{
+ for (const [first, last, frameIndex] of FRAME_CHUNKS.neuron_ranges) {{
+ if (neuronId >= first && neuronId <= last) {{
+ return frameIndex;
+ }}
+ }}
+ }}
  // Search all frames
  for (let idx = 0; idx < FRAME_DATA.length; idx++) {{
  const frame = FRAME_DATA[idx];
@@ -1810,9 +1864,54 @@ def build_page_html(
  markNeuronRowActive(null);
  }}
 
+ function loadFrameChunk(index) {{
+ const stub = FRAME_DATA[index];
+ if (!FRAME_CHUNKS || !stub || !stub.pending) {{
+ return Promise.resolve(stub);
+ }}
+ if (FRAME_CHUNK_REQUESTS[index]) {{
+ return FRAME_CHUNK_REQUESTS[index];
+ }}
+ const url = FRAME_CHUNKS.base + '/frame_' + String(index).padStart(5, '0') + FRAME_CHUNKS.suffix;
+ FRAME_CHUNK_REQUESTS[index] = fetch(url)
+ .then(resp => {{
+ if (!resp.ok) throw new Error('HTTP ' + resp.status + ' for ' + url);
+ if (FRAME_CHUNKS.gzip) {{
+ return new Response(resp.body.pipeThrough(new DecompressionStream('gzip'))).json();
+ }}
+ return resp.json();
+ }})
+ .then(chunk => {{
+ Object.assign(stub, chunk.ui, {{plot: chunk.plot, pending: false}});
+ FRAME_INDEX_BY_ID[stub.frame_id] = index;
+ Object.keys(stub.nodes || {{}}).forEach(key => {{
+ const numericId = Number(key);
+ if (!Number.isNaN(numericId) && typeof NODE_FRAME_INDEX[numericId] === 'undefined') {{
+ NODE_FRAME_INDEX[numericId] = index;
+ }}
+ }});
+ return stub;
+ }})
+ .catch(err => {{
+ delete FRAME_CHUNK_REQUESTS[index];
+ throw err;
+ }});
+ return FRAME_CHUNK_REQUESTS[index];
+ }}
+
  function goToFrame(index, animatePlot = true) {{
  if (!FRAME_DATA || !FRAME_DATA.length) return;
  const clamped = Math.max(0, Math.min(index, FRAME_DATA.length - 1));
+ if (FRAME_DATA[clamped] && FRAME_DATA[clamped].pending) {{
+ // Fetch the chunk first; only the most recent request is shown when it arrives
+ requestedFrameIndex = clamped;
+ loadFrameChunk(clamped)
+ .then(() => {{
+ if (requestedFrameIndex === clamped) goToFrame(clamped, animatePlot);
+ }})
+ .catch(err => console.warn('Frame chunk failed to load', err));
+ return;
+ }}
  currentFrameIndex = clamped;
  if (timelineSlider && Number(timelineSlider.value) !== clamped) {{
  timelineSlider.value = clamped;
@@ -1824,18 +1923,23 @@ def build_page_html(
  
  const plotEl = document.getElementById('neuraxon-plot');
  const frame = FRAME_DATA[clamped];
+ // Chunked frames carry their own trace deltas; otherwise animate the named figure frame
+ const animateTarget = frame && frame.plot ? [frame.plot] : [frame && frame.frame_id];
+ if (FRAME_CHUNKS && clamped + 1 < FRAME_DATA.length) {{
+ loadFrameChunk(clamped + 1).catch(() => {{}});
+ }}
  if (plotEl && frame && plotEl.data && typeof Plotly !== 'undefined') {{
  // Only clear selection if not in playback mode to avoid lag
  if (!timelineInterval) {{
  if (animatePlot) {{
- Plotly.animate(plotEl, [frame.frame_id], {{
+ Plotly.animate(plotEl, animateTarget, {{
  transition: {{duration: 400}},
  frame: {{duration: 400, redraw: true}},
  mode: 'immediate',
  }});
  setTimeout(clearPlotSelection, 450);
  }} else {{
- Plotly.animate(plotEl, [frame.frame_id], {{
+ Plotly.animate(plotEl, animateTarget, {{
  transition: {{duration: 0}},
  frame: {{duration: 0, redraw: true}},
  mode: 'immediate',
@@ -1844,7 +1948,7 @@ def build_page_html(
  }}
  }} else {{
  // During playback, skip selection clearing and use faster animation
- Plotly.animate(plotEl, [frame.frame_id], {{
+ Plotly.animate(plotEl, animateTarget, {{
  transition: {{duration: 0}},
  frame: {{duration: 0, redraw: true}},
  mode: 'immediate',
@@ -2491,6 +2595,7 @@ def build_page_html(
  onchain_count=onchain_count,
  onchain_rate=onchain_rate,
  frames_json=frames_json,
+ chunks_json=chunks_json,
  performance_js=performance_js,
  table_batch=table_batch,
  slider_max=slider_max,
@@ -2513,6 +2618,8 @@ def build_frame_traces(
  table_limit: int,
  connection_limit: int,
  performance_mode: bool,
+ arrays: Optional[GraphArrays] = None,
+ edge_lod: float = 1.0,
 ) -> Tuple[go.Scatter3d, List[go.Scatter3d], go.Scatter3d, go.Scatter3d, go.Table, go.Table, List[go.Scatter3d]]:
  annotations = frame["annotations"]
  node_ids = frame.get("node_ids") or list(annotations.keys())
@@ -2520,8 +2627,6 @@ def build_frame_traces(
  if not node_ids:
  node_ids = sorted(g.nodes())
 
- subgraph = g.subgraph(node_ids)
-
  x_nodes, y_nodes, z_nodes, colors, text, sizes = [], [], [], [], [], []
 
  for node in node_ids:
@@ -2565,107 +2670,48 @@ def build_frame_traces(
  # Build edge traces with weight-based visualization
  # Note: Structural connections are static (scientifically correct)
  # But we can vary line width/opacity based on actual synapse weights
- edge_x, edge_y, edge_z = [], [], []
- edge_data = []
- 
- # Collect all weights for normalization
- all_weights = []
- effective_max_edges = min(max_edges or len(subgraph.edges), len(node_ids) * 3 or 1)
- filtered_edges = filter_edges(subgraph, effective_max_edges, edge_percentile)
-
- for start, end in filtered_edges:
- edge_attrs = subgraph.get_edge_data(start, end, {})
- weight = edge_attrs.get("weight", 0.0)
- all_weights.append(weight)
- 
- max_weight = max(all_weights) if all_weights else 1.0
- min_weight = min(all_weights) if all_weights else 0.0
- weight_range = max_weight - min_weight if max_weight > min_weight else 1.0
- 
- # Build edge traces with proper weight-based visualization
- # Group edges by weight ranges for better visualization
- weak_edges = {"x": [], "y": [], "z": []}
- medium_edges = {"x": [], "y": [], "z": []}
- strong_edges = {"x": [], "y": [], "z": []}
- 
- for start, end in filtered_edges:
- # Get actual synapse weight from graph
- edge_attrs = subgraph.get_edge_data(start, end, {})
- weight = edge_attrs.get("weight", 0.0)
- 
- x0, y0, z0 = layout.get(start, (0.0, 0.0, 0.0))
- x1, y1, z1 = layout.get(end, (0.0, 0.0, 0.0))
- 
- norm_weight = (weight - min_weight) / weight_range if weight_range > 0 else 0.5
- 
- # Categorize edges by strength
- if norm_weight < 0.33:
- weak_edges["x"] += [x0, x1, None]
- weak_edges["y"] += [y0, y1, None]
- weak_edges["z"] += [z0, z1, None]
- elif norm_weight < 0.67:
- medium_edges["x"] += [x0, x1, None]
- medium_edges["y"] += [y0, y1, None]
- medium_edges["z"] += [z0, z1, None]
- else:
- strong_edges["x"] += [x0, x1, None]
- strong_edges["y"] += [y0, y1, None]
- strong_edges["z"] += [z0, z1, None]
- 
- # Create separate traces for different weight ranges
+ if arrays is None:
+ arrays = GraphArrays.from_graph(g, layout)
+ node_idx = arrays.indices_of(node_ids)
+ effective_max_edges = min(max_edges or len(arrays.edge_weight), len(node_ids) * 3 or 1)
+ edge_idx = arrays.select_edges(node_idx, effective_max_edges, edge_percentile)
+ edge_idx = arrays.decimate_edges(edge_idx, edge_lod)
+ # weak / medium / strong by normalized weight, each as NaN-separated line arrays
+ buckets = arrays.edge_buckets(edge_idx)
+ edge_styles = {
+ "weak": dict(width=0.5, color="rgba(100, 100, 100, 0.6)"),
+ "medium": dict(width=0.7, color="rgba(70, 70, 70, 0.75)"),
+ "strong": dict(width=1.0, color="rgba(50, 50, 50, 0.9)"),
+ }
+
+ # One trace per weight range; empty ranges keep an empty trace so every
+ # frame has the same trace slots (required for partial frame updates)
  edge_traces = []
- 
- # Weak edges: darker gray, thin, visible opacity
- if weak_edges["x"]:
- edge_traces.append(go.Scatter3d(
- x=weak_edges["x"],
- y=weak_edges["y"],
- z=weak_edges["z"],
- mode="lines",
- line=dict(width=0.5, color="rgba(100, 100, 100, 0.6)"),
- hoverinfo="none",
- showlegend=False,
- ))
- 
- # Medium edges: medium-dark gray, medium width, good opacity
- if medium_edges["x"]:
- edge_traces.append(go.Scatter3d(
- x=medium_edges["x"],
- y=medium_edges["y"],
- z=medium_edges["z"],
- mode="lines",
- line=dict(width=0.7, color="rgba(70, 70, 70, 0.75)"),
- hoverinfo="none",
- showlegend=False,
- ))
- 
- # Strong edges: dark gray, thicker, high opacity
- if strong_edges["x"]:
+ for bucket, style in edge_styles.items():
+ bx, by, bz = buckets.get(bucket, ([], [], []))
  edge_traces.append(go.Scatter3d(
- x=strong_edges["x"],
- y=strong_edges["y"],
- z=strong_edges["z"],
+ x=bx,
+ y=by,
+ z=bz,
  mode="lines",
- line=dict(width=1.0, color="rgba(50, 50, 50, 0.9)"),
+ line=style,
  hoverinfo="none",
  showlegend=False,
  ))
  
  # Return all edge traces (will be added separately)
  # For backward compatibility, also return first trace
- edge_trace = edge_traces[0] if edge_traces else go.Scatter3d(x=[], y=[], z=[], mode="lines")
- additional_edge_traces = edge_traces[1:] if len(edge_traces) > 1 else []
+ edge_trace = edge_traces[0]
+ additional_edge_traces = edge_traces[1:]
 
- highlight_x, highlight_y, highlight_z, highlight_text = [], [], [], []
+ highlight_text = []
  top_connections = frame.get("top_connections", [])[:connection_limit]
+ highlight_x, highlight_y, highlight_z = arrays.pair_segments(
+ [(conn.get("pre_id"), conn.get("post_id")) for conn in top_connections]
+ )
  for conn in top_connections:
  start = conn.get("pre_id")
  end = conn.get("post_id")
- x0, y0, z0 = layout.get(start, (0.0, 0.0, 0.0))
- x1, y1, z1 = layout.get(end, (0.0, 0.0, 0.0))
- highlight_x += [x0, x1, None]
- highlight_y += [y0, y1, None]
- highlight_z += [z0, z1, None]
  msg = "<br>".join(
  [
  f"From {start} → {end}",
@@ -2704,13 +2750,14 @@ def build_frame_traces(
  # Show packets on top connections - these represent the strongest synaptic pathways
  packet_traces: List[go.Scatter3d] = []
  if not performance_mode:
+ positions = dict(zip(arrays.node_ids.tolist(), arrays.positions.tolist()))
  frame_index = frame.get("index", 0)
  num_connections_with_packets = min(12, len(top_connections))
  for i, conn in enumerate(top_connections[:num_connections_with_packets]):
  start = conn.get("pre_id")
  end = conn.get("post_id")
- x0, y0, z0 = layout.get(start, (0.0, 0.0, 0.0))
- x1, y1, z1 = layout.get(end, (0.0, 0.0, 0.0))
+ x0, y0, z0 = positions.get(start, (0.0, 0.0, 0.0))
+ x1, y1, z1 = positions.get(end, (0.0, 0.0, 0.0))
  
  num_packets = 2 if i < 6 else 1
  for j in range(num_packets):
@@ -2765,7 +2812,7 @@ def render_interactive(
  frames: List[Dict[str, Any]],
  payload: Dict[str, Any],
  args: argparse.Namespace,
-) -> Tuple[go.Figure, List[Dict[str, Any]], Dict[str, Any], str]:
+) -> Tuple[go.Figure, List[Dict[str, Any]], Dict[str, Any], str, List[Dict[str, Any]]]:
  metadata = payload.get("metadata", {})
  global_stats = metadata.get("global_stats", {})
  total_entries = global_stats.get("total_entries", len(frames[0]["annotations"]))
@@ -2780,29 +2827,45 @@ def render_interactive(
  edge_percentile = max(edge_percentile, 0.35)
  connection_limit = min(connection_limit, 6)
 
- edge0, additional_edges0, highlight0, node0, id_table0, conn_table0, packets0 = build_frame_traces(
+ # Build every frame once from shared arrays; the base figure gets frame 0 in full,
+ # animation frames only carry the attributes that change between frames.
+ arrays = GraphArrays.from_graph(graph, layout)
+ frame_traces = []
+ for frame in frames:
+ edge_trace, additional_edges, highlight_trace, node_trace, _, _, packet_traces = build_frame_traces(
  graph,
  layout,
- frames[0],
+ frame,
  max_edges,
  edge_percentile,
  args.table_limit,
  connection_limit,
  performance_mode,
+ arrays,
+ args.edge_lod,
  )
+ frame_traces.append(([edge_trace] + additional_edges + [highlight_trace, node_trace], packet_traces))
+
+ # Pad packet traces so every frame exposes the same trace slots
+ packet_slots = max((len(packets) for _, packets in frame_traces), default=0)
+ for _, packets in frame_traces:
+ while len(packets) < packet_slots:
+ packets.append(go.Scatter3d(
+ x=[], y=[], z=[],
+ mode="markers",
+ marker=dict(size=3, color="#ff6f00", opacity=0.85, line=dict(width=0)),
+ hoverinfo="skip",
+ showlegend=False,
+ ))
+ all_traces = [traces + packets for traces, packets in frame_traces]
 
  fig = make_subplots(
  rows=1,
  cols=1,
  specs=[[{"type": "scene"}]],
  )
- fig.add_trace(edge0, row=1, col=1)
- for extra_edge in additional_edges0:
- fig.add_trace(extra_edge, row=1, col=1)
- fig.add_trace(highlight0, row=1, col=1)
- fig.add_trace(node0, row=1, col=1)
- for packet in packets0:
- fig.add_trace(packet, row=1, col=1)
+ for trace in all_traces[0]:
+ fig.add_trace(trace, row=1, col=1)
 
  fig.update_layout(
  title=dict(text=args.title, font=dict(size=18, color="#0f172a")),
@@ -2839,42 +2902,24 @@ def render_interactive(
  ),
  )
 
- frames_plotly = []
- for frame in frames:
- edge_trace, additional_edges, highlight_trace, node_trace, id_table_trace, conn_table_trace, packet_traces = build_frame_traces(
- graph,
- layout,
- frame,
- max_edges,
- edge_percentile,
- args.table_limit,
- connection_limit,
- performance_mode,
- )
- # Calculate trace indices: 
- # - Main edge trace = 0
- # - Additional edge traces = 1 to len(additional_edges)
- # - Highlight trace = len(additional_edges) + 1
- # - Node trace = len(additional_edges) + 2
- # - Packets start after that
- num_additional_edges = len(additional_edges)
- trace_indices = [0] + list(range(1, 1 + num_additional_edges)) + [1 + num_additional_edges, 2 + num_additional_edges] + list(range(3 + num_additional_edges, 3 + num_additional_edges + len(packet_traces)))
- frames_plotly.append(
- go.Frame(
- data=[edge_trace] + additional_edges + [highlight_trace, node_trace] + packet_traces,
- traces=trace_indices,
- name=frame["frame_id"],
- )
- )
+ # Trace slots: weak/medium/strong edges, highlight, node trace, then packets
+ trace_indices = list(range(len(all_traces[0])))
+ deltas = frame_deltas([[trace.to_plotly_json() for trace in traces] for traces in all_traces])
+ plot_frames = [
+ {"name": frame["frame_id"], "data": delta, "traces": trace_indices}
+ for frame, delta in zip(frames, deltas)
+ ]
 
- fig.frames = frames_plotly
+ # In chunked mode the deltas are written to per-frame files instead of the figure
+ if not args.frame_chunks:
+ fig.frames = [go.Frame(**plot_frame) for plot_frame in plot_frames]
  fig.update_layout(
  updatemenus=[],
  sliders=[],
  )
 
  ui_frames = build_ui_frames(frames, args.table_limit, args.connection_limit)
- return fig, ui_frames, global_stats, summary_text
+ return fig, ui_frames, global_stats, summary_text, plot_frames
 
 def parse_args() -> argparse.Namespace:
  parser = argparse.ArgumentParser(description="Neuraxon 3D Visualizer")
@@ -2902,6 +2947,30 @@ def parse_args() -> argparse.Namespace:
  action="store_true",
  help="Render full-fidelity visualization (heavier on GPU/CPU)",
  )
+ parser.add_argument(
+ "--layout-cache-dir",
+ type=Path,
+ default=DEFAULT_LAYOUT_CACHE_DIR,
+ help="Directory for cached 3D layouts (keyed by graph hash + seed)",
+ )
+ parser.add_argument("--no-layout-cache", action="store_true", help="Always recompute the spring layout")
+ parser.add_argument(
+ "--edge-lod",
+ type=float,
+ default=1.0,
+ help="Level of detail for edges (0-1): fraction of selected edges to draw",
+ )
+ parser.add_argument(
+ "--frame-chunks",
+ action="store_true",
+ help="Write frames as lazily-fetched JSON chunks next to the HTML instead of inlining them",
+ )
+ parser.add_argument("--gzip-chunks", action="store_true", help="Gzip frame chunks (decoded in the browser)")
+ parser.add_argument(
+ "--pack-arrays",
+ action="store_true",
+ help="Store float arrays in frame chunks as base64 typed arrays (needs plotly.js >= 2.28)",
+ )
  return parser.parse_args()
 
 def main() -> None:
@@ -2909,10 +2978,15 @@ def main() -> None:
  payload = load_payload(args.network_json)
  metadata = payload.get("metadata", {})
  graph = build_graph(payload)
- layout = compute_layout(graph, args.seed)
+ layout = compute_layout(graph, args.seed, None if args.no_layout_cache else args.layout_cache_dir)
  frames = prepare_frames(metadata, metadata.get("neuron_annotations", {}))
- fig, ui_frames, stats_meta, summary_text = render_interactive(graph, layout, frames, payload, args)
+ fig, ui_frames, stats_meta, summary_text, plot_frames = render_interactive(graph, layout, frames, payload, args)
  args.output_html.parent.mkdir(parents=True, exist_ok=True)
+ chunk_config = None
+ if args.frame_chunks:
+ chunk_dir = args.output_html.parent / f"{args.output_html.stem}_frames"
+ chunk_config = write_frame_chunks(chunk_dir, ui_frames, plot_frames, args.gzip_chunks, args.pack_arrays)
+ print(f"Wrote {chunk_config['count']} frame chunks ({chunk_config['bytes'] / 1e6:.1f} MB) to {chunk_dir}")
  plot_html = fig.to_html(
  include_plotlyjs="cdn",
  full_html=False,
@@ -2934,6 +3008,8 @@ def main() -> None:
  summary_text,
  performance_mode,
  args.table_batch,
+ chunk_config,
+ plot_frames,
  )
  with args.output_html.open("w", encoding="utf-8") as f:
  f.write(full_html)
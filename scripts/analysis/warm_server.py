@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Warm analysis server: preload once, run many analysis scripts.
+
+Every analysis script pays for importing numpy/pandas/scipy/sklearn/plotly and
+re-reading the Anna matrix and the layer corpora before it does any work. The
+server does that once and then runs scripts in forked children, so each run
+starts with everything already in memory:
+
+- heavy modules are imported up front (missing ones are skipped),
+- the Anna matrix is loaded once; `load_anna_matrix()`, `pd.read_excel(...,
+  header=None)` and `openpyxl.load_workbook(..., data_only=True)` on the matrix
+  file are answered from memory,
+- the layer/mapping JSON corpora are parsed once; `json.load()` on one of those
+  files returns the preloaded object (first call per run, and only while the
+  file is unchanged on disk).
+
+Each request runs in its own fork (`runpy`, `__name__ == "__main__"`), so
+scripts cannot affect each other or the server. stdout/stderr are streamed
+back to the client as they are written. The script file itself is read fresh
+on every run, but project modules imported by the server (analysis.utils, …)
+are not; the server warns when one of them changed and should be restarted.
+
+Requires fork and Unix sockets (Linux/macOS).
+
+Usage:
+    python3 scripts/analysis/warm_server.py serve [--no-data] &
+    python3 scripts/analysis/warm_server.py run scripts/analysis/pattern_discovery_engine.py
+    python3 scripts/analysis/warm_server.py run -m analysis.21_base26_identity_extraction
+    python3 scripts/analysis/warm_server.py batch --jobs 4 scripts/analysis/a.py scripts/analysis/b.py
+    python3 scripts/analysis/warm_server.py ping | stop
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import runpy
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+DEFAULT_SOCKET = Path(
+    os.environ.get("ANALYSIS_SERVER_SOCKET", Path(tempfile.gettempdir()) / f"qubic-analysis-{os.getuid()}.sock")
+)
+
+HEAVY_MODULES = [
+    "numpy",
+    "pandas",
+    "scipy",
+    "scipy.stats",
+    "sklearn",
+    "openpyxl",
+    "plotly.graph_objects",
+    "networkx",
+    "matplotlib.pyplot",
+    "analysis.utils.data_loader",
+    "analysis.utils.identity_tools",
+    "qubipy.crypto.utils",
+]
+
+MATRIX_FILE = project_root / "data" / "anna-matrix" / "Anna_Matrix.xlsx"
+CORPUS_FILES = [
+    project_root / "outputs" / "derived" / "layer2_derivation_complete.json",
+    project_root / "outputs" / "derived" / "layer3_derivation_complete.json",
+    project_root / "outputs" / "derived" / "complete_24846_seeds_to_real_ids_mapping.json",
+    project_root / "outputs" / "analysis" / "complete_mapping_database.json",
+]
+
+# Last line of every response: EXIT_MARKER + exit code
+EXIT_MARKER = "\x00warm-server-exit "
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+class WarmCache:
+    """Objects loaded in the server, handed to forked runs while the file is unchanged."""
+
+    def __init__(self) -> None:
+        self.entries: Dict[Tuple[str, str], Tuple[Tuple[int, int], Any]] = {}
+        self.used: set = set()
+
+    def put(self, kind: str, path: Path, value: Any) -> None:
+        stamp = _stamp(path)
+        if stamp is not None:
+            self.entries[(kind, os.path.realpath(path))] = (stamp, value)
+
+    def take(self, kind: str, path: Any, reusable: bool = False) -> Any:
+        """Preloaded value or None. Non-reusable values are handed out once per run."""
+        if not isinstance(path, (str, os.PathLike)):
+            return None
+        key = (kind, os.path.realpath(path))
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != _stamp(Path(path)) or (not reusable and key in self.used):
+            return None
+        self.used.add(key)
+        return entry[1]
+
+CACHE = WarmCache()
+
+def preload_modules(names: Sequence[str] = HEAVY_MODULES) -> List[str]:
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    loaded = []
+    for name in names:
+        try:
+            __import__(name)
+            loaded.append(name)
+        except Exception:
+            pass
+    return loaded
+
+def preload_data(corpus_files: Optional[Sequence[Path]] = None) -> List[str]:
+    """Load the matrix and corpora into CACHE and route the loaders through it."""
+    loaded = []
+    data_loader = sys.modules.get("analysis.utils.data_loader")
+    if data_loader is not None and MATRIX_FILE.exists():
+        payload = data_loader.load_anna_matrix()
+        CACHE.put("matrix", MATRIX_FILE, payload)
+        real_load_matrix = data_loader.load_anna_matrix
+
+        def load_anna_matrix(candidate_paths=None):
+            cached = CACHE.take("matrix", MATRIX_FILE, reusable=True) if candidate_paths is None else None
+            if cached is None:
+                return real_load_matrix(candidate_paths)
+            return type(cached)(matrix=cached.matrix.copy(), source_path=cached.source_path, loaded_at=cached.loaded_at)
+
+        data_loader.load_anna_matrix = load_anna_matrix
+        loaded.append(os.path.relpath(MATRIX_FILE, project_root))
+
+    pd = sys.modules.get("pandas")
+    if pd is not None and MATRIX_FILE.exists():
+        CACHE.put("read_excel", MATRIX_FILE, pd.read_excel(MATRIX_FILE, header=None))
+        real_read_excel = pd.read_excel
+
+        def read_excel(io, *args, **kwargs):
+            if not args and kwargs == {"header": None}:
+                cached = CACHE.take("read_excel", io, reusable=True)
+                if cached is not None:
+                    return cached.copy()
+            return real_read_excel(io, *args, **kwargs)
+
+        pd.read_excel = read_excel
+
+    openpyxl = sys.modules.get("openpyxl")
+    if openpyxl is not None and MATRIX_FILE.exists():
+        CACHE.put("workbook", MATRIX_FILE, openpyxl.load_workbook(MATRIX_FILE, data_only=True))
+        real_load_workbook = openpyxl.load_workbook
+
+        def load_workbook(filename, *args, **kwargs):
+            if not args and kwargs == {"data_only": True}:
+                cached = CACHE.take("workbook", filename)
+                if cached is not None:
+                    return cached
+            return real_load_workbook(filename, *args, **kwargs)
+
+        openpyxl.load_workbook = load_workbook
+
+    for path in CORPUS_FILES if corpus_files is None else corpus_files:
+        if path.exists():
+            with path.open("r", encoding="utf-8") as fh:
+                CACHE.put("json", path, json.load(fh))
+            loaded.append(os.path.relpath(path, project_root))
+    real_json_load = json.load
+
+    def json_load(fp, *args, **kwargs):
+        if not args and not kwargs:
+            cached = CACHE.take("json", getattr(fp, "name", None))
+            if cached is not None:
+                return cached
+        return real_json_load(fp, *args, **kwargs)
+
+    json.load = json_load
+    return loaded
+
+def _project_module_stamps() -> Dict[str, Optional[Tuple[int, int]]]:
+    stamps = {}
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and str(path).startswith(str(project_root)) and "site-packages" not in str(path):
+            stamps[path] = _stamp(Path(path))
+    return stamps
+
+def _run_child(conn: socket.socket, request: Dict[str, Any]) -> None:
+    """Runs in the forked child: execute one script with output on `conn`."""
+    code = 0
+    try:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        for fd in (1, 2):
+            os.dup2(conn.fileno(), fd)
+        sys.stdout.reconfigure(line_buffering=True)
+        sys.stderr.reconfigure(line_buffering=True)
+        os.chdir(request.get("cwd") or project_root)
+        os.environ.update(request.get("env") or {})
+        target = request["target"]
+        sys.argv = [target] + list(request.get("args") or [])
+        if request.get("module"):
+            runpy.run_module(target, run_name="__main__", alter_sys=True)
+        else:
+            sys.path.insert(0, str(Path(target).resolve().parent))
+            runpy.run_path(target, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            code = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            for stream in (sys.stdout, sys.stderr):
+                try:
+                    stream.flush()
+                except (ValueError, OSError):
+                    pass  # closed by the script
+            conn.sendall(f"\n{EXIT_MARKER}{code}\n".encode())
+        finally:
+            os._exit(0)
+
+def _reply(conn: socket.socket, text: str, code: int = 0) -> None:
+    """Server-side response, framed like a child's output."""
+    conn.sendall(f"{text}\n\n{EXIT_MARKER}{code}\n".encode())
+
+def _read_request(conn: socket.socket) -> Dict[str, Any]:
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return json.loads(data.decode("utf-8"))
+
+def serve(socket_path: Path = DEFAULT_SOCKET, load_data: bool = True, extra_corpora: Sequence[Path] = ()) -> None:
+    modules = preload_modules()
+    corpora = preload_data(CORPUS_FILES + list(extra_corpora)) if load_data else []
+    stamps = _project_module_stamps()
+    started = time.time()
+
+    if socket_path.exists():
+        socket_path.unlink()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    server.listen(64)
+    server.settimeout(1.0)
+    print(f"[warm-server] listening on {socket_path}", flush=True)
+    print(f"[warm-server] modules: {', '.join(modules) or '-'}", flush=True)
+    print(f"[warm-server] data: {', '.join(corpora) or '-'}", flush=True)
+
+    children = 0
+    try:
+        while True:
+            # Reap finished runs
+            while children:
+                try:
+                    pid, _ = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    children = 0
+                    break
+                if pid == 0:
+                    break
+                children -= 1
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            with conn:
+                conn.settimeout(None)
+                try:
+                    request = _read_request(conn)
+                except ValueError as e:
+                    _reply(conn, f"invalid request: {e}", 2)
+                    continue
+                cmd = request.get("cmd", "run")
+                if cmd == "ping":
+                    info = {"pid": os.getpid(), "uptime": round(time.time() - started, 1), "modules": modules,
+                            "data": corpora, "running": children}
+                    _reply(conn, json.dumps(info))
+                    continue
+                if cmd == "stop":
+                    _reply(conn, "[warm-server] stopping")
+                    break
+                stale = [p for p, stamp in stamps.items() if _stamp(Path(p)) != stamp]
+                if stale:
+                    names = ", ".join(str(Path(p).relative_to(project_root)) for p in stale[:5])
+                    conn.sendall(f"[warm-server] warning: {names} changed since start; restart the server\n".encode())
+                sys.stdout.flush()
+                sys.stderr.flush()
+                pid = os.fork()
+                if pid == 0:
+                    server.close()
+                    _run_child(conn, request)
+                children += 1
+    finally:
+        server.close()
+        if socket_path.exists():
+            socket_path.unlink()
+
+def is_running(socket_path: Path = DEFAULT_SOCKET) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(socket_path))
+            sock.sendall(b'{"cmd": "ping"}\n')
+            return bool(sock.recv(1))
+    except OSError:
+        return False
+
+def request(
+    payload: Dict[str, Any],
+    socket_path: Path = DEFAULT_SOCKET,
+    write: Callable[[str], None] = sys.stdout.write,
+) -> int:
+    """Send one request and stream its output to `write`; returns the exit code."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall((json.dumps(payload) + "\n").encode())
+        pending = ""
+        code = None
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            pending += chunk.decode("utf-8", errors="replace")
+            if "\x00" not in pending:
+                write(pending)
+                pending = ""
+                continue
+            head, _, tail = pending.partition(EXIT_MARKER)
+            if tail.endswith("\n"):
+                # The child adds a newline before the marker so it starts a line
+                write(head[:-1] if head.endswith("\n") else head)
+                code = int(tail.strip())
+                break
+        if code is None:
+            write(pending)
+            return 1  # the run died without reporting (crash/kill)
+        return code
+
+def run_script(
+    target: str,
+    args: Sequence[str] = (),
+    module: bool = False,
+    env: Optional[Dict[str, str]] = None,
+    socket_path: Path = DEFAULT_SOCKET,
+    write: Callable[[str], None] = sys.stdout.write,
+    cwd: Optional[Path] = None,
+) -> int:
+    """Run a script (path) or module (`module=True`) on the server."""
+    payload = {"cmd": "run", "target": target, "args": list(args), "module": module, "env": env or {},
+               "cwd": str(cwd or os.getcwd())}
+    return request(payload, socket_path, write)
+
+def run_batch(targets: Sequence[str], jobs: int = 4, socket_path: Path = DEFAULT_SOCKET) -> List[Tuple[str, int]]:
+    """Run several scripts concurrently; output lines are prefixed with the script name."""
+    lock = threading.Lock()
+
+    def one(target: str) -> int:
+        name = Path(target).stem
+        buffer = [""]
+
+        def write(text: str) -> None:
+            buffer[0] += text
+            *lines, buffer[0] = buffer[0].split("\n")
+            with lock:
+                for line in lines:
+                    print(f"[{name}] {line}", flush=True)
+
+        code = run_script(target, socket_path=socket_path, write=write)
+        if buffer[0]:
+            write("\n")
+        return code
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(zip(targets, pool.map(one, targets)))
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Warm analysis server")
+    parser.add_argument("--socket", type=Path, default=DEFAULT_SOCKET, help=f"Unix socket (default: {DEFAULT_SOCKET})")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    serve_parser = sub.add_parser("serve", help="Start the server (foreground)")
+    serve_parser.add_argument("--no-data", action="store_true", help="Only preload modules, not the matrix/corpora")
+    serve_parser.add_argument("--corpus", type=Path, action="append", default=[], help="Additional JSON file to preload")
+    run_parser = sub.add_parser("run", help="Run one script: run SCRIPT [ARGS...] | run -m MODULE [ARGS...]")
+    run_parser.add_argument("-m", dest="module", metavar="MODULE", help="Run a module instead of a script")
+    run_parser.add_argument("command", nargs=argparse.REMAINDER)
+    batch_parser = sub.add_parser("batch", help="Run several scripts concurrently")
+    batch_parser.add_argument("--jobs", type=int, default=4)
+    batch_parser.add_argument("targets", nargs="+")
+    sub.add_parser("ping", help="Show server status")
+    sub.add_parser("stop", help="Stop the server")
+    args = parser.parse_args()
+
+    if args.cmd == "serve":
+        serve(args.socket, load_data=not args.no_data, extra_corpora=[p.resolve() for p in args.corpus])
+        return 0
+    if not is_running(args.socket):
+        print(f"No warm server on {args.socket}; start one with: python3 {Path(__file__).name} serve", file=sys.stderr)
+        return 2
+    if args.cmd == "run":
+        if args.module:
+            return run_script(args.module, args.command, module=True, socket_path=args.socket)
+        if not args.command:
+            parser.error("run needs a script path or -m MODULE")
+        return run_script(args.command[0], args.command[1:], socket_path=args.socket)
+    if args.cmd == "batch":
+        codes = run_batch(args.targets, args.jobs, args.socket)
+        failed = [target for target, code in codes if code != 0]
+        print(f"{len(codes) - len(failed)}/{len(codes)} succeeded" + (f"; failed: {', '.join(failed)}" if failed else ""))
+        return 1 if failed else 0
+    return request({"cmd": args.cmd}, args.socket)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -73,8 +73,24 @@ print(identity)
  except Exception as e:
  return None
 
+def _char_array(texts: List[str], width: int, right: bool = False):
+ """(n, width) Codepoint-Array, links- (oder rechts-) bündig mit NUL aufgefüllt."""
+ import numpy as np
+ 
+ padded = "".join(text.rjust(width, "\0") if right else text.ljust(width, "\0") for text in texts)
+ return np.frombuffer(padded.encode("utf-32-le"), dtype=np.uint32).reshape(len(texts), width)
+
+def _leading_true(mask, limit):
+ """Anzahl führender True-Werte pro Zeile, höchstens `limit`."""
+ import numpy as np
+ 
+ mask = mask & (np.arange(mask.shape[1]) < limit[:, None])
+ return np.where(mask.all(axis=1), mask.shape[1], (~mask).argmax(axis=1))
+
 def analyze_patterns(comparisons: List[Dict]) -> Dict:
- """Analyze Muster in den Seed-Identity-Vergleichen."""
+ """Analyze Muster in den Seed-Identity-Vergleichen (alle Vergleiche auf einmal, spaltenweise)."""
+ import numpy as np
+ 
  patterns = {
  "character_differences": defaultdict(int),
  "position_differences": [],
@@ -83,50 +99,35 @@ def analyze_patterns(comparisons: List[Dict]) -> Dict:
  "seed_identity_overlap": [],
  }
  
- for comp in comparisons:
- seed = comp["seed"]
- documented = comp["documented_identity"]
- derived = comp["derived_identity"]
- 
- if not derived:
- continue
- 
- # Charakter-Unterschiede
- for i, (doc_char, der_char) in enumerate(zip(documented, derived)):
- if doc_char != der_char:
- patterns["character_differences"][i] += 1
- 
- # Position der ersten Differenz
- first_diff = None
- for i, (doc_char, der_char) in enumerate(zip(documented, derived)):
- if doc_char != der_char:
- first_diff = i
- break
- if first_diff is not None:
- patterns["position_differences"].append(first_diff)
- 
- # Gemeinsame Präfix-Länge
- prefix_len = 0
- for i, (doc_char, der_char) in enumerate(zip(documented, derived)):
- if doc_char == der_char:
- prefix_len += 1
- else:
- break
- patterns["common_prefix_length"].append(prefix_len)
+ rows = [comp for comp in comparisons if comp["derived_identity"]]
+ if rows:
+ seeds = [comp["seed"].upper() for comp in rows] # Seeds sind lowercase, Identities uppercase
+ documented = [comp["documented_identity"] for comp in rows]
+ derived = [comp["derived_identity"] for comp in rows]
+ width = max(1, max(len(text) for text in seeds + documented + derived))
+ common = np.minimum([len(text) for text in documented], [len(text) for text in derived])
+ 
+ # Charakter-Unterschiede (Positionen in Reihenfolge ihres ersten Auftretens)
+ in_range = np.arange(width) < common[:, None]
+ diff = (_char_array(documented, width) != _char_array(derived, width)) & in_range
+ counts = diff.sum(axis=0)
+ first_row = diff.argmax(axis=0)
+ for pos in sorted(np.flatnonzero(counts).tolist(), key=lambda pos: (first_row[pos], pos)):
+ patterns["character_differences"][pos] += int(counts[pos])
+ 
+ # Position der ersten Differenz und gemeinsame Präfix-Länge
+ prefix = _leading_true(~diff, common)
+ patterns["position_differences"] = prefix[diff.any(axis=1)].tolist()
+ patterns["common_prefix_length"] = prefix.tolist()
  
  # Gemeinsame Suffix-Länge
- suffix_len = 0
- for i in range(min(len(documented), len(derived))):
- if documented[-(i+1)] == derived[-(i+1)]:
- suffix_len += 1
- else:
- break
- patterns["common_suffix_length"].append(suffix_len)
+ same_from_end = (_char_array(documented, width, right=True) == _char_array(derived, width, right=True))[:, ::-1]
+ patterns["common_suffix_length"] = _leading_true(same_from_end, common).tolist()
  
  # Seed-Identity Overlap
- seed_lower = seed.upper() # Seeds sind lowercase, Identities uppercase
- overlap = sum(1 for s, d in zip(seed_lower, documented) if s == d)
- patterns["seed_identity_overlap"].append(overlap)
+ overlap_len = np.minimum([len(text) for text in seeds], [len(text) for text in documented])
+ same = (_char_array(seeds, width) == _char_array(documented, width)) & (np.arange(width) < overlap_len[:, None])
+ patterns["seed_identity_overlap"] = same.sum(axis=1).tolist()
  
  # Berechne Statistiken
  stats = {
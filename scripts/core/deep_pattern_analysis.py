@@ -12,11 +12,17 @@ Analysiert:
 """
 
 import json
+import math
+import sys
 from pathlib import Path
-from typing import List, Dict, Set
+from typing import Iterable, List, Dict, Set
 from collections import Counter, defaultdict
 import re
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analysis.streaming_stats import Counts, entropy
+
 OUTPUT_DIR = Path(__file__).parent.parent.parent / "outputs" / "derived"
 COMPREHENSIVE_LAYER2 = OUTPUT_DIR / "comprehensive_scan_layer2_derivation.json"
 SYSTEMATIC_DATA = OUTPUT_DIR / "systematic_matrix_extraction_complete.json"
@@ -157,20 +163,24 @@ def analyze_cryptographic_intention(identities: List[str]) -> Dict:
  
  return analysis
 
-def analyze_statistical_anomalies(identities: List[str]) -> Dict:
- """Analyze statistische Anomalien in Zeichen-Verteilungen."""
+def analyze_statistical_anomalies(identities: Iterable[str]) -> Dict:
+ """Analyze statistische Anomalien in Zeichen-Verteilungen (ein Durchlauf, beliebiger Generator)."""
  
  # Erwartete Verteilung (gleichmäßig)
  expected_frequency = 1 / 26 # ~3.85% pro Zeichen
  
- all_chars = "".join(identities)
- char_counts = Counter(all_chars)
- total_chars = len(all_chars)
+ counts = Counts()
+ for identity in identities:
+ counts.update(identity)
+ char_counts = counts.counter
+ total_chars = counts.total
  
  anomalies = {
  "overrepresented": [], # Zeichen die häufiger als erwartet sind
  "underrepresented": [], # Zeichen die seltener als erwartet sind
  "expected_frequency": expected_frequency * 100,
+ "entropy_bits": entropy(char_counts.values()),
+ "max_entropy_bits": math.log2(26),
  "actual_distribution": {},
  }
  
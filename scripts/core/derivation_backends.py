@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Batched seed → identity derivation backends.
+
+Search scripts generate candidates in bulk; deriving them one at a time (and,
+on machines without qubipy, one `docker run` per seed) dominated their runtime.
+Every backend here exposes the same call:
+
+    backend.derive_batch(seeds) -> List[Optional[str]]   # None = invalid/failed
+
+- `QubipyBackend`: in-process qubipy (K12 subseed → private key → FourQ public
+  key → identity), functions resolved once.
+- `PortableBackend`: the same chain in Python (`qubic_crypto`), batched K12
+  with numpy; identical results, no compiled code needed.
+- `PoolBackend`: either chain fanned out over a process pool.
+- `DockerBatchBackend`: one container per *batch* (seeds on stdin, identities
+  on stdout), only when asked for explicitly.
+- `GatewayBackend`: batches streamed to the long-lived gateway container
+  (`derivation_gateway`), started once per session.
+
+"auto" picks qubipy when its native library loads and the portable chain
+otherwise, so no host needs Docker for derivation.
+
+Usage:
+    from scripts.core.derivation_backends import make_backend
+
+    backend = make_backend("auto")
+    identities = backend.derive_batch(["aaaa...", ...])
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from scripts.core.qubic_crypto import SEED_LENGTH, derive_identities, identity_from_seed, is_valid_seed
+
+project_root = Path(__file__).parent.parent.parent
+
+DOCKER_IMAGE = os.environ.get("QUBIC_DOCKER_IMAGE", "qubic-proof")
+
+def qubipy_available() -> bool:
+    """True if qubipy imports and its compiled crypto library loads on this host."""
+    try:
+        _load_qubipy()
+    except (ImportError, OSError):
+        return False
+    return True
+
+def _load_qubipy() -> Dict[str, Callable]:
+    from qubipy.crypto.utils import (
+        get_subseed_from_seed,
+        get_private_key_from_subseed,
+        get_public_key_from_private_key,
+        get_identity_from_public_key,
+    )
+
+    return {
+        "subseed": get_subseed_from_seed,
+        "private_key": get_private_key_from_subseed,
+        "public_key": get_public_key_from_private_key,
+        "identity": get_identity_from_public_key,
+    }
+
+class QubipyBackend:
+    """In-process derivation via qubipy."""
+
+    name = "qubipy"
+
+    def __init__(self) -> None:
+        self._fn = _load_qubipy()
+
+    def derive(self, seed: str) -> Optional[str]:
+        if not is_valid_seed(seed):
+            return None
+        try:
+            subseed = self._fn["subseed"](seed.encode("utf-8"))
+            private_key = self._fn["private_key"](subseed)
+            public_key = self._fn["public_key"](private_key)
+            return self._fn["identity"](public_key)
+        except Exception:
+            return None
+
+    def derive_batch(self, seeds: Sequence[str]) -> List[Optional[str]]:
+        return [self.derive(seed) for seed in seeds]
+
+    def close(self) -> None:
+        pass
+
+class PortableBackend:
+    """Pure-Python derivation (numpy-batched K12 when available)."""
+
+    name = "portable"
+
+    def __init__(self, chunk: int = 4096) -> None:
+        self.chunk = chunk
+
+    def derive(self, seed: str) -> Optional[str]:
+        return identity_from_seed(seed) if is_valid_seed(seed) else None
+
+    def derive_batch(self, seeds: Sequence[str]) -> List[Optional[str]]:
+        seeds = list(seeds)
+        results: List[Optional[str]] = []
+        for start in range(0, len(seeds), self.chunk):
+            results.extend(derive_identities(seeds[start : start + self.chunk]))
+        return results
+
+    def close(self) -> None:
+        pass
+
+ENGINES = {"qubipy": QubipyBackend, "portable": PortableBackend}
+
+_WORKER_BACKEND: Optional[Union[QubipyBackend, PortableBackend]] = None
+
+def _worker_derive(seeds: List[str], engine: str = "qubipy") -> List[Optional[str]]:
+    global _WORKER_BACKEND
+    if _WORKER_BACKEND is None:
+        _WORKER_BACKEND = ENGINES[engine]()
+    return _WORKER_BACKEND.derive_batch(seeds)
+
+class PoolBackend:
+    """qubipy or portable derivation spread over worker processes (one backend per worker)."""
+
+    name = "pool"
+
+    def __init__(self, workers: Optional[int] = None, chunk: int = 256, engine: str = "qubipy") -> None:
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown derivation engine: {engine}")
+        if engine == "qubipy":
+            _load_qubipy()  # fail fast if qubipy is missing
+        self.engine = engine
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk = chunk
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    def derive_batch(self, seeds: Sequence[str]) -> List[Optional[str]]:
+        seeds = list(seeds)
+        parts = [seeds[i : i + self.chunk] for i in range(0, len(seeds), self.chunk)]
+        results: List[Optional[str]] = []
+        for part in self._pool.map(partial(_worker_derive, engine=self.engine), parts):
+            results.extend(part)
+        return results
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+# Runs inside the container: seeds on stdin (one per line), JSON list on stdout
+_DOCKER_SCRIPT = """
+import json, sys
+from qubipy.crypto.utils import (
+    get_subseed_from_seed, get_private_key_from_subseed,
+    get_public_key_from_private_key, get_identity_from_public_key,
+)
+out = []
+for line in sys.stdin:
+    seed = line.strip()
+    try:
+        pk = get_public_key_from_private_key(get_private_key_from_subseed(get_subseed_from_seed(seed.encode())))
+        out.append(get_identity_from_public_key(pk))
+    except Exception:
+        out.append(None)
+print(json.dumps(out))
+"""
+
+class DockerBatchBackend:
+    """One `docker run` per batch instead of one per seed."""
+
+    name = "docker"
+
+    def __init__(self, image: str = DOCKER_IMAGE, timeout: int = 600) -> None:
+        self.image = image
+        self.timeout = timeout
+
+    def derive_batch(self, seeds: Sequence[str]) -> List[Optional[str]]:
+        seeds = list(seeds)
+        valid = [idx for idx, seed in enumerate(seeds) if is_valid_seed(seed)]
+        results: List[Optional[str]] = [None] * len(seeds)
+        if not valid:
+            return results
+        proc = subprocess.run(
+            ["docker", "run", "--rm", "-i", self.image, "python3", "-c", _DOCKER_SCRIPT],
+            input="\n".join(seeds[idx] for idx in valid) + "\n",
+            capture_output=True,
+            text=True,
+            timeout=self.timeout,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip() or "Docker execution failed")
+        for idx, identity in zip(valid, json.loads(proc.stdout.strip().splitlines()[-1])):
+            results[idx] = identity if identity and len(identity) == 60 else None
+        return results
+
+    def close(self) -> None:
+        pass
+
+class GatewayBackend:
+    """Derivation in the long-lived qubipy container (started on first use, left running)."""
+
+    name = "gateway"
+
+    def __init__(self, address: Optional[str] = None) -> None:
+        from scripts.core.derivation_gateway import DEFAULT_ADDRESS, ensure_gateway
+
+        self._address = address or DEFAULT_ADDRESS
+        ensure_gateway(self._address)
+
+    @property
+    def _client(self):
+        from scripts.core.derivation_gateway import ensure_gateway
+
+        return ensure_gateway(self._address)  # reconnects after a transport failure
+
+    def derive(self, seed: str) -> Optional[str]:
+        return self.derive_batch([seed])[0]
+
+    def derive_batch(self, seeds: Sequence[str]) -> List[Optional[str]]:
+        seeds = list(seeds)
+        valid = [idx for idx, seed in enumerate(seeds) if is_valid_seed(seed)]
+        results: List[Optional[str]] = [None] * len(seeds)
+        for idx, identity in zip(valid, self._client.derive_batch([seeds[idx] for idx in valid])):
+            results[idx] = identity if identity and len(identity) == 60 else None
+        return results
+
+    def close(self) -> None:
+        pass  # the container outlives the script; `derivation_gateway.py stop` ends it
+
+def make_backend(name: str = "auto", workers: Optional[int] = None):
+    """Create a backend by name: auto | qubipy | portable | pool | docker | gateway.
+
+    "auto" (and "pool") use qubipy's native code when it loads, otherwise the
+    portable chain; with `workers > 1` "auto" spreads it over a process pool.
+    """
+    if name == "qubipy":
+        return QubipyBackend()
+    if name == "portable":
+        return PortableBackend()
+    if name == "docker":
+        return DockerBatchBackend()
+    if name == "gateway":
+        return GatewayBackend()
+    if name not in ("auto", "pool"):
+        raise ValueError(f"Unknown derivation backend: {name}")
+    engine = "qubipy" if qubipy_available() else "portable"
+    if name == "pool" or (workers or 0) > 1:
+        return PoolBackend(workers, engine=engine)
+    return ENGINES[engine]()
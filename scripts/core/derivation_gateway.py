@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Derivation/RPC gateway: one long-lived qubipy container per session.
+
+Scripts that need qubipy on a host without it used to pay a `docker run`
+(container start, often `pip install qubipy`) per seed or per batch. The
+gateway runs inside a single container started from Dockerfile.qubipy and
+stays up; host scripts talk to it over localhost TCP (or a Unix socket when
+the server runs on the host):
+
+- requests are one JSON object per line, several per connection,
+- `derive` takes a batch of seeds and streams the identities back chunk by
+  chunk (`{"offset": n, "identities": [...]}` lines, then `{"done": ...}`),
+- `balance` streams one `get_balance` result per identity (qubipy RPC in
+  the container), `tick` returns `get_latest_tick`, `ping` / `stop` as in
+  warm_server.
+
+The container is started on first use (`ensure_gateway()`, or `start`) and
+reused by every later call and script until `stop`.
+
+Usage:
+    python3 scripts/core/derivation_gateway.py start          # build image if needed, start container
+    python3 scripts/core/derivation_gateway.py derive SEED... # or seeds on stdin
+    python3 scripts/core/derivation_gateway.py balance IDENTITY...
+    python3 scripts/core/derivation_gateway.py ping | tick | stop
+
+    from scripts.core.derivation_gateway import ensure_gateway
+
+    gateway = ensure_gateway()
+    identities = gateway.derive_batch(seeds)
+    gateway.get_balance(identity)     # same result as QubiPy_RPC().get_balance
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.derivation_backends import DOCKER_IMAGE, make_backend
+
+DEFAULT_ADDRESS = os.environ.get("QUBIC_GATEWAY_ADDRESS", "127.0.0.1:8347")
+CONTAINER_NAME = os.environ.get("QUBIC_GATEWAY_CONTAINER", f"qubic-gateway-{os.getuid()}")
+DOCKERFILE = project_root / "Dockerfile.qubipy"
+CHUNK = 512  # seeds per streamed response line
+
+Address = Union[Tuple[str, int], str]
+
+def parse_address(address: str) -> Address:
+    """"host:port" -> (host, port); anything else is a Unix socket path."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return host or "127.0.0.1", int(port)
+    return address
+
+# --- server (runs in the container) ----------------------------------------------
+
+class _Handler(socketserver.StreamRequestHandler):
+    def _send(self, message: Dict[str, Any]) -> None:
+        self.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                self._send({"error": f"invalid request: {e}"})
+                continue
+            cmd = request.get("cmd")
+            try:
+                if cmd == "derive":
+                    self._derive(request.get("seeds") or [], int(request.get("chunk") or CHUNK))
+                elif cmd == "balance":
+                    self._balance(request.get("identities") or [])
+                elif cmd == "tick":
+                    self._send({"tick": self.server.rpc().get_latest_tick(), "done": True})
+                elif cmd == "ping":
+                    self._send({**self.server.info(), "done": True})
+                elif cmd == "stop":
+                    self._send({"done": True, "stopping": True})
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    return
+                else:
+                    self._send({"error": f"unknown command: {cmd}"})
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            except Exception as e:
+                self._send({"error": f"{type(e).__name__}: {e}"})
+
+    def _derive(self, seeds: List[str], chunk: int) -> None:
+        backend = self.server.backend
+        for offset in range(0, len(seeds), chunk):
+            identities = backend.derive_batch(seeds[offset:offset + chunk])
+            self._send({"offset": offset, "identities": identities})
+        self.server.count("derived", len(seeds))
+        self._send({"done": True, "count": len(seeds)})
+
+    def _balance(self, identities: List[str]) -> None:
+        rpc = self.server.rpc()
+        for identity in identities:
+            try:
+                self._send({"identity": identity, "balance": rpc.get_balance(identity)})
+            except Exception as e:
+                self._send({"identity": identity, "error": str(e)})
+        self.server.count("balances", len(identities))
+        self._send({"done": True, "count": len(identities)})
+
+class _GatewayServerMixin:
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def setup_gateway(self, engine: str) -> None:
+        self.backend = make_backend(engine)
+        self.started = time.time()
+        self.counters = {"derived": 0, "balances": 0}
+        self._rpc = None
+        self._lock = threading.Lock()
+
+    def rpc(self):
+        with self._lock:
+            if self._rpc is None:
+                from qubipy.rpc import rpc_client
+
+                self._rpc = rpc_client.QubiPy_RPC()
+            return self._rpc
+
+    def count(self, name: str, amount: int) -> None:
+        with self._lock:
+            self.counters[name] += amount
+
+    def info(self) -> Dict[str, Any]:
+        return {"pid": os.getpid(), "uptime": round(time.time() - self.started, 1),
+                "engine": self.backend.name, **self.counters}
+
+class _TCPServer(_GatewayServerMixin, socketserver.ThreadingTCPServer):
+    pass
+
+class _UnixServer(_GatewayServerMixin, socketserver.ThreadingUnixStreamServer):
+    pass
+
+def serve(address: str = DEFAULT_ADDRESS, engine: str = "auto") -> None:
+    """Run the gateway in the foreground (inside the container: `--address 0.0.0.0:PORT`)."""
+    target = parse_address(address)
+    if isinstance(target, str):
+        Path(target).unlink(missing_ok=True)
+        server = _UnixServer(target, _Handler)
+    else:
+        server = _TCPServer(target, _Handler)
+    server.setup_gateway(engine)
+    print(f"[gateway] listening on {address} (engine: {server.backend.name})", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if isinstance(target, str):
+            Path(target).unlink(missing_ok=True)
+
+# --- client ----------------------------------------------------------------------
+
+class GatewayError(RuntimeError):
+    pass
+
+class GatewayClient:
+    """Persistent connection to a running gateway.
+
+    Transport and decode failures are raised as GatewayError and mark the
+    client `broken` (the stream may be out of step with the server);
+    `ensure_gateway` then replaces it.
+    """
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: float = 600) -> None:
+        self.address = address
+        target = parse_address(address)
+        family = socket.AF_UNIX if isinstance(target, str) else socket.AF_INET
+        self.broken = False
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        try:
+            self._sock.connect(target)
+        except OSError:
+            self._sock.close()
+            raise
+        self._reader = self._sock.makefile("rb")
+        self._lock = threading.Lock()
+
+    def _request(self, payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Send one request, yield its response lines up to and including the final one."""
+        with self._lock:
+            if self.broken:
+                raise GatewayError(f"connection to gateway at {self.address} is broken")
+            finished = False
+            try:
+                self._sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+                while True:
+                    line = self._reader.readline()
+                    if not line:
+                        raise GatewayError(f"gateway at {self.address} closed the connection")
+                    message = json.loads(line)
+                    if "error" in message and "identity" not in message:
+                        finished = True  # the server's error line ends the request
+                        raise GatewayError(message["error"])
+                    finished = bool(message.get("done"))
+                    yield message
+                    if finished:
+                        return
+            except (OSError, ValueError) as e:  # socket.timeout, ConnectionResetError, bad JSON
+                raise GatewayError(f"gateway at {self.address}: {type(e).__name__}: {e}") from e
+            finally:
+                if not finished:  # failed or abandoned mid-response
+                    self.broken = True
+                    self.close()
+
+    def ping(self) -> Dict[str, Any]:
+        return list(self._request({"cmd": "ping"}))[-1]
+
+    def derive_stream(self, seeds: Sequence[str], chunk: int = CHUNK) -> Iterator[Tuple[int, List[Optional[str]]]]:
+        """(offset, identities) per chunk as the gateway produces them."""
+        for message in self._request({"cmd": "derive", "seeds": list(seeds), "chunk": chunk}):
+            if not message.get("done"):
+                yield message["offset"], message["identities"]
+
+    def derive_batch(self, seeds: Sequence[str]) -> List[Optional[str]]:
+        results: List[Optional[str]] = [None] * len(seeds)
+        for offset, identities in self.derive_stream(seeds):
+            results[offset:offset + len(identities)] = identities
+        return results
+
+    def derive(self, seed: str) -> Optional[str]:
+        return self.derive_batch([seed])[0]
+
+    def balance_stream(self, identities: Sequence[str]) -> Iterator[Dict[str, Any]]:
+        """{"identity", "balance"} (qubipy's get_balance result) or {"identity", "error"} per identity."""
+        for message in self._request({"cmd": "balance", "identities": list(identities)}):
+            if not message.get("done"):
+                yield message
+
+    def get_balance(self, identity: str) -> Optional[Dict[str, Any]]:
+        """Drop-in for `QubiPy_RPC().get_balance` (raises GatewayError on RPC errors)."""
+        message = list(self.balance_stream([identity]))[0]
+        if "error" in message:
+            raise GatewayError(message["error"])
+        return message["balance"]
+
+    def get_latest_tick(self) -> int:
+        return list(self._request({"cmd": "tick"}))[-1]["tick"]
+
+    def stop(self) -> None:
+        list(self._request({"cmd": "stop"}))
+
+    def close(self) -> None:
+        try:
+            self._reader.close()
+        finally:
+            self._sock.close()
+
+def connect(address: str = DEFAULT_ADDRESS, timeout: float = 600) -> Optional[GatewayClient]:
+    """Client for a gateway that answers ping at `address`, else None."""
+    try:
+        client = GatewayClient(address, timeout)
+    except OSError:
+        return None
+    try:
+        client.ping()
+    except GatewayError:
+        client.close()
+        return None
+    return client
+
+# --- container -------------------------------------------------------------------
+
+class GatewayContainer:
+    """The long-lived qubipy container running `serve`."""
+
+    def __init__(self, image: str = DOCKER_IMAGE, address: str = DEFAULT_ADDRESS, name: str = CONTAINER_NAME) -> None:
+        target = parse_address(address)
+        if isinstance(target, str):
+            raise ValueError("The container gateway needs a host:port address")
+        self.image = image
+        self.address = address
+        self.host, self.port = target
+        self.name = name
+
+    def _docker(self, *args: str, timeout: int = 60) -> subprocess.CompletedProcess:
+        try:
+            return subprocess.run(["docker", *args], capture_output=True, text=True, timeout=timeout)
+        except FileNotFoundError:
+            raise GatewayError("docker not found - install qubipy locally or use the portable backend") from None
+
+    def image_exists(self) -> bool:
+        return self._docker("image", "inspect", self.image).returncode == 0
+
+    def build(self) -> None:
+        proc = self._docker("build", "-f", str(DOCKERFILE), "-t", self.image, str(project_root), timeout=1800)
+        if proc.returncode != 0:
+            raise GatewayError(f"docker build failed: {proc.stderr.strip()[-500:]}")
+
+    def running(self) -> bool:
+        proc = self._docker("ps", "-q", "--filter", f"name=^{self.name}$")
+        return bool(proc.stdout.strip())
+
+    def start(self, wait: float = 60) -> GatewayClient:
+        """Start the container unless it already runs; returns a connected client."""
+        client = connect(self.address)
+        if client is not None:
+            return client
+        if not self.running():
+            if not self.image_exists():
+                self.build()
+            self._docker("rm", "-f", self.name)
+            proc = self._docker(
+                "run", "-d", "--rm", "--name", self.name,
+                "-p", f"{self.host}:{self.port}:{self.port}",
+                "-v", f"{project_root}:/workspace", "-w", "/workspace", "-e", "PYTHONPATH=/workspace",
+                self.image, "python3", "scripts/core/derivation_gateway.py",
+                "--address", f"0.0.0.0:{self.port}", "serve", "--engine", "qubipy",
+            )
+            if proc.returncode != 0:
+                raise GatewayError(f"docker run failed: {proc.stderr.strip()}")
+        deadline = time.time() + wait
+        while time.time() < deadline:
+            client = connect(self.address)
+            if client is not None:
+                return client
+            time.sleep(0.5)
+        logs = self._docker("logs", "--tail", "20", self.name).stdout
+        raise GatewayError(f"gateway did not answer on {self.address} within {wait:.0f}s\n{logs}")
+
+    def stop(self) -> None:
+        client = connect(self.address, timeout=10)
+        if client is not None:
+            try:
+                client.stop()
+            finally:
+                client.close()
+        if self.running():
+            self._docker("stop", self.name)
+
+def stop_gateway(address: str = DEFAULT_ADDRESS, image: str = DOCKER_IMAGE) -> None:
+    """Stop the gateway at `address`: a host server over its socket, else the container."""
+    if not isinstance(parse_address(address), str):
+        GatewayContainer(image, address).stop()
+        return
+    client = connect(address, timeout=10)
+    if client is None:
+        raise GatewayError(f"no gateway listening on {address}")
+    try:
+        client.stop()
+    finally:
+        client.close()
+
+_CLIENT: Optional[GatewayClient] = None
+
+def reset_gateway() -> None:
+    """Drop the shared client; the next `ensure_gateway` reconnects."""
+    global _CLIENT
+    client, _CLIENT = _CLIENT, None
+    if client is not None:
+        client.close()
+
+def ensure_gateway(address: str = DEFAULT_ADDRESS, image: str = DOCKER_IMAGE) -> GatewayClient:
+    """Shared client for this process; starts the container on first use.
+
+    A client whose connection failed (or one for another address) is replaced:
+    reconnect if the gateway still answers, else restart the container. A Unix
+    socket gateway runs on the host (`serve`), so nothing is started for it.
+    """
+    global _CLIENT
+    if _CLIENT is not None and (_CLIENT.broken or _CLIENT.address != address):
+        reset_gateway()
+    if _CLIENT is None:
+        client = connect(address)
+        if client is None:
+            if isinstance(parse_address(address), str):
+                raise GatewayError(f"no gateway listening on {address} (run `serve --address {address}` first)")
+            client = GatewayContainer(image, address).start()
+        _CLIENT = client
+    return _CLIENT
+
+# --- CLI -------------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Derivation/RPC gateway (one long-lived qubipy container)")
+    parser.add_argument("--address", default=DEFAULT_ADDRESS, help=f"host:port or Unix socket path (default: {DEFAULT_ADDRESS})")
+    parser.add_argument("--image", default=DOCKER_IMAGE)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    serve_parser = sub.add_parser("serve", help="Run the gateway in the foreground")
+    serve_parser.add_argument("--engine", default="auto", choices=["auto", "qubipy", "portable"])
+    sub.add_parser("start", help="Start the container (build the image if needed)")
+    sub.add_parser("stop", help="Stop the gateway and its container")
+    sub.add_parser("ping", help="Show gateway status")
+    sub.add_parser("tick", help="Latest tick via the gateway's RPC client")
+    derive_parser = sub.add_parser("derive", help="Derive identities (seeds as arguments or on stdin)")
+    derive_parser.add_argument("seeds", nargs="*")
+    balance_parser = sub.add_parser("balance", help="get_balance for identities (arguments or stdin)")
+    balance_parser.add_argument("identities", nargs="*")
+    args = parser.parse_args()
+
+    if args.cmd == "serve":
+        serve(args.address, args.engine)
+        return 0
+    try:
+        if args.cmd == "start":
+            print(json.dumps(ensure_gateway(args.address, args.image).ping()))
+            return 0
+        if args.cmd == "stop":
+            stop_gateway(args.address, args.image)
+            print("[gateway] stopped")
+            return 0
+    except GatewayError as e:
+        print(f"[gateway] {e}", file=sys.stderr)
+        return 2
+    client = connect(args.address)
+    if client is None:
+        print(f"No gateway on {args.address}; start one with: python3 {Path(__file__).name} start", file=sys.stderr)
+        return 2
+    if args.cmd == "ping":
+        print(json.dumps(client.ping()))
+    elif args.cmd == "tick":
+        print(client.get_latest_tick())
+    elif args.cmd == "derive":
+        seeds = args.seeds or [line.strip() for line in sys.stdin if line.strip()]
+        for offset, identities in client.derive_stream(seeds):
+            for seed, identity in zip(seeds[offset:], identities):
+                print(f"{seed}\t{identity or '-'}", flush=True)
+    elif args.cmd == "balance":
+        identities = args.identities or [line.strip() for line in sys.stdin if line.strip()]
+        for message in client.balance_stream(identities):
+            print(json.dumps(message), flush=True)
+    client.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
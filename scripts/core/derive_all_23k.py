@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Derive alle 23.765 Layer-3 Identities
-Optimiert for große Datensätze mit Progress-Tracking
+Optimiert for große Datensätze mit Progress-Tracking; Layer-2 und Layer-3
+werden gestreamt und überlappend abgeleitet (scripts/core/layer_pipeline.py)
 """
 
 import json
@@ -17,12 +18,9 @@ MAPPING_FILE = project_root / "outputs" / "analysis" / "complete_mapping_databas
 REPORTS_DIR = project_root / "outputs" / "reports"
 PROGRESS_FILE = OUTPUT_DIR / "23k_derivation_progress.json"
 
-# Import derivation functions
-from scripts.core.derive_layer3_extended import (
- identity_to_seed,
- derive_identity_from_seed,
- load_layer2_identities
-)
+COLUMNS_DIR = OUTPUT_DIR / "layer_columns"
+
+from scripts.core.layer_pipeline import LayerPipeline, identity_to_seed, iter_rows, print_summary
 
 def save_progress(current: int, total: int, start_time: float):
  """Speichere Progress."""
@@ -56,59 +54,45 @@ def derive_all_23k():
  print(f"✅ Loaded {total_seeds} seeds from mapping database")
  print()
  
- # Load Layer-2 Identities (alle)
- print("Loading Layer-2 identities...")
- layer2_identities = []
- 
- # Von Layer-1 ableiten
- layer1_identities = list(data.get("seed_to_real_id", {}).values())
- print(f"Deriving Layer-2 from {len(layer1_identities)} Layer-1 identities...")
- 
- for i, layer1_id in enumerate(layer1_identities, 1):
- layer2_seed = identity_to_seed(layer1_id)
- layer2_id = derive_identity_from_seed(layer2_seed)
- if layer2_id:
- layer2_identities.append(layer2_id)
- 
- if i % 1000 == 0:
- print(f" Derived {i}/{len(layer1_identities)} Layer-2 identities...")
- 
- print(f"✅ Loaded {len(layer2_identities)} Layer-2 identities")
- print()
- 
- # Derive Layer-3
- print("Deriving Layer-3 identities (this will take a while)...")
+ # Layer-2 und Layer-3 laufen als überlappende Stages (scripts/core/layer_pipeline.py);
+ # jede Batch landet sofort in den Spalten-Dateien, ein Abbruch wird beim nächsten Lauf fortgesetzt
+ print("Deriving Layer-2 and Layer-3 identities (pipelined)...")
  print("⚠️ Skipping RPC checks - faster but no on-chain status")
  print()
  
- results = []
  start_time = datetime.now().timestamp()
+ layer1_identities = list(data.get("seed_to_real_id", {}).values())
+ del data
+ 
+ pipeline = LayerPipeline(
+ COLUMNS_DIR,
+ layer1_identities,
+ start_layer=1,
+ end_layer=3,
+ source_name=f"{MAPPING_FILE.name}:all",
+ total=len(layer1_identities),
+ )
+ summary = pipeline.run()
+ save_progress(summary["rows"], len(layer1_identities), start_time)
+ print_summary(summary)
  
- for i, layer2_id in enumerate(layer2_identities, 1):
- layer3_seed = identity_to_seed(layer2_id)
- layer3_id = derive_identity_from_seed(layer3_seed)
- 
+ results = []
+ total_layer2 = 0
+ for row in iter_rows(COLUMNS_DIR, ["layer2", "layer3"]):
+ layer2_id = row["layer2"]
+ if not layer2_id:
+ continue
+ total_layer2 += 1
+ layer3_id = row["layer3"]
  if layer3_id:
  results.append({
  "layer2_identity": layer2_id,
- "seed": layer3_seed,
+ "seed": identity_to_seed(layer2_id),
  "layer3_identity": layer3_id,
  "layer3_derivable": True,
  "layer3_onchain": None # No RPC check
  })
  
- # Progress update
- if i % 100 == 0:
- save_progress(i, len(layer2_identities), start_time)
- elapsed = datetime.now().timestamp() - start_time
- rate = i / elapsed if elapsed > 0 else 0
- remaining = (len(layer2_identities) - i) / rate if rate > 0 else 0
- print(f" Processed: {i}/{len(layer2_identities)} ({i/len(layer2_identities)*100:.1f}%) - "
- f"ETA: {remaining/60:.1f} min")
- 
- # Final save
- save_progress(len(layer2_identities), len(layer2_identities), start_time)
- 
  print()
  print(f"✅ Derived {len(results)} Layer-3 identities")
  print()
@@ -116,7 +100,7 @@ def derive_all_23k():
  # Speichere Ergebnisse
  output_data = {
  "total_derived": len(results),
- "total_layer2": len(layer2_identities),
+ "total_layer2": total_layer2,
  "timestamp": datetime.now().isoformat(),
  "results": results
  }
@@ -134,7 +118,7 @@ def derive_all_23k():
  "# 23K Derivation Complete",
  "",
  f"**Total Derived**: {len(results)} Layer-3 Identities",
- f"**Total Layer-2**: {len(layer2_identities)}",
+ f"**Total Layer-2**: {total_layer2}",
  f"**Timestamp**: {datetime.now().isoformat()}",
  "",
  "## Status",
@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 """
 Fast Layer-4 Derivation (ohne RPC checks, optimiert for Geschwindigkeit)
+Batches laufen durch scripts/core/layer_pipeline.py statt ein Subprozess pro Identity.
 """
 
 import sys
 import json
-import subprocess
 from pathlib import Path
 from typing import Dict, List, Optional
 import time
@@ -15,52 +15,9 @@ sys.path.insert(0, str(project_root))
 
 OUTPUT_DIR = project_root / "outputs" / "derived"
 REPORTS_DIR = project_root / "outputs" / "reports"
-VENV_PYTHON = project_root / "venv-tx" / "bin" / "python"
+COLUMNS_DIR = OUTPUT_DIR / "layer4_columns"
 
-def identity_to_seed(identity: str) -> str:
- """Konvertiere Identity zu Seed."""
- return identity.lower()[:55]
-
-def derive_identity_from_seed(seed: str) -> Optional[str]:
- """Leite Identity aus Seed ab."""
- if not VENV_PYTHON.exists():
- return None
- 
- script = f"""
-from qubipy.crypto.utils import (
- get_subseed_from_seed,
- get_private_key_from_subseed,
- get_public_key_from_private_key,
- get_identity_from_public_key,
-)
-
-seed = "{seed}"
-seed_bytes = seed.encode('utf-8')
-subseed = get_subseed_from_seed(seed_bytes)
-private_key = get_private_key_from_subseed(subseed)
-public_key = get_public_key_from_private_key(private_key)
-identity = get_identity_from_public_key(public_key)
-print(identity)
-"""
- 
- try:
- result = subprocess.run(
- [str(VENV_PYTHON), "-c", script],
- capture_output=True,
- text=True,
- timeout=5, # Kürzeres Timeout
- cwd=project_root
- )
- 
- if result.returncode != 0:
- return None
- 
- identity = result.stdout.strip()
- if len(identity) == 60 and identity.isupper():
- return identity
- return None
- except Exception:
- return None
+from scripts.core.layer_pipeline import LayerPipeline, identity_to_seed, iter_rows, print_summary
 
 def load_layer3_identities() -> List[str]:
  """Load Layer-3 Identities (aus 23k Dataset)."""
@@ -101,34 +58,30 @@ def derive_layer4_fast():
  print("⚠️ Skipping RPC checks for speed - will validate later")
  print()
  
- results = []
- start_time = time.time()
- 
- print("Deriving Layer-4 identities...")
+ print("Deriving Layer-4 identities (streamed, written per batch)...")
  print()
  
- for idx, layer3_identity in enumerate(layer3_identities, 1):
- seed = identity_to_seed(layer3_identity)
- layer4_identity = derive_identity_from_seed(seed)
+ pipeline = LayerPipeline(
+ COLUMNS_DIR,
+ layer3_identities,
+ start_layer=3,
+ end_layer=4,
+ source_name=f"layer3:{len(layer3_identities)}",
+ total=len(layer3_identities),
+ )
+ print_summary(pipeline.run())
  
+ results = []
+ for row in iter_rows(COLUMNS_DIR, ["layer3", "layer4"]):
+ layer4_identity = row["layer4"]
  results.append({
- "layer3_identity": layer3_identity,
- "seed": seed,
+ "layer3_identity": row["layer3"],
+ "seed": identity_to_seed(row["layer3"]),
  "layer4_identity": layer4_identity,
  "layer4_derivable": layer4_identity is not None,
  "layer4_onchain": None # Will später geprüft
  })
  
- # Progress alle 1000 Identities
- if idx % 1000 == 0:
- elapsed = time.time() - start_time
- rate = idx / elapsed if elapsed > 0 else 0
- remaining = (len(layer3_identities) - idx) / rate if rate > 0 else 0
- progress_pct = (idx / len(layer3_identities)) * 100
- print(f" Progress: {idx}/{len(layer3_identities)} ({progress_pct:.1f}%) | "
- f"Rate: {rate:.1f} ids/sec | "
- f"ETA: {remaining/60:.1f} min")
- 
  print()
  print("=" * 80)
  print("LAYER-4 DERIVATION COMPLETE")
@@ -3,12 +3,15 @@
 Derive Layer-4 and Layer-5 Identities
 
 Rekursive Derivation von Layer-4 und Layer-5 Identities aus Layer-3.
-Prüft on-chain Existenz und Assets.
+Prüft on-chain Existenz und Assets. Derivation und RPC-Checks laufen als
+Stages von scripts/core/layer_pipeline.py (resumable statt Checkpoint-JSON):
+erst Layer-3 -> Layer-4 mit RPC-Check, dann Layer-4 -> Layer-5 nur für die
+on-chain Layer-4 Identities.
 """
 
 import sys
 import json
-import subprocess
+from hashlib import sha256
 from pathlib import Path
 from typing import Dict, List, Optional
 import time
@@ -18,83 +21,9 @@ sys.path.insert(0, str(project_root))
 
 OUTPUT_DIR = project_root / "outputs" / "derived"
 REPORTS_DIR = project_root / "outputs" / "reports"
-VENV_PYTHON = project_root / "venv-tx" / "bin" / "python"
+COLUMNS_DIR = OUTPUT_DIR / "layer4_layer5_columns"
 
-CHECKPOINT_FILE = OUTPUT_DIR / "layer4_layer5_derivation_checkpoint.json"
-
-def identity_to_seed(identity: str) -> str:
- """Konvertiere Identity zu Seed."""
- return identity.lower()[:55]
-
-def derive_identity_from_seed(seed: str) -> Optional[str]:
- """Leite Identity aus Seed ab."""
- if not VENV_PYTHON.exists():
- return None
- 
- script = f"""
-from qubipy.crypto.utils import (
- get_subseed_from_seed,
- get_private_key_from_subseed,
- get_public_key_from_private_key,
- get_identity_from_public_key,
-)
-
-seed = "{seed}"
-seed_bytes = seed.encode('utf-8')
-subseed = get_subseed_from_seed(seed_bytes)
-private_key = get_private_key_from_subseed(subseed)
-public_key = get_public_key_from_private_key(private_key)
-identity = get_identity_from_public_key(public_key)
-print(identity)
-"""
- 
- try:
- result = subprocess.run(
- [str(VENV_PYTHON), "-c", script],
- capture_output=True,
- text=True,
- timeout=10,
- cwd=project_root
- )
- 
- if result.returncode != 0:
- return None
- 
- identity = result.stdout.strip()
- if len(identity) == 60 and identity.isupper():
- return identity
- return None
- except Exception:
- return None
-
-def check_identity_onchain(identity: str) -> bool:
- """Check ob Identity on-chain existiert."""
- if not VENV_PYTHON.exists():
- return False
- 
- script = f"""
-from qubipy.rpc import QubicRPC
-
-rpc = QubicRPC()
-identity = "{identity}"
-try:
- balance = rpc.get_balance(identity)
- print("EXISTS" if balance is not None else "NOT_EXISTS")
-except:
- print("NOT_EXISTS")
-"""
- 
- try:
- result = subprocess.run(
- [str(VENV_PYTHON), "-c", script],
- capture_output=True,
- text=True,
- timeout=15,
- cwd=project_root
- )
- return "EXISTS" in result.stdout
- except Exception:
- return False
+from scripts.core.layer_pipeline import LayerPipeline, identity_to_seed, iter_column, iter_rows, print_summary
 
 def load_layer3_identities() -> List[str]:
  """Load Layer-3 Identities (aus 23k Dataset)."""
@@ -121,29 +50,6 @@ def load_layer3_identities() -> List[str]:
  
  return identities
 
-def load_checkpoint() -> Dict:
- """Load Checkpoint."""
- if CHECKPOINT_FILE.exists():
- with CHECKPOINT_FILE.open() as f:
- checkpoint = json.load(f)
- # Stelle sicher dass start_time gesetzt ist
- if "start_time" not in checkpoint:
- checkpoint["start_time"] = time.time()
- return checkpoint
- return {
- "layer4_results": [],
- "layer5_results": [],
- "processed_layer4": 0,
- "processed_layer5": 0,
- "start_time": time.time()
- }
-
-def save_checkpoint(checkpoint: Dict):
- """Speichere Checkpoint."""
- CHECKPOINT_FILE.parent.mkdir(parents=True, exist_ok=True)
- with CHECKPOINT_FILE.open("w") as f:
- json.dump(checkpoint, f, indent=2)
-
 def derive_layer4_layer5():
  """Leite Layer-4 und Layer-5 Identities ab."""
  print("=" * 80)
@@ -162,87 +68,77 @@ def derive_layer4_layer5():
  print(f"✅ Loaded {len(layer3_identities)} Layer-3 identities")
  print()
  
- # Load Checkpoint
- checkpoint = load_checkpoint()
- layer4_results = checkpoint.get("layer4_results", [])
- layer5_results = checkpoint.get("layer5_results", [])
- processed_layer4 = checkpoint.get("processed_layer4", 0)
- processed_layer5 = checkpoint.get("processed_layer5", 0)
- 
- # Layer-4 Derivation
- print("Deriving Layer-4 identities...")
- print(f"Starting from index {processed_layer4}/{len(layer3_identities)}")
- print("⚠️ Skipping RPC checks for speed - will validate later")
+ # Derivation und RPC-Check laufen als überlappende Stages; jede Batch wird sofort
+ # geschrieben, ein abgebrochener Lauf setzt nach der letzten Batch fort. Unbekannte
+ # on-chain Flags (fehlgeschlagene RPC-Requests) werden bei jedem Lauf erneut geprüft.
+ print("Deriving Layer-4 identities with on-chain checks (pipelined)...")
  print()
  
- for idx, layer3_identity in enumerate(layer3_identities[processed_layer4:], start=processed_layer4):
- seed = identity_to_seed(layer3_identity)
- layer4_identity = derive_identity_from_seed(seed)
+ layer4_dir = COLUMNS_DIR / "layer4"
+ pipeline = LayerPipeline(
+ layer4_dir,
+ layer3_identities,
+ start_layer=3,
+ end_layer=4,
+ source_name=f"layer3:{len(layer3_identities)}",
+ total=len(layer3_identities),
+ rpc_layers=[4],
+ )
+ print_summary(pipeline.run())
+ print()
  
- is_derivable = layer4_identity is not None
- is_onchain = None # Will später via RPC geprüft
+ # Layer-5 nur von on-chain Layer-4: zweite Pipeline über diese Teilmenge
+ layer4_onchain_identities = [
+ identity
+ for identity, onchain in zip(iter_column(layer4_dir, "layer4"), iter_column(layer4_dir, "onchain_layer4"))
+ if onchain
+ ]
+ print(f"Deriving Layer-5 identities for {len(layer4_onchain_identities)} on-chain Layer-4 identities...")
+ print()
  
- # Skip RPC checks for speed (kann später gemacht werden)
- # if is_derivable:
- # is_onchain = check_identity_onchain(layer4_identity)
+ layer5_dir = COLUMNS_DIR / "layer5"
+ layer5_rows = iter(())
+ if layer4_onchain_identities:
+ # Quelle ändert sich, wenn ein Retry weitere Layer-4 Identities on-chain findet
+ digest = sha256("".join(layer4_onchain_identities).encode("ascii")).hexdigest()[:16]
+ pipeline = LayerPipeline(
+ layer5_dir,
+ layer4_onchain_identities,
+ start_layer=4,
+ end_layer=5,
+ source_name=f"layer4-onchain:{len(layer4_onchain_identities)}:{digest}",
+ total=len(layer4_onchain_identities),
+ rpc_layers=[5],
+ )
+ print_summary(pipeline.run())
+ layer5_rows = iter_rows(layer5_dir)
  
+ layer4_results = []
+ layer5_results = []
+ for row in iter_rows(layer4_dir):
+ layer4_identity = row["layer4"]
  layer4_results.append({
- "layer3_identity": layer3_identity,
- "seed": seed,
+ "layer3_identity": row["layer3"],
+ "seed": identity_to_seed(row["layer3"]),
  "layer4_identity": layer4_identity,
- "layer4_derivable": is_derivable,
- "layer4_onchain": is_onchain
+ "layer4_derivable": layer4_identity is not None,
+ "layer4_onchain": row["onchain_layer4"]  # None: RPC-Check auch nach Retry fehlgeschlagen
  })
  
- # Checkpoint alle 100 Identities (weniger Output)
- if (idx + 1) % 100 == 0:
- checkpoint["layer4_results"] = layer4_results
- checkpoint["processed_layer4"] = idx + 1
- save_checkpoint(checkpoint)
- elapsed = time.time() - checkpoint.get("start_time", time.time())
- if elapsed > 0 and (idx + 1) > 0:
- rate = (idx + 1) / elapsed # Identities per second
- remaining = (len(layer3_identities) - idx - 1) / rate if rate > 0 else 0
- print(f" Progress: {idx+1}/{len(layer3_identities)} ({((idx+1)/len(layer3_identities)*100):.1f}%) | Est. remaining: {remaining/60:.1f} min | Rate: {rate:.1f} ids/sec")
- 
- print()
- print("Deriving Layer-5 identities from Layer-4...")
- 
- # Layer-5 Derivation (nur von on-chain Layer-4)
- layer4_onchain = [r for r in layer4_results if r.get("layer4_onchain")]
- print(f"Found {len(layer4_onchain)} on-chain Layer-4 identities")
- print()
- 
- for idx, layer4_result in enumerate(layer4_onchain[processed_layer5:], start=processed_layer5):
- layer4_identity = layer4_result.get("layer4_identity")
- if not layer4_identity:
+ # Layer-5 nur von on-chain Layer-4 (gleiche Reihenfolge wie die Layer-5 Quelle)
+ if not row["onchain_layer4"]:
  continue
- 
- seed = identity_to_seed(layer4_identity)
- layer5_identity = derive_identity_from_seed(seed)
- 
- is_derivable = layer5_identity is not None
- is_onchain = False
- 
- if is_derivable:
- is_onchain = check_identity_onchain(layer5_identity)
- 
+ layer5_row = next(layer5_rows)
+ layer5_identity = layer5_row["layer5"]
  layer5_results.append({
  "layer4_identity": layer4_identity,
- "seed": seed,
+ "seed": identity_to_seed(layer4_identity),
  "layer5_identity": layer5_identity,
- "layer5_derivable": is_derivable,
- "layer5_onchain": is_onchain
+ "layer5_derivable": layer5_identity is not None,
+ "layer5_onchain": bool(layer5_row["onchain_layer5"])
  })
  
- # Checkpoint alle 5 Identities
- if (idx + 1) % 5 == 0:
- checkpoint["layer5_results"] = layer5_results
- checkpoint["processed_layer5"] = idx + 1
- save_checkpoint(checkpoint)
- elapsed = time.time() - checkpoint.get("start_time", time.time())
- remaining = (elapsed / (idx + 1)) * (len(layer4_onchain) - idx - 1)
- print(f" Progress: {idx+1}/{len(layer4_onchain)} ({((idx+1)/len(layer4_onchain)*100):.1f}%) | Est. remaining: {remaining/60:.1f} min")
+ layer4_onchain = [r for r in layer4_results if r.get("layer4_onchain")]
  
  # Finale Ergebnisse
  print()
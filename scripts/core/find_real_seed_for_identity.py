@@ -16,6 +16,8 @@ from typing import Optional, List, Tuple
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.core.matrix_path_index import PathIndex
+
 OUTPUT_DIR = project_root / "outputs" / "derived"
 REPORTS_DIR = project_root / "outputs" / "reports"
 VENV_PYTHON = project_root / "venv-tx" / "bin" / "python"
@@ -49,29 +51,19 @@ def find_identity_coordinates(matrix_identity: str, matrix: np.ndarray) -> List[
  """
  Finde Koordinaten, wo die Identity in der Matrix vorkommt.
  
- Sucht nach der Identity (oder Teilen davon) in der Matrix.
+ Sucht den Body (erste 56 Zeichen) über den Pfad-Index in allen Extraktions-
+ Pfaden (Zeilen, Spalten, Diagonalen, Strides, Spiralen, Ringe, Block-Scans),
+ vorwärts und rückwärts. Rückgabe: Startkoordinate jedes Treffers.
  """
- coords = []
- 
- # Extrahiere den Body (erste 56 Zeichen)
- identity_body = matrix_identity[:56].lower()
+ index = PathIndex.from_matrix(matrix, encoding="mod") # gleiche Kodierung wie base26_char
  
- # Suche nach Patterns in der Matrix
- for r in range(128):
- for c in range(128):
- # Teste horizontale Sequenz
- if c + 56 <= 128:
- seq = ''.join(base26_char(matrix[r, c+i]) for i in range(56))
- if seq.lower() == identity_body:
- coords.append((r, c))
- 
- # Teste vertikale Sequenz
- if r + 56 <= 128:
- seq = ''.join(base26_char(matrix[r+i, c]) for i in range(56))
- if seq.lower() == identity_body:
- coords.append((r, c))
+ coords = []
+ for hit in index.lookup_identity(matrix_identity):
+ start = index.coordinates(hit)[0]
+ if start not in coords:
+ coords.append(start)
  
- return coords
+ return sorted(coords)
 
 def extract_55_chars_around(matrix: np.ndarray, r: int, c: int, direction: str = 'horizontal') -> Optional[str]:
  """
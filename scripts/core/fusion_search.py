@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Exhaustive master-seed fusion search.
+
+`master_seed_fusion.py` evaluates five fusion operators for one fixed ordering
+of the 8 Layer-1 seeds. This module represents seed sets as `(k, 55)` uint8
+arrays (a=0 … z=25) and evaluates the operators over *all* candidates:
+
+- order-independent operators (XOR, modular sum) over every subset of the
+  seed pool (size >= 2),
+- order-dependent operators (interleaved round-robin, concatenation + K12)
+  over every permutation of every subset up to --max-perm-size
+  (8! = 40,320 full orderings of the Layer-1 seeds; 109,600 including
+  partial subsets).
+
+The array operators reproduce `fusion_xor`, `fusion_modular_sum` and
+`fusion_interleaved` exactly; `concat_k12` matches the Layer-1 variant
+(55-byte K12 output mapped to a-z; qubipy's K12 when installed, otherwise
+the batched portable one from `qubic_crypto`). Candidates are
+deduplicated, derived in batches via `derivation_backends`, and new
+identities are checked on-chain through a persistent cache, so re-runs only
+query identities never seen before.
+
+Usage:
+    python3 scripts/core/fusion_search.py --pool layer1 --no-rpc
+    python3 scripts/core/fusion_search.py --pool both --max-perm-size 4 --backend pool
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations, permutations
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.transformation_search import fingerprint, letters_to_seeds
+
+OUTPUT_DIR = project_root / "outputs" / "derived"
+OUTPUT_JSON = OUTPUT_DIR / "fusion_search_results.json"
+ONCHAIN_CACHE = project_root / "outputs" / "cache" / "fusion_onchain_cache.json"
+
+SEED_LENGTH = 55
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+LAYER1_IDENTITIES = [
+    ("Diagonal #1", "AQIOSQQMACYBPQXQSJNIUAYLMXXIWQOXQMEQYXBBTBONSJJRCWPXXDDRDWOR"),
+    ("Diagonal #2", "GWUXOMMMMFMTBWFZSNGMUKWBILTXQDKNMMMNYPEFTAMRONJMABLHTRRROHXZ"),
+    ("Diagonal #3", "ACGJGQQYILBPXDRBORFGWFZBBBNLQNGHDDELVLXXXLBNNNFBLLPBNNNLJIFV"),
+    ("Diagonal #4", "GIUVFGAWCBBFFKVBMFJESLHBBFBFWZWNNXCBQBBJRVFBNVJLTJBBBHTHKLDC"),
+    ("Vortex #1", "UUFEEMUUBIYXYXDUXZCFBIHABAYSACQSWSGABOBKNXBZCICLYOKOBMLKMUAF"),
+    ("Vortex #2", "HJBRFBHTBZJLVRBXTDRFORBWNACAHAQMSBUNBONHTRHNJKXKKNKHWCBNAXLD"),
+    ("Vortex #3", "JKLMNOIPDQORWSICTWWUIYVMOFIQCQSYKMKACMOKQYCCMCOGOCQCSCWCDQFL"),
+    ("Vortex #4", "XYZQAUBQUUQBQBYQAYEIYAQYMMEMQQQMMQSQEQAZSMOGWOXKIRMJXMCLFAVK"),
+]
+
+# Layer-2 seeds as listed in scripts/verify/matrix_seed_mapper.py
+LAYER2_SEEDS = [
+    ("L2 Diagonal #1", "obwiipwfpowiqchgjhkfznmssyobynndluexaelxkeroiukixeuxmlz"),
+    ("L2 Diagonal #2", "oqoomlaqlgojffaygxalstdvdgqdwkwgdqjrmnzsodhmwwwslsqzzah"),
+    ("L2 Diagonal #3", "wezpwomkyyqygdzjduepiottukccqvbyemyhqutwgamhfvjjvrcqlmv"),
+    ("L2 Diagonal #4", "buicahkiblqwqaionarlyroqgmrayeaoecszcpmtehuifxlkgtmapjf"),
+    ("L2 Vortex #1", "faeeivwninmpfaawuuymcjxmsfcagdjnfdrcehbfpgfccekuwtmcbhx"),
+    ("L2 Vortex #2", "pruatxfveffwaehuadbsbkofeqtcyoxpsjhwpusukchbxgmrqqewitae"),
+    ("L2 Vortex #3", "riomizkjdphcffgvymwsfokvbnxayckuxolhlhhcpcqduliitmfgzqu"),
+    ("L2 Vortex #4", "dzgtelpkneitgbrurpcwrnzgltmbcrplrperufbzhdfdtfytjxoudyl"),
+]
+
+def normalize_seed(seed: str) -> str:
+    """Same normalization as master_seed_fusion.normalize_seed."""
+    seed = "".join(c for c in seed.lower() if c in ALPHABET)
+    if len(seed) < SEED_LENGTH:
+        seed = (seed * ((SEED_LENGTH // len(seed)) + 1))[:SEED_LENGTH]
+    return seed[:SEED_LENGTH]
+
+def load_pool(name: str) -> Tuple[List[str], np.ndarray]:
+    """Seed labels and the `(k, 55)` letter array for layer1 | layer2 | both."""
+    entries: List[Tuple[str, str]] = []
+    if name in ("layer1", "both"):
+        entries += [(label, identity[:55].lower()) for label, identity in LAYER1_IDENTITIES]
+    if name in ("layer2", "both"):
+        entries += LAYER2_SEEDS
+    if not entries:
+        raise ValueError(f"Unknown seed pool: {name}")
+    seeds = [normalize_seed(seed) for _, seed in entries]
+    letters = np.frombuffer("".join(seeds).encode("ascii"), dtype=np.uint8).reshape(len(seeds), SEED_LENGTH) - ord("a")
+    return [label for label, _ in entries], letters.astype(np.uint8)
+
+# --- Operators --------------------------------------------------------------
+
+def subset_masks(k: int, min_size: int = 2) -> np.ndarray:
+    """All subsets of `k` seeds with at least `min_size` members as `(S, k)` bool."""
+    codes = np.arange(1 << k, dtype=np.int64)
+    masks = ((codes[:, None] >> np.arange(k)) & 1).astype(bool)
+    return masks[masks.sum(axis=1) >= min_size]
+
+def fuse_xor(pool: np.ndarray, masks: np.ndarray) -> np.ndarray:
+    """XOR of the selected seeds' letter values, mod 26 (`fusion_xor`)."""
+    result = np.zeros((len(masks), pool.shape[1]), dtype=np.uint8)
+    for j in range(pool.shape[0]):
+        result ^= np.where(masks[:, j, None], pool[j], 0).astype(np.uint8)
+    return result % 26
+
+def fuse_modular_sum(pool: np.ndarray, masks: np.ndarray) -> np.ndarray:
+    """Sum of the selected seeds' letter values, mod 26 (`fusion_modular_sum`)."""
+    return ((masks.astype(np.int64) @ pool.astype(np.int64)) % 26).astype(np.uint8)
+
+def fuse_interleaved(pool: np.ndarray, perms: np.ndarray) -> np.ndarray:
+    """Round-robin interleave of ordered seeds (`fusion_interleaved`)."""
+    k = perms.shape[1]
+    positions = np.arange(pool.shape[1])
+    seed_idx = perms[:, positions % k]
+    return pool[seed_idx, positions // k]
+
+def fuse_concat_k12(pool: np.ndarray, perms: np.ndarray, k12: Optional[Callable] = None) -> np.ndarray:
+    """K12 over the concatenated ordered seeds, 55 output bytes mapped to a-z.
+
+    Without `k12` (qubipy's signature) all permutations are hashed in one batch.
+    """
+    text = pool + ord("a")
+    if k12 is None:
+        from scripts.core.qubic_crypto import kangaroo_twelve_batch
+
+        return kangaroo_twelve_batch(text[perms].reshape(len(perms), -1), SEED_LENGTH) % 26
+    out = np.empty((len(perms), pool.shape[1]), dtype=np.uint8)
+    for row, perm in enumerate(perms):
+        data = text[perm].tobytes()
+        digest = k12(data, len(data), SEED_LENGTH)
+        out[row] = np.frombuffer(bytes(digest), dtype=np.uint8)[:SEED_LENGTH] % 26
+    return out
+
+def iter_permutation_blocks(k: int, max_size: int, min_size: int = 2, block: int = 20_000) -> Iterator[np.ndarray]:
+    """Every ordered selection of `min_size..max_size` seeds, as `(B, size)` blocks."""
+    for size in range(min_size, max_size + 1):
+        buf: List[Tuple[int, ...]] = []
+        for subset in combinations(range(k), size):
+            buf.extend(permutations(subset))
+            if len(buf) >= block:
+                yield np.array(buf, dtype=np.int64)
+                buf = []
+        if buf:
+            yield np.array(buf, dtype=np.int64)
+
+def iter_candidates(
+    pool: np.ndarray,
+    operators: Sequence[str],
+    max_perm_size: int,
+    k12: Optional[Callable] = None,
+    block: int = 20_000,
+) -> Iterator[Tuple[str, np.ndarray, np.ndarray]]:
+    """Yield (operator, members, letters) blocks; members are masks or permutations."""
+    k = pool.shape[0]
+    if "xor" in operators or "modsum" in operators:
+        masks = subset_masks(k)
+        for start in range(0, len(masks), block):
+            part = masks[start : start + block]
+            if "xor" in operators:
+                yield "xor", part, fuse_xor(pool, part)
+            if "modsum" in operators:
+                yield "modsum", part, fuse_modular_sum(pool, part)
+    ordered_ops = [op for op in ("interleaved", "concat_k12") if op in operators]
+    if ordered_ops:
+        for perms in iter_permutation_blocks(k, min(max_perm_size, k), block=block):
+            if "interleaved" in ordered_ops:
+                yield "interleaved", perms, fuse_interleaved(pool, perms)
+            if "concat_k12" in ordered_ops:
+                yield "concat_k12", perms, fuse_concat_k12(pool, perms, k12)
+
+def members_to_labels(members: np.ndarray, labels: List[str]) -> List[str]:
+    if members.dtype == bool:
+        return [labels[j] for j in np.flatnonzero(members)]
+    return [labels[j] for j in members.tolist()]
+
+# --- On-chain check ---------------------------------------------------------
+
+class OnChainCache:
+    """Persistent identity → on-chain status cache with rate-limited RPC lookups."""
+
+    def __init__(self, rpc, path: Path = ONCHAIN_CACHE, delay: float = 0.2, full_check: bool = False) -> None:
+        self.rpc = rpc
+        self.path = path
+        self.delay = delay
+        self.full_check = full_check
+        self._lock = threading.Lock()
+        self._last_call = 0.0
+        self.entries: Dict[str, Dict] = json.loads(path.read_text()) if path.exists() else {}
+        self.hits = 0
+        self.lookups = 0
+
+    def _throttle(self) -> None:
+        with self._lock:
+            wait = self._last_call + self.delay - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_call = time.monotonic()
+
+    def _lookup(self, identity: str) -> Dict:
+        result = {"balance": None, "assets": None, "history": None, "status": "unknown", "error": None}
+        try:
+            self._throttle()
+            balance_data = self.rpc.get_balance(identity)
+            if not balance_data:
+                result["status"] = "not_found"
+                return result
+            result["balance"] = str(balance_data.get("balance", 0))
+            if self.full_check:
+                self._throttle()
+                result["assets"] = self.rpc.get_owned_assets(identity) or []
+                self._throttle()
+                result["history"] = self.rpc.get_transaction_history(identity, limit=10) or []
+            hit = int(result["balance"]) > 0 or bool(result["assets"]) or bool(result["history"])
+            result["status"] = "HIT" if hit else "empty"
+        except Exception as e:
+            result["error"] = str(e)
+            result["status"] = "rpc_error"
+        return result
+
+    def check_many(self, identities: Sequence[str], workers: int = 4) -> Dict[str, Dict]:
+        """Check identities, querying RPC only for ones not cached (errors are retried next run)."""
+        todo = sorted({i for i in identities if i and self.entries.get(i, {}).get("status") in (None, "rpc_error")})
+        if todo:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for identity, result in zip(todo, pool.map(self._lookup, todo)):
+                    self.entries[identity] = result
+            self.lookups += len(todo)
+        return {i: self.entries[i] for i in identities if i in self.entries}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.entries, indent=1))
+        tmp_path.replace(self.path)
+
+# --- Driver -----------------------------------------------------------------
+
+def run_search(
+    labels: List[str],
+    pool: np.ndarray,
+    operators: Sequence[str],
+    max_perm_size: int,
+    backend=None,
+    onchain: Optional[OnChainCache] = None,
+    batch_size: int = 4096,
+    k12: Optional[Callable] = None,
+) -> Dict:
+    stats = {"generated": 0, "unique": 0, "derived": 0, "failed": 0, "checked": 0, "per_operator": {}}
+    hits: List[Dict] = []
+    seen: Set[int] = set()
+    pending: List[Tuple[str, str, List[str]]] = []
+    start = time.perf_counter()
+
+    def flush() -> None:
+        if not pending or backend is None:
+            pending.clear()
+            return
+        identities = backend.derive_batch([seed for seed, _, _ in pending])
+        stats["derived"] += len(pending)
+        stats["failed"] += sum(1 for identity in identities if identity is None)
+        status = onchain.check_many([i for i in identities if i]) if onchain else {}
+        stats["checked"] += len(status)
+        for (seed, op, members), identity in zip(pending, identities):
+            result = status.get(identity)
+            if result and result["status"] == "HIT":
+                hits.append({"operator": op, "seeds": members, "seed": seed, "identity": identity, **result})
+                print(f"🎉🎉🎉 HIT! {op} {members} -> {identity} (balance {result['balance']})")
+        pending.clear()
+        if onchain:
+            onchain.save()
+
+    for op, members, letters in iter_candidates(pool, operators, max_perm_size, k12):
+        stats["generated"] += len(letters)
+        prints = fingerprint(letters)
+        _, first = np.unique(prints, return_index=True)
+        first.sort()
+        fresh = [idx for idx in first.tolist() if int(prints[idx]) not in seen]
+        seen.update(int(prints[idx]) for idx in fresh)
+        stats["unique"] += len(fresh)
+        stats["per_operator"][op] = stats["per_operator"].get(op, 0) + len(fresh)
+        for seed, idx in zip(letters_to_seeds(letters[fresh]), fresh):
+            pending.append((seed, op, members_to_labels(members[idx], labels)))
+            if len(pending) >= batch_size:
+                flush()
+        print(f"  {op:<12} +{len(fresh):,} unique (total {stats['unique']:,} / {stats['generated']:,})")
+    flush()
+
+    stats["elapsed_seconds"] = round(time.perf_counter() - start, 2)
+    stats["rpc_lookups"] = onchain.lookups if onchain else 0
+    stats["hits"] = hits
+    return stats
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Exhaustive master-seed fusion search")
+    parser.add_argument("--pool", default="layer1", choices=["layer1", "layer2", "both"])
+    parser.add_argument("--operators", default="xor,modsum,interleaved,concat_k12")
+    parser.add_argument("--max-perm-size", type=int, default=None, help="Default: 8 (4 for --pool both)")
+    parser.add_argument("--backend", default="auto", choices=["auto", "qubipy", "portable", "pool", "docker", "gateway"])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--no-rpc", action="store_true", help="Derive only, skip on-chain checks")
+    parser.add_argument("--full-check", action="store_true", help="Also fetch assets and history per identity")
+    parser.add_argument("--rpc-delay", type=float, default=0.2, help="Minimum seconds between RPC calls")
+    parser.add_argument("--dry-run", action="store_true", help="Only generate and deduplicate candidates")
+    args = parser.parse_args()
+
+    labels, pool = load_pool(args.pool)
+    operators = [op.strip() for op in args.operators.split(",") if op.strip()]
+    max_perm_size = args.max_perm_size or (4 if len(labels) > 8 else len(labels))
+
+    print("=" * 80)
+    print("🧬 FUSION SEARCH")
+    print("=" * 80)
+    print(f"Pool: {args.pool} ({len(labels)} seeds), operators: {', '.join(operators)}, max perm size: {max_perm_size}")
+
+    k12 = None
+    try:
+        from qubipy.crypto.utils import kangaroo_twelve as k12
+    except (ImportError, OSError):
+        if "concat_k12" in operators:
+            print("ℹ️ qubipy not available - concat_k12 uses the portable K12")
+
+    backend = onchain = None
+    if not args.dry_run:
+        from scripts.core.derivation_backends import make_backend
+
+        backend = make_backend(args.backend, args.workers)
+        print(f"Backend: {backend.name}")
+        if not args.no_rpc:
+            try:
+                from qubipy.rpc import rpc_client
+
+                onchain = OnChainCache(rpc_client.QubiPy_RPC(), delay=args.rpc_delay, full_check=args.full_check)
+                print(f"✅ RPC connection established ({len(onchain.entries):,} cached identities)")
+            except Exception as e:
+                print(f"⚠️ RPC connection failed: {e} - deriving only")
+    print()
+
+    try:
+        stats = run_search(labels, pool, operators, max_perm_size, backend, onchain, args.batch_size, k12)
+    finally:
+        if backend is not None:
+            backend.close()
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    with OUTPUT_JSON.open("w", encoding="utf-8") as f:
+        json.dump({"pool": args.pool, "seeds": labels, "operators": operators, "max_perm_size": max_perm_size, **stats}, f, indent=2)
+
+    print()
+    print(f"Generated: {stats['generated']:,}  Unique: {stats['unique']:,}  Derived: {stats['derived']:,}  RPC lookups: {stats['rpc_lookups']:,}")
+    print(f"Elapsed: {stats['elapsed_seconds']}s")
+    if stats["hits"]:
+        print(f"🎉 {len(stats['hits'])} HIT(S) FOUND!")
+    else:
+        print("❌ No hits found")
+    print(f"💾 Results saved to: {OUTPUT_JSON}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
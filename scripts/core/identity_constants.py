@@ -2,15 +2,17 @@
 
 This module provides a single source of truth for all identity definitions.
 Import from here instead of defining identities in multiple places.
+
+The identity length constants are re-exported lazily from
+analysis.utils.identity_tools (PEP 562), so importing the identity lists does
+not load the identity helpers.
 """
+import os
 import sys
-from pathlib import Path
-
-# Add project root to Python path
-project_root = Path(__file__).resolve().parents[2]
-sys.path.insert(0, str(project_root))
 
-from analysis.utils.identity_tools import IDENTITY_BODY_LENGTH, IDENTITY_LENGTH
+# Add project root to Python path (os.path: pathlib alone costs more than the import budget)
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
 
 # Seed length (55 chars) - derived from identity body length
 SEED_LENGTH = 55
@@ -34,6 +36,16 @@ VORTEX_IDENTITIES = [
 # All identities combined
 ALL_IDENTITIES = DIAGONAL_IDENTITIES + VORTEX_IDENTITIES
 
+_LAZY_FROM_IDENTITY_TOOLS = ("IDENTITY_BODY_LENGTH", "IDENTITY_LENGTH")
+
+def __getattr__(name):
+    if name in _LAZY_FROM_IDENTITY_TOOLS:
+        from analysis.utils import identity_tools
+        value = getattr(identity_tools, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = [
  "DIAGONAL_IDENTITIES",
  "VORTEX_IDENTITIES",
@@ -18,6 +18,9 @@ sys.path.insert(0, "venv-tx/lib/python3.11/site-packages")
 OUTPUT_DIR = Path("outputs/derived")
 OUTPUT_JSON = OUTPUT_DIR / "layer2_to_master_transactions.json"
 
+# Ticks zwischen aktuellem Tick und Ziel-Tick
+TARGET_TICK_OFFSET = 5
+
 # Master Identity
 MASTER_IDENTITY = "BZBQFLLBNCXEMGLOBHUVFTLUPLVCPQUASSILFABOFFBCADQSSUPNWLZBQEXK"
 
@@ -105,127 +108,6 @@ class TxResult:
  error: Optional[str] = None
  target_tick: Optional[int] = None
 
-def build_tx_with_payload(
- seed: str,
- dest_identity: str,
- amount: int,
- target_tick: int,
- payload: str,
-) -> bytes:
- """Build transaction with payload."""
- from qubipy.tx.utils import (
- get_public_key_from_identity,
- get_subseed_from_seed,
- get_private_key_from_subseed,
- get_public_key_from_private_key,
- )
- from qubipy.crypto.utils import sign, kangaroo_twelve
- 
- seed_bytes = bytes(seed, 'utf-8')
- subseed = get_subseed_from_seed(seed_bytes)
- private_key = get_private_key_from_subseed(subseed)
- source_pubkey = get_public_key_from_private_key(private_key)
- dest_pubkey = get_public_key_from_identity(dest_identity)
- 
- built_data = bytearray()
- offset = 0
- 
- # 1. Source Public Key (32 bytes)
- built_data.extend(source_pubkey)
- offset += len(source_pubkey)
- 
- # 2. Destination Public Key (32 bytes)
- built_data.extend(dest_pubkey)
- offset += len(dest_pubkey)
- 
- # 3. Amount (8 bytes)
- amount_qubic = int(amount * 1_000_000) # Convert to microQU
- built_data.extend(amount_qubic.to_bytes(8, byteorder='little'))
- offset += 8
- 
- # 4. Target Tick (4 bytes)
- built_data.extend(target_tick.to_bytes(4, byteorder='little'))
- offset += 4
- 
- # 5. Input Type (2 bytes) - always 0 for simple transfers
- input_type = 0
- built_data.extend(input_type.to_bytes(2, byteorder='little'))
- offset += 2
- 
- # 6. Input Size (2 bytes) - size of the payload
- payload_bytes = payload.encode('utf-8') if payload else b''
- input_size = len(payload_bytes)
- built_data.extend(input_size.to_bytes(2, byteorder='little'))
- offset += 2
- 
- # 7. Payload (N bytes) - inserted BEFORE signing
- if payload_bytes:
- built_data.extend(payload_bytes)
- offset += len(payload_bytes)
- 
- # Sign the transaction digest (which now includes the payload)
- tx_digest = kangaroo_twelve(built_data, offset, 32)
- signature = sign(subseed, source_pubkey, tx_digest)
- 
- # 8. Signature (64 bytes)
- built_data.extend(signature)
- 
- return bytes(built_data)
-
-def send_transaction(
- rpc,
- seed: str,
- identity: str,
- dest_identity: str,
- payload: str,
- amount: int = 1,
-) -> TxResult:
- """Send transaction from Layer-2 Identity to Master Identity."""
- 
- print(f" 📤 Sending {amount} QU with payload '{payload}'...")
- 
- result = TxResult(
- label="",
- identity=identity,
- payload=payload,
- amount=amount,
- tx_id=None,
- status="unknown",
- )
- 
- try:
- # Get latest tick
- latest_tick = rpc.get_latest_tick()
- target_tick = latest_tick + 25 # Standard offset
- result.target_tick = target_tick
- 
- # Build transaction
- tx_bytes = build_tx_with_payload(
- seed=seed,
- dest_identity=dest_identity,
- amount=amount,
- target_tick=target_tick,
- payload=payload,
- )
- 
- # Broadcast transaction
- response = rpc.broadcast_transaction(tx_bytes)
- 
- tx_id = response.get("txId") or response.get("transactionHash") or "UNKNOWN"
- result.tx_id = tx_id
- result.status = "sent"
- 
- print(f" ✅ TX-ID: {tx_id}")
- 
- except Exception as e:
- result.error = str(e)
- result.status = "error"
- print(f" ❌ Error: {e}")
- import traceback
- traceback.print_exc()
- 
- return result
-
 def check_balance(rpc, identity: str) -> int:
  """Check balance of an identity."""
  try:
@@ -249,7 +131,10 @@ def main() -> int:
  
  try:
  from qubipy.rpc import rpc_client
+ from scripts.core.qubic_transactions import TransactionSigner
+ from scripts.core.tick_scheduler import ScheduledTx, TickScheduler
  rpc = rpc_client.QubiPy_RPC()
+ signer = TransactionSigner()
  print("✅ RPC connection established")
  except Exception as e:
  print(f"❌ RPC connection failed: {e}")
@@ -299,59 +184,53 @@ def main() -> int:
  print()
  
  all_results = []
+ scheduler = TickScheduler(rpc, signer, tick_offset=TARGET_TICK_OFFSET)
  
  # Teste jeden Payload mit allen 8 Identities
  for payload_info in PAYLOADS:
- payload_name = payload_info["name"]
  payload = payload_info["payload"]
  
  print(f"Payload: '{payload}' ({payload_info['description']})")
- print()
- 
- payload_results = []
  
  for item in LAYER2_IDENTITIES:
  label = item["label"]
- seed = item["seed"]
  identity = item["identity"]
  balance = layer2_balances.get(identity, 0)
  
- print(f" {label}:")
- 
  # Check ob genug Balance vorhanden
  if balance < 1_000_000: # Mindestens 1 QUBIC
- print(f" ⚠️ Insufficient balance: {balance / 1_000_000:.2f} QUBIC")
- result = TxResult(
- label=label,
- identity=identity,
- payload=payload,
- amount=1,
- tx_id=None,
- status="insufficient_balance",
- error=f"Insufficient balance: {balance} QU",
- )
- payload_results.append(result)
+ print(f" {label}: ⚠️ Insufficient balance: {balance / 1_000_000:.2f} QUBIC")
  continue
  
- # Sende Transaktion
- result = send_transaction(
- rpc=rpc,
- seed=seed,
- identity=identity,
+ # 1 QUBIC pro Transaktion (in microQU)
+ scheduler.submit(ScheduledTx(
+ label=label,
+ seed=item["seed"],
  dest_identity=MASTER_IDENTITY,
+ amount=1_000_000,
  payload=payload,
- amount=1, # 1 QUBIC pro Transaktion
- )
+ source_identity=identity,
+ ))
  
- result.label = label
- payload_results.append(result)
- all_results.append(result)
+ print()
  
- # Rate limiting
- time.sleep(3.0)
+ # Scheduler verteilt die Transaktionen auf aufeinanderfolgende Ticks,
+ # sendet parallel und wartet auf Inklusion statt fester Pausen
+ for tx in scheduler.run():
+ icon = "✅" if tx.status == "confirmed" else "❌"
+ print(f" {icon} {tx.label} '{tx.payload}': {tx.status} (tick {tx.target_tick}, TX-ID {tx.tx_id})")
+ all_results.append(TxResult(
+ label=tx.label,
+ identity=tx.source_identity,
+ payload=tx.payload,
+ amount=1,
+ tx_id=tx.tx_id,
+ status=tx.status,
+ error=tx.error,
+ target_tick=tx.target_tick,
+ ))
  
  print()
- time.sleep(5.0) # Pause zwischen Payloads
  
  # Check Master Identity Balance und Assets NACHHER
  print("=" * 80)
@@ -359,8 +238,6 @@ def main() -> int:
  print("=" * 80)
  print()
  
- time.sleep(10.0) # Warte auf Bestätigung
- 
  master_balance_after = check_balance(rpc, MASTER_IDENTITY)
  master_assets_after = []
  try:
@@ -418,7 +295,7 @@ def main() -> int:
  print()
  
  # Zusammenfassung
- successful = [r for r in all_results if r.status == "sent"]
+ successful = [r for r in all_results if r.status == "confirmed"]
  print(f"✅ {len(successful)} successful transaction(s)")
  print(f"❌ {len(all_results) - len(successful)} failed transaction(s)")
  print()
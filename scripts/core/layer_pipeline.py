@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Staged streaming pipeline for multi-layer identity derivation.
+
+derive_all_23k.py derived every Layer-2 identity before it started Layer-3,
+and the Layer-4/5 scripts re-read those outputs for another full pass, so a
+multi-layer run took the sum of the passes. Here every layer is a stage of its
+own, connected by bounded queues:
+
+    source (Layer-N identities) -> Layer-N+1 -> ... -> Layer-M -> RPC check -> writer
+
+- each derivation stage owns its backend (with "pool" its own worker
+  processes), so Layer-3 derives batch k while Layer-2 derives batch k+1 and
+  the run takes about as long as the slowest stage,
+- queues hold at most `depth` batches: a slow stage throttles the ones in front
+  of it instead of buffering the corpus in memory,
+- the optional RPC stage checks the identities of selected layers with a
+  thread pool (qubipy `get_balance`); flags stored as unknown ("?", the
+  request failed) are re-queried in place after every run, so a rerun also
+  retries the failures of earlier runs,
+- the writer appends every batch as soon as it leaves the last stage, one
+  fixed-width column file per layer (`layer3.col`: 60 characters + newline per
+  row, "-" padding for identities that could not be derived), so row i of
+  every column belongs to the same source identity, a column can be read line
+  by line or `numpy.memmap`ped, and a rerun resumes after the last complete row.
+
+Usage:
+    python3 scripts/core/layer_pipeline.py --layers 5                 # Layer-1 -> 2..5 from the mapping database
+    python3 scripts/core/layer_pipeline.py --layers 4 --rpc-layer 4   # plus on-chain check of Layer-4
+    python3 scripts/core/layer_pipeline.py --layers 3 --limit 1000 --fresh
+
+    from scripts.core.layer_pipeline import LayerPipeline, iter_rows
+
+    LayerPipeline(OUTPUT_DIR / "layer_columns", source, start_layer=1, end_layer=5).run()
+    for row in iter_rows(OUTPUT_DIR / "layer_columns"):
+        ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.derivation_backends import make_backend
+
+OUTPUT_DIR = project_root / "outputs" / "derived"
+MAPPING_FILE = project_root / "outputs" / "analysis" / "complete_mapping_database.json"
+COLUMNS_DIR = OUTPUT_DIR / "layer_columns"
+
+BATCH_SIZE = 1024
+QUEUE_DEPTH = 4  # batches in flight between two stages
+RPC_WORKERS = 8
+
+IDENTITY_WIDTH = 60
+MISSING = "-" * IDENTITY_WIDTH
+ONCHAIN_CODES = {True: "1", False: "0", None: "?"}
+
+def identity_to_seed(identity: str) -> str:
+    """Seed of the next layer: the identity, lower-cased, first 55 characters."""
+    return identity.lower()[:55]
+
+def layer_column(layer: int) -> str:
+    return f"layer{layer}"
+
+def onchain_column(layer: int) -> str:
+    return f"onchain_layer{layer}"
+
+@dataclass
+class Batch:
+    """Consecutive source rows and the columns filled in so far."""
+
+    start: int
+    columns: Dict[str, List[Any]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values())))
+
+# --- Columnar output ------------------------------------------------------------
+
+class ColumnWriter:
+    """Append-only fixed-width column files plus a manifest."""
+
+    def __init__(self, out_dir: Path, widths: Dict[str, int], source: str, fresh: bool = False) -> None:
+        self.out_dir = Path(out_dir)
+        self.widths = widths
+        self.source = source
+        self.manifest_path = self.out_dir / "manifest.json"
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._read_manifest()
+        if fresh or manifest.get("source") != source or manifest.get("columns") != widths:
+            for name in widths:
+                self._path(name).unlink(missing_ok=True)
+        self.rows = min((self._rows_on_disk(name) for name in widths), default=0)
+        self._files = {}
+        for name in widths:
+            fh = self._path(name).open("ab")
+            fh.truncate(self.rows * (widths[name] + 1))  # drop a half-written batch
+            self._files[name] = fh
+        self._write_manifest(complete=False)
+
+    def _path(self, name: str) -> Path:
+        return self.out_dir / f"{name}.col"
+
+    def _rows_on_disk(self, name: str) -> int:
+        path = self._path(name)
+        return path.stat().st_size // (self.widths[name] + 1) if path.exists() else 0
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        if not self.manifest_path.exists():
+            return {}
+        with self.manifest_path.open() as f:
+            return json.load(f)
+
+    def _write_manifest(self, complete: bool) -> None:
+        tmp = self.manifest_path.with_suffix(".tmp")
+        with tmp.open("w") as f:
+            json.dump({
+                "source": self.source,
+                "columns": self.widths,
+                "rows": self.rows,
+                "complete": complete,
+                "updated": datetime.now().isoformat(),
+            }, f, indent=2)
+        tmp.replace(self.manifest_path)
+
+    def write(self, batch: Batch) -> None:
+        if batch.start != self.rows:
+            raise RuntimeError(f"batch at row {batch.start}, writer at row {self.rows}")
+        for name, width in self.widths.items():
+            lines = []
+            for value in batch.columns[name]:
+                if value is None:
+                    value = MISSING if width == IDENTITY_WIDTH else ONCHAIN_CODES[None]
+                elif isinstance(value, bool):
+                    value = ONCHAIN_CODES[value]
+                lines.append(value.ljust(width)[:width])
+            self._files[name].write(("\n".join(lines) + "\n").encode("ascii"))
+            self._files[name].flush()
+        self.rows += len(batch)
+        self._write_manifest(complete=False)
+
+    def close(self, complete: bool) -> None:
+        for fh in self._files.values():
+            fh.close()
+        self._write_manifest(complete)
+
+def read_manifest(out_dir: Path) -> Dict[str, Any]:
+    with (Path(out_dir) / "manifest.json").open() as f:
+        return json.load(f)
+
+def iter_column(out_dir: Path, name: str) -> Iterator[Any]:
+    """Values of one column: identities (None if missing) or on-chain flags (True/False/None)."""
+    manifest = read_manifest(out_dir)
+    width = manifest["columns"][name]
+    decode = {code: flag for flag, code in ONCHAIN_CODES.items()}
+    with (Path(out_dir) / f"{name}.col").open() as f:
+        for line in islice(f, manifest["rows"]):
+            value = line[:width]
+            if width == IDENTITY_WIDTH:
+                yield None if value == MISSING else value
+            else:
+                yield decode[value]
+
+def iter_rows(out_dir: Path, columns: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Rows as dicts over the selected (default: all) columns."""
+    names = list(columns or read_manifest(out_dir)["columns"])
+    for index, values in enumerate(zip(*(iter_column(out_dir, name) for name in names))):
+        yield {"index": index, **dict(zip(names, values))}
+
+def recheck_onchain(
+    out_dir: Path,
+    layers: Sequence[int],
+    check: Callable[[str], Optional[bool]],
+    workers: int = RPC_WORKERS,
+) -> Dict[int, Tuple[int, int]]:
+    """Re-query the unknown on-chain flags of `layers` and rewrite them in place.
+
+    Returns {layer: (unknown before, resolved now)}.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for layer in layers:
+            todo = [
+                (index, identity)
+                for index, (identity, flag) in enumerate(zip(
+                    iter_column(out_dir, layer_column(layer)), iter_column(out_dir, onchain_column(layer))
+                ))
+                if identity and flag is None
+            ]
+            flags = list(pool.map(lambda item: check(item[1]), todo))
+            resolved = 0
+            with (Path(out_dir) / f"{onchain_column(layer)}.col").open("r+b") as fh:
+                for (index, _), flag in zip(todo, flags):
+                    if flag is not None:
+                        fh.seek(index * 2)  # width 1 + newline
+                        fh.write(ONCHAIN_CODES[flag].encode("ascii"))
+                        resolved += 1
+            results[layer] = (len(todo), resolved)
+    return results
+
+# --- Stages ---------------------------------------------------------------------
+
+_DONE = object()
+
+@dataclass
+class StageStats:
+    name: str
+    rows: int = 0
+    busy: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.rows / self.busy if self.busy > 0 else 0.0
+
+def make_rpc_check() -> Callable[[str], Optional[bool]]:
+    """`identity -> on-chain?` with qubipy's RPC client (None if the request fails)."""
+    from qubipy.rpc import rpc_client
+
+    rpc = rpc_client.QubiPy_RPC()
+
+    def check(identity: str) -> Optional[bool]:
+        try:
+            return rpc.get_balance(identity) is not None
+        except Exception:
+            return None
+
+    return check
+
+class LayerPipeline:
+    """Source identities of `start_layer` -> derived layers up to `end_layer` -> columns."""
+
+    def __init__(
+        self,
+        out_dir: Path,
+        source: Iterable[str],
+        start_layer: int = 1,
+        end_layer: int = 3,
+        source_name: str = "",
+        total: Optional[int] = None,
+        backend: str = "pool",
+        workers: Optional[int] = None,
+        rpc_layers: Sequence[int] = (),
+        rpc_check: Optional[Callable[[str], Optional[bool]]] = None,
+        rpc_workers: int = RPC_WORKERS,
+        batch_size: int = BATCH_SIZE,
+        depth: int = QUEUE_DEPTH,
+        fresh: bool = False,
+        progress_every: int = 10_000,
+    ) -> None:
+        if end_layer <= start_layer:
+            raise ValueError("end_layer must be above start_layer")
+        self.layers = list(range(start_layer + 1, end_layer + 1))
+        self.rpc_layers = [layer for layer in rpc_layers if start_layer <= layer <= end_layer]
+        self.source = source
+        self.start_layer = start_layer
+        self.total = total
+        self.batch_size = batch_size
+        self.depth = depth
+        self.progress_every = progress_every
+        # the derivation stages split the CPUs between them
+        per_stage = workers or max(1, (os.cpu_count() or 1) // len(self.layers))
+        self.backend_name = backend
+        self.backend_workers = per_stage
+        self.rpc_check = rpc_check
+        self.rpc_workers = rpc_workers
+        widths = {layer_column(start_layer): IDENTITY_WIDTH}
+        widths.update({layer_column(layer): IDENTITY_WIDTH for layer in self.layers})
+        widths.update({onchain_column(layer): 1 for layer in self.rpc_layers})
+        self.writer = ColumnWriter(
+            out_dir, widths, source_name or f"layer{start_layer}->layer{end_layer}", fresh=fresh
+        )
+        self.stats: List[StageStats] = []
+        self._errors: List[BaseException] = []
+
+    # Each stage thread: take a batch, fill in its column(s), pass it on.
+    def _stage(self, stats: StageStats, fn: Callable[[Batch], None], inbox: queue.Queue, outbox: queue.Queue) -> None:
+        try:
+            while True:
+                batch = inbox.get()
+                if batch is _DONE:
+                    break
+                if self._errors:
+                    continue  # drain so upstream does not block
+                started = time.perf_counter()
+                try:
+                    fn(batch)
+                except BaseException as exc:
+                    self._errors.append(exc)
+                    continue
+                stats.busy += time.perf_counter() - started
+                stats.rows += len(batch)
+                outbox.put(batch)
+        finally:
+            outbox.put(_DONE)
+
+    def _feed(self, outbox: queue.Queue) -> None:
+        column = layer_column(self.start_layer)
+        try:
+            items = islice(iter(self.source), self.writer.rows, None)
+            start = self.writer.rows
+            while not self._errors:
+                chunk = [identity or None for identity in islice(items, self.batch_size)]
+                if not chunk:
+                    break
+                outbox.put(Batch(start, {column: chunk}))
+                start += len(chunk)
+        except BaseException as exc:
+            self._errors.append(exc)
+        finally:
+            outbox.put(_DONE)
+
+    def _derive_fn(self, layer: int) -> Callable[[Batch], None]:
+        backend = make_backend(self.backend_name, self.backend_workers)
+        self._backends.append(backend)
+        parent = layer_column(layer - 1)
+
+        def derive(batch: Batch) -> None:
+            parents = batch.columns[parent]
+            todo = [idx for idx, identity in enumerate(parents) if identity]
+            derived: List[Optional[str]] = [None] * len(parents)
+            identities = backend.derive_batch([identity_to_seed(parents[idx]) for idx in todo])
+            for idx, identity in zip(todo, identities):
+                derived[idx] = identity
+            batch.columns[layer_column(layer)] = derived
+
+        return derive
+
+    def _rpc_fn(self) -> Callable[[Batch], None]:
+        check = self._check = self.rpc_check or make_rpc_check()
+        pool = ThreadPoolExecutor(max_workers=self.rpc_workers)
+        self._pools.append(pool)
+
+        def rpc(batch: Batch) -> None:
+            for layer in self.rpc_layers:
+                identities = batch.columns[layer_column(layer)]
+                flags = pool.map(lambda identity: check(identity) if identity else None, identities)
+                batch.columns[onchain_column(layer)] = list(flags)
+
+        return rpc
+
+    def _progress(self, started: float, resumed: int) -> None:
+        done = self.writer.rows - resumed
+        elapsed = time.perf_counter() - started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        line = f"  Written: {self.writer.rows:,}"
+        if self.total:
+            remaining = (self.total - self.writer.rows) / rate if rate > 0 else 0
+            line += f"/{self.total:,} ({self.writer.rows / self.total * 100:.1f}%) - ETA: {remaining / 60:.1f} min"
+        print(f"{line} - {rate:,.0f} rows/s", flush=True)
+
+    def run(self) -> Dict[str, Any]:
+        """Run all stages to completion; returns rows, wall time and per-stage rates."""
+        self._backends: List[Any] = []
+        self._pools: List[ThreadPoolExecutor] = []
+        steps = [(f"layer{layer}", self._derive_fn(layer)) for layer in self.layers]
+        if self.rpc_layers:
+            steps.append(("rpc", self._rpc_fn()))
+
+        resumed = self.writer.rows
+        if resumed:
+            print(f"↻ Resuming after row {resumed:,}")
+        queues = [queue.Queue(maxsize=self.depth) for _ in range(len(steps) + 1)]
+        threads = [threading.Thread(target=self._feed, args=(queues[0],), daemon=True)]
+        for idx, (name, fn) in enumerate(steps):
+            stats = StageStats(name)
+            self.stats.append(stats)
+            threads.append(threading.Thread(
+                target=self._stage, args=(stats, fn, queues[idx], queues[idx + 1]), daemon=True
+            ))
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        writer_stats = StageStats("writer")
+        self.stats.append(writer_stats)
+        next_report = resumed + self.progress_every
+        try:
+            while True:
+                batch = queues[-1].get()
+                if batch is _DONE:
+                    break
+                if self._errors:
+                    continue
+                t0 = time.perf_counter()
+                self.writer.write(batch)
+                writer_stats.busy += time.perf_counter() - t0
+                writer_stats.rows += len(batch)
+                if self.writer.rows >= next_report:
+                    self._progress(started, resumed)
+                    next_report += self.progress_every
+        except BaseException as exc:  # Ctrl-C: let the stages finish their batch and drain
+            self._errors.append(exc)
+            print("\n⏹ Stopping - stages finish their current batch, written rows are kept", flush=True)
+            while queues[-1].get() is not _DONE:
+                pass
+        finally:
+            for thread in threads:
+                thread.join()
+            for backend in self._backends:
+                backend.close()
+            for pool in self._pools:
+                pool.shutdown()
+            self.writer.close(complete=not self._errors)
+        if self._errors:
+            raise self._errors[0]
+
+        rechecked = {}
+        if self.rpc_layers:
+            rechecked = recheck_onchain(self.writer.out_dir, self.rpc_layers, self._check, self.rpc_workers)
+        wall = time.perf_counter() - started
+        return {
+            "rows": self.writer.rows,
+            "new_rows": self.writer.rows - resumed,
+            "seconds": round(wall, 2),
+            "stages": {stats.name: {"rows": stats.rows, "busy_seconds": round(stats.busy, 2),
+                                    "rows_per_second": round(stats.rate, 1)} for stats in self.stats},
+            "rechecked": {layer_column(layer): {"unknown": unknown, "resolved": resolved}
+                          for layer, (unknown, resolved) in rechecked.items()},
+        }
+
+# --- Sources ----------------------------------------------------------------------
+
+def mapping_source(path: Path = MAPPING_FILE, limit: Optional[int] = None) -> Iterator[str]:
+    """Layer-1 identities of the mapping database in sorted seed order."""
+    from scripts.analysis.mapping_stream import MappingStage
+
+    with MappingStage(path) as stage:
+        for entry in stage.iter_entries(limit):
+            yield entry["real_id"]
+
+def mapping_count(path: Path = MAPPING_FILE, limit: Optional[int] = None) -> int:
+    from scripts.analysis.mapping_stream import MappingStage
+
+    with MappingStage(path) as stage:
+        return stage.count(limit)
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    print(f"✅ {summary['rows']:,} rows ({summary['new_rows']:,} new) in {summary['seconds']:.1f}s")
+    for name, stage in summary["stages"].items():
+        print(f"  {name:<10} {stage['rows']:>8,} rows  busy {stage['busy_seconds']:>8.1f}s  "
+              f"{stage['rows_per_second']:>10,.0f} rows/s")
+    for name, counts in summary.get("rechecked", {}).items():
+        if counts["unknown"]:
+            print(f"  ↻ {name}: {counts['resolved']:,}/{counts['unknown']:,} unknown on-chain flags resolved on retry")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--layers", type=int, default=3, help="Derive up to this layer (default: 3).")
+    parser.add_argument("--mapping", type=Path, default=MAPPING_FILE, help="Mapping database (Layer-1 source).")
+    parser.add_argument("--out", type=Path, default=COLUMNS_DIR)
+    parser.add_argument("--limit", type=int, default=None, help="Only the first N seeds.")
+    parser.add_argument("--backend", default="pool", choices=["auto", "qubipy", "portable", "pool", "docker", "gateway"])
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes per derivation stage.")
+    parser.add_argument("--rpc-layer", type=int, action="append", default=[], help="Check this layer on-chain (repeatable).")
+    parser.add_argument("--rpc-workers", type=int, default=RPC_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--depth", type=int, default=QUEUE_DEPTH, help="Batches buffered between two stages.")
+    parser.add_argument("--fresh", action="store_true", help="Discard existing columns instead of resuming.")
+    args = parser.parse_args()
+
+    if not args.mapping.exists():
+        sys.exit(f"❌ Mapping file not found: {args.mapping}")
+
+    print("=" * 80)
+    print(f"LAYER PIPELINE: LAYER-1 -> LAYER-{args.layers}")
+    print("=" * 80)
+    print()
+    total = mapping_count(args.mapping, args.limit)
+    pipeline = LayerPipeline(
+        args.out,
+        mapping_source(args.mapping, args.limit),
+        start_layer=1,
+        end_layer=args.layers,
+        source_name=f"{args.mapping.name}:{args.limit or 'all'}",
+        total=total,
+        backend=args.backend,
+        workers=args.workers,
+        rpc_layers=args.rpc_layer,
+        rpc_workers=args.rpc_workers,
+        batch_size=args.batch_size,
+        depth=args.depth,
+        fresh=args.fresh,
+    )
+    print(f"✅ {total:,} source identities, stages: "
+          f"{' -> '.join(f'Layer-{layer}' for layer in pipeline.layers)}"
+          f"{' -> RPC' if pipeline.rpc_layers else ''} -> {args.out}")
+    print()
+    summary = pipeline.run()
+    print()
+    print_summary(summary)
+
+if __name__ == "__main__":
+    main()
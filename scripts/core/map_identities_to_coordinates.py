@@ -6,18 +6,24 @@ Analysiert die räumliche Verteilung der Identities in der Matrix.
 """
 
 import json
+import sys
 import numpy as np
 from pathlib import Path
 from collections import defaultdict, Counter
 from typing import List, Dict, Tuple
 
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.matrix_path_index import ENCODINGS, PathIndex
+
 OUTPUT_DIR = Path("outputs/derived")
 REPORTS_DIR = Path("outputs/reports")
 
 def load_anna_matrix():
  """Load Anna Matrix."""
  from analysis.utils.data_loader import load_anna_matrix
- return load_anna_matrix()
+ return load_anna_matrix().matrix
 
 def load_onchain_identities() -> List[str]:
  """Load alle on-chain Identities."""
@@ -41,15 +47,39 @@ def load_onchain_identities() -> List[str]:
 
 def find_identity_coordinates(matrix: np.ndarray, identity: str) -> List[Tuple[int, int]]:
  """Finde alle Koordinaten wo diese Identity gefunden wurde."""
- # Vereinfachte Suche - in echt müsste man die Extraction-Methoden nachvollziehen
- # Für jetzt: Suche nach Base-26 encoded patterns
+ # Pfad-Index über alle Extraktions-Pfade (beide Base-26 Kodierungen, beide Richtungen)
  coordinates = []
- 
- # TODO: Implementiere echte Koordinaten-Suche basierend auf Extraction-Methoden
- # Für jetzt: Placeholder
+ for encoding in ENCODINGS:
+ index = PathIndex.from_matrix(matrix, encoding=encoding)
+ for hit in index.lookup_identity(identity):
+ coordinates.extend(index.coordinates(hit))
  
  return coordinates
 
+def map_identities(matrix: np.ndarray, identities: List[str]) -> Tuple[Dict[str, List[Dict]], List[Tuple[int, int]]]:
+ """Batch-Lookup aller Identities gegen alle Matrix-Pfade (ein Hash-Lookup pro Identity)."""
+ bodies = {identity[:56].upper(): identity for identity in identities if len(identity) >= 56}
+ mappings: Dict[str, List[Dict]] = defaultdict(list)
+ all_coordinates: List[Tuple[int, int]] = []
+ 
+ for encoding in ENCODINGS:
+ index = PathIndex.from_matrix(matrix, encoding=encoding)
+ for body, hits in index.lookup_many(bodies).items():
+ for hit in hits:
+ cells = index.coordinates(hit)
+ all_coordinates.extend(cells)
+ mappings[bodies[body]].append({
+ "encoding": encoding,
+ "family": hit.family,
+ "line": hit.key,
+ "offset": hit.start,
+ "reverse": hit.reverse,
+ "start": cells[0],
+ "end": cells[-1],
+ })
+ 
+ return dict(mappings), all_coordinates
+
 def analyze_spatial_distribution(coordinates: List[Tuple[int, int]], matrix_size: Tuple[int, int]) -> Dict:
  """Analyze räumliche Verteilung."""
  
@@ -101,37 +131,36 @@ def main():
  
  print("Loading on-chain identities...")
  identities = load_onchain_identities()
+ identities = [
+ identity if isinstance(identity, str) else identity.get("identity", "")
+ for identity in identities
+ ]
  print(f"✅ {len(identities):,} identities loaded")
  print()
  
- print("Mapping identities to coordinates...")
- print("(This requires implementing coordinate search based on extraction methods)")
- print()
+ print("Mapping identities to coordinates (path index)...")
+ mappings, all_coordinates = map_identities(matrix, identities)
+ family_counts = Counter(hit["family"] for hits in mappings.values() for hit in hits)
+ spatial = analyze_spatial_distribution(all_coordinates, matrix.shape)
  
- # TODO: Implementiere echte Koordinaten-Mapping
- # Für jetzt: Placeholder-Analyse
- 
- print("=" * 80)
- print("NOTE: Coordinate mapping requires implementation")
- print("=" * 80)
- print()
- print("To implement:")
- print("1. Track coordinates during identity extraction")
- print("2. Store coordinate-identity mapping")
- print("3. Analyze spatial patterns")
+ print(f"✅ {len(mappings):,} of {len(identities):,} identities found on a matrix path")
+ for family, count in family_counts.most_common():
+ print(f" {family}: {count}")
  print()
  
- # Speichere Placeholder
  OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
  json_file = OUTPUT_DIR / "identity_coordinate_mapping.json"
  with json_file.open("w") as f:
  json.dump({
- "note": "Coordinate mapping requires implementation",
  "total_identities": len(identities),
- "matrix_size": matrix.shape,
+ "mapped_identities": len(mappings),
+ "matrix_size": list(matrix.shape),
+ "hits_by_family": dict(family_counts),
+ "spatial_distribution": spatial,
+ "mappings": mappings,
  }, f, indent=2)
  
- print(f"💾 Placeholder saved to: {json_file}")
+ print(f"💾 Mapping saved to: {json_file}")
 
 if __name__ == "__main__":
  main()
@@ -13,6 +13,10 @@ Methods:
 4. Interleaved: Alternating characters from each seed
 
 If the 'Treasure' is not in the 8 wallets, it might be in the wallet formed by their union.
+
+This script checks one fixed ordering per method. For every subset/permutation of the
+Layer-1/Layer-2 seeds (batched derivation + cached on-chain check) use:
+ python3 scripts/core/fusion_search.py --pool layer1
 """
 
 from __future__ import annotations
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Reverse path index: locate identities and seeds inside the Anna Matrix.
+
+Every extraction path is read once into a letter string ("line") and every
+55-character window of every line goes into a hash map
+`window -> [(line, offset)]`. A lookup is then one dict access per query
+(plus one for the reversed query) instead of rebuilding 56-character strings
+for every cell:
+
+- rows, columns, diagonals, anti-diagonals,
+- row-major / column-major strides (2, 3, 4) and the cyclic 1649-step walk,
+- clockwise and counter-clockwise spirals over the whole matrix,
+- the 64 concentric rings (cyclic),
+- the block scans of the pattern registry (`PATTERNS`, 4 blocks of 14 cells,
+  as used by comprehensive_matrix_scan.py).
+
+Lines are indexed in one direction only; reversed reads are found by looking
+up the reversed query. Bodies (56) and seeds (55) use the same windows: a
+query longer than 55 characters is verified against the line after the
+window lookup.
+
+Usage:
+    from scripts.core.matrix_path_index import PathIndex
+
+    index = PathIndex.from_matrix(matrix)                   # encoding "mod" or "abs"
+    for hit in index.lookup(identity[:56]):
+        print(hit.family, hit.reverse, index.coordinates(hit)[0])
+    hits_by_identity = index.lookup_many(bodies)          # batch hash join
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+Position = Tuple[int, int]
+PatternFunc = Callable[[int, int], Sequence[Position]]
+
+MATRIX_SIZE = 128
+WINDOW = 55  # seed length; identity bodies (56) are verified after the window lookup
+STRIDES = (2, 3, 4)
+STEP_WALK = 1649
+
+# Base-26 conventions used across the repo: `int(v) % 26` (extraction scripts)
+# and `int(abs(v)) % 26` (analysis.utils.identity_tools.base26_char)
+ENCODINGS: Dict[str, Callable[[float], str]] = {
+    "mod": lambda value: chr(ord("A") + int(value) % 26),
+    "abs": lambda value: chr(ord("A") + int(abs(value)) % 26),
+}
+
+# --- pattern registry (14-cell block builders) ---------------------------------
+
+def diag_main(base_r: int, base_c: int) -> Sequence[Position]:
+    """Main diagonal: (r+j, c+j)"""
+    return [(base_r + j, base_c + j) for j in range(14)]
+
+def diag_reverse(base_r: int, base_c: int) -> Sequence[Position]:
+    """Reverse diagonal: (r+j, c+(13-j))"""
+    return [(base_r + j, base_c + (13 - j)) for j in range(14)]
+
+def vertical_stride(base_r: int, base_c: int) -> Sequence[Position]:
+    """Vertical stride pattern"""
+    return [(base_r + j, base_c + (j % 4)) for j in range(14)]
+
+def horizontal_stride(base_r: int, base_c: int) -> Sequence[Position]:
+    """Horizontal stride pattern"""
+    return [(base_r + (j % 4), base_c + j) for j in range(14)]
+
+def zigzag_snake(base_r: int, base_c: int) -> Sequence[Position]:
+    """Zigzag snake pattern"""
+    coords: List[Position] = []
+    for j in range(14):
+        row = base_r + j
+        col = base_c + (j if j % 2 == 0 else 13 - j)
+        coords.append((row, col))
+    return coords
+
+def row_scan(base_r: int, base_c: int) -> Sequence[Position]:
+    """Simple row scan"""
+    return [(base_r, base_c + j) for j in range(14)]
+
+def column_scan(base_r: int, base_c: int) -> Sequence[Position]:
+    """Simple column scan"""
+    return [(base_r + j, base_c) for j in range(14)]
+
+def spiral_pattern(base_r: int, base_c: int) -> Sequence[Position]:
+    """Spiral pattern starting from base"""
+    coords: List[Position] = []
+    directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+    r, c = base_r, base_c
+    step = 1
+    dir_idx = 0
+
+    for _ in range(14):
+        coords.append((r, c))
+        dr, dc = directions[dir_idx]
+        r += dr
+        c += dc
+        step -= 1
+        if step == 0:
+            dir_idx = (dir_idx + 1) % 4
+            if dir_idx % 2 == 0:
+                step += 1
+    return coords
+
+def l_shape(base_r: int, base_c: int) -> Sequence[Position]:
+    """L-shaped pattern"""
+    coords: List[Position] = []
+    for j in range(7):
+        coords.append((base_r + j, base_c))
+    for j in range(1, 8):
+        coords.append((base_r + 6, base_c + j))
+    return coords[:14]
+
+PATTERNS: Dict[str, PatternFunc] = {
+    "diag_main": diag_main,
+    "diag_reverse": diag_reverse,
+    "vertical_stride": vertical_stride,
+    "horizontal_stride": horizontal_stride,
+    "zigzag_snake": zigzag_snake,
+    "row_scan": row_scan,
+    "column_scan": column_scan,
+    "spiral": spiral_pattern,
+    "l_shape": l_shape,
+}
+
+def block_scan_paths(builder: PatternFunc, size: int = MATRIX_SIZE) -> Iterator[Tuple[Tuple[int, int, int], List[Position]]]:
+    """((start_row, start_col, block_offset), 56-cell path) for the 4-block scan of one builder."""
+    for start_row in range(0, size, 16):
+        for start_col in range(0, size, 16):
+            for block_offset in [0, 8]:
+                path: List[Position] = []
+                for block in range(4):
+                    base_r = start_row + (block // 2) * 16 + block_offset
+                    base_c = start_col + (block % 2) * 16 + block_offset
+                    if base_r >= size or base_c >= size:
+                        continue
+                    for row, col in builder(base_r, base_c):
+                        if row >= size or col >= size:
+                            continue
+                        path.append((row, col))
+                if len(path) >= 56:
+                    yield (start_row, start_col, block_offset), path[:56]
+
+# --- full-length lines ------------------------------------------------------------
+
+def _rows(n: int) -> Iterator[Tuple[object, List[Position], bool]]:
+    for r in range(n):
+        yield r, [(r, c) for c in range(n)], False
+
+def _columns(n: int) -> Iterator[Tuple[object, List[Position], bool]]:
+    for c in range(n):
+        yield c, [(r, c) for r in range(n)], False
+
+def _diagonals(n: int) -> Iterator[Tuple[object, List[Position], bool]]:
+    for d in range(-(n - 1), n):  # d = c - r
+        yield d, [(r, r + d) for r in range(max(0, -d), min(n, n - d))], False
+
+def _anti_diagonals(n: int) -> Iterator[Tuple[object, List[Position], bool]]:
+    for s in range(2 * n - 1):  # s = r + c, read top-right to bottom-left
+        yield s, [(r, s - r) for r in range(max(0, s - n + 1), min(n, s + 1))], False
+
+def _row_major_stride(step: int) -> Callable[[int], Iterator[Tuple[object, List[Position], bool]]]:
+    def lines(n: int) -> Iterator[Tuple[object, List[Position], bool]]:
+        for offset in range(step):
+            yield offset, [divmod(i, n) for i in range(offset, n * n, step)], False
+    return lines
+
+def _column_major_stride(step: int) -> Callable[[int], Iterator[Tuple[object, List[Position], bool]]]:
+    def lines(n: int) -> Iterator[Tuple[object, List[Position], bool]]:
+        for offset in range(step):
+            yield offset, [divmod(i, n)[::-1] for i in range(offset, n * n, step)], False
+    return lines
+
+def _step_walk(n: int) -> Iterator[Tuple[object, List[Position], bool]]:
+    cells = n * n
+    yield STEP_WALK, [divmod(i * STEP_WALK % cells, n) for i in range(cells)], True  # 1649 is odd: one cycle
+
+def _ring(n: int, k: int) -> List[Position]:
+    """Ring k (0 = border), clockwise from its top-left corner."""
+    lo, hi = k, n - 1 - k
+    if lo == hi:
+        return [(lo, lo)]
+    top = [(lo, c) for c in range(lo, hi)]
+    right = [(r, hi) for r in range(lo, hi)]
+    bottom = [(hi, c) for c in range(hi, lo, -1)]
+    left = [(r, lo) for r in range(hi, lo, -1)]
+    return top + right + bottom + left
+
+def _rings(n: int) -> Iterator[Tuple[object, List[Position], bool]]:
+    for k in range((n + 1) // 2):
+        yield k, _ring(n, k), True
+
+def _spiral_clockwise(n: int) -> Iterator[Tuple[object, List[Position], bool]]:
+    yield "outside_in", [cell for k in range((n + 1) // 2) for cell in _ring(n, k)], False
+
+def _spiral_counterclockwise(n: int) -> Iterator[Tuple[object, List[Position], bool]]:
+    yield "outside_in", [(c, r) for k in range((n + 1) // 2) for r, c in _ring(n, k)], False
+
+LINE_FAMILIES: Dict[str, Callable[[int], Iterator[Tuple[object, List[Position], bool]]]] = {
+    "row": _rows,
+    "column": _columns,
+    "diagonal": _diagonals,
+    "anti_diagonal": _anti_diagonals,
+    **{f"row_stride{step}": _row_major_stride(step) for step in STRIDES},
+    **{f"column_stride{step}": _column_major_stride(step) for step in STRIDES},
+    "step1649": _step_walk,
+    "spiral_cw": _spiral_clockwise,
+    "spiral_ccw": _spiral_counterclockwise,
+    "ring": _rings,
+}
+
+@dataclass(frozen=True)
+class Line:
+    family: str
+    key: object  # row/column number, diagonal offset, ring number, block-scan start, ...
+    coords: Tuple[Position, ...]
+    text: str
+    cyclic: bool
+
+@dataclass(frozen=True)
+class PathHit:
+    line: int  # index into PathIndex.lines
+    family: str
+    key: object
+    start: int  # offset of the match in the line's forward text
+    length: int
+    reverse: bool  # True: the query reads the line backwards
+
+class PathIndex:
+    """55-character windows of all matrix paths -> (line, offset)."""
+
+    def __init__(self, lines: List[Line], encoding: str) -> None:
+        self.lines = lines
+        self.encoding = encoding
+        self.windows: Dict[str, List[Tuple[int, int]]] = {}
+        for line_no, line in enumerate(lines):
+            if len(line.text) < WINDOW:
+                continue
+            text = line.text + line.text[:WINDOW - 1] if line.cyclic else line.text
+            for start in range(len(line.text) if line.cyclic else len(text) - WINDOW + 1):
+                self.windows.setdefault(text[start:start + WINDOW], []).append((line_no, start))
+
+    @classmethod
+    def from_matrix(cls, matrix, encoding: str = "mod", families: Optional[Iterable[str]] = None,
+                    block_scans: bool = True) -> "PathIndex":
+        """Index a 128x128 matrix (numpy array or nested lists); cached per matrix content."""
+        rows = matrix.tolist() if hasattr(matrix, "tolist") else [list(row) for row in matrix]
+        families = tuple(families) if families is not None else tuple(LINE_FAMILIES)
+        key = (sha256(repr(rows).encode()).hexdigest(), encoding, families, block_scans)
+        index = _INDEX_CACHE.get(key)
+        if index is None:
+            index = _INDEX_CACHE[key] = cls.build(rows, encoding, families, block_scans)
+        return index
+
+    @classmethod
+    def build(cls, rows: Sequence[Sequence[float]], encoding: str = "mod",
+              families: Iterable[str] = tuple(LINE_FAMILIES), block_scans: bool = True) -> "PathIndex":
+        encode = ENCODINGS[encoding]
+        grid = [[encode(value) for value in row] for row in rows]
+        n = len(grid)
+        lines: List[Line] = []
+        for family in families:
+            for key, coords, cyclic in LINE_FAMILIES[family](n):
+                text = "".join(grid[r][c] for r, c in coords)
+                lines.append(Line(family, key, tuple(coords), text, cyclic))
+        if block_scans:
+            for name, builder in PATTERNS.items():
+                for params, path in block_scan_paths(builder, n):
+                    text = "".join(grid[r][c] for r, c in path)  # negative indices wrap, as with numpy
+                    lines.append(Line(f"scan:{name}", params, tuple(path), text, False))
+        return cls(lines, encoding)
+
+    def _find(self, text: str, reverse: bool) -> List[PathHit]:
+        hits = []
+        for line_no, start in self.windows.get(text[:WINDOW], ()):
+            line = self.lines[line_no]
+            if len(text) > len(line.text):
+                continue
+            full = line.text + line.text[:len(text) - 1] if line.cyclic else line.text
+            if full[start:start + len(text)] == text:
+                hits.append(PathHit(line_no, line.family, line.key, start, len(text), reverse))
+        return hits
+
+    def lookup(self, text: str) -> List[PathHit]:
+        """All paths containing `text` (55+ letters, any case), read forwards or backwards."""
+        text = text.upper()
+        if len(text) < WINDOW:
+            raise ValueError(f"Query braucht mindestens {WINDOW} Zeichen, hat {len(text)}")
+        hits = self._find(text, reverse=False)
+        backwards = text[::-1]
+        if backwards != text:
+            hits.extend(self._find(backwards, reverse=True))
+        return hits
+
+    def lookup_identity(self, identity: str) -> List[PathHit]:
+        """Hits for the 56-letter body of an identity (the checksum is not in the matrix)."""
+        return self.lookup(identity[:56])
+
+    def lookup_many(self, texts: Iterable[str]) -> Dict[str, List[PathHit]]:
+        """Batch lookup; only queries with at least one hit are returned."""
+        found = {}
+        for text in texts:
+            hits = self.lookup(text)
+            if hits:
+                found[text] = hits
+        return found
+
+    def coordinates(self, hit: PathHit) -> List[Position]:
+        """Matrix cells of a hit, in the order the query reads them."""
+        line = self.lines[hit.line]
+        n = len(line.coords)
+        cells = [line.coords[(hit.start + i) % n] for i in range(hit.length)]
+        return cells[::-1] if hit.reverse else cells
+
+    def families(self) -> List[str]:
+        return sorted({line.family for line in self.lines})
+
+_INDEX_CACHE: Dict[Tuple[str, str, Tuple[str, ...], bool], PathIndex] = {}
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Portable implementation of the Qubic seed → identity chain.
+
+Same results as qubipy's compiled `crypto.so` (and the Qubic core), without
+the shared library or Docker:
+
+    seed (55 × a-z)  → subseed     = K12(seed letters as 0..25, 32 bytes)
+    subseed          → private key = K12(subseed, 32 bytes)
+    private key      → public key  = encode([k]G) on FourQ
+    public key       → identity    = 4 × 14 base-26 letters (least significant
+                                     first) + 4 checksum letters from K12(pk, 3)
+
+- KangarooTwelve (K12, empty customization) in pure Python; with numpy the
+  batch functions run the Keccak-p[1600,12] permutation on all messages at
+  once (one uint64 array per state lane).
+- FourQ scalar multiplication uses a fixed-base table of the generator
+  (radix 2^WINDOW, built once per process), so a public key costs ~32 mixed
+  point additions and one inversion.
+
+`derivation_backends.make_backend("auto")` uses qubipy when its native code
+loads and this module otherwise. `scripts/verify/validate_derivation_engine.py`
+checks it against the fixture corpus generated with qubipy.
+
+Usage:
+    from scripts.core.qubic_crypto import derive_identities, identity_from_seed
+
+    identity_from_seed("a" * 55)          # BZBQFLLBNCXEMGLOBHUVFTLUPLVCPQUASSILFABOFFBCADQSSUPNWLZBQEXK
+    derive_identities(seeds)              # batched, None for invalid seeds
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+SEED_LENGTH = 55
+KEY_LENGTH = 32
+IDENTITY_LENGTH = 60
+
+# --- KangarooTwelve ---------------------------------------------------------------
+
+MASK64 = (1 << 64) - 1
+RATE = 168  # bytes, 1344-bit rate of K12 (capacity 256)
+CHUNK = 8192  # K12 tree-hashing chunk size
+ROUNDS = 12
+
+def _round_constants(rounds: int) -> List[int]:
+    """Keccak iota constants of the last `rounds` rounds (LFSR from FIPS 202)."""
+    state = 1
+    bits = []
+    for _ in range(7 * 24):
+        bits.append(state & 1)
+        state <<= 1
+        if state & 0x100:
+            state ^= 0x171
+    constants = []
+    for rnd in range(24):
+        value = 0
+        for j in range(7):
+            if bits[7 * rnd + j]:
+                value |= 1 << ((1 << j) - 1)
+        constants.append(value)
+    return constants[24 - rounds:]
+
+def _rho_pi() -> Tuple[List[int], List[int]]:
+    """Per lane x + 5y: rotation offset and target lane of the combined rho/pi step."""
+    rotations = [0] * 25
+    x, y = 1, 0
+    for t in range(24):
+        rotations[x + 5 * y] = ((t + 1) * (t + 2) // 2) % 64
+        x, y = y, (2 * x + 3 * y) % 5
+    targets = [y + 5 * ((2 * x + 3 * y) % 5) for y in range(5) for x in range(5)]
+    return rotations, targets
+
+ROUND_CONSTANTS = _round_constants(ROUNDS)
+ROTATIONS, PI_TARGETS = _rho_pi()
+_LANES = [(i, ROTATIONS[i], PI_TARGETS[i]) for i in range(25)]
+
+def keccak_p(lanes: List[int]) -> List[int]:
+    """Keccak-p[1600, 12] on 25 little-endian 64-bit lanes (index x + 5y)."""
+    a = lanes
+    for rc in ROUND_CONSTANTS:
+        c = [a[x] ^ a[x + 5] ^ a[x + 10] ^ a[x + 15] ^ a[x + 20] for x in range(5)]
+        d = [c[x - 1] ^ (((c[(x + 1) % 5] << 1) | (c[(x + 1) % 5] >> 63)) & MASK64) for x in range(5)]
+        b = [0] * 25
+        for i, rot, target in _LANES:
+            v = a[i] ^ d[i % 5]
+            b[target] = ((v << rot) | (v >> (64 - rot))) & MASK64 if rot else v
+        a = [
+            b[i] ^ (~b[i - i % 5 + (i + 1) % 5] & b[i - i % 5 + (i + 2) % 5])
+            for i in range(25)
+        ]
+        a[0] ^= rc
+    return a
+
+def _sponge(data: bytes, suffix: int, output_length: int) -> bytes:
+    """TurboSHAKE-style sponge: Keccak-p[1600,12], rate 168, delimited suffix."""
+    padded = bytearray(data)
+    padded.append(suffix)
+    padded.extend(b"\0" * (-len(padded) % RATE))
+    padded[-1] ^= 0x80
+    lanes = [0] * 25
+    for start in range(0, len(padded), RATE):
+        block = padded[start:start + RATE]
+        for i in range(RATE // 8):
+            lanes[i] ^= int.from_bytes(block[8 * i:8 * i + 8], "little")
+        lanes = keccak_p(lanes)
+    out = bytearray()
+    while True:
+        out += b"".join(lane.to_bytes(8, "little") for lane in lanes[:RATE // 8])
+        if len(out) >= output_length:
+            return bytes(out[:output_length])
+        lanes = keccak_p(lanes)
+
+def _length_encode(value: int) -> bytes:
+    encoded = value.to_bytes((value.bit_length() + 7) // 8, "big") if value else b""
+    return encoded + bytes([len(encoded)])
+
+def kangaroo_twelve(data: bytes, output_length: int = 32, customization: bytes = b"") -> bytes:
+    """KangarooTwelve(data, customization, output_length) - qubipy's `kangaroo_twelve`."""
+    s = bytes(data) + customization + _length_encode(len(customization))
+    if len(s) <= CHUNK:
+        return _sponge(s, 0x07, output_length)
+    chunks = [s[i:i + CHUNK] for i in range(CHUNK, len(s), CHUNK)]
+    node = bytearray(s[:CHUNK])
+    node += b"\x03" + b"\0" * 7
+    for chunk in chunks:
+        node += _sponge(chunk, 0x0B, 32)
+    node += _length_encode(len(chunks)) + b"\xff\xff"
+    return _sponge(bytes(node), 0x06, output_length)
+
+def _keccak_p_batch(state: np.ndarray) -> np.ndarray:
+    """Keccak-p[1600, 12] on a (25, n) uint64 array: one column per message."""
+    np = numpy
+    one, sixty_three = np.uint64(1), np.uint64(63)
+    rotations = np.array(ROTATIONS, dtype=np.uint64)[:, None]
+    back = np.uint64(63) - rotations
+    targets = np.array(PI_TARGETS)
+    constants = [np.uint64(rc) for rc in ROUND_CONSTANTS]
+    lanes = state.copy()
+    for rc in constants:
+        grid = lanes.reshape(5, 5, -1)  # [y, x, n]
+        c = np.bitwise_xor.reduce(grid, axis=0)
+        left = np.roll(c, -1, axis=0)
+        d = np.roll(c, 1, axis=0) ^ ((left << one) | (left >> sixty_three))
+        lanes = (grid ^ d[None]).reshape(25, -1)
+        # rotate by r as (v << r) | ((v >> 1) >> (63 - r)), also valid for r = 0
+        rotated = (lanes << rotations) | ((lanes >> one) >> back)
+        b = np.empty_like(rotated)
+        b[targets] = rotated
+        grid = b.reshape(5, 5, -1)
+        lanes = (grid ^ (~np.roll(grid, -1, axis=1) & np.roll(grid, -2, axis=1))).reshape(25, -1)
+        lanes[0] ^= rc
+    return lanes
+
+def kangaroo_twelve_batch(messages: np.ndarray, output_length: int = 32) -> np.ndarray:
+    """K12 of every row of an (n, length) uint8 array -> (n, output_length) uint8.
+
+    Rows are hashed in parallel (single-node K12, length < 8192 bytes).
+    """
+    np = numpy
+    n, length = messages.shape
+    if length + 1 > CHUNK:
+        return np.array([list(kangaroo_twelve(row.tobytes(), output_length)) for row in messages], dtype=np.uint8)
+    blocks = -(-(length + 2) // RATE)
+    padded = np.zeros((n, blocks * RATE), dtype=np.uint8)
+    padded[:, :length] = messages
+    padded[:, length] = 0x00  # length_encode(0) of the empty customization
+    padded[:, length + 1] = 0x07
+    padded[:, -1] ^= 0x80
+    words = padded.view("<u8").astype(np.uint64)
+    state = np.zeros((25, n), dtype=np.uint64)
+    for block in range(blocks):
+        state[:RATE // 8] ^= words[:, block * (RATE // 8):(block + 1) * (RATE // 8)].T
+        state = _keccak_p_batch(state)
+    out = []
+    produced = 0
+    while True:
+        out.append(np.ascontiguousarray(state[:RATE // 8].T, dtype="<u8").view(np.uint8))
+        produced += RATE
+        if produced >= output_length:
+            return np.ascontiguousarray(np.concatenate(out, axis=1)[:, :output_length])
+        state = _keccak_p_batch(state)
+
+# --- FourQ ------------------------------------------------------------------------
+# Twisted Edwards curve -x^2 + y^2 = 1 + d x^2 y^2 over GF(p^2), p = 2^127 - 1, i^2 = -1.
+# Elements of GF(p^2) are (real, imaginary) pairs of ints in [0, p).
+
+P = (1 << 127) - 1
+CURVE_D = (0x00000000000000E40000000000000142, 0x5E472F846657E0FCB3821488F1FC0C8D)
+GENERATOR = (
+    (0x1A3472237C2FB305286592AD7B3833AA, 0x1E1F553F2878AA9C96869FB360AC77F6),
+    (0x0E3FEE9BA120785AB924A2462BCBB287, 0x6E1C4AF8630E024249A7C344844C8B5C),
+)
+ORDER = 0x0029CBC14E5E0A72F05397829CBC14E5DFBD004DFE0F79992FB2540EC7768CE7
+WINDOW = 8  # bits per fixed-base table row
+
+Fp2 = Tuple[int, int]
+
+def _mul(a0: int, a1: int, b0: int, b1: int) -> Fp2:
+    t0 = a0 * b0
+    t1 = a1 * b1
+    return (t0 - t1) % P, ((a0 + a1) * (b0 + b1) - t0 - t1) % P
+
+def _inv(a0: int, a1: int) -> Fp2:
+    norm = pow((a0 * a0 + a1 * a1) % P, -1, P)
+    return a0 * norm % P, -a1 * norm % P
+
+def on_curve(x: Fp2, y: Fp2) -> bool:
+    xx, yy = _mul(*x, *x), _mul(*y, *y)
+    lhs = ((yy[0] - xx[0]) % P, (yy[1] - xx[1]) % P)
+    dxy = _mul(*CURVE_D, *_mul(*xx, *yy))
+    return lhs == ((1 + dxy[0]) % P, dxy[1])
+
+def _precomputed(x: Fp2, y: Fp2) -> Tuple[int, int, int, int, int, int]:
+    """Affine point as (y + x, y - x, 2d*x*y) for mixed addition."""
+    xy = _mul(*x, *y)
+    t = _mul(*CURVE_D, 2 * xy[0] % P, 2 * xy[1] % P)
+    return (
+        (y[0] + x[0]) % P, (y[1] + x[1]) % P,
+        (y[0] - x[0]) % P, (y[1] - x[1]) % P,
+        t[0], t[1],
+    )
+
+def _madd(point: List[int], q: Tuple[int, int, int, int, int, int]) -> List[int]:
+    """Extended (X, Y, Z, T) + precomputed affine point (complete formulas, a = -1)."""
+    x0, x1, y0, y1, z0, z1, t0, t1 = point
+    ypx0, ypx1, ymx0, ymx1, k0, k1 = q
+    a0, a1 = _mul((y0 - x0) % P, (y1 - x1) % P, ymx0, ymx1)
+    b0, b1 = _mul((y0 + x0) % P, (y1 + x1) % P, ypx0, ypx1)
+    c0, c1 = _mul(t0, t1, k0, k1)
+    d0, d1 = 2 * z0, 2 * z1
+    e0, e1 = b0 - a0, b1 - a1
+    f0, f1 = d0 - c0, d1 - c1
+    g0, g1 = d0 + c0, d1 + c1
+    h0, h1 = b0 + a0, b1 + a1
+    return [*_mul(e0, e1, f0, f1), *_mul(g0, g1, h0, h1), *_mul(f0, f1, g0, g1), *_mul(e0, e1, h0, h1)]
+
+IDENTITY_POINT = [0, 0, 1, 0, 1, 0, 0, 0]
+
+def _affine(point: List[int]) -> Tuple[Fp2, Fp2]:
+    x0, x1, y0, y1, z0, z1 = point[:6]
+    zi = _inv(z0, z1)
+    return _mul(x0, x1, *zi), _mul(y0, y1, *zi)
+
+_TABLE: List[List[Tuple[int, int, int, int, int, int]]] = []
+
+def _fixed_base_table() -> List[List[Tuple[int, int, int, int, int, int]]]:
+    """table[row][j - 1] = j * 2^(WINDOW*row) * G, j = 1 .. 2^WINDOW - 1 (built once per process)."""
+    if _TABLE:
+        return _TABLE
+    rows = -(-ORDER.bit_length() // WINDOW)
+    base = _precomputed(*GENERATOR)
+    for _ in range(rows):
+        entries = [base]
+        acc = _madd(list(IDENTITY_POINT), base)
+        for _ in range(2, 1 << WINDOW):
+            acc = _madd(acc, base)
+            entries.append(_precomputed(*_affine(acc)))
+        _TABLE.append(entries)
+        base = _precomputed(*_affine(_madd(acc, base)))  # 2^WINDOW * base
+    return _TABLE
+
+def scalar_mul_base(scalar: int) -> Tuple[Fp2, Fp2]:
+    """Affine [scalar]G."""
+    table = _fixed_base_table()
+    scalar %= ORDER
+    mask = (1 << WINDOW) - 1
+    acc = list(IDENTITY_POINT)
+    row = 0
+    while scalar:
+        digit = scalar & mask
+        if digit:
+            acc = _madd(acc, table[row][digit - 1])
+        scalar >>= WINDOW
+        row += 1
+    return _affine(acc)
+
+def encode_point(x: Fp2, y: Fp2) -> bytes:
+    """FourQ point encoding: y (real, imaginary; 16 bytes LE each), bit 255 = sign bit of x."""
+    sign = (x[0] if x[0] else x[1]) >> 126 & 1
+    return y[0].to_bytes(16, "little") + (y[1] | sign << 127).to_bytes(16, "little")
+
+# --- chain ------------------------------------------------------------------------
+
+def is_valid_seed(seed: str) -> bool:
+    """55 lowercase ASCII letters."""
+    return len(seed) == SEED_LENGTH and seed.isascii() and seed.isalpha() and seed.islower()
+
+def subseed_from_seed(seed: str) -> bytes:
+    if not is_valid_seed(seed):
+        raise ValueError(f"Invalid seed: must be {SEED_LENGTH} lowercase letters a-z")
+    return kangaroo_twelve(bytes(ord(char) - ord("a") for char in seed), KEY_LENGTH)
+
+def private_key_from_subseed(subseed: bytes) -> bytes:
+    if len(subseed) != KEY_LENGTH:
+        raise ValueError("Subseed must be 32 bytes")
+    return kangaroo_twelve(subseed, KEY_LENGTH)
+
+def public_key_from_private_key(private_key: bytes) -> bytes:
+    if len(private_key) != KEY_LENGTH:
+        raise ValueError("Private key must be 32 bytes")
+    return encode_point(*scalar_mul_base(int.from_bytes(private_key, "little")))
+
+def _identity_letters(public_key: bytes, checksum: bytes, lower: bool = False) -> str:
+    offset = ord("a") if lower else ord("A")
+    letters = []
+    for i in range(4):
+        fragment = int.from_bytes(public_key[8 * i:8 * i + 8], "little")
+        for _ in range(14):
+            fragment, digit = divmod(fragment, 26)
+            letters.append(digit)
+    value = int.from_bytes(checksum[:3], "little") & 0x3FFFF
+    for _ in range(4):
+        value, digit = divmod(value, 26)
+        letters.append(digit)
+    return "".join(chr(offset + digit) for digit in letters)
+
+def identity_from_public_key(public_key: bytes, lower: bool = False) -> str:
+    if len(public_key) != KEY_LENGTH:
+        raise ValueError("Public key must be 32 bytes")
+    return _identity_letters(public_key, kangaroo_twelve(public_key, 3), lower)
+
+def identity_from_seed(seed: str) -> str:
+    """Full chain for one seed (raises ValueError for invalid seeds)."""
+    private_key = private_key_from_subseed(subseed_from_seed(seed))
+    return identity_from_public_key(public_key_from_private_key(private_key))
+
+def derive_identities(seeds: Sequence[str]) -> List[Optional[str]]:
+    """Identities for many seeds (None where the seed is invalid).
+
+    The three K12 stages run batched over all valid seeds when numpy is
+    available; the FourQ stage is per key.
+    """
+    seeds = list(seeds)
+    results: List[Optional[str]] = [None] * len(seeds)
+    valid = [idx for idx, seed in enumerate(seeds) if is_valid_seed(seed)]
+    if not valid:
+        return results
+    if numpy is None:
+        for idx in valid:
+            results[idx] = identity_from_seed(seeds[idx])
+        return results
+    np = numpy
+    letters = np.frombuffer("".join(seeds[idx] for idx in valid).encode("ascii"), dtype=np.uint8)
+    subseeds = kangaroo_twelve_batch((letters - ord("a")).reshape(len(valid), SEED_LENGTH), KEY_LENGTH)
+    private_keys = kangaroo_twelve_batch(subseeds, KEY_LENGTH)
+    public_keys = [public_key_from_private_key(row.tobytes()) for row in private_keys]
+    checksums = kangaroo_twelve_batch(np.frombuffer(b"".join(public_keys), dtype=np.uint8).reshape(-1, KEY_LENGTH), 3)
+    for idx, public_key, checksum in zip(valid, public_keys, checksums):
+        results[idx] = _identity_letters(public_key, checksum.tobytes())
+    return results
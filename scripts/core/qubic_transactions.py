@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Shared Qubic transaction builder with cached key material.
+
+Every transaction script used to carry its own copy of `build_tx_with_payload`,
+re-deriving subseed → private key → public key from the seed and re-encoding
+the destination public key for each transaction. `TransactionSigner` derives
+the key chain once per seed, caches destination public keys and signs batches
+of transactions, returning raw bytes ready for `rpc.broadcast_transaction`.
+
+Transaction layout (identical to the previous per-script builders):
+    source pubkey (32) | dest pubkey (32) | amount (8) | target tick (4) |
+    input type (2) | input size (2) | payload (N) | signature (64)
+
+Usage:
+    from scripts.core.qubic_transactions import TransactionSigner, TxRequest, default_signer
+
+    signer = TransactionSigner()
+    tx_bytes = signer.build(seed, CONTRACT_ID, 1, target_tick, "7,2,1649")
+    tx_bytes = default_signer().build(seed, CONTRACT_ID, 1, target_tick, "7,2")
+    batch = signer.build_batch(TxRequest(seed, CONTRACT_ID, 1, tick, p) for p in payloads)
+
+Micro-benchmark (requires qubipy, e.g. inside the qubipy Docker image):
+    python scripts/core/qubic_transactions.py --count 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import struct
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Union
+
+# Fixed 80-byte header: two public keys, amount, tick, input type, input size
+TX_HEADER = struct.Struct("<32s32sqIHH")
+SIGNATURE_LENGTH = 64
+MAX_INPUT_SIZE = 1024
+MAX_TICK = 0xFFFFFFFF
+
+CONTRACT_ID = "POCCZYCKTRQGHFIPWGSBLJTEQFDDVVBMNUHNCKMRACBGQOPBLURNRCBAFOBD"
+
+# The 8 Layer-2 seeds used by the tick-gap sweeps (benchmark fixture)
+BENCHMARK_SEEDS = [
+    "aqiosqqmacybpqxqsjniuaylmxxiwqoxqmeqyxbbtbonsjjrcwpxxdd",
+    "gwuxommmmfmtbwfzsngmukwbiltxqdknmmmnypeftamronjmablhtrr",
+    "acgjgqqyilbpxdrborfgwfzbbbnlqnghddelvlxxxlbnnnfbllpbnnn",
+    "giuvfgawcbbffkvbmfjeslhbbfbfwzwnnxcbqbbjrvfbnvjltjbbbht",
+    "uufeemuubiyxyxduxzcfbihabaysacqswsgabobknxbzciclyokobml",
+    "hjbrfbhtbzjlvrbxtdrforbwnacahaqmsbunbonhtrhnjkxkknkhwcb",
+    "jklmnoipdqorwsictwwuiyvmofiqcqsykmkacmokqyccmcogocqcscw",
+    "xyzqaubquuqbqbyqayeiyaqymmemqqqmmqsqeqazsmogwoxkirmjxmc",
+]
+
+Payload = Union[str, bytes, bytearray, int, None]
+
+@dataclass(frozen=True)
+class KeyMaterial:
+    """Derived key chain for one seed."""
+
+    seed: str
+    subseed: bytes
+    private_key: bytes
+    public_key: bytes
+
+@dataclass(frozen=True)
+class TxRequest:
+    """One transaction to build in a batch."""
+
+    seed: str
+    dest_identity: str
+    amount: int
+    target_tick: int
+    payload: Payload = b""
+    input_type: int = 0
+
+def encode_payload(payload: Payload) -> bytes:
+    """Encode a payload the same way the original scripts did (UTF-8 of str())."""
+    if payload is None:
+        return b""
+    if isinstance(payload, (bytes, bytearray)):
+        return bytes(payload)
+    return str(payload).encode("utf-8")
+
+class TransactionSigner:
+    """Builds and signs Qubic transactions, caching per-seed key material.
+
+    The qubipy crypto primitives are imported on construction so that this module
+    can be imported (and the dataclasses used) on machines without qubipy.
+    """
+
+    def __init__(self) -> None:
+        from qubipy.tx.utils import (
+            get_public_key_from_identity,
+            get_subseed_from_seed,
+            get_private_key_from_subseed,
+            get_public_key_from_private_key,
+        )
+        from qubipy.crypto.utils import sign, kangaroo_twelve
+
+        self._get_subseed = get_subseed_from_seed
+        self._get_private_key = get_private_key_from_subseed
+        self._get_public_key = get_public_key_from_private_key
+        self._get_identity_key = get_public_key_from_identity
+        self._sign = sign
+        self._k12 = kangaroo_twelve
+        self._keys: Dict[str, KeyMaterial] = {}
+        self._destinations: Dict[str, bytes] = {}
+
+    def key_material(self, seed: str) -> KeyMaterial:
+        """Return (and cache) subseed, private key and public key for a seed."""
+        cached = self._keys.get(seed)
+        if cached is not None:
+            return cached
+        subseed = self._get_subseed(bytes(seed, "utf-8"))
+        private_key = self._get_private_key(subseed)
+        public_key = self._get_public_key(private_key)
+        material = KeyMaterial(
+            seed=seed,
+            subseed=bytes(subseed),
+            private_key=bytes(private_key),
+            public_key=bytes(public_key),
+        )
+        self._keys[seed] = material
+        return material
+
+    def destination_key(self, identity: str) -> bytes:
+        """Return (and cache) the 32-byte public key of a destination identity."""
+        cached = self._destinations.get(identity)
+        if cached is None:
+            cached = bytes(self._get_identity_key(identity))
+            self._destinations[identity] = cached
+        return cached
+
+    def build(
+        self,
+        seed: str,
+        dest_identity: str,
+        amount: int,
+        target_tick: int,
+        payload: Payload = b"",
+        input_type: int = 0,
+    ) -> bytes:
+        """Build and sign a single transaction, returning the raw bytes."""
+        if amount < 0:
+            raise ValueError(f"amount must be non-negative, got {amount}")
+        if not 0 <= target_tick <= MAX_TICK:
+            raise ValueError(f"target_tick out of range: {target_tick}")
+        payload_bytes = encode_payload(payload)
+        if len(payload_bytes) > MAX_INPUT_SIZE:
+            raise ValueError(f"payload exceeds {MAX_INPUT_SIZE} bytes ({len(payload_bytes)})")
+
+        keys = self.key_material(seed)
+        built_data = bytearray(
+            TX_HEADER.pack(
+                keys.public_key,
+                self.destination_key(dest_identity),
+                amount,
+                target_tick,
+                input_type,
+                len(payload_bytes),
+            )
+        )
+        built_data += payload_bytes
+
+        # Sign the digest of header + payload, then append the 64-byte signature
+        tx_digest = self._k12(built_data, len(built_data), 32)
+        built_data += self._sign(keys.subseed, keys.public_key, tx_digest)
+        return bytes(built_data)
+
+    def build_batch(self, requests: Iterable[TxRequest]) -> List[bytes]:
+        """Build and sign many transactions, reusing cached key material."""
+        return [
+            self.build(
+                req.seed,
+                req.dest_identity,
+                req.amount,
+                req.target_tick,
+                req.payload,
+                req.input_type,
+            )
+            for req in requests
+        ]
+
+    def cache_info(self) -> Dict[str, int]:
+        """Number of cached seeds and destination keys."""
+        return {"seeds": len(self._keys), "destinations": len(self._destinations)}
+
+_DEFAULT_SIGNER: Optional[TransactionSigner] = None
+
+def default_signer() -> TransactionSigner:
+    """Return a process-wide shared signer so key caches survive across calls."""
+    global _DEFAULT_SIGNER
+    if _DEFAULT_SIGNER is None:
+        _DEFAULT_SIGNER = TransactionSigner()
+    return _DEFAULT_SIGNER
+
+def benchmark(count: int, seeds: List[str], dest_identity: str) -> Dict[str, float]:
+    """Time cold key derivation vs cached batch construction (µs per transaction)."""
+    signer = TransactionSigner()
+
+    start = time.perf_counter()
+    for seed in seeds:
+        signer.key_material(seed)
+    signer.destination_key(dest_identity)
+    cold_us = (time.perf_counter() - start) * 1e6 / max(len(seeds), 1)
+
+    # 8 blocks × tick-gap sweep, the shape of brute_force_tick_gaps_fast
+    requests = [
+        TxRequest(
+            seeds[idx % len(seeds)],
+            dest_identity,
+            1,
+            1_000_000 + idx,
+            f"{idx % 8 + 1},2,{1644 + idx % 11}",
+        )
+        for idx in range(count)
+    ]
+    start = time.perf_counter()
+    signer.build_batch(requests)
+    batch_us = (time.perf_counter() - start) * 1e6 / max(count, 1)
+
+    empty_key = bytes(32)
+    start = time.perf_counter()
+    for req in requests:
+        TX_HEADER.pack(empty_key, empty_key, req.amount, req.target_tick, 0, 8)
+    header_us = (time.perf_counter() - start) * 1e6 / max(count, 1)
+
+    return {
+        "transactions": count,
+        "key_derivation_us_per_seed": cold_us,
+        "batch_build_sign_us_per_tx": batch_us,
+        "header_pack_us_per_tx": header_us,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmark the batch transaction signer.")
+    parser.add_argument("--count", type=int, default=1000, help="Transactions to build")
+    args = parser.parse_args()
+
+    results = benchmark(args.count, BENCHMARK_SEEDS, CONTRACT_ID)
+    print("=" * 80)
+    print("BATCH TRANSACTION SIGNER BENCHMARK")
+    print("=" * 80)
+    print(f"Transactions: {results['transactions']}")
+    print(f"Key derivation (cold): {results['key_derivation_us_per_seed']:.1f} µs/seed")
+    print(f"Build + sign (cached keys): {results['batch_build_sign_us_per_tx']:.1f} µs/tx")
+    print(f"Header packing only: {results['header_pack_us_per_tx']:.2f} µs/tx")
+
+if __name__ == "__main__":
+    main()
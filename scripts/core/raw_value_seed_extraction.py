@@ -50,7 +50,7 @@ def get_qubipy_functions():
  'get_identity_from_public_key': get_identity_from_public_key,
  }
  return QUBIPY_FUNCTIONS
- except ImportError:
+ except (ImportError, OSError):
  pass
  
  # Method 2: Try venv path
@@ -73,27 +73,20 @@ def get_qubipy_functions():
  'get_identity_from_public_key': get_identity_from_public_key,
  }
  return QUBIPY_FUNCTIONS
- except ImportError:
+ except (ImportError, OSError):
  pass
  
- # Method 3: Use Docker
- try:
- import subprocess
- import json
- 
- # Test Docker
- result = subprocess.run(['docker', '--version'], capture_output=True, text=True)
- if result.returncode == 0:
- # Docker is available, we can use it for validation
- QUBIPY_AVAILABLE = True # Mark as available for Docker calls
- QUBIPY_FUNCTIONS = "docker" # Special marker
+ # Method 3: portable implementation of the same chain (no crypto.so, no Docker)
+ from scripts.core import qubic_crypto
+ QUBIPY_AVAILABLE = True
+ QUBIPY_FUNCTIONS = {
+ 'get_subseed_from_seed': lambda seed_bytes: qubic_crypto.subseed_from_seed(seed_bytes.decode('ascii')),
+ 'get_private_key_from_subseed': qubic_crypto.private_key_from_subseed,
+ 'get_public_key_from_private_key': qubic_crypto.public_key_from_private_key,
+ 'get_identity_from_public_key': qubic_crypto.identity_from_public_key,
+ 'derive_batch': qubic_crypto.derive_identities,
+ }
  return QUBIPY_FUNCTIONS
- except Exception:
- pass
- 
- QUBIPY_AVAILABLE = False
- QUBIPY_FUNCTIONS = None
- return None
 
 # Initialize
 get_qubipy_functions()
@@ -168,58 +161,6 @@ def derive_identity(seed_candidate: str) -> Tuple[bool, str]:
  if funcs is None:
  return False, "QubiPy not available"
  
- # Use Docker if needed
- if funcs == "docker":
- try:
- import subprocess
- import json
- import tempfile
- import os
- 
- # Create temp script
- script = f'''
-import sys
-sys.path.insert(0, "/workspace")
-try:
- from qubipy.crypto.utils import (
- get_subseed_from_seed,
- get_private_key_from_subseed,
- get_public_key_from_private_key,
- get_identity_from_public_key,
- )
- seed = "{seed_candidate}"
- seed_bytes = seed.encode("utf-8")
- subseed = get_subseed_from_seed(seed_bytes)
- private_key = get_private_key_from_subseed(subseed)
- public_key = get_public_key_from_private_key(private_key)
- identity = get_identity_from_public_key(public_key)
- print(identity)
-except Exception as e:
- print(f"ERROR: {{e}}", file=sys.stderr)
- sys.exit(1)
-'''
- 
- result = subprocess.run(
- ['docker', 'run', '--rm', '-v', f'{project_root}:/workspace', '-w', '/workspace',
- 'python:3.11', 'bash', '-c', f'pip install -q qubipy && python3 -c "{script}"'],
- capture_output=True,
- text=True,
- timeout=30
- )
- 
- if result.returncode == 0 and result.stdout.strip():
- identity = result.stdout.strip()
- if len(identity) == 60:
- return True, identity
- else:
- return False, f"Invalid identity length: {len(identity)}"
- else:
- return False, result.stderr.strip() or "Docker execution failed"
- except subprocess.TimeoutExpired:
- return False, "Docker timeout"
- except Exception as e:
- return False, f"Docker error: {str(e)}"
- 
  # Use direct import
  try:
  if len(seed_candidate) != 55:
@@ -238,40 +179,48 @@ except Exception as e:
  except Exception as e:
  return False, str(e)
 
+# (name, value mode, a, b, c): seed[i] = (a * mode(v) + b + c * i) mod 26
+# Full parameter grids live in scripts/core/transformation_search.py
+TRANSFORMATIONS = [
+ ("Raw % 26 (Baseline)", "trunc", 1, 0, 0),
+ ("Raw + 1 % 26", "trunc", 1, 1, 0),
+ ("Raw - 1 % 26", "trunc", 1, -1, 0),
+ ("Raw + 14 % 26", "trunc", 1, 14, 0),
+ ("Raw (Absolute) % 26", "abs", 1, 0, 0),
+ ("Raw / 2 % 26", "half", 1, 0, 0),
+ ("Raw * 2 % 26", "double", 1, 0, 0),
+ ("Raw + Index % 26", "trunc", 1, 0, 1),
+ ("Raw - Index % 26", "trunc", 1, 0, -1),
+ ("Raw + 26 % 26", "trunc", 1, 26, 0),
+ ("Raw - 26 % 26", "trunc", 1, -26, 0),
+ ("Raw mod 26 (floor)", "floor", 1, 0, 0),
+ ("Raw mod 26 (ceil)", "ceil", 1, 0, 0),
+]
+
+def derive_identities_batch(seed_candidates: List[str]) -> List[Tuple[bool, str]]:
+ """Derive many seeds at once; the portable chain hashes the whole batch together."""
+ funcs = get_qubipy_functions()
+ if funcs and 'derive_batch' in funcs:
+ identities = funcs['derive_batch'](seed_candidates)
+ return [(True, identity) if identity else (False, "Invalid seed") for identity in identities]
+ return [derive_identity(seed) for seed in seed_candidates]
+
 def test_transformations(raw_vals: List[float], target_identity: str) -> List[Dict]:
  """Test various transformations on raw values."""
+ from scripts.core.transformation_search import affine_letters, apply_value_mode, letters_to_seeds
+
  results = []
+ raw = np.asarray(raw_vals, dtype=np.float64)
  
- transformations = [
- ("Raw % 26 (Baseline)", lambda v: int(v) % 26),
- ("Raw + 1 % 26", lambda v: (int(v) + 1) % 26),
- ("Raw - 1 % 26", lambda v: (int(v) - 1) % 26),
- ("Raw + 14 % 26", lambda v: (int(v) + 14) % 26),
- ("Raw (Absolute) % 26", lambda v: abs(int(v)) % 26),
- ("Raw / 2 % 26", lambda v: int(v / 2) % 26 if v != 0 else 0),
- ("Raw * 2 % 26", lambda v: int(v * 2) % 26),
- ("Raw + Index % 26", lambda v, i: (int(v) + i) % 26),
- ("Raw - Index % 26", lambda v, i: (int(v) - i) % 26),
- ("Raw + 26 % 26", lambda v: (int(v) + 26) % 26),
- ("Raw - 26 % 26", lambda v: (int(v) - 26) % 26),
- ("Raw mod 26 (floor)", lambda v: int(np.floor(v)) % 26),
- ("Raw mod 26 (ceil)", lambda v: int(np.ceil(v)) % 26),
- ]
- 
- for name, func in transformations:
- try:
- # Apply transformation
- import inspect
- if len(inspect.signature(func).parameters) == 2:
- indices = [func(v, i) % 26 for i, v in enumerate(raw_vals)]
- else:
- indices = [func(v) % 26 for v in raw_vals]
+ # All candidate seeds in one vectorized pass, then one derivation batch
+ letters = np.vstack([
+ affine_letters(apply_value_mode(raw, mode), a, b, c)
+ for _, mode, a, b, c in TRANSFORMATIONS
+ ])
+ seed_candidates = letters_to_seeds(letters)
+ derived = derive_identities_batch(seed_candidates)
  
- # Map 0-25 to a-z
- seed_candidate = "".join(chr(ord('a') + (i % 26)) for i in indices)
- 
- # Check
- success, derived_id = derive_identity(seed_candidate)
+ for (name, *_), seed_candidate, (success, derived_id) in zip(TRANSFORMATIONS, seed_candidates, derived):
  match = (derived_id == target_identity) if success else False
  
  results.append({
@@ -289,16 +238,6 @@ def test_transformations(raw_vals: List[float], target_identity: str) -> List[Di
  print(f"\n🎉 FOUND IT! The True Seed is: {seed_candidate}")
  break
  
- except Exception as e:
- print(f" Error testing {name}: {e}")
- results.append({
- "method": name,
- "seed": "ERROR",
- "derived_identity": str(e),
- "match": False,
- "success": False
- })
- 
  return results
 
 def load_test_data() -> List[Dict]:
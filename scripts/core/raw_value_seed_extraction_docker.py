@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 """
 Raw Value Seed Extraction - Docker Version
-Uses Docker to run QubiPy for identity derivation.
+Uses Docker to run QubiPy for identity derivation - one long-lived gateway
+container (scripts/core/derivation_gateway.py) instead of one per seed.
 """
 
 import json
 import sys
-import subprocess
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import numpy as np
@@ -15,6 +15,8 @@ import openpyxl
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.core.derivation_gateway import GatewayError, ensure_gateway
+
 OUTPUT_DIR = project_root / "outputs" / "derived"
 REPORTS_DIR = project_root / "outputs" / "reports"
 
@@ -74,46 +76,15 @@ def extract_raw_sequence(matrix: np.ndarray, coords: List[Tuple[int, int]], leng
  return raw_values
 
 def derive_identity_docker(seed_candidate: str) -> Tuple[bool, str]:
- """Derive identity from seed using Docker."""
+ """Derive identity from seed via the derivation gateway container."""
  try:
- script = f'''
-import sys
-sys.path.insert(0, "/workspace")
-from qubipy.crypto.utils import (
- get_subseed_from_seed,
- get_private_key_from_subseed,
- get_public_key_from_private_key,
- get_identity_from_public_key,
-)
-seed = "{seed_candidate}"
-seed_bytes = seed.encode("utf-8")
-subseed = get_subseed_from_seed(seed_bytes)
-private_key = get_private_key_from_subseed(subseed)
-public_key = get_public_key_from_private_key(private_key)
-identity = get_identity_from_public_key(public_key)
-print(identity)
-'''
- 
- result = subprocess.run(
- ['docker', 'run', '--rm', '-v', f'{project_root}:/workspace', '-w', '/workspace',
- 'python:3.11', 'bash', '-c', f'pip install -q qubipy && python3 -c """{script}"""'],
- capture_output=True,
- text=True,
- timeout=30
- )
- 
- if result.returncode == 0 and result.stdout.strip():
- identity = result.stdout.strip()
- if len(identity) == 60:
+ identity = ensure_gateway().derive(seed_candidate)
+ except GatewayError as e:
+ return False, f"Gateway error: {e}"
+ 
+ if identity and len(identity) == 60:
  return True, identity
- else:
- return False, f"Invalid identity length: {len(identity)}"
- else:
- return False, result.stderr.strip() or "Docker execution failed"
- except subprocess.TimeoutExpired:
- return False, "Docker timeout"
- except Exception as e:
- return False, f"Docker error: {str(e)}"
+ return False, f"Invalid identity: {identity!r}"
 
 def test_transformations(raw_vals: List[float], target_identity: str) -> List[Dict]:
  """Test various transformations on raw values."""
@@ -199,15 +170,12 @@ def main():
  print("=" * 80)
  print()
  
- # Check Docker
+ # Start (or reuse) the gateway container
  try:
- result = subprocess.run(['docker', '--version'], capture_output=True, text=True)
- if result.returncode != 0:
- print("❌ Docker not available!")
- return
- print(f"✅ Docker available: {result.stdout.strip()}")
- except FileNotFoundError:
- print("❌ Docker not found!")
+ info = ensure_gateway().ping()
+ print(f"✅ Derivation gateway ready: engine {info.get('engine')}, {info.get('derived', 0)} seeds derived so far")
+ except GatewayError as e:
+ print(f"❌ Derivation gateway not available: {e}")
  return
  
  print()
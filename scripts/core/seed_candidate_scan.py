@@ -22,10 +22,17 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Sequence
 
 from analysis.utils.identity_tools import identity_from_body, checksum_letters
+from scripts.core.qubic_crypto import (
+ identity_from_public_key,
+ private_key_from_subseed,
+ public_key_from_private_key,
+ subseed_from_seed,
+)
 
 # Valid checksum identities from the diagonal and vortex reports
 DIAGONAL_IDENTITIES = [
@@ -90,85 +97,45 @@ def _is_seed_like(text: str) -> bool:
 
 def _seed_to_private_key_bytes(seed: str) -> bytes:
  """
- Convert a 55-character lowercase seed to 32-byte private key.
+ Convert a 55-character lowercase seed to its 32-byte private key.
  
- Qubic uses Base-26 encoding: each character represents a value 0-25.
- We decode the seed and use it to generate a 32-byte key via SHA-256.
+ Qubic chain: subseed = K12(seed letters as values 0-25), private key = K12(subseed).
  """
- if len(seed) != SEED_LENGTH or not seed.islower() or not seed.isalpha():
+ if not _is_seed_like(seed):
  raise ValueError(f"Invalid seed format: must be {SEED_LENGTH} lowercase letters")
- 
- # Decode Base-26 seed to integer
- seed_value = 0
- for char in seed:
- seed_value = seed_value * 26 + (ord(char) - ord('a'))
- 
- # Convert to bytes (big-endian, pad to 32 bytes)
- seed_bytes = seed_value.to_bytes((seed_value.bit_length() + 7) // 8, 'big')
- 
- # Hash to get 32-byte private key (Qubic uses SHA-256 for seed derivation)
- import hashlib
- private_key = hashlib.sha256(seed_bytes).digest()
- 
- # Ed25519 requires specific key format: clamp the key
- # For now, we'll use the SHA-256 hash directly
- return private_key[:32]
+ return private_key_from_subseed(subseed_from_seed(seed))
 
 def _private_key_to_public_key(private_key: bytes) -> bytes:
  """
- Derive Ed25519 public key from private key.
- 
- This requires the ed25519 library. If not available, we'll use a fallback.
+ Derive the FourQ public key ([k]G, 32-byte encoding) from the private key.
  """
- try:
- import ed25519
- signing_key = ed25519.SigningKey(private_key)
- return signing_key.get_verifying_key().to_bytes()
- except ImportError:
- # Fallback: Use SHA-256 hash of private key as "public key"
- # This is NOT cryptographically correct but allows testing without ed25519
- import hashlib
- return hashlib.sha256(private_key).digest()[:32]
- except Exception as e:
- raise ValueError(f"Failed to derive public key: {e}")
+ return public_key_from_private_key(private_key)
 
 def _public_key_to_identity_body(public_key: bytes) -> str:
  """
  Convert 32-byte public key to 56-character Base-26 identity body.
  
- This reverses the process in identity_tools._pack_body.
+ Four little-endian uint64 fragments, 14 letters each, least significant letter first
+ (the inverse of identity_tools._pack_body).
  """
  if len(public_key) != 32:
  raise ValueError("Public key must be 32 bytes")
- 
- body = ""
- for i in range(4):
- # Extract 8 bytes (little-endian uint64)
- import struct
- fragment = struct.unpack('<Q', public_key[i*8:(i+1)*8])[0]
- 
- # Convert to Base-26 (14 characters, reverse order)
- group = ""
- for _ in range(14):
- group = chr(ord('A') + (fragment % 26)) + group
- fragment //= 26
- 
- body += group
- 
- return body
+ return identity_from_public_key(public_key)[:56]
+
+@lru_cache(maxsize=1)
+def _derivation_backend():
+ """qubipy's native chain when it loads, the portable implementation otherwise."""
+ from scripts.core.derivation_backends import make_backend
+ return make_backend("auto")
 
 def derive_identity_from_seed(seed: str) -> Optional[str]:
  """
  Derive a Qubic identity from a seed string.
  
- Process: seed → private key → public key → identity body → identity with checksum
+ Process: seed → subseed → private key → public key → identity body + K12 checksum
  """
  try:
- private_key = _seed_to_private_key_bytes(seed)
- public_key = _private_key_to_public_key(private_key)
- body = _public_key_to_identity_body(public_key)
- identity = identity_from_body(body)
- return identity
+ return _derivation_backend().derive(seed)
  except Exception as e:
  return None
 
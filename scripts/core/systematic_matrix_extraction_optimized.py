@@ -8,15 +8,22 @@ Features:
 - Progress-Tracking
 - Effiziente Datenstrukturen
 - Vollständige Speicherung aller Kandidaten
+- Buchstaben aus dem vorberechneten MatrixViews.letters_mod (int(v) % 26)
 """
 
 import json
+import sys
 import numpy as np
 from pathlib import Path
 from typing import List, Set, Tuple, Optional, Dict
 from collections import defaultdict
 import time
 
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from analysis.utils.matrix_views import matrix_views
+
 OUTPUT_DIR = Path("outputs/derived")
 MATRIX_PATH = Path("data/anna-matrix/Anna_Matrix.xlsx")
 CHECKPOINT_FILE = OUTPUT_DIR / "matrix_extraction_checkpoint.json"
@@ -42,26 +49,15 @@ def load_matrix(path: Path) -> np.ndarray:
  print("ERROR: openpyxl nicht installiert. Installiere mit: pip3 install openpyxl")
  raise
 
-def base26_to_char(value: float) -> str:
- """Konvertiere Matrix-Wert zu Base-26 Charakter."""
- return chr(ord('A') + (int(value) % 26))
-
-def extract_identity_from_positions(matrix: np.ndarray, positions: List[Tuple[int, int]]) -> Optional[str]:
- """Extrahiere Identity aus Liste von Positionen."""
+def extract_identity_from_positions(letters: np.ndarray, positions: List[Tuple[int, int]]) -> Optional[str]:
+ """Extrahiere Identity aus Liste von Positionen (letters: Base-26-Codes 0..25 je Zelle)."""
  if len(positions) < 56:
  return None
  
- chars = []
- for row, col in positions[:56]:
- if 0 <= row < 128 and 0 <= col < 128:
- chars.append(base26_to_char(matrix[row, col]))
- else:
- return None
- 
- identity_body = ''.join(chars)
- if len(identity_body) == 56 and all(c.isupper() or c.isalpha() for c in identity_body):
- return identity_body
+ coords = np.asarray(positions[:56])
+ if ((coords < 0) | (coords >= 128)).any():
  return None
+ return (letters[coords[:, 0], coords[:, 1]] + ord('A')).astype(np.uint8).tobytes().decode('ascii')
 
 def diagonal_pattern(base_r: int, base_c: int, length: int = 14) -> List[Tuple[int, int]]:
  """Diagonal Pattern: (r+j, c+j) for j in range(length)."""
@@ -145,7 +141,7 @@ def save_checkpoint(checkpoint: Dict):
  json.dump(checkpoint_save, f, indent=2)
 
 def extract_pattern_optimized(
- matrix: np.ndarray,
+ letters: np.ndarray,
  pattern_func,
  pattern_name: str,
  start_params: List[Tuple],
@@ -185,7 +181,7 @@ def extract_pattern_optimized(
  save_checkpoint(checkpoint)
  
  positions = pattern_func(*params) if isinstance(params, tuple) else pattern_func(params)
- identity = extract_identity_from_positions(matrix, positions)
+ identity = extract_identity_from_positions(letters, positions)
  
  if identity:
  candidates.add(identity)
@@ -220,6 +216,7 @@ def main():
  print(f"Load Matrix: {MATRIX_PATH}")
  matrix = load_matrix(MATRIX_PATH)
  print(f"✅ Matrix geloadn: {matrix.shape}")
+ letters = matrix_views(matrix).letters_mod
  print()
  
  # Bekannte Identities (zum Vergleich)
@@ -249,7 +246,7 @@ def main():
  start_time = time.time()
  diagonal_params = [(r, c) for r in range(0, 128, 4) for c in range(0, 128, 4)]
  diag_candidates, diag_results = extract_pattern_optimized(
- matrix, diagonal_pattern, "diagonal", diagonal_params, checkpoint
+ letters, diagonal_pattern, "diagonal", diagonal_params, checkpoint
  )
  all_candidates.update(diag_candidates)
  pattern_results["diagonal"].extend(diag_results)
@@ -262,7 +259,7 @@ def main():
  start_time = time.time()
  horizontal_params = [(r, c) for r in range(0, 128, 2) for c in range(0, 128 - 56)]
  horiz_candidates, horiz_results = extract_pattern_optimized(
- matrix, horizontal_pattern, "horizontal", horizontal_params, checkpoint
+ letters, horizontal_pattern, "horizontal", horizontal_params, checkpoint
  )
  all_candidates.update(horiz_candidates)
  pattern_results["horizontal"].extend(horiz_results)
@@ -275,7 +272,7 @@ def main():
  start_time = time.time()
  vertical_params = [(r, c) for r in range(0, 128 - 56) for c in range(0, 128, 2)]
  vert_candidates, vert_results = extract_pattern_optimized(
- matrix, vertical_pattern, "vertical", vertical_params, checkpoint
+ letters, vertical_pattern, "vertical", vertical_params, checkpoint
  )
  all_candidates.update(vert_candidates)
  pattern_results["vertical"].extend(vert_results)
@@ -288,7 +285,7 @@ def main():
  start_time = time.time()
  lshape_params = [(r, c) for r in range(0, 128 - 8) for c in range(0, 128 - 7)]
  lshape_candidates, lshape_results = extract_pattern_optimized(
- matrix, l_shape_pattern, "lshape", lshape_params, checkpoint
+ letters, l_shape_pattern, "lshape", lshape_params, checkpoint
  )
  all_candidates.update(lshape_candidates)
  pattern_results["lshape"].extend(lshape_results)
@@ -301,7 +298,7 @@ def main():
  start_time = time.time()
  spiral_params = [(r, c) for r in range(10, 118, 10) for c in range(10, 118, 10)]
  spiral_candidates, spiral_results = extract_pattern_optimized(
- matrix, spiral_pattern, "spiral", spiral_params, checkpoint
+ letters, spiral_pattern, "spiral", spiral_params, checkpoint
  )
  all_candidates.update(spiral_candidates)
  pattern_results["spiral"].extend(spiral_results)
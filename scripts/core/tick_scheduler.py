@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Tick-aware transaction scheduler for broadcast campaigns.
+
+The broadcast scripts used to `time.sleep()` fixed intervals between sends and
+pick `latest_tick + TARGET_TICK_OFFSET` by hand. This module replaces that with:
+
+- `TickPoller`: one background thread polling `rpc.get_latest_tick()`, shared by
+  every consumer, with `wait_for_tick()` instead of sleeps.
+- `TickScheduler`: queues transactions, assigns target ticks just in time
+  (at most `per_source_per_tick` transactions per source identity and tick),
+  signs them with the shared `TransactionSigner`, broadcasts concurrently and
+  confirms inclusion once the RPC has processed the target tick. Only
+  transactions known *not* to be included in their target tick (the RPC
+  rejected the broadcast, or the processed target tick does not contain them)
+  are re-signed and re-queued; a broadcast that errored otherwise (timeout,
+  connection reset - the node may have accepted it) or whose inclusion is
+  still undetermined after the grace window ends as "unknown" and is never
+  broadcast again.
+
+Usage:
+    from scripts.core.tick_scheduler import ScheduledTx, TickScheduler
+
+    scheduler = TickScheduler(rpc, signer)
+    scheduler.submit(ScheduledTx(label, seed, CONTRACT_ID, 1, "7,2,1649"))
+    results = scheduler.run()
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_TICK_OFFSET = 5
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_CONFIRM_GRACE_TICKS = 5
+DEFAULT_MAX_ATTEMPTS = 3
+
+@dataclass
+class ScheduledTx:
+    """A queued transaction and its lifecycle state."""
+
+    label: str
+    seed: str
+    dest_identity: str
+    amount: int
+    payload: Any = b""
+    input_type: int = 0
+    source_identity: Optional[str] = None
+    status: str = "queued"  # queued → sent → confirmed | expired | unknown; expired → queued | failed
+    target_tick: Optional[int] = None
+    tx_id: Optional[str] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    history: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "dest_identity": self.dest_identity,
+            "amount": self.amount,
+            "payload": self.payload if isinstance(self.payload, str) else repr(self.payload),
+            "status": self.status,
+            "target_tick": self.target_tick,
+            "tx_id": self.tx_id,
+            "attempts": self.attempts,
+            "error": self.error,
+            "history": self.history,
+        }
+
+class TickPoller:
+    """Single shared poller for the live tick.
+
+    Consumers call `current_tick` or block on `wait_for_tick(n)`; only this
+    thread talks to `get_latest_tick()`.
+    """
+
+    def __init__(self, rpc, interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        self._rpc = rpc
+        self._interval = interval
+        self._tick: Optional[int] = None
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.errors = 0
+
+    def start(self) -> "TickPoller":
+        if self._thread is None:
+            self._poll_once()
+            self._thread = threading.Thread(target=self._run, name="tick-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self._interval * 2)
+            self._thread = None
+
+    def __enter__(self) -> "TickPoller":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _poll_once(self) -> None:
+        try:
+            tick = int(self._rpc.get_latest_tick())
+        except Exception:
+            self.errors += 1
+            return
+        with self._cond:
+            if self._tick is None or tick > self._tick:
+                self._tick = tick
+                self._cond.notify_all()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self._poll_once()
+
+    @property
+    def current_tick(self) -> Optional[int]:
+        with self._cond:
+            return self._tick
+
+    def wait_for_tick(self, tick: int, timeout: Optional[float] = None) -> Optional[int]:
+        """Block until the live tick reaches `tick` (or timeout). Returns the live tick."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._tick is None or self._tick < tick:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining if remaining is not None else self._interval * 4)
+            return self._tick
+
+def broadcast_rejected(exc: BaseException) -> bool:
+    """True if the RPC positively refused the transaction.
+
+    qubipy raises "API Error <code>: ..." for an HTTP 400 answer and refuses
+    malformed bytes before sending; every other error leaves open whether the
+    node received the transaction.
+    """
+    message = str(exc)
+    return message.startswith("API Error") or message.startswith("A bytes-like object is required")
+
+def processed_tick(rpc) -> Optional[int]:
+    """Last tick the RPC's archiver has processed (None if the client can't tell)."""
+    if not hasattr(rpc, "get_rpc_status"):
+        return None
+    try:
+        status = rpc.get_rpc_status()
+    except Exception:
+        return None
+    last = status.get("lastProcessedTick") if isinstance(status, dict) else None
+    if isinstance(last, dict):
+        last = last.get("tickNumber")
+    try:
+        return int(last)
+    except (TypeError, ValueError):
+        return None
+
+def confirm_via_rpc(rpc, tx: ScheduledTx) -> Optional[bool]:
+    """Check whether `tx` was included in its target tick.
+
+    Returns None (undetermined) until the RPC has processed the target tick -
+    a live tick past the target says nothing about the indexer. After that,
+    the transaction status endpoint is asked first, then the source
+    identity's transfers for the target tick are scanned.
+    """
+    if not tx.tx_id or tx.target_tick is None:
+        return None
+    processed = processed_tick(rpc)
+    if processed is None or processed < tx.target_tick:
+        return None
+    if hasattr(rpc, "get_transaction_status"):
+        try:
+            status = rpc.get_transaction_status(tx.tx_id)
+        except Exception:
+            status = None
+        if isinstance(status, dict):
+            info = status.get("transactionStatus", status)
+            if info.get("moneyFlew") is True or info.get("txId") == tx.tx_id:
+                return True
+    if tx.source_identity and hasattr(rpc, "get_transfer_transactions_per_tick"):
+        try:
+            data = rpc.get_transfer_transactions_per_tick(
+                tx.source_identity, tx.target_tick, tx.target_tick
+            )
+        except Exception:
+            return None
+        return tx.tx_id in str(data)
+    return None
+
+class TickScheduler:
+    """Schedules, broadcasts and confirms transactions against the live tick."""
+
+    def __init__(
+        self,
+        rpc,
+        signer,
+        tick_offset: int = DEFAULT_TICK_OFFSET,
+        per_source_per_tick: int = 1,
+        max_workers: int = 8,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        confirm_grace_ticks: int = DEFAULT_CONFIRM_GRACE_TICKS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        confirm: Optional[Callable[[Any, ScheduledTx], Optional[bool]]] = confirm_via_rpc,
+        rejected: Callable[[BaseException], bool] = broadcast_rejected,
+        poller: Optional[TickPoller] = None,
+    ) -> None:
+        self.rpc = rpc
+        self.signer = signer
+        self.tick_offset = tick_offset
+        self.per_source_per_tick = per_source_per_tick
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.confirm_grace_ticks = confirm_grace_ticks
+        self.confirm = confirm
+        self.rejected = rejected
+        self.poller = poller or TickPoller(rpc, poll_interval)
+        self._owns_poller = poller is None
+        self._queue: List[ScheduledTx] = []
+        self._all: List[ScheduledTx] = []
+        # (seed, tick) → number of transactions already assigned to that tick
+        self._slots: Dict[tuple, int] = defaultdict(int)
+
+    def submit(self, tx: ScheduledTx) -> ScheduledTx:
+        self._queue.append(tx)
+        self._all.append(tx)
+        return tx
+
+    def _assign_tick(self, tx: ScheduledTx, live_tick: int) -> int:
+        tick = live_tick + self.tick_offset
+        while self._slots[(tx.seed, tick)] >= self.per_source_per_tick:
+            tick += 1
+        self._slots[(tx.seed, tick)] += 1
+        return tick
+
+    def _broadcast(self, tx: ScheduledTx, tx_bytes: bytes) -> None:
+        try:
+            response = self.rpc.broadcast_transaction(tx_bytes)
+            tx.tx_id = response.get("txId") or response.get("transactionHash") or "UNKNOWN"
+            tx.status = "sent"
+        except Exception as exc:
+            # Only a refusal is safe to retry; after a timeout the node may have the tx
+            tx.status = "expired" if self.rejected(exc) else "unknown"
+            tx.error = str(exc)
+        tx.history.append({"attempt": tx.attempts, "target_tick": tx.target_tick, "status": tx.status, "tx_id": tx.tx_id})
+
+    def _dispatch(self, pool: ThreadPoolExecutor, live_tick: int) -> None:
+        batch, self._queue = self._queue, []
+        jobs = []
+        for tx in batch:
+            tx.attempts += 1
+            tx.target_tick = self._assign_tick(tx, live_tick)
+            tx.tx_id = None
+            tx.error = None
+            try:
+                tx_bytes = self.signer.build(
+                    tx.seed, tx.dest_identity, tx.amount, tx.target_tick, tx.payload, tx.input_type
+                )
+            except Exception as exc:
+                tx.status = "failed"
+                tx.error = str(exc)
+                continue
+            jobs.append(pool.submit(self._broadcast, tx, tx_bytes))
+        for job in jobs:
+            job.result()
+
+    def _settle(self, live_tick: int) -> None:
+        for tx in self._all:
+            if tx.status not in ("sent", "expired") or tx.target_tick is None:
+                continue
+            if tx.status == "sent":
+                if live_tick <= tx.target_tick:
+                    continue
+                included = self.confirm(self.rpc, tx) if self.confirm else True
+                if included:
+                    tx.status = "confirmed"
+                    continue
+                if live_tick <= tx.target_tick + self.confirm_grace_ticks:
+                    continue
+                if included is None:
+                    # Never re-broadcast while inclusion is unknown: that could spend twice
+                    tx.status = "unknown"
+                    tx.error = f"inclusion in tick {tx.target_tick} not determinable via RPC"
+                    tx.history.append({"attempt": tx.attempts, "target_tick": tx.target_tick, "status": tx.status, "tx_id": tx.tx_id})
+                    continue
+                tx.status = "expired"
+            if tx.attempts >= self.max_attempts:
+                tx.status = "failed"
+            else:
+                tx.status = "queued"
+                self._queue.append(tx)
+
+    def run(self, timeout: Optional[float] = None) -> List[ScheduledTx]:
+        """Drive every submitted transaction to confirmed/failed and return them."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self.poller.start()
+        try:
+            live_tick = self.poller.wait_for_tick(0, timeout)
+            if live_tick is None:
+                raise RuntimeError("could not read the latest tick from RPC")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                while any(tx.status in ("queued", "sent", "expired") for tx in self._all):
+                    if self._queue:
+                        self._dispatch(pool, live_tick)
+                    self._settle(live_tick)
+                    if deadline is not None and time.monotonic() >= deadline:
+                        break
+                    remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                    live_tick = self.poller.wait_for_tick(live_tick + 1, remaining)
+        finally:
+            if self._owns_poller:
+                self.poller.stop()
+        return list(self._all)
+
+    def summary(self) -> Dict[str, int]:
+        counts: Dict[str, int] = defaultdict(int)
+        for tx in self._all:
+            counts[tx.status] += 1
+        return dict(counts)
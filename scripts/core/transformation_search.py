@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Combinatorial transformation search: raw matrix values → seed candidates.
+
+Generalizes `raw_value_seed_extraction.test_transformations` (13 hand-written
+lambdas) to a parameterized grammar, evaluated with NumPy over all parameters
+at once:
+
+    seed[i] = (a * V(raw[path[i]]) + b + c * i + d * block(i)) mod 26
+
+- path:  diagonal coordinate sets from `get_diagonal_coordinates(idx)`,
+         forward or reversed, rotated by k positions; first 55 values
+- V:     value mode (trunc, floor, ceil, abs, half = v/2, double = v*2)
+- a, b:  multiplier and offset; c: per-index step; d: per-block offset
+         (the diagonal path has 4 blocks of 14 characters)
+
+Identical base vectors and identical seeds are deduplicated (64-bit rolling
+fingerprint) before derivation; unique candidates are streamed through a
+batched derivation backend and the search stops at the first identity that is
+in the target set (unless --exhaustive).
+
+Usage:
+    python3 scripts/core/transformation_search.py --dry-run
+    python3 scripts/core/transformation_search.py --multipliers 1-25 --index-steps 0-25 --backend pool
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+OUTPUT_DIR = project_root / "outputs" / "derived"
+
+SEED_LENGTH = 55
+BLOCK_LENGTH = 14
+VALUE_MODES = ("trunc", "floor", "ceil", "abs", "half", "double")
+PATH_MODES = ("forward", "reversed")
+
+# Powers of 27 modulo 2**64 for the candidate fingerprint
+_FINGERPRINT_POWERS = np.array([pow(27, i, 2**64) for i in range(SEED_LENGTH)], dtype=np.uint64)
+
+@dataclass(frozen=True)
+class Grammar:
+    """Parameter grid of the transformation search."""
+
+    identity_indices: Tuple[int, ...] = (1, 2, 3, 4)
+    path_modes: Tuple[str, ...] = PATH_MODES
+    rotations: Tuple[int, ...] = (0,)
+    value_modes: Tuple[str, ...] = VALUE_MODES
+    multipliers: Tuple[int, ...] = (1,)
+    offsets: Tuple[int, ...] = tuple(range(26))
+    index_steps: Tuple[int, ...] = (0, 1, 25)
+    block_steps: Tuple[int, ...] = (0,)
+
+    def size(self, base_rows: int) -> int:
+        """Number of (transformation × path) combinations before deduplication."""
+        return (
+            base_rows
+            * len(self.multipliers)
+            * len(self.offsets)
+            * len(self.index_steps)
+            * len(self.block_steps)
+        )
+
+@dataclass
+class SearchStats:
+    base_rows: int = 0
+    generated: int = 0
+    unique: int = 0
+    derived: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    matches: List[Dict] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        rate = self.derived / self.elapsed if self.elapsed else 0.0
+        return {
+            "base_rows": self.base_rows,
+            "generated": self.generated,
+            "unique": self.unique,
+            "derived": self.derived,
+            "failed": self.failed,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "derivations_per_second": round(rate, 1),
+            "matches": self.matches,
+        }
+
+def apply_value_mode(raw: np.ndarray, mode: str) -> np.ndarray:
+    """Vectorized equivalent of the legacy `int(...)` conversions."""
+    if mode == "trunc":
+        values = np.trunc(raw)
+    elif mode == "floor":
+        values = np.floor(raw)
+    elif mode == "ceil":
+        values = np.ceil(raw)
+    elif mode == "abs":
+        values = np.abs(np.trunc(raw))
+    elif mode == "half":
+        values = np.trunc(raw / 2)
+    elif mode == "double":
+        values = np.trunc(raw * 2)
+    else:
+        raise ValueError(f"Unknown value mode: {mode}")
+    return values.astype(np.int64)
+
+def affine_letters(values: np.ndarray, a: int = 1, b: int = 0, c: int = 0, d: int = 0) -> np.ndarray:
+    """`(a*v + b + c*i + d*block(i)) mod 26` for `(..., 55)` integer arrays."""
+    positions = np.arange(values.shape[-1], dtype=np.int64)
+    shift = c * positions + d * (positions // BLOCK_LENGTH)
+    return ((a * values + b + shift) % 26).astype(np.uint8)
+
+def letters_to_seeds(letters: np.ndarray) -> List[str]:
+    """`(n, 55)` uint8 arrays of 0..25 → lowercase seed strings."""
+    if letters.size == 0:
+        return []
+    buf = (letters.astype(np.uint8) + ord("a")).tobytes()
+    width = letters.shape[1]
+    return [buf[i : i + width].decode("ascii") for i in range(0, len(buf), width)]
+
+def fingerprint(letters: np.ndarray) -> np.ndarray:
+    """64-bit rolling hash per row (uint64 arithmetic wraps modulo 2**64)."""
+    return (letters.astype(np.uint64) * _FINGERPRINT_POWERS[: letters.shape[1]]).sum(axis=1, dtype=np.uint64)
+
+def build_paths(matrix: np.ndarray, grammar: Grammar) -> Tuple[List[Dict], np.ndarray]:
+    """Raw value vectors for every (coordinate set, direction, rotation)."""
+    from scripts.core.raw_value_seed_extraction import get_diagonal_coordinates
+
+    labels: List[Dict] = []
+    rows: List[np.ndarray] = []
+    for identity_index in grammar.identity_indices:
+        coords = np.array(get_diagonal_coordinates(identity_index), dtype=np.int64).reshape(-1, 2)
+        if len(coords) < SEED_LENGTH:
+            continue
+        for path_mode in grammar.path_modes:
+            ordered = coords[::-1] if path_mode == "reversed" else coords
+            for rotation in grammar.rotations:
+                path = np.roll(ordered, -rotation, axis=0)[:SEED_LENGTH]
+                rows.append(matrix[path[:, 0], path[:, 1]].astype(np.float64))
+                labels.append({"identity_index": identity_index, "path": path_mode, "rotation": rotation})
+    raw = np.vstack(rows) if rows else np.empty((0, SEED_LENGTH))
+    return labels, raw
+
+def build_base_rows(matrix: np.ndarray, grammar: Grammar) -> Tuple[List[Dict], np.ndarray]:
+    """Integer base vectors for every path × value mode, with duplicates removed."""
+    path_labels, raw = build_paths(matrix, grammar)
+    labels: List[Dict] = []
+    blocks: List[np.ndarray] = []
+    for mode in grammar.value_modes:
+        blocks.append(apply_value_mode(raw, mode))
+        labels.extend(dict(label, value_mode=mode) for label in path_labels)
+    if not blocks:
+        return [], np.empty((0, SEED_LENGTH), dtype=np.int64)
+    values = np.vstack(blocks)
+    # For integer-valued matrices trunc/floor/ceil coincide; keep the first label
+    _, first = np.unique(values, axis=0, return_index=True)
+    first.sort()
+    return [labels[i] for i in first], values[first]
+
+def iter_candidates(values: np.ndarray, grammar: Grammar) -> Iterator[Tuple[np.ndarray, Tuple[int, int, int]]]:
+    """Yield (letters, (a, c, d)) blocks over the whole grammar.
+
+    Each block covers every base row × offset for one (a, c, d) combination;
+    row `k` of a block is base row `k // len(offsets)` with offset
+    `offsets[k % len(offsets)]`.
+    """
+    offsets = np.array(grammar.offsets, dtype=np.int64)
+    for a in grammar.multipliers:
+        for c in grammar.index_steps:
+            for d in grammar.block_steps:
+                block = affine_letters(values[:, None, :], a, offsets[:, None], c, d)
+                yield block.reshape(-1, values.shape[1]), (a, c, d)
+
+def describe(params: Dict) -> str:
+    return (
+        f"{params['value_mode']}: ({params['a']}*v + {params['b']} + {params['c']}*i + "
+        f"{params['d']}*block) mod 26 | id{params['identity_index']} {params['path']} "
+        f"rot{params['rotation']}"
+    )
+
+def search(
+    matrix: np.ndarray,
+    targets: Set[str],
+    grammar: Grammar,
+    backend=None,
+    batch_size: int = 2048,
+    stop_on_match: bool = True,
+    max_candidates: Optional[int] = None,
+    progress_every: int = 50_000,
+) -> SearchStats:
+    """Run the search. `backend=None` only enumerates and deduplicates (dry run)."""
+    stats = SearchStats()
+    start = time.perf_counter()
+    labels, values = build_base_rows(matrix, grammar)
+    stats.base_rows = len(values)
+    seen: Set[int] = set()
+    pending_seeds: List[str] = []
+    pending_params: List[Dict] = []
+    next_report = progress_every
+
+    def flush() -> bool:
+        if not pending_seeds:
+            return False
+        identities = backend.derive_batch(pending_seeds)
+        stats.derived += len(pending_seeds)
+        for seed, identity, params in zip(pending_seeds, identities, pending_params):
+            if identity is None:
+                stats.failed += 1
+            elif identity in targets:
+                stats.matches.append({"seed": seed, "identity": identity, "transformation": describe(params), **params})
+                print(f"🎉 MATCH: {seed} -> {identity} ({describe(params)})")
+        pending_seeds.clear()
+        pending_params.clear()
+        return bool(stats.matches) and stop_on_match
+
+    for letters, (a, c, d) in iter_candidates(values, grammar):
+        stats.generated += len(letters)
+        prints = fingerprint(letters)
+        _, first = np.unique(prints, return_index=True)
+        first.sort()
+        fresh = [idx for idx in first.tolist() if int(prints[idx]) not in seen]
+        seen.update(int(prints[idx]) for idx in fresh)
+        if max_candidates is not None:
+            fresh = fresh[: max(max_candidates - stats.unique, 0)]
+        stats.unique += len(fresh)
+
+        if backend is not None and fresh:
+            seeds = letters_to_seeds(letters[fresh])
+            for seed, idx in zip(seeds, fresh):
+                row, b = divmod(idx, len(grammar.offsets))
+                pending_seeds.append(seed)
+                pending_params.append(dict(labels[row], a=a, b=grammar.offsets[b], c=c, d=d))
+                if len(pending_seeds) >= batch_size and flush():
+                    stats.elapsed = time.perf_counter() - start
+                    return stats
+
+        if stats.unique >= next_report:
+            elapsed = time.perf_counter() - start
+            print(f"  {stats.unique:,} unique / {stats.generated:,} generated, {stats.derived:,} derived ({elapsed:.1f}s)")
+            next_report += progress_every
+        if max_candidates is not None and stats.unique >= max_candidates:
+            break
+
+    if backend is not None:
+        flush()
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+def parse_int_list(text: str) -> Tuple[int, ...]:
+    """'1,3,5-8' → (1, 3, 5, 6, 7, 8). Negative steps are written mod 26 (-1 → 25)."""
+    values: List[int] = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            low, high = part.split("-", 1)
+            values.extend(range(int(low), int(high) + 1))
+        else:
+            values.append(int(part))
+    return tuple(dict.fromkeys(values))
+
+def load_targets(path: Optional[Path]) -> Set[str]:
+    """Target identities: a JSON list/dict file, or the 100 documented identities."""
+    if path is None:
+        from scripts.core.raw_value_seed_extraction import load_test_data
+
+        return {item["identity"] for item in load_test_data() if item.get("identity")}
+    data = json.loads(path.read_text())
+    if isinstance(data, dict):
+        data = data.get("identities") or data.get("seeds_and_identities") or list(data.values())
+    return {item["identity"] if isinstance(item, dict) else str(item) for item in data}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Combinatorial raw-value → seed transformation search")
+    parser.add_argument("--identity-indices", default="1-4", help="Diagonal coordinate sets (get_diagonal_coordinates)")
+    parser.add_argument("--path-modes", default=",".join(PATH_MODES))
+    parser.add_argument("--rotations", default="0", help="Path rotations, e.g. 0-55")
+    parser.add_argument("--value-modes", default=",".join(VALUE_MODES))
+    parser.add_argument("--multipliers", default="1", help="Values for a, e.g. 1-25")
+    parser.add_argument("--offsets", default="0-25", help="Values for b")
+    parser.add_argument("--index-steps", default="0,1,25", help="Values for c")
+    parser.add_argument("--block-steps", default="0", help="Values for d")
+    parser.add_argument("--targets", type=Path, default=None, help="JSON file with target identities")
+    parser.add_argument("--backend", default="auto", choices=["auto", "qubipy", "portable", "pool", "docker", "gateway"])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=2048)
+    parser.add_argument("--max-candidates", type=int, default=None)
+    parser.add_argument("--exhaustive", action="store_true", help="Keep searching after the first match")
+    parser.add_argument("--dry-run", action="store_true", help="Only enumerate and deduplicate candidates")
+    args = parser.parse_args()
+
+    from scripts.core.raw_value_seed_extraction import load_matrix
+
+    grammar = Grammar(
+        identity_indices=parse_int_list(args.identity_indices),
+        path_modes=tuple(p for p in args.path_modes.split(",") if p),
+        rotations=parse_int_list(args.rotations),
+        value_modes=tuple(m for m in args.value_modes.split(",") if m),
+        multipliers=parse_int_list(args.multipliers),
+        offsets=parse_int_list(args.offsets),
+        index_steps=parse_int_list(args.index_steps),
+        block_steps=parse_int_list(args.block_steps),
+    )
+
+    print("=" * 80)
+    print("TRANSFORMATION SEARCH")
+    print("=" * 80)
+    matrix = load_matrix()
+    if matrix is None:
+        return
+    targets = load_targets(args.targets)
+    print(f"Targets: {len(targets)} identities")
+
+    backend = None
+    if not args.dry_run:
+        from scripts.core.derivation_backends import make_backend
+
+        backend = make_backend(args.backend, args.workers)
+        print(f"Backend: {backend.name}")
+
+    try:
+        stats = search(
+            matrix,
+            targets,
+            grammar,
+            backend,
+            batch_size=args.batch_size,
+            stop_on_match=not args.exhaustive,
+            max_candidates=args.max_candidates,
+        )
+    finally:
+        if backend is not None:
+            backend.close()
+
+    result = stats.to_dict()
+    print()
+    print(f"Base vectors: {result['base_rows']} (grid size {grammar.size(result['base_rows']):,})")
+    print(f"Generated: {result['generated']:,}  Unique: {result['unique']:,}  Derived: {result['derived']:,}")
+    print(f"Elapsed: {result['elapsed_seconds']}s ({result['derivations_per_second']}/s)")
+    print(f"Matches: {len(result['matches'])}")
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output_file = OUTPUT_DIR / "transformation_search_results.json"
+    with output_file.open("w") as f:
+        json.dump({"grammar": asdict(grammar), "targets": len(targets), **result}, f, indent=2)
+    print(f"✅ Results saved to: {output_file}")
+
+if __name__ == "__main__":
+    main()
@@ -1,66 +1,33 @@
 #!/usr/bin/env python3
 """
 Validate Seeds with Docker - Batch Version
-Validiert mehrere Seeds in einem Docker-Call (schneller)
+Validiert mehrere Seeds in einem Request an das Derivation-Gateway
+(ein langlebiger Container, siehe scripts/core/derivation_gateway.py)
 """
 
 import json
-import subprocess
 import sys
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-def validate_seeds_batch(seeds: list, target_identity: str) -> dict:
- """Validate multiple seeds in one Docker call."""
- # Create Python script that tests all seeds
- script = f'''
-from qubipy.crypto.utils import (
- get_subseed_from_seed,
- get_private_key_from_subseed,
- get_public_key_from_private_key,
- get_identity_from_public_key,
-)
-
-target = "{target_identity}"
-results = {{}}
-
-seeds = {json.dumps(seeds)}
+from scripts.core.derivation_gateway import GatewayError, ensure_gateway
 
-for i, seed in enumerate(seeds):
+def validate_seeds_batch(seeds: list, target_identity: str) -> dict:
+ """Validate multiple seeds in one request to the derivation gateway."""
  try:
- seed_bytes = seed.encode("utf-8")
- subseed = get_subseed_from_seed(seed_bytes)
- private_key = get_private_key_from_subseed(subseed)
- public_key = get_public_key_from_private_key(private_key)
- identity = get_identity_from_public_key(public_key)
- match = (identity == target)
- results[i] = {{"seed": seed, "identity": identity, "match": match}}
- except Exception as e:
- results[i] = {{"seed": seed, "error": str(e)}}
-
-import json
-print(json.dumps(results))
-'''
+ identities = ensure_gateway().derive_batch(seeds)
+ except GatewayError as e:
+ return {"error": str(e)}
  
- try:
- result = subprocess.run(
- ['docker', 'run', '--rm', '-v', f'{project_root}:/workspace', '-w', '/workspace',
- 'python:3.11', 'bash', '-c', f'pip install -q qubipy && python3 -c """{script}"""'],
- capture_output=True,
- text=True,
- timeout=180
- )
- 
- if result.returncode == 0 and result.stdout.strip():
- return json.loads(result.stdout.strip())
+ results = {}
+ for i, (seed, identity) in enumerate(zip(seeds, identities)):
+ if identity:
+ results[str(i)] = {"seed": seed, "identity": identity, "match": identity == target_identity}
  else:
- return {"error": result.stderr.strip() or "Docker execution failed"}
- except subprocess.TimeoutExpired:
- return {"error": "Docker timeout"}
- except Exception as e:
- return {"error": str(e)}
+ results[str(i)] = {"seed": seed, "error": "invalid seed"}
+ return results
 
 def main():
  """Main function."""
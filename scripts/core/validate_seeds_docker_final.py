@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 """
 Validate Seeds with Docker - Final Version
-Nutzt Docker for Identity-Derivation (da QubiPy lokal nicht verfügbar)
+Nutzt Docker for Identity-Derivation (da QubiPy lokal nicht verfügbar) -
+über das Derivation-Gateway, einen einzigen langlebigen Container
 """
 
 import json
-import subprocess
 import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
@@ -13,55 +13,29 @@ from typing import Dict, List, Tuple
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.core.derivation_gateway import GatewayError, ensure_gateway
+
 def derive_identity_docker(seed: str) -> Tuple[bool, str]:
- """Derive identity from seed using Docker."""
- # Use inline script to avoid f-string issues
- script = "from qubipy.crypto.utils import get_subseed_from_seed, get_private_key_from_subseed, get_public_key_from_private_key, get_identity_from_public_key; seed = '" + seed + "'; seed_bytes = seed.encode('utf-8'); subseed = get_subseed_from_seed(seed_bytes); private_key = get_private_key_from_subseed(subseed); public_key = get_public_key_from_private_key(private_key); identity = get_identity_from_public_key(public_key); print(identity)"
- 
+ """Derive identity from seed via the derivation gateway container."""
  try:
- result = subprocess.run(
- ['docker', 'run', '--rm', '-v', f'{project_root}:/workspace', '-w', '/workspace',
- 'qubic-proof', 'python3', '-c', script],
- capture_output=True,
- text=True,
- timeout=120
- )
- 
- if result.returncode == 0 and result.stdout.strip():
- identity = result.stdout.strip()
- if len(identity) == 60:
+ identity = ensure_gateway().derive(seed)
+ except GatewayError as e:
+ return False, f"Gateway error: {e}"
+ 
+ if identity and len(identity) == 60:
  return True, identity
- else:
- return False, f"Invalid identity length: {len(identity)}"
- else:
- return False, result.stderr.strip() or "Docker execution failed"
- except subprocess.TimeoutExpired:
- return False, "Docker timeout"
- except Exception as e:
- return False, f"Docker error: {e}"
+ return False, f"Invalid identity: {identity!r}"
 
 def check_identity_onchain_docker(identity: str) -> Dict:
- """Check identity on-chain using Docker."""
- # Use inline script to avoid f-string issues
- script = "from qubipy.rpc import rpc_client; import json; identity = '" + identity + "'; rpc = rpc_client.QubiPy_RPC(); balance_data = rpc.get_balance(identity); result = {'exists': True, 'balance': balance_data.get('balance', 0), 'validForTick': balance_data.get('validForTick')} if balance_data else {'exists': False}; print(json.dumps(result))"
- 
+ """Check identity on-chain via the gateway's qubipy RPC client."""
  try:
- result = subprocess.run(
- ['docker', 'run', '--rm', '-v', f'{project_root}:/workspace', '-w', '/workspace',
- 'qubic-proof', 'python3', '-c', script],
- capture_output=True,
- text=True,
- timeout=60
- )
- 
- if result.returncode == 0 and result.stdout.strip():
- return json.loads(result.stdout.strip())
- else:
- return {"exists": False, "error": result.stderr.strip() or "Docker execution failed"}
- except subprocess.TimeoutExpired:
- return {"exists": False, "error": "Docker timeout"}
- except Exception as e:
+ balance_data = ensure_gateway().get_balance(identity)
+ except GatewayError as e:
  return {"exists": False, "error": str(e)}
+ 
+ if not balance_data:
+ return {"exists": False}
+ return {"exists": True, "balance": balance_data.get("balance", 0), "validForTick": balance_data.get("validForTick")}
 
 def main():
  """Main function."""
@@ -114,7 +88,7 @@ def main():
  sys.stdout.flush()
  
  # Derive identity
- print(f" Deriving identity (Docker)...")
+ print(f" Deriving identity (Gateway)...")
  sys.stdout.flush()
  success, identity = derive_identity_docker(seed)
  
@@ -124,7 +98,7 @@ def main():
  "method": method,
  "seed": seed,
  "error": identity,
- "derivation_method": "docker"
+ "derivation_method": "gateway"
  })
  print()
  continue
@@ -136,7 +110,7 @@ def main():
  print(f" {'✅ MATCH!' if match else '❌ No match'}")
  
  # Check on-chain
- print(f" Checking on-chain (Docker)...")
+ print(f" Checking on-chain (Gateway)...")
  sys.stdout.flush()
  onchain = check_identity_onchain_docker(identity)
  onchain_status = "✅ ON-CHAIN" if onchain.get("exists") else "❌ NOT ON-CHAIN"
@@ -147,7 +121,7 @@ def main():
  "seed": seed,
  "derived_identity": identity,
  "match": match,
- "derivation_method": "docker",
+ "derivation_method": "gateway",
  "onchain": onchain
  })
  
@@ -13,7 +13,6 @@ from typing import Dict, List, Tuple
 from collections import Counter, defaultdict
 from datetime import datetime
 import numpy as np
-from scipy.stats import chi2_contingency
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
@@ -83,6 +82,7 @@ def analyze_seed_position_influence(pairs: List[Dict], seed_pos: int, target_pos
  
  if len(contingency) > 1 and all(len(row) == 2 for row in contingency):
  try:
+ from scipy.stats import chi2_contingency
  chi2, p_value, dof, expected = chi2_contingency(contingency)
  n = sum(sum(row) for row in contingency)
  min_dim = min(len(contingency), len(contingency[0]))
@@ -18,6 +18,8 @@ import random
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.analysis.positional_index import load_layer_index
+
 LAYER3_FILE = project_root / "outputs" / "derived" / "layer3_derivation_23k_complete.json"
 MAPPING_FILE = project_root / "outputs" / "derived" / "all_seed_identity_mappings_complete.json"
 OUTPUT_DIR = project_root / "outputs" / "derived"
@@ -30,41 +32,11 @@ def identity_to_seed(identity: str) -> str:
 def find_seeds_with_targets(targets: Dict[int, str]) -> List[str]:
  """Finde Seeds die alle Targets erfüllen."""
  
- with LAYER3_FILE.open() as f:
- layer3_data = json.load(f)
- layer3_results = layer3_data.get("results", [])
- 
- matching = []
- 
- for entry in layer3_results:
- identity = entry.get("layer3_identity", "")
- if len(identity) != 60:
- continue
- 
- seed = identity_to_seed(identity)
- if len(seed) < 55:
- continue
- 
- # Check ob Seed alle Targets erfüllt
- seed_matches = True
- for pos, target_char in targets.items():
- if pos < 55:
- if len(seed) > pos and seed[pos].lower() != target_char.lower():
- seed_matches = False
- break
- 
- if seed_matches:
- # Check ob Identity auch alle Targets erfüllt
- identity_matches = True
- for pos, target_char in targets.items():
- if len(identity) > pos and identity[pos].upper() != target_char.upper():
- identity_matches = False
- break
- 
- if identity_matches:
- matching.append(identity)
- 
- return matching
+ # Bitmap-Index (einmal pro Prozess geladen): Seed = identity.lower()[:55], daher
+ # reicht der Identity-Check; Positionen >= 60 werden wie bisher ignoriert
+ index = load_layer_index(LAYER3_FILE)
+ constraints = {pos: char for pos, char in targets.items() if pos < 60}
+ return index.values(index.select(constraints))
 
 def analyze_position_combinations() -> Dict:
  """Analyze welche Position-Kombinationen am besten funktionieren."""
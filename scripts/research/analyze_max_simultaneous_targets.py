@@ -17,6 +17,8 @@ import random
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.analysis.positional_index import load_layer_index
+
 LAYER3_FILE = project_root / "outputs" / "derived" / "layer3_derivation_23k_complete.json"
 MAPPING_FILE = project_root / "outputs" / "derived" / "all_seed_identity_mappings_complete.json"
 OUTPUT_DIR = project_root / "outputs" / "derived"
@@ -29,41 +31,11 @@ def identity_to_seed(identity: str) -> str:
 def find_seeds_with_targets(targets: Dict[int, str]) -> List[str]:
  """Finde Seeds die alle Targets erfüllen."""
  
- with LAYER3_FILE.open() as f:
- layer3_data = json.load(f)
- layer3_results = layer3_data.get("results", [])
- 
- matching = []
- 
- for entry in layer3_results:
- identity = entry.get("layer3_identity", "")
- if len(identity) != 60:
- continue
- 
- seed = identity_to_seed(identity)
- if len(seed) < 55:
- continue
- 
- # Check ob Seed alle Targets erfüllt
- seed_matches = True
- for pos, target_char in targets.items():
- if pos < 55:
- if len(seed) > pos and seed[pos].lower() != target_char.lower():
- seed_matches = False
- break
- 
- if seed_matches:
- # Check ob Identity auch alle Targets erfüllt
- identity_matches = True
- for pos, target_char in targets.items():
- if len(identity) > pos and identity[pos].upper() != target_char.upper():
- identity_matches = False
- break
- 
- if identity_matches:
- matching.append(identity)
- 
- return matching
+ # Bitmap-Index (einmal pro Prozess geladen): Seed = identity.lower()[:55], daher
+ # reicht der Identity-Check; Positionen >= 60 werden wie bisher ignoriert
+ index = load_layer_index(LAYER3_FILE)
+ constraints = {pos: char for pos, char in targets.items() if pos < 60}
+ return index.values(index.select(constraints))
 
 def test_simultaneous_targets(num_positions: int, num_tests: int = 10) -> Dict:
  """Teste ob num_positions gleichzeitig gesetzt werden können."""
@@ -83,6 +55,12 @@ def test_simultaneous_targets(num_positions: int, num_tests: int = 10) -> Dict:
  
  direct_positions = sorted(list(direct_positions))
  
+ # Verfügbare Characters pro Position (einmal statt pro Test und Position)
+ available_by_position = defaultdict(set)
+ for mapping in perfect_mappings:
+ if mapping["seed_position"] == mapping["identity_position"]:
+ available_by_position[mapping["seed_position"]].add(mapping["seed_char"].upper())
+ 
  if len(direct_positions) < num_positions:
  return {
  "num_positions": num_positions,
@@ -100,11 +78,7 @@ def test_simultaneous_targets(num_positions: int, num_tests: int = 10) -> Dict:
  # Wähle zufällige Characters for jede Position
  targets = {}
  for pos in selected_positions:
- # Finde verfügbare Characters for diese Position
- available_chars = set()
- for mapping in perfect_mappings:
- if mapping["seed_position"] == pos and mapping["identity_position"] == pos:
- available_chars.add(mapping["seed_char"].upper())
+ available_chars = available_by_position.get(pos, set())
  
  if available_chars:
  targets[pos] = random.choice(list(available_chars))
@@ -134,6 +108,12 @@ def test_simultaneous_targets(num_positions: int, num_tests: int = 10) -> Dict:
 
 def main():
  """Hauptfunktion."""
+ import argparse
+ 
+ parser = argparse.ArgumentParser(description="Maximale gleichzeitige Targets")
+ parser.add_argument("--tests", type=int, default=20, help="Zufällige Target-Sets pro Anzahl Positionen (Standard: 20)")
+ args = parser.parse_args()
+ 
  print("=" * 80)
  print("ANALYSE: MAXIMALE GLEICHZEITIGE TARGETS")
  print("=" * 80)
@@ -147,7 +127,7 @@ def main():
  
  for num_pos in test_counts:
  print(f"🔍 Teste {num_pos} Positionen gleichzeitig...")
- result = test_simultaneous_targets(num_pos, num_tests=20)
+ result = test_simultaneous_targets(num_pos, num_tests=args.tests)
  all_results[num_pos] = result
  
  if result["possible"]:
@@ -18,45 +18,38 @@ sys.path.insert(0, str(project_root))
 OUTPUT_DIR = project_root / "outputs" / "derived"
 REPORTS_DIR = project_root / "outputs" / "reports"
 
+from scripts.analysis.identity_graph import identity_to_seed, load_graph
+
 def load_complete_chains() -> List[Dict]:
- """Load komplette Layer-Ketten."""
- chains = []
+ """Load komplette Layer-Ketten aus dem Identity-Graph (statt JSON-Join pro Lauf)."""
+ graph = load_graph()
+ layer2_nodes = graph.nodes_in_layer(2)
+ if not layer2_nodes.size:
+ return []
  
- # Load Layer-3 Daten
- layer3_file = OUTPUT_DIR / "layer3_derivation_complete.json"
- if not layer3_file.exists():
+ # Layer-2 → Layer-3 für alle Ketten in einem Schritt
+ paths = graph.chains(layer2_nodes, max_length=2)
+ if paths.shape[1] < 2:
  return []
  
- with layer3_file.open() as f:
- layer3_data = json.load(f)
- 
- # Load Layer-1 Identities
- db_file = project_root / "outputs" / "analysis" / "complete_mapping_database.json"
- seed_to_real_id = {}
- if db_file.exists():
- with db_file.open() as f:
- db = json.load(f)
- seed_to_real_id = db.get("seed_to_real_id", {})
- 
- # Baue Chains
- for result in layer3_data.get("results", []):
- layer2_id = result.get("layer2_identity")
- layer3_id = result.get("layer3_identity")
- seed = result.get("seed", "")
- layer3_onchain = result.get("layer3_onchain", False)
- 
- if not layer2_id or not layer3_id:
+ chains = []
+ for layer2_node, layer3_node in paths:
+ if layer3_node < 0:
  continue
  
- # Finde Layer-1 (aus Seed)
- layer1_id = seed_to_real_id.get(seed)
+ # Layer-1: Parent im Graph (Layer-1 → Layer-2 Kante)
+ layer1_id = next(
+ (graph.identity(parent) for parent in graph.parents(layer2_node) if graph.layer[parent] == 1),
+ None
+ )
+ layer2_id = graph.identity(layer2_node)
  
  chain = {
  "layer1": layer1_id,
  "layer2": layer2_id,
- "layer3": layer3_id,
- "seed": seed,
- "layer3_onchain": layer3_onchain
+ "layer3": graph.identity(layer3_node),
+ "seed": identity_to_seed(layer2_id),
+ "layer3_onchain": bool(graph.onchain[layer3_node] == 1)
  }
  
  chains.append(chain)
@@ -16,9 +16,6 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import RandomizedSearchCV, StratifiedKFold, train_test_split
-from sklearn.metrics import accuracy_score
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
@@ -69,6 +66,10 @@ def main() -> None:
  log(f"❌ Datendatei fehlt: {DATA_FILE}")
  return
 
+ from sklearn.ensemble import RandomForestClassifier
+ from sklearn.metrics import accuracy_score
+ from sklearn.model_selection import RandomizedSearchCV, StratifiedKFold, train_test_split
+
  matrix = load_anna_matrix(MATRIX_FILE) if MATRIX_FILE.exists() else None
  target_pos = 27
  X, y = load_data(target_pos, matrix)
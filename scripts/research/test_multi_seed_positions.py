@@ -5,13 +5,18 @@ Teste Multi-Position Models (3+ Seed-Positionen)
 """
 
 import json
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
-from collections import Counter, defaultdict
+from collections import Counter
 from datetime import datetime
 import itertools
 
 project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.analysis.positional_index import MISSING, PositionalIndex
+
 LAYER3_FILE = project_root / "outputs" / "derived" / "layer3_derivation_23k_complete.json"
 LAYER4_FILE = project_root / "outputs" / "derived" / "layer4_derivation_full_23k.json"
 OUTPUT_DIR = project_root / "outputs" / "derived"
@@ -26,64 +31,34 @@ def test_multi_seed_positions(pairs: List[Dict], seed_positions: List[int], min_
  
  print(f"🔍 Teste Kombinationen von {len(seed_positions)} Seed-Positionen...")
  
- # Erstelle alle möglichen Kombinationen
- # Für Performance: Teste nur Top Characters pro Position
- position_top_chars = {}
+ # Bitmap-Index über die Paare: Seed-Characters pro Position + Stabilität von Position 27
+ index = PositionalIndex.build({
+ "seed": [identity_to_seed(pair["layer3"]) for pair in pairs],
+ "layer3": [pair["layer3"] for pair in pairs],
+ "layer4": [pair["layer4"] for pair in pairs],
+ })
  
- # Finde Top Characters for jede Position
+ # Für Performance: Teste nur Top 5 Characters pro Position
+ valid_rows = index.all_rows
  for seed_pos in seed_positions:
- char_counts = Counter()
- for pair in pairs:
- seed = identity_to_seed(pair["layer3"])
- if len(seed) > seed_pos:
- char_counts[seed[seed_pos].lower()] += 1
- # Top 5 Characters pro Position
- position_top_chars[seed_pos] = [char for char, _ in char_counts.most_common(5)]
- 
- # Teste Kombinationen
- combination_groups = defaultdict(lambda: {"stable": 0, "changing": 0})
- 
- for pair in pairs:
- l3_id = pair["layer3"]
- l4_id = pair["layer4"]
- seed = identity_to_seed(l3_id)
- 
- if len(seed) >= 55 and len(l3_id) > 27 and len(l4_id) > 27:
- # Erstelle Kombinations-Key
- combo_chars = []
- valid = True
- for seed_pos in seed_positions:
- if len(seed) > seed_pos:
- char = seed[seed_pos].lower()
- # Nur testen wenn Character in Top 5
- if char in position_top_chars[seed_pos]:
- combo_chars.append(f"{seed_pos}:{char}")
- else:
- valid = False
- break
- else:
- valid = False
- break
- 
- if valid:
- combination_key = "_".join(combo_chars)
- stable = l3_id[27].upper() == l4_id[27].upper()
- 
- if stable:
- combination_groups[combination_key]["stable"] += 1
- else:
- combination_groups[combination_key]["changing"] += 1
+ char_counts = Counter(index.columns["seed"][seed_pos]) if seed_pos < len(index.columns["seed"]) else Counter()
+ top_chars = [char for char, _ in char_counts.most_common() if char != MISSING][:5]
+ valid_rows &= index.any_of("seed", seed_pos, top_chars)
+ 
+ stable_rows = index.equal("layer3", 27, "layer4", 27)
+ totals = index.combination_counts("seed", seed_positions, within=valid_rows)
+ stable_counts = index.combination_counts("seed", seed_positions, within=valid_rows & stable_rows)
  
  # Berechne Raten
  combination_rates = {}
- for combo, stats in combination_groups.items():
- total = stats["stable"] + stats["changing"]
+ for chars, total in totals.items():
  if total >= min_samples:
- rate = stats["stable"] / total
- combination_rates[combo] = {
- "rate": rate,
- "stable": stats["stable"],
- "changing": stats["changing"],
+ stable = stable_counts.get(chars, 0)
+ combination_key = "_".join(f"{seed_pos}:{char.lower()}" for seed_pos, char in zip(seed_positions, chars))
+ combination_rates[combination_key] = {
+ "rate": stable / total,
+ "stable": stable,
+ "changing": total - stable,
  "total": total
  }
  
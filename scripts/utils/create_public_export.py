@@ -15,16 +15,31 @@ Keeps:
 - Basic layer structure (Layer-1 → Layer-2)
 - Reproducible extraction methods
 - Statistical proof
+
+The export is incremental: a manifest of (source hash, sanitizer version) →
+output hash is kept in outputs/cache/export_manifests/, only changed files are
+re-sanitized (in parallel) and files are written atomically. Use --full to
+rebuild the export from scratch.
 """
 
+import argparse
 import re
 import shutil
+import sys
 from pathlib import Path
-from typing import List, Set
+from typing import List, Optional, Set, Tuple
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 EXPORT_DIR = PROJECT_ROOT / "github_export"
 
+sys.path.insert(0, str(PROJECT_ROOT))
+from scripts.utils.export_pipeline import MANIFEST_DIR, ExportTask, atomic_write_text, run_export, sanitizer_version
+
+EXPORT_MANIFEST = MANIFEST_DIR / "public_export.json"
+
+# Bump when sanitize_export_content changes beyond the pattern tables below
+SANITIZER_VERSION = "1"
+
 # Files to exclude completely
 EXCLUDE_FILES = [
  "outputs/derived/", # Will selektiv above include_dirs eingefügt
@@ -203,11 +218,12 @@ def humanize_content(content: str) -> str:
  
  return result
 
-def sanitize_file(src: Path, dst: Path):
- """Sanitize file content."""
- dst.parent.mkdir(parents=True, exist_ok=True)
- 
- try:
+def export_sanitizer_version() -> str:
+ """Version of sanitize_export_content; cached exports are redone when it changes."""
+ return sanitizer_version(SANITIZER_VERSION, GENESIS_PATTERNS, LLM_PHRASES, PERSONAL_PATTERNS)
+
+def sanitize_export_content(src: Path) -> Optional[str]:
+ """Sanitized content of `src`, or None if the file must not be exported."""
  content = src.read_text(encoding='utf-8', errors='ignore')
  
  # Skip if contains Genesis strategies
@@ -240,7 +256,7 @@ def sanitize_file(src: Path, dst: Path):
  content = '\n'.join(filtered_lines)
  else:
  # For markdown, just skip the file
- return
+ return None
  
  # Humanize content
  sanitized = humanize_content(content)
@@ -260,33 +276,24 @@ def sanitize_file(src: Path, dst: Path):
  sanitized
  )
  
- dst.write_text(sanitized, encoding='utf-8')
+ return sanitized
+
+def sanitize_file(src: Path, dst: Path):
+ """Sanitize file content."""
+ try:
+ sanitized = sanitize_export_content(src)
+ if sanitized is None:
+ return
+ atomic_write_text(dst, sanitized)
  print(f" ✓ {src.relative_to(PROJECT_ROOT)}")
  
  except Exception as e:
  print(f" ✗ {src.relative_to(PROJECT_ROOT)}: {e}")
 
-def export_public_repo():
- """Export public repository."""
- print("=" * 80)
- print("CREATING PUBLIC GITHUB EXPORT")
- print("=" * 80)
- print()
- print("Filtering:")
- print(" - Genesis/contract strategies")
- print(" - Personal data")
- print(" - LLM-typical phrases")
- print(" - Internal research steps")
- print()
- 
- # Remove old export
- if EXPORT_DIR.exists():
- shutil.rmtree(EXPORT_DIR)
- EXPORT_DIR.mkdir(parents=True, exist_ok=True)
- 
- files_copied = 0
+def collect_export_tasks() -> Tuple[List[ExportTask], int]:
+ """Files of the public export (with export-relative paths) and the excluded count."""
+ tasks = []
  files_excluded = 0
- files_sanitized = 0
  
  # Core files to include
  core_files = [
@@ -327,57 +334,91 @@ def export_public_repo():
  "docs/",
  ]
  
- # Copy core files
+ # Core files
  for file_pattern in core_files:
  src = PROJECT_ROOT / file_pattern
  if src.exists():
  if src.is_file():
- dst = EXPORT_DIR / file_pattern
- sanitize_file(src, dst)
- files_copied += 1
+ tasks.append(ExportTask(src, file_pattern))
  else:
  # Directory
- for file_path in src.rglob('*'):
+ for file_path in sorted(src.rglob('*')):
  if file_path.is_file() and not should_exclude(file_path):
- rel_path = file_path.relative_to(PROJECT_ROOT)
- dst = EXPORT_DIR / rel_path
- sanitize_file(file_path, dst)
- files_copied += 1
+ tasks.append(ExportTask(file_path, str(file_path.relative_to(PROJECT_ROOT))))
  
- # Copy include directories/files
+ # Include directories/files
  for pattern in include_dirs:
  src = PROJECT_ROOT / pattern
  if src.exists():
  if src.is_file():
  if not is_genesis_strategy_file(src):
- dst = EXPORT_DIR / pattern
- sanitize_file(src, dst)
- files_copied += 1
+ tasks.append(ExportTask(src, pattern))
  else:
  files_excluded += 1
  else:
- for file_path in src.rglob('*'):
+ for file_path in sorted(src.rglob('*')):
  if file_path.is_file() and not should_exclude(file_path):
  if not is_genesis_strategy_file(file_path):
- sanitize_file(file_path, EXPORT_DIR / file_path.relative_to(PROJECT_ROOT))
- files_copied += 1
+ tasks.append(ExportTask(file_path, str(file_path.relative_to(PROJECT_ROOT))))
  else:
  files_excluded += 1
  
- # Copy scripts/utils (forensic_audit for verification)
+ # scripts/utils (forensic_audit for verification, export tooling)
  utils_dir = PROJECT_ROOT / "scripts" / "utils"
  if utils_dir.exists():
- for file_path in utils_dir.rglob('*.py'):
- if file_path.name in ['forensic_audit.py', 'create_public_export.py']:
- dst = EXPORT_DIR / file_path.relative_to(PROJECT_ROOT)
- sanitize_file(file_path, dst)
- files_copied += 1
+ for file_path in sorted(utils_dir.rglob('*.py')):
+ if file_path.name in ['forensic_audit.py', 'create_public_export.py', 'export_pipeline.py']:
+ tasks.append(ExportTask(file_path, str(file_path.relative_to(PROJECT_ROOT))))
+ 
+ return tasks, files_excluded
+
+def export_public_repo(full: bool = False, workers: Optional[int] = None):
+ """Export public repository (incremental unless `full`)."""
+ print("=" * 80)
+ print("CREATING PUBLIC GITHUB EXPORT")
+ print("=" * 80)
+ print()
+ print("Filtering:")
+ print(" - Genesis/contract strategies")
+ print(" - Personal data")
+ print(" - LLM-typical phrases")
+ print(" - Internal research steps")
+ print()
+ 
+ # Full rebuild: remove old export and forget what was exported
+ if full:
+ if EXPORT_DIR.exists():
+ shutil.rmtree(EXPORT_DIR)
+ EXPORT_MANIFEST.unlink(missing_ok=True)
+ EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+ 
+ tasks, files_excluded = collect_export_tasks()
+ 
+ def report(task: ExportTask, status: str, error: str):
+ if status == "written":
+ print(f" ✓ {task.dst}")
+ elif status == "failed":
+ print(f" ✗ {task.dst}: {error}")
+ 
+ stats = run_export(
+ tasks,
+ EXPORT_DIR,
+ sanitize_export_content,
+ export_sanitizer_version(),
+ manifest_path=EXPORT_MANIFEST,
+ workers=workers,
+ on_result=report,
+ )
  
  print()
  print("=" * 80)
  print("EXPORT SUMMARY")
  print("=" * 80)
- print(f"Files copied: {files_copied}")
+ print(f"Files copied: {len(tasks)}")
+ print(f" rewritten: {len(stats.written)}, unchanged: {len(stats.unchanged)}, "
+ f"skipped (Genesis content): {len(stats.skipped)}, failed: {len(stats.failed)}")
+ if stats.removed:
+ print(f"Stale files removed: {len(stats.removed)}")
  print(f"Files excluded (Genesis/contract): {files_excluded}")
  print(f"Export directory: {EXPORT_DIR}")
  print()
@@ -388,5 +429,8 @@ def export_public_repo():
  print("4. Commit: git add . && git commit -m 'Public release'")
 
 if __name__ == "__main__":
- export_public_repo()
-
+ parser = argparse.ArgumentParser(description="Create public GitHub export")
+ parser.add_argument("--full", action="store_true", help="Rebuild the export from scratch")
+ parser.add_argument("--workers", type=int, default=None, help="Sanitizer processes (default: CPU count)")
+ args = parser.parse_args()
+ export_public_repo(full=args.full, workers=args.workers)
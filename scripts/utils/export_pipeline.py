@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Incremental export pipeline for the public/GitHub exports.
+
+The export scripts used to wipe the target, then re-read, regex-sanitize and
+rewrite every file on each run. Here every output file is tracked in a
+manifest:
+
+    dst → (source hash, sanitizer version) → output hash
+
+and a file is only re-sanitized when its source or the sanitizer changed
+(or the output was modified/deleted). Changed files are sanitized in a
+process pool and written atomically (temp file + rename), so an interrupted
+export never leaves half-written files behind. Pruning removes every file in
+the export directory that the current run did not produce - whichever script
+or manifest it came from - so the directory matches a from-scratch export.
+
+A transform is a module-level function `transform(src: Path) -> str | bytes | None`
+(None = do not export this file). The sanitizer version should change whenever
+the transform's behaviour does; `sanitizer_version()` hashes the pattern tables
+for that.
+
+Usage:
+    from scripts.utils.export_pipeline import ExportTask, run_export, sanitizer_version
+
+    version = sanitizer_version("1", LLM_PHRASES, PERSONAL_PATTERNS)
+    stats = run_export(tasks, EXPORT_DIR, sanitize_for_export, version,
+                       manifest_path=MANIFEST_DIR / "github_export.json")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+MANIFEST_DIR = PROJECT_ROOT / "outputs" / "cache" / "export_manifests"
+MANIFEST_VERSION = 1
+
+Transform = Callable[[Path], Union[str, bytes, None]]
+
+@dataclass(frozen=True)
+class ExportTask:
+    """One source file and its path relative to the export directory."""
+
+    src: Path
+    dst: str
+
+@dataclass
+class ExportStats:
+    written: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)  # transform returned None
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+def sanitizer_version(*parts: Any) -> str:
+    """Stable hash of a version tag plus the pattern tables a transform uses."""
+    payload = json.dumps(parts, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write via a temp file in the same directory, then rename over `path`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+    try:
+        with tmp_path.open("wb") as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+def atomic_write_text(path: Path, text: str, encoding: str = "utf-8") -> None:
+    atomic_write_bytes(path, text.encode(encoding))
+
+def load_manifest(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Manifest entries keyed by export-relative path ({} if missing/unreadable)."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("files", {})
+
+def save_manifest(path: Path, entries: Dict[str, Dict[str, Any]]) -> None:
+    payload = {"version": MANIFEST_VERSION, "files": entries}
+    atomic_write_text(path, json.dumps(payload, indent=1, sort_keys=True))
+
+def _display_path(path: Path) -> str:
+    try:
+        return str(path.relative_to(PROJECT_ROOT))
+    except ValueError:
+        return str(path)
+
+def _is_current(entry: Optional[Dict[str, Any]], src_stat: os.stat_result, dst: Path, version: str) -> bool:
+    """Cheap check: same sanitizer, untouched source stat, output still as written."""
+    if not entry or entry.get("sanitizer") != version:
+        return False
+    if entry.get("src_mtime_ns") != src_stat.st_mtime_ns or entry.get("src_size") != src_stat.st_size:
+        return False
+    if entry.get("out_hash") is None:
+        return not dst.exists()
+    try:
+        dst_stat = dst.stat()
+    except OSError:
+        return False
+    return dst_stat.st_size == entry.get("out_size") and dst_stat.st_mtime_ns == entry.get("out_mtime_ns")
+
+def _process(job: Tuple[str, str, str, Transform, str, Optional[Dict[str, Any]]]) -> Tuple[str, str, Dict[str, Any], str]:
+    """Worker: hash the source, re-sanitize if needed, write atomically.
+
+    Returns (dst_rel, status, manifest_entry, error) with status one of
+    written | unchanged | skipped | failed.
+    """
+    rel, src_str, dst_str, transform, version, entry = job
+    src, dst = Path(src_str), Path(dst_str)
+    try:
+        src_stat = src.stat()
+        src_hash = file_hash(src)
+        new_entry = {
+            "src": _display_path(src),
+            "src_hash": src_hash,
+            "src_mtime_ns": src_stat.st_mtime_ns,
+            "src_size": src_stat.st_size,
+            "sanitizer": version,
+        }
+        # Source touched but identical content and output intact: only refresh the stat
+        if entry and entry.get("src_hash") == src_hash and entry.get("sanitizer") == version:
+            out_hash = entry.get("out_hash")
+            if out_hash is None and not dst.exists():
+                return rel, "unchanged", {**entry, **new_entry}, ""
+            if out_hash is not None and dst.exists() and file_hash(dst) == out_hash:
+                dst_stat = dst.stat()
+                new_entry.update(out_hash=out_hash, out_size=dst_stat.st_size, out_mtime_ns=dst_stat.st_mtime_ns)
+                return rel, "unchanged", new_entry, ""
+
+        output = transform(src)
+        if output is None:
+            if dst.exists():
+                dst.unlink()
+            new_entry["out_hash"] = None
+            return rel, "skipped", new_entry, ""
+        data = output.encode("utf-8") if isinstance(output, str) else output
+        atomic_write_bytes(dst, data)
+        dst_stat = dst.stat()
+        new_entry.update(
+            out_hash=hashlib.sha256(data).hexdigest(),
+            out_size=dst_stat.st_size,
+            out_mtime_ns=dst_stat.st_mtime_ns,
+        )
+        return rel, "written", new_entry, ""
+    except Exception as e:
+        return rel, "failed", {}, str(e)
+
+def _prune(export_dir: Path, keep: set) -> List[str]:
+    """Delete files under `export_dir` not in `keep` (relative paths), then empty directories."""
+    removed = []
+    if not export_dir.is_dir():
+        return removed
+    for path in sorted(export_dir.rglob("*"), reverse=True):
+        rel = path.relative_to(export_dir)
+        if path.is_dir() and not path.is_symlink():
+            if not any(path.iterdir()):
+                path.rmdir()
+        elif rel not in keep:
+            path.unlink()
+            removed.append(str(rel))
+    return removed
+
+def run_export(
+    tasks: Iterable[ExportTask],
+    export_dir: Path,
+    transform: Transform,
+    version: str,
+    manifest_path: Path,
+    workers: Optional[int] = None,
+    prune: bool = True,
+    on_result: Optional[Callable[[ExportTask, str, str], None]] = None,
+) -> ExportStats:
+    """Export `tasks` into `export_dir`, reprocessing only what changed.
+
+    With `prune`, every file under `export_dir` that is not an output of this
+    run is deleted, including files another export script wrote there
+    (replaces wiping the whole export directory). `on_result(task, status,
+    error)` is called for every task as it completes.
+    """
+    stats = ExportStats()
+    manifest = load_manifest(manifest_path)
+    fresh: Dict[str, Dict[str, Any]] = {}
+    by_dst: Dict[str, ExportTask] = {}
+    jobs = []
+
+    for task in tasks:
+        if task.dst in by_dst:
+            continue
+        by_dst[task.dst] = task
+        dst = export_dir / task.dst
+        entry = manifest.get(task.dst)
+        try:
+            src_stat = task.src.stat()
+        except OSError as e:
+            stats.failed.append((task.dst, str(e)))
+            if on_result:
+                on_result(task, "failed", str(e))
+            continue
+        if _is_current(entry, src_stat, dst, version):
+            fresh[task.dst] = entry
+            status = "unchanged" if entry.get("out_hash") else "skipped"
+            getattr(stats, status).append(task.dst)
+            if on_result:
+                on_result(task, status, "")
+            continue
+        jobs.append((task.dst, str(task.src), str(dst), transform, version, entry))
+
+    def collect(results) -> None:
+        for rel, status, entry, error in results:
+            if status == "failed":
+                stats.failed.append((rel, error))
+            else:
+                fresh[rel] = entry
+                getattr(stats, status).append(rel)
+            if on_result:
+                on_result(by_dst[rel], status, error)
+
+    if workers == 1 or len(jobs) < 2:
+        collect(map(_process, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            collect(pool.map(_process, jobs, chunksize=16))
+
+    if prune:
+        produced = {Path(rel) for rel, entry in fresh.items() if rel in by_dst and entry.get("out_hash") is not None}
+        stats.removed.extend(_prune(export_dir, produced))
+    else:
+        # Keep tracking outputs of tasks not part of this run
+        for rel, entry in manifest.items():
+            fresh.setdefault(rel, entry)
+
+    save_manifest(manifest_path, fresh)
+    return stats
@@ -9,11 +9,27 @@ Scans for:
 - Localhost references
 - System-specific paths
 - API keys/tokens
+
+The tree is walked once (skipped directories are pruned), every file is
+matched against all patterns in a single combined-regex pass and files are
+scanned in parallel. Results are cached per file (mtime/size, then content
+hash) and invalidated when PATTERNS or SKIP_PATTERNS change; issues are
+streamed to a JSONL report as files finish.
+
+Usage:
+    python3 scripts/utils/forensic_audit.py [DIR] [--workers N] [--no-cache]
 """
 
+import argparse
+import hashlib
+import json
+import os
 import re
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
@@ -62,7 +78,28 @@ SKIP_PATTERNS = [
  "outputs/derived/cfb_discord_messages/", # Discord data
  "outputs/derived/discord_intelligence_analysis.json",
  "outputs/derived/discord_intelligence_analysis.md",
+ "outputs/cache/forensic_audit_cache.json", # own cache/report
+ "outputs/reports/forensic_audit.jsonl",
+]
+
+CACHE_FILE = PROJECT_ROOT / "outputs" / "cache" / "forensic_audit_cache.json"
+REPORT_JSONL = PROJECT_ROOT / "outputs" / "reports" / "forensic_audit.jsonl"
+CACHE_VERSION = 1
+CRITICAL_CATEGORIES = ("absolute_paths", "personal_names")
+
+# All patterns as one alternation: a single pass over the file finds candidate lines,
+# only those lines are then checked pattern by pattern (same results as before)
+COMPILED_PATTERNS = [
+ (category, pattern, re.compile(pattern, re.IGNORECASE))
+ for category, patterns in PATTERNS.items()
+ for pattern in patterns
 ]
+COMBINED_REGEX = re.compile("|".join(f"(?:{pattern})" for _, pattern, _ in COMPILED_PATTERNS), re.IGNORECASE)
+
+def rules_fingerprint() -> str:
+ """Hash of patterns + skip rules; cached results are dropped when it changes."""
+ payload = json.dumps([CACHE_VERSION, PATTERNS, SKIP_PATTERNS], sort_keys=True)
+ return hashlib.sha256(payload.encode()).hexdigest()[:16]
 
 def should_skip(file_path: Path) -> bool:
  """Check if file should be skipped."""
@@ -72,58 +109,207 @@ def should_skip(file_path: Path) -> bool:
  return True
  return False
 
-def scan_file(file_path: Path) -> List[Dict]:
- """Scan a single file for sensitive data."""
- issues = []
- 
+def _display_path(file_path: Path) -> str:
  try:
- with file_path.open('r', encoding='utf-8', errors='ignore') as f:
- content = f.read()
+ return str(file_path.relative_to(PROJECT_ROOT))
+ except ValueError:
+ return str(file_path)
+
+def should_skip_dir(dir_path: Path) -> bool:
+ """Directory-level SKIP_PATTERNS ("venv/", ...), checked before descending."""
+ path_str = str(dir_path) + "/"
+ return any(pattern.endswith("/") and pattern in path_str for pattern in SKIP_PATTERNS)
+
+def _candidate_lines(content: str) -> List[int]:
+ """0-based line numbers touched by any match of the combined regex."""
+ lines = set()
+ line_starts = None
+ for match in COMBINED_REGEX.finditer(content):
+ if line_starts is None:
+ line_starts = [0] + [m.end() for m in re.finditer("\n", content)]
+ first = bisect_right(line_starts, match.start()) - 1
+ last = bisect_right(line_starts, max(match.start(), match.end() - 1)) - 1
+ lines.update(range(first, last + 1))
+ return sorted(lines)
+
+def scan_content(content: str, display_path: str) -> List[Dict]:
+ """Scan file content for sensitive data."""
+ issues = []
+ candidates = _candidate_lines(content)
+ if not candidates:
+ return issues
  lines = content.split('\n')
  
- for category, patterns in PATTERNS.items():
- for pattern in patterns:
- regex = re.compile(pattern, re.IGNORECASE)
- for line_num, line in enumerate(lines, 1):
- matches = regex.finditer(line)
- for match in matches:
+ for category, pattern, regex in COMPILED_PATTERNS:
+ for idx in candidates:
+ line = lines[idx]
+ for match in regex.finditer(line):
  # Skip if in comment/docstring (less critical)
  if '#' in line[:match.start()] or '"""' in line[:match.start()]:
  continue
  
  issues.append({
- "file": str(file_path.relative_to(PROJECT_ROOT)),
- "line": line_num,
+ "file": display_path,
+ "line": idx + 1,
  "category": category,
  "pattern": pattern,
  "match": match.group(),
  "context": line.strip()[:100],
  })
- except Exception as e:
+ return issues
+
+def scan_file(file_path: Path) -> List[Dict]:
+ """Scan a single file for sensitive data."""
+ try:
+ with file_path.open('r', encoding='utf-8', errors='ignore') as f:
+ content = f.read()
+ except Exception:
  # Skip binary files or unreadable files
- pass
- 
+ return []
+ return scan_content(content, _display_path(file_path))
+
+def audit_file(file_path: Path) -> List[Dict]:
+ """scan_file plus `severity`/`message`, as used by the GitHub export scripts."""
+ issues = scan_file(Path(file_path))
+ for issue in issues:
+ issue["severity"] = "critical" if issue["category"] in CRITICAL_CATEGORIES else "warning"
+ issue["message"] = f"{issue['category']}: {issue['match']} ({issue['file']}:{issue['line']})"
  return issues
 
-def scan_directory(root: Path) -> List[Dict]:
- """Scan directory recursively for sensitive data."""
- all_issues = []
+def iter_files(root: Path) -> Iterator[Path]:
+ """Walk `root`, pruning skipped directories, yielding files to scan."""
+ for dirpath, dirnames, filenames in os.walk(root):
+ dirnames[:] = sorted(d for d in dirnames if not should_skip_dir(Path(dirpath) / d))
+ for name in sorted(filenames):
+ file_path = Path(dirpath) / name
+ if not should_skip(file_path):
+ yield file_path
+
+def _scan_job(job: Tuple[str, Optional[str]]) -> Tuple[str, str, Optional[List[Dict]]]:
+ """Worker: hash + scan one file. Skips the regex pass if the hash is unchanged."""
+ path_str, known_hash = job
+ file_path = Path(path_str)
+ try:
+ raw = file_path.read_bytes()
+ except OSError:
+ return path_str, "", []
+ digest = hashlib.sha1(raw).hexdigest()
+ if digest == known_hash:
+ return path_str, digest, None
+ content = raw.decode('utf-8', errors='ignore')
+ return path_str, digest, scan_content(content, _display_path(file_path))
+
+def load_cache(path: Path) -> Dict:
+ """Cached per-file results, or an empty cache if missing/stale."""
+ if path.exists():
+ try:
+ cache = json.loads(path.read_text())
+ if cache.get("rules") == rules_fingerprint():
+ return cache
+ except (OSError, ValueError):
+ pass
+ return {"rules": rules_fingerprint(), "files": {}}
+
+def save_cache(path: Path, cache: Dict) -> None:
+ path.parent.mkdir(parents=True, exist_ok=True)
+ tmp_path = path.with_suffix(".tmp")
+ tmp_path.write_text(json.dumps(cache))
+ tmp_path.replace(path)
+
+def scan_directory(
+ root: Path,
+ workers: Optional[int] = None,
+ cache_path: Optional[Path] = CACHE_FILE,
+ on_result: Optional[Callable[[str, List[Dict], bool], None]] = None,
+) -> List[Dict]:
+ """Scan directory recursively for sensitive data.
+ 
+ Unchanged files (same mtime/size, or same content hash) reuse cached issues;
+ the rest are scanned in a process pool. `on_result(file, issues, cached)` is
+ called as each file finishes.
+ """
+ cache = load_cache(cache_path) if cache_path else {"files": {}}
+ cached_files = cache["files"]
+ fresh_files: Dict[str, Dict] = {}
+ order: List[str] = []
+ jobs: List[Tuple[str, Optional[str]]] = []
+ stats: Dict[str, Tuple[int, int]] = {}
+ 
+ for file_path in iter_files(root):
+ key = str(file_path)
+ try:
+ st = file_path.stat()
+ except OSError:
+ continue
+ stats[key] = (st.st_mtime_ns, st.st_size)
+ order.append(key)
+ entry = cached_files.get(key)
+ if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+ fresh_files[key] = entry
+ if on_result:
+ on_result(key, entry["issues"], True)
+ else:
+ jobs.append((key, entry["sha1"] if entry else None))
  
- for file_path in root.rglob('*'):
- if file_path.is_file() and not should_skip(file_path):
- issues = scan_file(file_path)
- all_issues.extend(issues)
+ def collect(results: Iterator[Tuple[str, str, Optional[List[Dict]]]]) -> None:
+ for key, digest, issues in results:
+ reused = issues is None
+ if reused:
+ issues = cached_files[key]["issues"]
+ mtime_ns, size = stats[key]
+ fresh_files[key] = {"mtime_ns": mtime_ns, "size": size, "sha1": digest, "issues": issues}
+ if on_result:
+ on_result(key, issues, reused)
  
- return all_issues
+ if workers == 1 or len(jobs) < 2:
+ collect(map(_scan_job, jobs))
+ else:
+ with ProcessPoolExecutor(max_workers=workers) as pool:
+ collect(pool.map(_scan_job, jobs, chunksize=32))
+ 
+ if cache_path:
+ cache["files"] = fresh_files
+ save_cache(cache_path, cache)
+ return [issue for key in order for issue in fresh_files[key]["issues"]]
+
+def parse_args() -> argparse.Namespace:
+ parser = argparse.ArgumentParser(description="Forensic audit - sensitive data scan")
+ parser.add_argument("root", nargs="?", type=Path, default=PROJECT_ROOT, help="Directory to scan")
+ parser.add_argument("--workers", type=int, default=None, help="Scanner processes (default: CPU count)")
+ parser.add_argument("--no-cache", action="store_true", help="Rescan every file")
+ parser.add_argument("--jsonl", type=Path, default=REPORT_JSONL, help="Issues streamed as JSON lines")
+ return parser.parse_args()
 
 def main():
  """Main audit function."""
+ args = parse_args()
  print("=" * 80)
  print("FORENSIC AUDIT - Checking for sensitive data")
  print("=" * 80)
  print()
  
- issues = scan_directory(PROJECT_ROOT)
+ start = time.perf_counter()
+ counters = {"files": 0, "cached": 0}
+ args.jsonl.parent.mkdir(parents=True, exist_ok=True)
+ with args.jsonl.open("w", encoding="utf-8") as report:
+ def emit(file_key: str, file_issues: List[Dict], cached: bool) -> None:
+ counters["files"] += 1
+ counters["cached"] += int(cached)
+ for issue in file_issues:
+ report.write(json.dumps(issue) + "\n")
+ if file_issues:
+ report.flush()
+ 
+ issues = scan_directory(
+ args.root.resolve(),
+ workers=args.workers,
+ cache_path=None if args.no_cache else CACHE_FILE,
+ on_result=emit,
+ )
+ elapsed = time.perf_counter() - start
+ print(f"Scanned {counters['files']} files in {elapsed:.1f}s ({counters['cached']} unchanged, from cache)")
+ print(f"Issues streamed to: {args.jsonl}")
+ print()
  
  # Group by category
  by_category = {}
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the shared utility modules.
+
+Imports each module in a fresh interpreter with `python -X importtime`, sums
+the cumulative import time of everything it pulls in and fails (exit code 1)
+when a module exceeds its budget or loads one of the heavy packages
+(numpy, pandas, scipy, ...) that light modules must only import lazily.
+
+Usage:
+    python3 scripts/utils/import_budget.py
+    python3 scripts/utils/import_budget.py --repeat 5 --show 10
+    python3 scripts/utils/import_budget.py analysis.utils.data_loader --budget-ms 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Packages that are expensive to import; light modules must defer them.
+HEAVY_PACKAGES = ("numpy", "pandas", "scipy", "sklearn", "lightgbm", "matplotlib", "openpyxl", "plotly", "networkx")
+
+# module -> import budget in milliseconds (interpreter startup not included)
+BUDGETS: Dict[str, float] = {
+    "analysis.utils.data_loader": 30.0,
+    "analysis.utils.dna_tools": 20.0,
+    "analysis.utils.identity_tools": 20.0,
+    "analysis.utils.report_utils": 30.0,
+    "scripts.core.identity_constants": 10.0,
+    "scripts.core.standardized_conversion": 10.0,
+    "scripts.utils.display_identities_and_seeds": 10.0,
+}
+
+@dataclass
+class ImportProfile:
+    module: str
+    total_us: int = 0  # cumulative time of the module and its parent packages
+    modules: Dict[str, int] = field(default_factory=dict)  # imported module -> cumulative us
+    error: str = ""
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_us / 1000.0
+
+    def heavy(self) -> List[str]:
+        return sorted({name.split(".")[0] for name in self.modules if name.split(".")[0] in HEAVY_PACKAGES})
+
+def profile_import(module: str, python: str = sys.executable) -> ImportProfile:
+    """Import `module` in a fresh interpreter and profile the import."""
+    env = {**os.environ, "PYTHONPATH": str(PROJECT_ROOT)}
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    profile = ImportProfile(module)
+    if proc.returncode != 0:
+        tail = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        profile.error = tail[-1] if tail else f"exit code {proc.returncode}"
+        return profile
+    profile.total_us, profile.modules = _target_subtree(proc.stderr, module)
+    if module not in profile.modules:
+        profile.error = "module not found in -X importtime output"
+    return profile
+
+def _target_subtree(stderr: str, module: str) -> Tuple[int, Dict[str, int]]:
+    """Cost of `module` and everything imported on its behalf.
+
+    -X importtime prints children before their parent, so the subtree of the
+    target is the block of lines directly preceding its own line that are
+    indented deeper than it. Parent packages of a dotted module (`analysis`,
+    `analysis.utils`) are listed separately and added to the total.
+    """
+    lines = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        lines.append((len(name) - len(name.lstrip()), name.strip(), int(parts[1])))
+
+    prefixes = {".".join(module.split(".")[:i]) for i in range(1, module.count(".") + 2)}
+    total = 0
+    modules: Dict[str, int] = {}
+    for idx, (depth, name, cumulative) in enumerate(lines):
+        if name not in prefixes:
+            continue
+        total += cumulative
+        modules[name] = cumulative
+        j = idx - 1
+        while j >= 0 and lines[j][0] > depth:
+            modules.setdefault(lines[j][1], lines[j][2])
+            j -= 1
+    return total, modules
+
+def best_of(module: str, repeat: int, python: str = sys.executable) -> ImportProfile:
+    """Fastest of `repeat` runs (the minimum is the least noisy estimate)."""
+    best: Optional[ImportProfile] = None
+    for _ in range(max(1, repeat)):
+        profile = profile_import(module, python)
+        if profile.error:
+            return profile
+        if best is None or profile.total_us < best.total_us:
+            best = profile
+    return best
+
+def check(budgets: Dict[str, float], repeat: int = 3, show: int = 0) -> int:
+    """Profile every module against its budget; returns the number of failures."""
+    failures = 0
+    width = max(len(m) for m in budgets)
+    for module, budget_ms in budgets.items():
+        profile = best_of(module, repeat)
+        if profile.error:
+            failures += 1
+            print(f"❌ {module:<{width}}  import failed: {profile.error}")
+            continue
+        heavy = profile.heavy()
+        ok = profile.total_ms <= budget_ms and not heavy
+        failures += not ok
+        mark = "✅" if ok else "❌"
+        note = f"  heavy imports: {', '.join(heavy)}" if heavy else ""
+        print(f"{mark} {module:<{width}}  {profile.total_ms:7.1f} ms  (budget {budget_ms:.0f} ms){note}")
+        if show:
+            slowest = sorted(
+                ((us, name) for name, us in profile.modules.items() if name != module), reverse=True
+            )[:show]
+            for us, name in slowest:
+                print(f"     {us / 1000:7.1f} ms  {name}")
+    return failures
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check import times of light utility modules")
+    parser.add_argument("modules", nargs="*", help="Modules to check (default: all in BUDGETS)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Budget for modules given on the command line")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module; the fastest counts (default: 3)")
+    parser.add_argument("--show", type=int, default=0, metavar="N", help="Also list the N slowest sub-imports")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.modules:
+        budgets = {m: args.budget_ms or BUDGETS.get(m, 50.0) for m in args.modules}
+    else:
+        budgets = dict(BUDGETS)
+
+    print("=" * 80)
+    print("IMPORT-TIME BUDGET")
+    print("=" * 80)
+    failures = check(budgets, repeat=args.repeat, show=args.show)
+    print()
+    print(f"{len(budgets) - failures}/{len(budgets)} modules within budget")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
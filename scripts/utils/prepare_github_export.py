@@ -7,16 +7,26 @@ the original files. It removes sensitive data and prepares files for
 public GitHub upload.
 
 IMPORTANT: This does NOT modify the original repository!
+
+Re-runs are incremental (see scripts/utils/export_pipeline.py): only files whose
+source or sanitization rules changed are rewritten. Use --full to start over.
 """
 
+import argparse
 import re
 import shutil
+import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Union
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 EXPORT_DIR = PROJECT_ROOT / "github_export"
 
+sys.path.insert(0, str(PROJECT_ROOT))
+from scripts.utils.export_pipeline import MANIFEST_DIR, ExportTask, run_export, sanitizer_version
+
+EXPORT_MANIFEST = MANIFEST_DIR / "github_export.json"
+
 # Files/directories to exclude from export
 EXCLUDE_PATTERNS = [
  ".git/",
@@ -29,6 +39,8 @@ EXCLUDE_PATTERNS = [
  "*.pyd",
  "github_export/",
  "outputs/derived/",
+ "outputs/cache/",
+ "outputs/metrics/",
  "outputs/reports/*.json",
  "outputs/reports/*.csv",
  "outputs/reports/*.log",
@@ -100,6 +112,13 @@ def needs_sanitization(file_path: Path) -> bool:
  return True
  return False
 
+def export_content(src: Path) -> Union[str, bytes]:
+ """Export transform: sanitized text for SANITIZE_FILES, raw bytes otherwise."""
+ if needs_sanitization(src):
+ content = src.read_text(encoding='utf-8', errors='ignore')
+ return sanitize_content(content, src)
+ return src.read_bytes()
+
 def copy_file(src: Path, dst: Path):
  """Copy file with optional sanitization."""
  dst.parent.mkdir(parents=True, exist_ok=True)
@@ -114,34 +133,45 @@ def copy_file(src: Path, dst: Path):
  # Direct copy
  shutil.copy2(src, dst)
 
-def export_repository():
+def export_repository(full: bool = False, workers: Optional[int] = None):
  """Export repository to clean directory."""
  print("=" * 80)
  print("GITHUB EXPORT PREPARATION")
  print("=" * 80)
  print()
  
- # Remove old export if exists
+ # Full rebuild: remove old export and its manifest
+ if full:
  if EXPORT_DIR.exists():
  print(f"Removing old export directory: {EXPORT_DIR}")
  shutil.rmtree(EXPORT_DIR)
+ EXPORT_MANIFEST.unlink(missing_ok=True)
  
  EXPORT_DIR.mkdir(parents=True, exist_ok=True)
  
- # Copy files
- files_copied = 0
- files_sanitized = 0
+ tasks = [
+ ExportTask(file_path, str(file_path.relative_to(PROJECT_ROOT)))
+ for file_path in sorted(PROJECT_ROOT.rglob('*'))
+ if file_path.is_file() and not should_exclude(file_path)
+ ]
+ files_copied = len(tasks)
+ files_sanitized = sum(1 for task in tasks if needs_sanitization(task.src))
  
- for file_path in PROJECT_ROOT.rglob('*'):
- if file_path.is_file() and not should_exclude(file_path):
- rel_path = file_path.relative_to(PROJECT_ROOT)
- dst_path = EXPORT_DIR / rel_path
+ def report(task: ExportTask, status: str, error: str):
+ if status == "written" and needs_sanitization(task.src):
+ print(f" Sanitized: {task.dst}")
+ elif status == "failed":
+ print(f" Failed: {task.dst}: {error}")
  
- copy_file(file_path, dst_path)
- files_copied += 1
- 
- if needs_sanitization(file_path):
- files_sanitized += 1
+ stats = run_export(
+ tasks,
+ EXPORT_DIR,
+ export_content,
+ sanitizer_version("1", REPLACEMENTS, SANITIZE_FILES),
+ manifest_path=EXPORT_MANIFEST,
+ workers=workers,
+ on_result=report,
+ )
  
  print()
  print("=" * 80)
@@ -149,6 +179,8 @@ def export_repository():
  print("=" * 80)
  print(f"Files copied: {files_copied}")
  print(f"Files sanitized: {files_sanitized}")
+ print(f"Rewritten: {len(stats.written)}, unchanged: {len(stats.unchanged)}, "
+ f"removed: {len(stats.removed)}, failed: {len(stats.failed)}")
  print(f"Export directory: {EXPORT_DIR}")
  print()
  print("Next steps:")
@@ -158,5 +190,9 @@ def export_repository():
  print("4. Commit and push to GitHub")
 
 if __name__ == "__main__":
- export_repository()
+ parser = argparse.ArgumentParser(description="Prepare clean export for GitHub upload")
+ parser.add_argument("--full", action="store_true", help="Rebuild the export from scratch")
+ parser.add_argument("--workers", type=int, default=None, help="Sanitizer processes (default: CPU count)")
+ args = parser.parse_args()
+ export_repository(full=args.full, workers=args.workers)
 
@@ -6,9 +6,15 @@ Sync ALL important reports from private to public repo
 - Copies to public repo
 - Updates README and RESEARCH_OVERVIEW
 
-RUN: python3 scripts/utils/sync_all_reports_to_public.py
+Incremental: reports synced earlier are tracked in a manifest
+(outputs/cache/export_manifests/public_reports.json) and only re-sanitized when
+the private report or the sanitizer changed. New/changed reports are processed
+in parallel and written atomically.
+
+RUN: python3 scripts/utils/sync_all_reports_to_public.py [--workers N]
 """
 
+import argparse
 import json
 import re
 import sys
@@ -20,7 +26,11 @@ project_root = Path(__file__).parent.parent.parent
 public_repo = project_root.parent / "qubic-anna-lab-public"
 
 sys.path.insert(0, str(project_root))
-from scripts.utils.sanitize_text import sanitize_text
+from scripts.utils.sanitize_text import EMOJI_PATTERN, LLM_PATTERNS, PATH_PATTERN, sanitize_text
+from scripts.utils.export_pipeline import MANIFEST_DIR, ExportTask, load_manifest, run_export, sanitizer_version
+
+SYNC_MANIFEST = MANIFEST_DIR / "public_reports.json"
+PUBLIC_REPORTS_DIR = public_repo / "outputs" / "reports"
 
 # Important keywords to identify critical reports
 IMPORTANT_KEYWORDS = [
@@ -90,46 +100,38 @@ def needs_translation(content: str) -> bool:
  german_count = sum(1 for word in german_words if f" {word} " in content_lower)
  return german_count > 10
 
-def process_report(private_file: Path) -> Dict:
- """Process a single report file."""
+def report_sanitizer_version() -> str:
+ """Changes whenever sanitize_text's pattern tables change."""
+ return sanitizer_version("1", LLM_PATTERNS, EMOJI_PATTERN.pattern, PATH_PATTERN.pattern)
+
+def sanitize_report(private_file: Path) -> str:
+ """Export transform: sanitized report text."""
+ # Translate if needed (simplified - would need proper translation)
+ # For now, just sanitize
+ return sanitize_text(private_file.read_text(encoding="utf-8"))
+
+def classify_report(private_file: Path, tracked: Dict) -> Dict:
+ """Decide whether a report is synced or left alone in the public repo."""
+ public_name = translate_title(private_file.name)
+ public_path = PUBLIC_REPORTS_DIR / public_name
  result = {
  "file": private_file.name,
- "status": "skipped",
+ "status": "pending",
  "reason": "",
- "public_name": "",
+ "public_name": public_name,
  }
- 
- try:
- content = private_file.read_text(encoding="utf-8")
- 
- # Check if already in public repo
- public_name = translate_title(private_file.name)
- public_path = public_repo / "outputs" / "reports" / public_name
- 
- if public_name in EXISTING_PUBLIC_REPORTS or public_path.exists():
+ # Reports written by hand in the public repo are never overwritten;
+ # ones this script synced before are kept up to date
+ if public_name in EXISTING_PUBLIC_REPORTS or (public_path.exists() and public_name not in tracked):
  result["status"] = "exists"
- result["public_name"] = public_name
- return result
- 
- # Translate if needed (simplified - would need proper translation)
- # For now, just sanitize
- sanitized = sanitize_text(content)
- 
- # Write to public repo
- public_path.parent.mkdir(parents=True, exist_ok=True)
- public_path.write_text(sanitized, encoding="utf-8")
- 
- result["status"] = "copied"
- result["public_name"] = public_name
- return result
- 
- except Exception as e:
- result["status"] = "error"
- result["reason"] = str(e)
  return result
 
 def main():
  """Main function."""
+ parser = argparse.ArgumentParser(description="Sync important reports to the public repo")
+ parser.add_argument("--workers", type=int, default=None, help="Sanitizer processes (default: CPU count)")
+ args = parser.parse_args()
+ 
  print("=" * 80)
  print("SYNC ALL REPORTS TO PUBLIC REPO")
  print("=" * 80)
@@ -143,12 +145,32 @@ def main():
  print(f"Important reports: {len(important_reports)}")
  print()
  
- results = []
- for i, report in enumerate(important_reports, 1):
- print(f"[{i}/{len(important_reports)}] Processing {report.name}...", end=" ")
- result = process_report(report)
- results.append(result)
- print(result["status"])
+ tracked = load_manifest(SYNC_MANIFEST)
+ results = [classify_report(report, tracked) for report in important_reports]
+ by_name = {r["public_name"]: r for r in results if r["status"] == "pending"}
+ tasks = [ExportTask(report, r["public_name"]) for report, r in zip(important_reports, results) if r["status"] == "pending"]
+ 
+ def record(task: ExportTask, status: str, error: str):
+ result = by_name[task.dst]
+ if status == "written":
+ result["status"] = "updated" if task.dst in tracked else "copied"
+ elif status == "failed":
+ result["status"] = "error"
+ result["reason"] = error
+ else:
+ result["status"] = status
+ print(f"{task.src.name}: {result['status']}")
+ 
+ run_export(
+ tasks,
+ PUBLIC_REPORTS_DIR,
+ sanitize_report,
+ report_sanitizer_version(),
+ manifest_path=SYNC_MANIFEST,
+ workers=args.workers,
+ prune=False,
+ on_result=record,
+ )
  
  print()
  print("=" * 80)
@@ -164,6 +186,8 @@ def main():
  
  print()
  print(f"Copied: {status_counts.get('copied', 0)} new reports")
+ print(f"Updated: {status_counts.get('updated', 0)} changed reports")
+ print(f"Unchanged: {status_counts.get('unchanged', 0)} already up to date")
  print(f"Exists: {status_counts.get('exists', 0)} already in public repo")
  print(f"Errors: {status_counts.get('error', 0)}")
  
@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""
+Shared instrumentation for long-running jobs.
+
+Metrics (counters, gauges, latency histograms) live in one process-wide
+registry and are exported in the Prometheus text format, to a file that is
+rewritten every few seconds and optionally on an HTTP `/metrics` endpoint.
+
+In code:
+
+    from scripts.utils.telemetry import METRICS, span, progress
+
+    with span("derivation", stage="layer3"):
+        identity = derive(seed)
+    METRICS.cache("identity_cache", hit=True)
+
+Without touching a script, run it under the instrumenting runner:
+
+    python3 scripts/utils/telemetry.py run --job rpc20k -- \\
+        scripts/research/rpc_validation_20000_background.py --resume-checkpoint ...
+    python3 scripts/utils/telemetry.py run --job derive23k --profile -- scripts/core/derive_all_23k.py
+
+The runner wraps the known hot paths as they are imported (qubipy derivation
+and RPC, requests, subprocess/docker, json I/O) plus the script's own
+functions named in DEFAULT_SCRIPT_SPANS / --span, writes
+outputs/metrics/<job>.prom while the job runs and prints where the time went
+at the end. `--profile` adds a sampling profiler (collapsed stacks for
+flamegraph.pl / speedscope in outputs/metrics/<job>.folded).
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import importlib.abc
+import importlib.util
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+project_root = Path(__file__).parent.parent.parent
+
+METRICS_DIR = project_root / "outputs" / "metrics"
+PREFIX = "qubic"
+
+# Seconds; covers cache hits (~µs) to docker round trips (~s)
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _labels(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    escaped = (
+        f'{k}="' + v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"' for k, v in items
+    )
+    return "{" + ",".join(escaped) + "}"
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        idx = 0
+        while idx < len(self.buckets) and value > self.buckets[idx]:
+            idx += 1
+        self.counts[idx] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound containing quantile q (coarse, for summaries)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        running = 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            running += n
+            if running >= target:
+                return bound
+        return float("inf")
+
+class Registry:
+    """Thread-safe counters, gauges and histograms keyed by name and labels."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counters: Dict[str, Dict[LabelKey, float]] = defaultdict(lambda: defaultdict(float))
+        self.gauges: Dict[str, Dict[LabelKey, float]] = defaultdict(dict)
+        self.histograms: Dict[str, Dict[LabelKey, Histogram]] = defaultdict(dict)
+        self.started = time.time()
+        self._last_rates: Tuple[float, Dict[LabelKey, int]] = (time.time(), {})
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        with self._lock:
+            self.counters[name][_labels(labels)] += value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        with self._lock:
+            self.gauges[name][_labels(labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            hist = self.histograms[name].get(key)
+            if hist is None:
+                hist = self.histograms[name][key] = Histogram()
+            hist.observe(value)
+
+    def cache(self, cache: str, hit: bool) -> None:
+        """Record one cache lookup; the hit rate is hits / (hits + misses)."""
+        self.inc("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+    def _update_rates(self) -> None:
+        """items/s per span since the previous export."""
+        now = time.time()
+        last_time, last_counts = self._last_rates
+        counts = {key: hist.count for key, hist in self.histograms.get("span_seconds", {}).items()}
+        elapsed = max(now - last_time, 1e-9)
+        for key, count in counts.items():
+            self.gauges["span_rate_per_second"][key] = (count - last_counts.get(key, 0)) / elapsed
+        self._last_rates = (now, counts)
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            self._update_rates()
+            self.gauges["uptime_seconds"][()] = time.time() - self.started
+            for name, series in sorted(self.counters.items()):
+                lines.append(f"# TYPE {PREFIX}_{name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{PREFIX}_{name}{_format_labels(key)} {value:g}")
+            for name, series in sorted(self.gauges.items()):
+                lines.append(f"# TYPE {PREFIX}_{name} gauge")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{PREFIX}_{name}{_format_labels(key)} {value:g}")
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f"# TYPE {PREFIX}_{name} histogram")
+                for key, hist in sorted(series.items()):
+                    running = 0
+                    for bound, n in zip(hist.buckets, hist.counts):
+                        running += n
+                        lines.append(f"{PREFIX}_{name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {running}")
+                    lines.append(f"{PREFIX}_{name}_bucket{_format_labels(key, ('le', '+Inf'))} {hist.count}")
+                    lines.append(f"{PREFIX}_{name}_sum{_format_labels(key)} {hist.sum:.6f}")
+                    lines.append(f"{PREFIX}_{name}_count{_format_labels(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def span_summary(self) -> List[Tuple[str, int, float, float, float]]:
+        """(span, calls, total s, p50, p99) sorted by total time."""
+        rows = []
+        with self._lock:
+            for key, hist in self.histograms.get("span_seconds", {}).items():
+                label = ",".join(f"{k}={v}" for k, v in key)
+                rows.append((label, hist.count, hist.sum, hist.quantile(0.5), hist.quantile(0.99)))
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+METRICS = Registry()
+
+@contextmanager
+def span(name: str, **labels: Any) -> Iterator[None]:
+    """Time a block as `span_seconds{span=name,...}`; exceptions are counted and re-raised."""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        METRICS.inc("errors_total", span=name, error=type(e).__name__, **labels)
+        raise
+    finally:
+        METRICS.observe("span_seconds", time.perf_counter() - start, span=name, **labels)
+
+def timed(name: str, **labels: Any) -> Callable[[Callable], Callable]:
+    """Decorator form of `span`."""
+
+    def wrap(func: Callable) -> Callable:
+        if getattr(func, "__telemetry__", False):
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, **labels):
+                return func(*args, **kwargs)
+
+        wrapper.__telemetry__ = True
+        return wrapper
+
+    return wrap
+
+class Progress:
+    """Processed/total counter with rate and ETA, exported as gauges."""
+
+    def __init__(self, job: str, total: int, done: int = 0) -> None:
+        self.job = job
+        self.total = total
+        self.done = done
+        self._start_done = done
+        self._start = time.time()
+        self._publish()
+
+    def advance(self, n: int = 1) -> None:
+        self.done += n
+        self._publish()
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.time() - self._start
+        return (self.done - self._start_done) / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> float:
+        return (self.total - self.done) / self.rate if self.rate > 0 else float("inf")
+
+    def _publish(self) -> None:
+        METRICS.set("progress_done", self.done, job=self.job)
+        METRICS.set("progress_total", self.total, job=self.job)
+        METRICS.set("progress_items_per_second", self.rate, job=self.job)
+        if self.eta_seconds != float("inf"):
+            METRICS.set("progress_eta_seconds", self.eta_seconds, job=self.job)
+
+    def __str__(self) -> str:
+        pct = 100 * self.done / self.total if self.total else 0.0
+        eta = f"{self.eta_seconds / 60:.1f} min" if self.eta_seconds != float("inf") else "?"
+        return f"{self.done}/{self.total} ({pct:.1f}%), {self.rate:.1f}/s, ETA {eta}"
+
+def progress(job: str, total: int, done: int = 0) -> Progress:
+    return Progress(job, total, done)
+
+class Exporter:
+    """Rewrites <job>.prom every `interval` seconds; optional HTTP /metrics."""
+
+    def __init__(self, path: Path, interval: float = 10.0, port: Optional[int] = None) -> None:
+        self.path = path
+        self.interval = interval
+        self.port = port
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._http: Optional[ThreadingHTTPServer] = None
+
+    def write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(METRICS.render(), encoding="utf-8")
+        tmp_path.replace(self.path)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError:
+                pass
+
+    def start(self) -> "Exporter":
+        self._thread = threading.Thread(target=self._loop, name="telemetry-export", daemon=True)
+        self._thread.start()
+        if self.port is not None:
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self) -> None:  # noqa: N802 (http.server API)
+                    body = METRICS.render().encode("utf-8")
+                    self.send_response(200 if self.path == "/metrics" else 404)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format: str, *args) -> None:
+                    pass
+
+            self._http = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+            self._http.daemon_threads = True
+            threading.Thread(target=self._http.serve_forever, name="telemetry-http", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._http is not None:
+            self._http.shutdown()
+            self._http.server_close()
+        self.write()
+
+class SamplingProfiler:
+    """Samples the main thread's stack every `interval` s (collapsed-stack output)."""
+
+    def __init__(self, interval: float = 0.01, thread_id: Optional[int] = None) -> None:
+        self.interval = interval
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self) -> "SamplingProfiler":
+        self._thread = threading.Thread(target=self._sample, name="telemetry-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write_folded(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as fh:
+            for stack, count in self.stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+
+    def top_functions(self, n: int = 15) -> List[Tuple[str, int]]:
+        """Leaf (self-time) sample counts."""
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(n)
+
+# --- automatic instrumentation -------------------------------------------------
+
+# module -> [(attribute path, span name, labels)]
+HOOKS: Dict[str, List[Tuple[str, str, Dict[str, str]]]] = {
+    "qubipy.crypto.utils": [
+        ("get_subseed_from_seed", "derivation", {"stage": "subseed"}),
+        ("get_private_key_from_subseed", "derivation", {"stage": "private_key"}),
+        ("get_public_key_from_private_key", "derivation", {"stage": "public_key"}),
+        ("get_identity_from_public_key", "derivation", {"stage": "identity"}),
+    ],
+    "qubipy.rpc.rpc_client": [
+        ("QubiPy_RPC.get_balance", "rpc", {"method": "get_balance"}),
+        ("QubiPy_RPC.get_tick_info", "rpc", {"method": "get_tick_info"}),
+    ],
+    "scripts.core.seed_candidate_scan": [("derive_identity_from_seed", "derivation", {"stage": "seed_candidate_scan"})],
+    "scripts.core.derivation_backends": [
+        ("QubipyBackend.derive_batch", "derivation", {"stage": "qubipy_batch"}),
+        ("PortableBackend.derive_batch", "derivation", {"stage": "portable_batch"}),
+        ("PoolBackend.derive_batch", "derivation", {"stage": "pool_batch"}),
+        ("DockerBatchBackend.derive_batch", "derivation", {"stage": "docker_batch"}),
+        ("GatewayBackend.derive_batch", "derivation", {"stage": "gateway_batch"}),
+    ],
+}
+
+# Functions defined in the job scripts themselves: name -> (span, labels)
+DEFAULT_SCRIPT_SPANS: Dict[str, Tuple[str, Dict[str, str]]] = {
+    "derive_identity_from_seed": ("derivation", {"stage": "script"}),
+    "validate_identity_rpc": ("rpc", {"method": "validate_identity_rpc"}),
+    "check_identity_onchain": ("rpc", {"method": "check_identity_onchain"}),
+    "extract_features": ("features", {"fn": "extract_features"}),
+    "prepare_ml_data": ("features", {"fn": "prepare_ml_data"}),
+    "build_seed_mapping": ("features", {"fn": "build_seed_mapping"}),
+    "save_progress": ("io", {"op": "save_progress"}),
+    "log_progress": ("io", {"op": "log_progress"}),
+}
+
+def _patch_attr(owner: Any, path: str, name: str, labels: Dict[str, str]) -> bool:
+    *parents, attr = path.split(".")
+    for part in parents:
+        owner = getattr(owner, part, None)
+        if owner is None:
+            return False
+    func = getattr(owner, attr, None)
+    if func is None or not callable(func):
+        return False
+    setattr(owner, attr, timed(name, **labels)(func))
+    return True
+
+class _PostImportFinder(importlib.abc.MetaPathFinder):
+    """Applies HOOKS right after a hooked module is executed."""
+
+    def __init__(self, hooks: Dict[str, List[Tuple[str, str, Dict[str, str]]]]) -> None:
+        self.hooks = hooks
+        self._busy: set = set()
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in self.hooks or fullname in self._busy:
+            return None
+        self._busy.add(fullname)
+        try:
+            spec = importlib.util.find_spec(fullname)
+        finally:
+            self._busy.discard(fullname)
+        if spec is None or spec.loader is None or not hasattr(spec.loader, "exec_module"):
+            return spec
+        loader = spec.loader
+        hooks = self.hooks[fullname]
+
+        class Loader(importlib.abc.Loader):
+            def create_module(self, spec):
+                return loader.create_module(spec)
+
+            def exec_module(self, module):
+                loader.exec_module(module)
+                for attr, name, labels in hooks:
+                    _patch_attr(module, attr, name, labels)
+
+        spec.loader = Loader()
+        return spec
+
+def _patch_requests(module: Any) -> None:
+    original = module.Session.request
+    if getattr(original, "__telemetry__", False):
+        return
+
+    @functools.wraps(original)
+    def request(self, method, url, *args, **kwargs):
+        host = url.split("/")[2] if "://" in url else ""
+        start = time.perf_counter()
+        try:
+            response = original(self, method, url, *args, **kwargs)
+        except Exception as e:
+            METRICS.inc("http_errors_total", host=host, error=type(e).__name__)
+            raise
+        finally:
+            METRICS.observe("http_seconds", time.perf_counter() - start, host=host, method=method.upper())
+        METRICS.inc("http_responses_total", host=host, status=response.status_code)
+        if response.status_code == 429:
+            METRICS.inc("http_rate_limited_total", host=host)
+        return response
+
+    request.__telemetry__ = True
+    module.Session.request = request
+
+def _patch_stdlib() -> None:
+    import json
+    import subprocess
+
+    for fn in ("load", "dump"):
+        setattr(json, fn, timed("io", op=f"json_{fn}")(getattr(json, fn)))
+
+    original_run = subprocess.run
+
+    @functools.wraps(original_run)
+    def run(args, *rest, **kwargs):
+        program = Path(str(args[0] if isinstance(args, (list, tuple)) else str(args).split()[0])).name
+        with span("subprocess", program=program):
+            return original_run(args, *rest, **kwargs)
+
+    subprocess.run = run
+
+def install(hooks: Optional[Dict[str, List[Tuple[str, str, Dict[str, str]]]]] = None) -> None:
+    """Instrument the hot paths for this process (idempotent)."""
+    if getattr(install, "_done", False):
+        return
+    install._done = True
+    hooks = dict(HOOKS if hooks is None else hooks)
+    # Modules imported already are patched in place, the rest on import
+    for name in list(hooks):
+        if name in sys.modules:
+            for attr, span_name, labels in hooks.pop(name):
+                _patch_attr(sys.modules[name], attr, span_name, labels)
+    sys.meta_path.insert(0, _PostImportFinder(hooks))
+    try:
+        import requests
+
+        _patch_requests(requests)
+    except ImportError:
+        pass
+    _patch_stdlib()
+
+class _ScriptNamespace(dict):
+    """Module globals that wrap selected functions as the script defines them."""
+
+    def __init__(self, spans: Dict[str, Tuple[str, Dict[str, str]]], **initial: Any) -> None:
+        super().__init__(**initial)
+        self._spans = spans
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._spans and callable(value):
+            name, labels = self._spans[key]
+            value = timed(name, **labels)(value)
+        super().__setitem__(key, value)
+
+def run_script(path: Path, argv: Sequence[str], spans: Dict[str, Tuple[str, Dict[str, str]]]) -> None:
+    """Execute `path` as __main__ with its selected functions instrumented."""
+    import types
+
+    source = path.read_text(encoding="utf-8")
+    code = compile(source, str(path), "exec", dont_inherit=True)
+    namespace = _ScriptNamespace(spans, __name__="__main__", __file__=str(path), __builtins__=__builtins__)
+    module = types.ModuleType("__main__")
+    main_module = sys.modules.get("__main__")
+    sys.modules["__main__"] = module
+    sys.argv = [str(path)] + list(argv)
+    sys.path.insert(0, str(path.parent))
+    try:
+        exec(code, namespace)
+    finally:
+        module.__dict__.update(namespace)
+        if main_module is not None:
+            sys.modules["__main__"] = main_module
+
+def print_summary(profiler: Optional[SamplingProfiler] = None, stream=sys.stderr) -> None:
+    rows = METRICS.span_summary()
+    if not rows:
+        return
+    wall = time.time() - METRICS.started
+    print("", file=stream)
+    print("=" * 80, file=stream)
+    print(f"TELEMETRY SUMMARY (wall {wall / 60:.1f} min)", file=stream)
+    print("=" * 80, file=stream)
+    print(f"  {'span':<46} {'calls':>9} {'total s':>10} {'% wall':>7} {'p50':>8} {'p99':>8}", file=stream)
+    for label, calls, total, p50, p99 in rows[:20]:
+        share = 100 * total / wall if wall else 0.0
+        print(f"  {label:<46} {calls:>9} {total:>10.1f} {share:>6.1f}% {p50:>7g}s {p99:>7g}s", file=stream)
+    with METRICS._lock:
+        http = dict(METRICS.counters.get("http_responses_total", {}))
+        cache = dict(METRICS.counters.get("cache_requests_total", {}))
+    if http:
+        total = sum(http.values())
+        limited = sum(v for k, v in http.items() if ("status", "429") in k)
+        print(f"  HTTP responses: {total:g}, 429: {limited:g} ({100 * limited / total:.1f}%)", file=stream)
+    if cache:
+        by_cache: Dict[str, Counter] = defaultdict(Counter)
+        for key, value in cache.items():
+            labels = dict(key)
+            by_cache[labels.get("cache", "")][labels.get("result", "")] += value
+        for name, counts in sorted(by_cache.items()):
+            lookups = counts["hit"] + counts["miss"]
+            print(f"  cache {name}: {100 * counts['hit'] / lookups:.1f}% hits of {lookups:g}", file=stream)
+    if profiler and profiler.stacks:
+        samples = sum(profiler.stacks.values())
+        print(f"  Sampled self time ({samples} samples):", file=stream)
+        for func, count in profiler.top_functions(10):
+            print(f"    {100 * count / samples:5.1f}%  {func}", file=stream)
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Instrumentation for long-running jobs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="Run a script with hot-path instrumentation")
+    run.add_argument("--job", help="Job name for the metrics files (default: script name)")
+    run.add_argument("--interval", type=float, default=10.0, help="Seconds between metric file updates")
+    run.add_argument("--port", type=int, default=None, help="Also serve metrics on http://127.0.0.1:PORT/metrics")
+    run.add_argument("--profile", action="store_true", help="Enable the sampling profiler")
+    run.add_argument("--profile-interval", type=float, default=0.01, help="Sampling interval in seconds")
+    run.add_argument("--span", action="append", default=[], metavar="FUNC[=SPAN]",
+                     help="Also time this script function (default span: 'script')")
+    run.add_argument("script", type=Path)
+    run.add_argument("args", nargs=argparse.REMAINDER)
+    return parser.parse_args(argv)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    job = args.job or args.script.stem
+    spans = dict(DEFAULT_SCRIPT_SPANS)
+    for item in args.span:
+        func, _, name = item.partition("=")
+        spans[func] = (name or "script", {"fn": func})
+    script_args = args.args[1:] if args.args[:1] == ["--"] else args.args
+
+    install()
+    exporter = Exporter(METRICS_DIR / f"{job}.prom", interval=args.interval, port=args.port).start()
+    profiler = SamplingProfiler(args.profile_interval).start() if args.profile else None
+    print(f"[telemetry] metrics: {exporter.path}", file=sys.stderr)
+    exit_code = 0
+    try:
+        run_script(args.script.resolve(), script_args, spans)
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except KeyboardInterrupt:
+        exit_code = 130
+    finally:
+        if profiler:
+            profiler.stop()
+            profiler.write_folded(METRICS_DIR / f"{job}.folded")
+        exporter.stop()
+        print_summary(profiler)
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,18 +9,17 @@ This avoids timeout issues with get_owned_assets().
 from __future__ import annotations
 
 import json
-import time
+import sys
 from pathlib import Path
 from typing import Dict, List
 
 from qubipy.rpc import rpc_client
-from qubipy.tx.utils import (
- get_public_key_from_identity,
- get_subseed_from_seed,
- get_private_key_from_subseed,
- get_public_key_from_private_key,
-)
-from qubipy.crypto.utils import sign, kangaroo_twelve
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.qubic_transactions import TransactionSigner
+from scripts.core.tick_scheduler import ScheduledTx, TickScheduler
 
 CONTRACT_ID = "POCCZYCKTRQGHFIPWGSBLJTEQFDDVVBMNUHNCKMRACBGQOPBLURNRCBAFOBD"
 AMOUNT_QU = 1
@@ -42,31 +41,6 @@ LAYER2_IDENTITIES = [
  {"label": "Vortex #4", "block_id": 8, "seed": "xyzqaubquuqbqbyqayeiyaqymmemqqqmmqsqeqazsmogwoxkirmjxmc", "identity": "DZGTELPKNEITGBRUPCWRNZGLTMBCRPLRPERUFBZHDFDTFYTJXOUDYLSBKRRB"},
 ]
 
-def build_tx_with_payload(seed: str, dest_identity: str, amount: int, target_tick: int, payload: str) -> bytes:
- """Build transaction with payload."""
- seed_bytes = bytes(seed, 'utf-8')
- subseed = get_subseed_from_seed(seed_bytes)
- private_key = get_private_key_from_subseed(subseed)
- source_pubkey = get_public_key_from_private_key(private_key)
- dest_pubkey = get_public_key_from_identity(dest_identity)
- 
- built_data = bytearray()
- built_data.extend(source_pubkey)
- built_data.extend(dest_pubkey)
- built_data.extend(amount.to_bytes(8, byteorder='little'))
- built_data.extend(target_tick.to_bytes(4, byteorder='little'))
- built_data.extend((0).to_bytes(2, byteorder='little'))
- 
- payload_bytes = payload.encode('utf-8')
- built_data.extend(len(payload_bytes).to_bytes(2, byteorder='little'))
- built_data.extend(payload_bytes)
- 
- tx_digest = kangaroo_twelve(built_data, len(built_data), 32)
- signature = sign(subseed, source_pubkey, tx_digest)
- built_data.extend(signature)
- 
- return bytes(built_data)
-
 def main():
  print("=" * 80)
  print("🚀 FAST BRUTE FORCE TICK GAP TESTING")
@@ -81,63 +55,42 @@ def main():
  print()
  
  rpc = rpc_client.QubiPy_RPC()
- current_tick = rpc.get_latest_tick()
- print(f"Current tick: {current_tick}")
- print()
+ signer = TransactionSigner()
+ scheduler = TickScheduler(rpc, signer, tick_offset=TARGET_TICK_OFFSET)
  
  blocks_data = {item["block_id"]: item for item in LAYER2_IDENTITIES if item["block_id"] in BLOCKS_TO_TEST}
  
- results = {}
- 
+ # Queue the whole sweep; the scheduler spreads each block's transactions over
+ # consecutive target ticks (one per source per tick) and broadcasts concurrently
  for block_id in BLOCKS_TO_TEST:
  block_data = blocks_data[block_id]
- label = block_data["label"]
- 
- print("=" * 80)
- print(f"Testing Block #{block_id} ({label})")
- print("=" * 80)
- print()
- 
- block_results = []
- 
  for tick_gap in range(BASE_TICK_GAP - TEST_RANGE, BASE_TICK_GAP + TEST_RANGE + 1):
- payload = f"{block_id},2,{tick_gap}"
- print(f" ▶️ Tick gap {tick_gap}: Payload '{payload}'")
- 
- try:
- target_tick = current_tick + TARGET_TICK_OFFSET
- tx_bytes = build_tx_with_payload(
- block_data["seed"],
- CONTRACT_ID,
- AMOUNT_QU,
- target_tick,
- payload
- )
- 
- response = rpc.broadcast_transaction(tx_bytes)
- tx_id = response.get("txId", response.get("transactionHash", "UNKNOWN"))
- print(f" ✅ TX sent: {tx_id}")
+ scheduler.submit(ScheduledTx(
+ label=f"{block_id}:{tick_gap}",
+ seed=block_data["seed"],
+ dest_identity=CONTRACT_ID,
+ amount=AMOUNT_QU,
+ payload=f"{block_id},2,{tick_gap}",
+ source_identity=block_data["identity"],
+ ))
  
- block_results.append({
- "tick_gap": tick_gap,
- "payload": payload,
- "tx_id": tx_id,
- "status": "sent"
- })
- 
- except Exception as e:
- print(f" ❌ Error: {e}")
- block_results.append({
+ results = {}
+ for tx in scheduler.run():
+ block_id, tick_gap = (int(part) for part in tx.label.split(":"))
+ icon = "✅" if tx.status == "confirmed" else "❌"
+ print(f" {icon} Block #{block_id} tick gap {tick_gap}: '{tx.payload}' → {tx.status} (tick {tx.target_tick}, tx {tx.tx_id})")
+ results.setdefault(block_id, []).append({
  "tick_gap": tick_gap,
- "payload": payload,
- "tx_id": None,
- "status": "error",
- "error": str(e)
+ "payload": tx.payload,
+ "tx_id": tx.tx_id,
+ "status": tx.status,
+ "target_tick": tx.target_tick,
+ "attempts": tx.attempts,
+ "error": tx.error,
  })
  
- time.sleep(0.3) # Small delay between transactions
- 
- results[block_id] = block_results
+ print()
+ print(f"Summary: {scheduler.summary()}")
  print()
  
  # Save results
@@ -11,6 +11,7 @@ Goal: Understand the EXACT data foundation before making assumptions.
 from __future__ import annotations
 
 import json
+import sys
 import time
 from collections import defaultdict, deque
 from pathlib import Path
@@ -24,78 +25,18 @@ from qubipy.crypto.utils import (
 )
 from qubipy.rpc import rpc_client
 
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.analysis.identity_graph import SCAN_SOURCES, build_graph
+
 OUTPUT_DIR = Path("outputs/derived")
 OUTPUT_JSON = OUTPUT_DIR / "complete_identity_structure.json"
 
-# Load all known identities from various sources
+# Load the start identities from the five exploration outputs
 def load_all_identities() -> Set[str]:
- """Load all identities from all JSON files."""
- identities = set()
- 
- files = [
- "outputs/derived/recursive_layer_map.json",
- "outputs/derived/identity_deep_scan.json",
- "outputs/derived/deep_layer_exploration.json",
- "outputs/derived/layer3_complete_analysis.json",
- "outputs/derived/seed_derivation_mass_scan.json",
- ]
- 
- for file_path in files:
- path = Path(file_path)
- if not path.exists():
- continue
- 
- try:
- with path.open() as f:
- data = json.load(f)
- 
- # Extract identities based on structure
- if isinstance(data, dict):
- # recursive_layer_map
- for key in ["known_8_exploration", "new_seeds_exploration"]:
- if key in data:
- exp = data[key]
- if "all_identities" in exp:
- identities.update(exp["all_identities"])
- if "layer_map" in exp:
- for layer_ids in exp["layer_map"].values():
- identities.update(layer_ids)
- 
- # identity_deep_scan
- if "records" in data:
- for record in data["records"]:
- if "identity" in record:
- identities.add(record["identity"])
- 
- # deep_layer_exploration
- if "chains" in data:
- for chain in data["chains"]:
- for layer in chain.get("layers", []):
- if "identity" in layer:
- identities.add(layer["identity"])
- 
- # layer3_complete_analysis
- if "layer3_records" in data:
- for record in data["layer3_records"]:
- if "layer3_identity" in record:
- identities.add(record["layer3_identity"])
- if "layer4_identity" in record:
- identities.add(record["layer4_identity"])
- 
- # seed_derivation_mass_scan
- if "tested_identities" in data:
- for item in data["tested_identities"]:
- if "identity" in item:
- identities.add(item["identity"])
- if "original_identity" in item:
- identities.add(item["original_identity"])
- if "derived_identity" in item:
- identities.add(item["derived_identity"])
- 
- except Exception as e:
- print(f"⚠️ Error loading {file_path}: {e}")
- 
- return identities
+ """Load all identities from the exploration JSON files (not the mapper's own output or the layer runs)."""
+ return set(build_graph(sources=SCAN_SOURCES, link_layer1=False).identities)
 
 def identity_to_seed(identity: str) -> str | None:
  """Convert identity to seed (55 chars, lowercase)."""
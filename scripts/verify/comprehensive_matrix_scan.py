@@ -16,13 +16,17 @@ Then checks which extracted identities exist on-chain.
 from __future__ import annotations
 
 import json
+import sys
 import time
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Callable, List, Sequence, Tuple
+from typing import List
 
 import numpy as np
 
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
 from analysis.utils.data_loader import load_anna_matrix
 from analysis.utils.identity_tools import (
  IdentityRecord,
@@ -31,13 +35,11 @@ from analysis.utils.identity_tools import (
  public_key_from_identity,
 )
 from qubipy.rpc import rpc_client
+from scripts.core.matrix_path_index import PATTERNS, PatternFunc, block_scan_paths
 
 OUTPUT_DIR = Path("outputs/derived")
 OUTPUT_JSON = OUTPUT_DIR / "comprehensive_matrix_scan.json"
 
-Position = Tuple[int, int]
-PatternFunc = Callable[[int, int], Sequence[Position]]
-
 @dataclass
 class PatternResult:
  pattern_name: str
@@ -46,110 +48,13 @@ class PatternResult:
  identities: List[IdentityRecord]
  on_chain_identities: List[str]
 
-def diag_main(base_r: int, base_c: int) -> Sequence[Position]:
- """Main diagonal: (r+j, c+j)"""
- return [(base_r + j, base_c + j) for j in range(14)]
-
-def diag_reverse(base_r: int, base_c: int) -> Sequence[Position]:
- """Reverse diagonal: (r+j, c+(13-j))"""
- return [(base_r + j, base_c + (13 - j)) for j in range(14)]
-
-def vertical_stride(base_r: int, base_c: int) -> Sequence[Position]:
- """Vertical stride pattern"""
- return [(base_r + j, base_c + (j % 4)) for j in range(14)]
-
-def horizontal_stride(base_r: int, base_c: int) -> Sequence[Position]:
- """Horizontal stride pattern"""
- return [(base_r + (j % 4), base_c + j) for j in range(14)]
-
-def zigzag_snake(base_r: int, base_c: int) -> Sequence[Position]:
- """Zigzag snake pattern"""
- coords: List[Position] = []
- for j in range(14):
- row = base_r + j
- col = base_c + (j if j % 2 == 0 else 13 - j)
- coords.append((row, col))
- return coords
-
-def row_scan(base_r: int, base_c: int) -> Sequence[Position]:
- """Simple row scan"""
- return [(base_r, base_c + j) for j in range(14)]
-
-def column_scan(base_r: int, base_c: int) -> Sequence[Position]:
- """Simple column scan"""
- return [(base_r + j, base_c) for j in range(14)]
-
-def spiral_pattern(base_r: int, base_c: int) -> Sequence[Position]:
- """Spiral pattern starting from base"""
- coords: List[Position] = []
- directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
- r, c = base_r, base_c
- step = 1
- dir_idx = 0
- 
- for _ in range(14):
- coords.append((r, c))
- dr, dc = directions[dir_idx]
- r += dr
- c += dc
- step -= 1
- if step == 0:
- dir_idx = (dir_idx + 1) % 4
- if dir_idx % 2 == 0:
- step += 1
- return coords
-
-def l_shape(base_r: int, base_c: int) -> Sequence[Position]:
- """L-shaped pattern"""
- coords: List[Position] = []
- for j in range(7):
- coords.append((base_r + j, base_c))
- for j in range(1, 8):
- coords.append((base_r + 6, base_c + j))
- return coords[:14]
-
-PATTERNS: dict[str, PatternFunc] = {
- "diag_main": diag_main,
- "diag_reverse": diag_reverse,
- "vertical_stride": vertical_stride,
- "horizontal_stride": horizontal_stride,
- "zigzag_snake": zigzag_snake,
- "row_scan": row_scan,
- "column_scan": column_scan,
- "spiral": spiral_pattern,
- "l_shape": l_shape,
-}
-
 def extract_with_pattern(matrix: np.ndarray, builder: PatternFunc, pattern_name: str) -> List[IdentityRecord]:
  """Extract identities using a pattern builder."""
  records: List[IdentityRecord] = []
  
- # Try different starting positions
- for start_row in range(0, 128, 16):
- for start_col in range(0, 128, 16):
- for block_offset in [0, 8]:
- chars: List[str] = []
- path: List[Position] = []
- 
- for block in range(4):
- base_r = start_row + (block // 2) * 16 + block_offset
- base_c = start_col + (block % 2) * 16 + block_offset
- 
- if base_r >= 128 or base_c >= 128:
- continue
- 
- positions = builder(base_r, base_c)
- for (row, col) in positions:
- if row >= 128 or col >= 128:
- continue
- val = matrix[row, col]
- chars.append(base26_char(val))
- path.append((row, col))
- 
- if len(chars) < 56:
- continue
- 
- body = "".join(chars[:56])
+ # Try different starting positions (4 blocks per path, see matrix_path_index.block_scan_paths)
+ for _, path in block_scan_paths(builder):
+ body = "".join(base26_char(matrix[row, col]) for row, col in path)
  identity = identity_from_body(body)
  public_key, checksum_valid = public_key_from_identity(identity)
  
@@ -159,7 +64,7 @@ def extract_with_pattern(matrix: np.ndarray, builder: PatternFunc, pattern_name:
  identity=identity,
  public_key=public_key or "",
  checksum_valid=checksum_valid,
- path=tuple(path[:56]),
+ path=tuple(path),
  note="",
  )
  )
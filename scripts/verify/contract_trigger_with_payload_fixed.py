@@ -7,19 +7,18 @@ This version properly includes the payload BEFORE signing, so the signature is v
 
 from __future__ import annotations
 
+import sys
 import time
 from dataclasses import dataclass
+from pathlib import Path
 from typing import List
 
 from qubipy.rpc import rpc_client
-from qubipy.tx.utils import (
- Tx_Builder,
- get_public_key_from_identity,
- get_subseed_from_seed,
- get_private_key_from_subseed,
- get_public_key_from_private_key,
-)
-from qubipy.crypto.utils import sign, kangaroo_twelve, get_identity_from_public_key
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.qubic_transactions import default_signer
 
 CONTRACT_ID = "POCCZYCKTRQGHFIPWGSBLJTEQFDDVVBMNUHNCKMRACBGQOPBLURNRCBAFOBD"
 AMOUNT_QU = 50
@@ -85,67 +84,6 @@ class TxResult:
  status: str
  error: str | None = None
 
-def build_tx_with_payload_correct(
- seed: str,
- dest_identity: str,
- amount: int,
- target_tick: int,
- payload: int,
-) -> bytes:
- """
- Build transaction with payload - CORRECT VERSION.
- 
- The payload is inserted BEFORE signing, so the signature includes it.
- """
- seed_bytes = bytes(seed, 'utf-8')
- subseed = get_subseed_from_seed(seed_bytes)
- private_key = get_private_key_from_subseed(subseed)
- source_pubkey = get_public_key_from_private_key(private_key)
- dest_pubkey = get_public_key_from_identity(dest_identity)
- 
- built_data = bytearray()
- offset = 0
- 
- # 1. Source public key (32 bytes)
- built_data[offset:offset+32] = source_pubkey
- offset += 32
- 
- # 2. Destination public key (32 bytes)
- built_data[offset:offset+32] = dest_pubkey
- offset += 32
- 
- # 3. Amount (8 bytes, little-endian)
- built_data[offset:offset+8] = amount.to_bytes(8, byteorder='little')
- offset += 8
- 
- # 4. Target tick (4 bytes, little-endian)
- built_data[offset:offset+4] = target_tick.to_bytes(4, byteorder='little')
- offset += 4
- 
- # 5. Input type (2 bytes, little-endian)
- built_data[offset:offset+2] = (0).to_bytes(2, byteorder='little')
- offset += 2
- 
- # 6. Input size (2 bytes, little-endian)
- payload_bytes = str(payload).encode('utf-8')
- payload_size = len(payload_bytes)
- built_data[offset:offset+2] = payload_size.to_bytes(2, byteorder='little')
- offset += 2
- 
- # 7. PAYLOAD (N bytes) - MUST BE BEFORE SIGNATURE!
- built_data.extend(payload_bytes)
- offset += payload_size
- 
- # 8. Now sign the transaction (including payload)
- # kangaroo_twelve hashes the first 'offset' bytes of the data
- tx_digest = kangaroo_twelve(built_data, offset, 32)
- signature = sign(subseed, source_pubkey, tx_digest)
- 
- # 9. Append signature (64 bytes)
- built_data.extend(signature)
- 
- return bytes(built_data)
-
 def send_transaction_with_payload(
  rpc: rpc_client.QubiPy_RPC,
  seed: str,
@@ -156,7 +94,7 @@ def send_transaction_with_payload(
  latest_tick = rpc.get_latest_tick()
  target_tick = latest_tick + TARGET_TICK_OFFSET
  
- tx_bytes = build_tx_with_payload_correct(
+ tx_bytes = default_signer().build(
  seed=seed,
  dest_identity=CONTRACT_ID,
  amount=AMOUNT_QU,
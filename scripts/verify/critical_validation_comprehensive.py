@@ -15,8 +15,6 @@ from collections import Counter, defaultdict
 from datetime import datetime
 import random
 import numpy as np
-from scipy.stats import chi2_contingency, fisher_exact
-from scipy.stats import binomtest
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
@@ -88,6 +86,7 @@ def test_random_hypothesis(pairs: List[Dict], n_iterations: int = 1000) -> Dict:
  p_value = sum(1 for r in random_rates if r >= actual_rate) / n_iterations
  
  # Binomial Test
+ from scipy.stats import binomtest
  binom_result = binomtest(actual_stable, actual_total, baseline_rate, alternative='greater')
  binom_p = binom_result.pvalue
  
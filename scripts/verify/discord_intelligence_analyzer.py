@@ -13,20 +13,32 @@ This script searches through:
  - Contract ID
  - Genesis, Asset
  - 26, 676, Block-ID
+
+Discord exports under outputs/derived/cfb_discord_messages are not line-scanned:
+they are ingested into the indexed message store (discord_store.py) and only
+messages added since the previous run are categorized.
 """
 
 from __future__ import annotations
 
 import json
 import re
+import sys
 from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.verify.discord_store import MessageStore, parse_query
+
 PROJECT_ROOT = Path("${PROJECT_ROOT}")
 OUTPUT_DIR = Path("outputs/derived")
 OUTPUT_JSON = OUTPUT_DIR / "discord_intelligence_analysis.json"
 OUTPUT_MD = OUTPUT_DIR / "discord_intelligence_analysis.md"
+DISCORD_EXPORT_DIR = OUTPUT_DIR / "cfb_discord_messages"
+STORE_CONSUMER = "discord_intelligence_analyzer"
 
 # Keywords to search for
 KEYWORDS = {
@@ -40,6 +52,12 @@ KEYWORDS = {
  "layer": ["layer", "seed", "identity"],
 }
 
+# One alternation per category: a single regex search instead of a substring test per keyword
+KEYWORD_PATTERNS = {
+ category: re.compile("|".join(re.escape(keyword.lower()) for keyword in keywords))
+ for category, keywords in KEYWORDS.items()
+}
+
 def search_file(file_path: Path) -> Dict[str, List[Tuple[int, str]]]:
  """Search a file for keywords and return matches with line numbers."""
  matches = defaultdict(list)
@@ -49,12 +67,9 @@ def search_file(file_path: Path) -> Dict[str, List[Tuple[int, str]]]:
  for line_num, line in enumerate(f, 1):
  line_lower = line.lower()
  
- for category, keywords in KEYWORDS.items():
- for keyword in keywords:
- if keyword.lower() in line_lower:
- # Get context (surrounding lines)
+ for category, pattern in KEYWORD_PATTERNS.items():
+ if pattern.search(line_lower):
  matches[category].append((line_num, line.strip()))
- break # Only count once per category per line
  except Exception as e:
  print(f" ⚠️ Error reading {file_path}: {e}")
  
@@ -95,6 +110,9 @@ def analyze_all_files() -> Dict:
  # Skip venv, .git, etc.
  if any(skip in str(file_path) for skip in ["venv", ".git", "__pycache__", "node_modules"]):
  continue
+ # Discord exports are covered by the message store
+ if DISCORD_EXPORT_DIR.resolve() in file_path.resolve().parents:
+ continue
  
  matches = search_file(file_path)
  
@@ -118,6 +136,37 @@ def analyze_all_files() -> Dict:
  
  return results
 
+def analyze_discord_store(previous: Dict) -> Dict:
+ """Ingest new Discord exports and categorize only messages added since the last run."""
+ with MessageStore() as store:
+ if DISCORD_EXPORT_DIR.exists():
+ store.ingest_paths([DISCORD_EXPORT_DIR])
+ if not previous:
+ store.advance(STORE_CONSUMER, 0) # no earlier report to extend: start over
+ new_docs = store.new_docs(STORE_CONSUMER)
+ 
+ by_category = {category: list(ids) for category, ids in previous.get("message_ids_by_category", {}).items()}
+ for category, keywords in KEYWORDS.items():
+ docs = set()
+ for keyword in keywords:
+ docs |= store.match(parse_query(keyword), docs=set(new_docs))
+ ids = [msg["id"] for msg in store.messages(docs)]
+ if ids:
+ # Edited messages come back as new docs: keep each id once
+ known = by_category.setdefault(category, [])
+ seen = set(known)
+ known.extend(msg_id for msg_id in ids if msg_id not in seen)
+ 
+ store.advance(STORE_CONSUMER, max(new_docs) if new_docs else None)
+ stats = store.stats()
+ 
+ print(f"Discord store: {stats['messages']} messages, {len(new_docs)} new since last run")
+ return {
+ "messages_indexed": stats["messages"],
+ "new_messages": len(new_docs),
+ "message_ids_by_category": by_category,
+ }
+
 def extract_interesting_findings(results: Dict) -> List[str]:
  """Extract particularly interesting findings."""
  findings = []
@@ -161,7 +210,16 @@ def main() -> int:
  print("Searching for Discord messages and relevant information...")
  print()
  
+ previous_discord = {}
+ if OUTPUT_JSON.exists():
+ try:
+ with OUTPUT_JSON.open("r", encoding="utf-8") as f:
+ previous_discord = json.load(f).get("discord_messages", {})
+ except (OSError, ValueError):
+ previous_discord = {}
+ 
  results = analyze_all_files()
+ results["discord_messages"] = analyze_discord_store(previous_discord)
  results["interesting_findings"] = extract_interesting_findings(results)
  
  # Print summary
@@ -180,6 +238,11 @@ def main() -> int:
  print(f" {category}: {len(items)} files")
  print()
  
+ print("Discord messages by category:")
+ for category, ids in results["discord_messages"]["message_ids_by_category"].items():
+ print(f" {category}: {len(ids)} messages")
+ print()
+ 
  if results["interesting_findings"]:
  print("=" * 80)
  print("🎯 INTERESTING FINDINGS")
@@ -200,7 +263,9 @@ def main() -> int:
  f.write(f"- Files searched: {len(results['files_searched'])}\n")
  f.write(f"- Files with CFB mentions: {len(results['files_with_cfb_mentions'])}\n")
  f.write(f"- Files with Contract mentions: {len(results['files_with_contract_mentions'])}\n")
- f.write(f"- Files with Puzzle mentions: {len(results['files_with_puzzle_mentions'])}\n\n")
+ f.write(f"- Files with Puzzle mentions: {len(results['files_with_puzzle_mentions'])}\n")
+ f.write(f"- Discord messages indexed: {results['discord_messages']['messages_indexed']}"
+ f" ({results['discord_messages']['new_messages']} new)\n\n")
  
  if results["interesting_findings"]:
  f.write("## Interesting Findings\n\n")
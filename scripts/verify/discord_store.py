@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Incremental message store with an inverted index for Discord exports.
+
+DiscordChatExporter JSON files (and the message lists saved by the
+export_cfb_* scripts) are ingested into a SQLite database, keyed by message
+id, so re-ingesting a file only adds new or edited messages. Every message is
+tokenized once into postings:
+
+- content terms with their positions (for phrase queries),
+- `author:<id>`, `author:<name>`, `channel:<id>`, `channel:<name>`,
+- `identity:<60 uppercase letters>` and `seed:<55 lowercase letters>` hits.
+
+Queries AND together terms, quoted phrases, `field:value` terms and
+`after:`/`before:` dates:
+
+    python3 scripts/verify/discord_store.py ingest outputs/derived/cfb_discord_messages
+    python3 scripts/verify/discord_store.py search '"anna matrix" author:395234579805503489 after:2024-01-01'
+    python3 scripts/verify/discord_store.py stats
+
+Consumers that only need new messages (e.g. the intelligence analyzer) keep a
+cursor with `new_messages(consumer)` / `advance(consumer, doc)`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+project_root = Path(__file__).parent.parent.parent
+
+DEFAULT_DB = project_root / "outputs" / "derived" / "cfb_discord_messages" / "discord_store.sqlite"
+INDEX_VERSION = "1"  # bump when tokenization changes; forces a reindex
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+IDENTITY_RE = re.compile(r"\b[A-Z]{60}\b")
+SEED_RE = re.compile(r"\b[a-z]{55}\b")
+QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    doc INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT UNIQUE NOT NULL,
+    ts TEXT,
+    guild_id TEXT,
+    channel_id TEXT,
+    channel_name TEXT,
+    author_id TEXT,
+    author_name TEXT,
+    content TEXT,
+    raw TEXT
+);
+CREATE INDEX IF NOT EXISTS messages_ts ON messages (ts);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    positions TEXT,
+    PRIMARY KEY (term, doc)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc);
+CREATE TABLE IF NOT EXISTS sources (path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER);
+CREATE TABLE IF NOT EXISTS cursors (consumer TEXT PRIMARY KEY, doc INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+def normalize_timestamp(value: Optional[str]) -> Optional[str]:
+    """ISO timestamp in UTC (`YYYY-MM-DDTHH:MM:SS`) so string order is time order."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat(timespec="seconds")
+
+def message_terms(content: str, author_id: str, author_name: str, channel_id: str,
+                  channel_name: str) -> Dict[str, List[int]]:
+    """term -> positions (field terms get no positions)."""
+    terms: Dict[str, List[int]] = {}
+    for pos, token in enumerate(tokenize(content)):
+        terms.setdefault(token, []).append(pos)
+    fields = [("author", author_id), ("author", author_name), ("channel", channel_id), ("channel", channel_name)]
+    for name, value in fields:
+        if value:
+            terms.setdefault(f"{name}:{value.lower()}", [])
+    for identity in IDENTITY_RE.findall(content):
+        terms.setdefault(f"identity:{identity.lower()}", [])
+    for seed in SEED_RE.findall(content):
+        terms.setdefault(f"seed:{seed}", [])
+    return terms
+
+@dataclass
+class Query:
+    terms: List[str] = field(default_factory=list)
+    phrases: List[List[str]] = field(default_factory=list)
+    after: Optional[str] = None
+    before: Optional[str] = None
+
+def parse_query(text: str) -> Query:
+    """`word`, `prefix*`, `"a phrase"`, `author:x`, `channel:x`, `identity:X`, `seed:x`, `after:DATE`, `before:DATE`."""
+    query = Query()
+    for phrase, word in QUERY_RE.findall(text):
+        if phrase:
+            tokens = tokenize(phrase)
+            if len(tokens) == 1:
+                query.terms.append(tokens[0])
+            elif tokens:
+                query.phrases.append(tokens)
+            continue
+        name, sep, value = word.partition(":")
+        if sep and name in ("after", "since"):
+            query.after = normalize_timestamp(value)
+        elif sep and name in ("before", "until"):
+            query.before = normalize_timestamp(value)
+        elif sep and name in ("author", "channel", "identity", "seed"):
+            query.terms.append(f"{name}:{value.lower()}")
+        else:
+            tokens = tokenize(word)
+            if len(tokens) == 1:
+                query.terms.append(tokens[0] + ("*" if word.endswith("*") else ""))
+            elif tokens:
+                query.phrases.append(tokens)  # "block-id" matches the words block, id in sequence
+    return query
+
+def _messages_from_payload(payload: Any) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """(export context, messages) for exporter JSON or a bare message list."""
+    if isinstance(payload, list):
+        return {}, payload
+    if isinstance(payload, dict):
+        return {"guild": payload.get("guild") or {}, "channel": payload.get("channel") or {}}, payload.get("messages") or []
+    return {}, []
+
+class MessageStore:
+    """SQLite-backed, deduplicated message store with an inverted index."""
+
+    def __init__(self, path: Path = DEFAULT_DB) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._check_version()
+
+    def __enter__(self) -> "MessageStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _check_version(self) -> None:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'index_version'").fetchone()
+        if row and row[0] == INDEX_VERSION:
+            return
+        if row:
+            self.reindex()
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('index_version', ?)", (INDEX_VERSION,))
+        self.conn.commit()
+
+    # --- ingest -------------------------------------------------------------
+
+    def _index(self, doc: int, content: str, author_id: str, author_name: str, channel_id: str,
+               channel_name: str) -> None:
+        terms = message_terms(content, author_id, author_name, channel_id, channel_name)
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO postings (term, doc, positions) VALUES (?, ?, ?)",
+            ((term, doc, ",".join(map(str, positions))) for term, positions in terms.items()),
+        )
+
+    def add_messages(self, messages: Iterable[Dict[str, Any]], context: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Insert new messages, re-index edited ones; returns ids of new or changed messages."""
+        context = context or {}
+        guild = context.get("guild") or {}
+        channel = context.get("channel") or {}
+        changed: List[str] = []
+        with self.conn:
+            for msg in messages:
+                msg_id = str(msg.get("id") or "")
+                if not msg_id:
+                    continue
+                content = msg.get("content") or ""
+                author = msg.get("author") or {}
+                author_id = str(author.get("id") or "")
+                author_name = author.get("name") or author.get("nickname") or ""
+                channel_id = str(msg.get("channel_id") or channel.get("id") or "")
+                channel_name = channel.get("name") or ""
+                row = self.conn.execute("SELECT doc, content FROM messages WHERE id = ?", (msg_id,)).fetchone()
+                if row is not None and row[1] == content:
+                    continue
+                values = (
+                    normalize_timestamp(msg.get("timestamp")), str(guild.get("id") or ""), channel_id, channel_name,
+                    author_id, author_name, content, json.dumps(msg, ensure_ascii=False),
+                )
+                if row is None:
+                    cur = self.conn.execute(
+                        "INSERT INTO messages (id, ts, guild_id, channel_id, channel_name, author_id, author_name,"
+                        " content, raw) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (msg_id,) + values,
+                    )
+                    doc = cur.lastrowid
+                else:
+                    # Edited message: new doc number so consumers see it again
+                    self.conn.execute("DELETE FROM postings WHERE doc = ?", (row[0],))
+                    self.conn.execute("DELETE FROM messages WHERE doc = ?", (row[0],))
+                    cur = self.conn.execute(
+                        "INSERT INTO messages (id, ts, guild_id, channel_id, channel_name, author_id, author_name,"
+                        " content, raw) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (msg_id,) + values,
+                    )
+                    doc = cur.lastrowid
+                self._index(doc, content, author_id, author_name, channel_id, channel_name)
+                changed.append(msg_id)
+        return changed
+
+    def ingest_file(self, path: Path, force: bool = False, track: bool = True) -> List[str]:
+        """Ingest one export file unless it is unchanged since the last ingest.
+
+        `track=False` is for temporary files (e.g. exporter batches): the
+        messages are indexed but no `sources` row is kept for the path.
+        """
+        st = path.stat()
+        key = str(path.resolve())
+        row = self.conn.execute("SELECT mtime_ns, size FROM sources WHERE path = ?", (key,)).fetchone()
+        if not force and row == (st.st_mtime_ns, st.st_size):
+            return []
+        with path.open(encoding="utf-8") as fh:
+            context, messages = _messages_from_payload(json.load(fh))
+        changed = self.add_messages(messages, context)
+        if track:
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?)", (key, st.st_mtime_ns, st.st_size))
+        return changed
+
+    def forget_missing_sources(self) -> int:
+        """Drop `sources` rows of files that no longer exist; returns how many."""
+        missing = [(path,) for (path,) in self.conn.execute("SELECT path FROM sources") if not Path(path).exists()]
+        with self.conn:
+            self.conn.executemany("DELETE FROM sources WHERE path = ?", missing)
+        return len(missing)
+
+    def ingest_paths(self, paths: Iterable[Path], force: bool = False) -> Dict[str, int]:
+        """Ingest JSON files and directories (recursively); returns per-file counts of new messages."""
+        self.forget_missing_sources()
+        counts: Dict[str, int] = {}
+        for path in paths:
+            files = sorted(path.rglob("*.json")) if path.is_dir() else [path]
+            for file_path in files:
+                try:
+                    counts[str(file_path)] = len(self.ingest_file(file_path, force=force))
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ Skipping {file_path}: {e}", file=sys.stderr)
+        return counts
+
+    def reindex(self) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM postings")
+            rows = self.conn.execute(
+                "SELECT doc, content, author_id, author_name, channel_id, channel_name FROM messages"
+            ).fetchall()
+            for doc, content, author_id, author_name, channel_id, channel_name in rows:
+                self._index(doc, content or "", author_id or "", author_name or "", channel_id or "",
+                            channel_name or "")
+
+    # --- query --------------------------------------------------------------
+
+    def _docs(self, term: str) -> Set[int]:
+        if term.endswith("*"):
+            prefix = term[:-1]
+            rows = self.conn.execute(
+                "SELECT doc FROM postings WHERE term >= ? AND term < ?", (prefix, prefix + "￿")
+            )
+        else:
+            rows = self.conn.execute("SELECT doc FROM postings WHERE term = ?", (term,))
+        return {doc for (doc,) in rows}
+
+    def _term_count(self, term: str) -> int:
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM postings WHERE term = ?", (term,)).fetchone()
+        return count
+
+    def _positions(self, term: str, docs: Iterable[int]) -> Dict[int, Set[int]]:
+        docs = list(docs)
+        result: Dict[int, Set[int]] = {}
+        for start in range(0, len(docs), 500):
+            chunk = docs[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            for doc, positions in self.conn.execute(
+                f"SELECT doc, positions FROM postings WHERE term = ? AND doc IN ({marks})", [term] + chunk
+            ):
+                result[doc] = {int(p) for p in positions.split(",") if p}
+        return result
+
+    def _phrase_docs(self, tokens: Sequence[str], candidates: Optional[Set[int]]) -> Set[int]:
+        docs = candidates
+        for token in sorted(set(tokens), key=self._term_count):
+            found = self._docs(token)
+            docs = found if docs is None else docs & found
+            if not docs:
+                return set()
+        positions = [self._positions(token, docs) for token in tokens]
+        matches = set()
+        for doc in docs:
+            first = positions[0].get(doc, set())
+            if any(all(p + i in positions[i].get(doc, ()) for i in range(1, len(tokens))) for p in first):
+                matches.add(doc)
+        return matches
+
+    def match(self, query: Query, docs: Optional[Set[int]] = None) -> Set[int]:
+        """Doc numbers matching all parts of the query (optionally within `docs`)."""
+        for term in sorted(query.terms, key=lambda t: self._term_count(t) if not t.endswith("*") else 0):
+            found = self._docs(term)
+            docs = found if docs is None else docs & found
+            if not docs:
+                return set()
+        for tokens in query.phrases:
+            docs = self._phrase_docs(tokens, docs)
+            if not docs:
+                return set()
+        if query.after or query.before:
+            sql, params = "SELECT doc FROM messages WHERE 1=1", []
+            if query.after:
+                sql, params = sql + " AND ts >= ?", params + [query.after]
+            if query.before:
+                sql, params = sql + " AND ts < ?", params + [query.before]
+            in_range = {doc for (doc,) in self.conn.execute(sql, params)}
+            docs = in_range if docs is None else docs & in_range
+        if docs is None:
+            docs = {doc for (doc,) in self.conn.execute("SELECT doc FROM messages")}
+        return docs
+
+    def messages(self, docs: Iterable[int], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Stored messages (exporter JSON) for doc numbers, oldest first."""
+        docs = sorted(docs)
+        rows: List[Tuple[Optional[str], int, str]] = []
+        for start in range(0, len(docs), 500):
+            chunk = docs[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            rows.extend(self.conn.execute(f"SELECT ts, doc, raw FROM messages WHERE doc IN ({marks})", chunk))
+        rows.sort(key=lambda row: (row[0] or "", row[1]))
+        if limit is not None:
+            rows = rows[:limit]
+        return [json.loads(raw) for _, _, raw in rows]
+
+    def search(self, text: str, limit: Optional[int] = 50) -> List[Dict[str, Any]]:
+        return self.messages(self.match(parse_query(text)), limit=limit)
+
+    def docs_for_ids(self, ids: Iterable[str]) -> Set[int]:
+        ids = list(ids)
+        docs: Set[int] = set()
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            docs.update(doc for (doc,) in self.conn.execute(f"SELECT doc FROM messages WHERE id IN ({marks})", chunk))
+        return docs
+
+    # --- incremental consumers ---------------------------------------------
+
+    def cursor(self, consumer: str) -> int:
+        row = self.conn.execute("SELECT doc FROM cursors WHERE consumer = ?", (consumer,)).fetchone()
+        return row[0] if row else 0
+
+    def new_docs(self, consumer: str) -> Set[int]:
+        """Docs added (or edited) since `consumer` last called `advance`."""
+        rows = self.conn.execute("SELECT doc FROM messages WHERE doc > ?", (self.cursor(consumer),))
+        return {doc for (doc,) in rows}
+
+    def advance(self, consumer: str, doc: Optional[int] = None) -> None:
+        if doc is None:
+            (doc,) = self.conn.execute("SELECT COALESCE(MAX(doc), 0) FROM messages").fetchone()
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO cursors VALUES (?, ?)", (consumer, doc))
+
+    def stats(self) -> Dict[str, Any]:
+        (messages,) = self.conn.execute("SELECT COUNT(*) FROM messages").fetchone()
+        (terms,) = self.conn.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()
+        (sources,) = self.conn.execute("SELECT COUNT(*) FROM sources").fetchone()
+        first, last = self.conn.execute("SELECT MIN(ts), MAX(ts) FROM messages").fetchone()
+        authors = self.conn.execute(
+            "SELECT author_name, author_id, COUNT(*) FROM messages GROUP BY author_id ORDER BY COUNT(*) DESC LIMIT 10"
+        ).fetchall()
+        return {"messages": messages, "terms": terms, "sources": sources, "first": first, "last": last,
+                "top_authors": authors}
+
+def format_message(msg: Dict[str, Any], width: int = 160) -> str:
+    author = (msg.get("author") or {}).get("name", "?")
+    content = " ".join((msg.get("content") or "").split())
+    return f"[{(msg.get('timestamp') or '')[:19]}] {author}: {content[:width]}"
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Indexed store for Discord exports")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help=f"Store file (default: {DEFAULT_DB})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="Ingest exporter JSON files or directories")
+    ingest.add_argument("paths", nargs="+", type=Path)
+    ingest.add_argument("--force", action="store_true", help="Re-read files even if unchanged")
+    search = sub.add_parser("search", help="Query the index")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=50)
+    search.add_argument("--json", action="store_true", help="Print matching messages as JSON")
+    sub.add_parser("stats", help="Store statistics")
+    sub.add_parser("reindex", help="Rebuild the inverted index")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    with MessageStore(args.db) as store:
+        if args.command == "ingest":
+            counts = store.ingest_paths(args.paths, force=args.force)
+            for path, count in counts.items():
+                if count:
+                    print(f"  +{count:6d}  {path}")
+            print(f"✅ {sum(counts.values())} new/edited messages from {len(counts)} files")
+        elif args.command == "search":
+            docs = store.match(parse_query(args.query))
+            messages = store.messages(docs, limit=args.limit)
+            if args.json:
+                print(json.dumps(messages, indent=2, ensure_ascii=False))
+            else:
+                for msg in messages:
+                    print(format_message(msg))
+                print(f"{len(docs)} matches" + (f" (showing {len(messages)})" if len(messages) < len(docs) else ""))
+        elif args.command == "stats":
+            for key, value in store.stats().items():
+                print(f"{key}: {value}")
+        elif args.command == "reindex":
+            store.reindex()
+            print("✅ Index rebuilt")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,12 @@ Can be interrupted and resumed without losing progress.
 
 CFB User ID: 395234579805503489
 Channel: 768890598736003092 (aigarth)
+
+Every batch is also ingested into the indexed message store
+(scripts/verify/discord_store.py), which does the author filtering. Duplicates
+from overlapping batches are dropped against the ids already saved by this
+exporter (not against the shared store, which the analyzer and
+`discord_store ingest` fill as well); edited messages replace their saved copy.
 """
 
 from __future__ import annotations
@@ -14,10 +20,16 @@ from __future__ import annotations
 import json
 import os
 import subprocess
+import sys
 import time
 from pathlib import Path
 from typing import Optional
 
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.verify.discord_store import MessageStore, parse_query
+
 # Configuration
 CFB_USER_ID = "395234579805503489"
 CHANNEL_ID = "768890598736003092"
@@ -133,23 +145,36 @@ def export_channel_json(
  return False
 
 def filter_cfb_messages(json_file: Path) -> list:
- """Filter messages from CFB's user ID."""
+ """Index a batch in the message store and return all of CFB's messages in it (oldest first)."""
  try:
  with json_file.open(encoding="utf-8") as f:
  data = json.load(f)
- 
- cfb_messages = []
- if "messages" in data:
- for msg in data["messages"]:
- author = msg.get("author", {})
- if author.get("id") == CFB_USER_ID:
- cfb_messages.append(msg)
- 
- return cfb_messages
+ batch_ids = [str(msg["id"]) for msg in data.get("messages") or [] if msg.get("id")]
+ if not batch_ids:
+ return []
+ with MessageStore() as store:
+ # The batch file is deleted afterwards: index it without a sources row
+ store.ingest_file(json_file, force=True, track=False)
+ docs = store.match(parse_query(f"author:{CFB_USER_ID}"), docs=store.docs_for_ids(batch_ids))
+ return store.messages(docs)
  except Exception as e:
  print(f"❌ Error filtering: {e}")
  return []
 
+def merge_messages(all_messages: list, batch: list) -> int:
+ """Append messages not saved yet, replace edited ones in place; returns the number added."""
+ position = {str(msg.get("id")): idx for idx, msg in enumerate(all_messages)}
+ added = 0
+ for msg in batch:
+ idx = position.get(str(msg.get("id")))
+ if idx is None:
+ position[str(msg.get("id"))] = len(all_messages)
+ all_messages.append(msg)
+ added += 1
+ else:
+ all_messages[idx] = msg
+ return added
+
 def main() -> int:
  """Main export function with incremental saving."""
  
@@ -209,9 +234,9 @@ def main() -> int:
  time.sleep(2)
  continue
  
- # Filter CFB messages
+ # Filter CFB messages, dedupe against what this export already saved
  batch_cfb = filter_cfb_messages(temp_file)
- batch_size = len(batch_cfb)
+ batch_size = merge_messages(all_messages, batch_cfb)
  
  if batch_size == 0:
  consecutive_empty += 1
@@ -234,7 +259,6 @@ def main() -> int:
  break
  else:
  consecutive_empty = 0
- all_messages.extend(batch_cfb)
  state["total_messages"] = len(all_messages)
  
  # Update last message ID
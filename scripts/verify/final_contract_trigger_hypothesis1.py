@@ -10,19 +10,18 @@ Example: "1,2", "2,2", ... "8,2"
 from __future__ import annotations
 
 import json
+import sys
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List
 
 from qubipy.rpc import rpc_client
-from qubipy.tx.utils import (
- get_public_key_from_identity,
- get_subseed_from_seed,
- get_private_key_from_subseed,
- get_public_key_from_private_key,
-)
-from qubipy.crypto.utils import sign, kangaroo_twelve
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.qubic_transactions import default_signer
 
 # --- CONSTANTS ---
 CONTRACT_ID = "POCCZYCKTRQGHFIPWGSBLJTEQFDDVVBMNUHNCKMRACBGQOPBLURNRCBAFOBD"
@@ -41,66 +40,6 @@ class TxResult:
  status: str
  error: str | None = None
 
-def build_tx_with_payload(
- seed: str,
- dest_identity: str,
- amount: int,
- target_tick: int,
- payload: str,
-) -> bytes:
- """
- Build transaction with payload - Payload is included BEFORE signing.
- """
- seed_bytes = bytes(seed, 'utf-8')
- subseed = get_subseed_from_seed(seed_bytes)
- private_key = get_private_key_from_subseed(subseed)
- source_pubkey = get_public_key_from_private_key(private_key)
- dest_pubkey = get_public_key_from_identity(dest_identity)
- 
- built_data = bytearray()
- offset = 0
-
- # 1. Source Public Key (32 bytes)
- built_data.extend(source_pubkey)
- offset += len(source_pubkey)
-
- # 2. Destination Public Key (32 bytes)
- built_data.extend(dest_pubkey)
- offset += len(dest_pubkey)
-
- # 3. Amount (8 bytes)
- built_data.extend(amount.to_bytes(8, byteorder='little'))
- offset += 8
-
- # 4. Target Tick (4 bytes)
- built_data.extend(target_tick.to_bytes(4, byteorder='little'))
- offset += 4
-
- # 5. Input Type (2 bytes) - always 0 for simple transfers
- input_type = 0
- built_data.extend(input_type.to_bytes(2, byteorder='little'))
- offset += 2
-
- # 6. Input Size (2 bytes) - size of the payload
- payload_bytes = payload.encode('utf-8')
- input_size = len(payload_bytes)
- built_data.extend(input_size.to_bytes(2, byteorder='little'))
- offset += 2
-
- # 7. Payload (N bytes) - inserted BEFORE signing
- built_data.extend(payload_bytes)
- offset += len(payload_bytes)
- 
- # Sign the transaction digest (which now includes the payload)
- tx_digest = kangaroo_twelve(built_data, offset, 32)
- signature = sign(subseed, source_pubkey, tx_digest)
-
- # 8. Signature (64 bytes)
- built_data.extend(signature)
- offset += len(signature)
-
- return bytes(built_data)
-
 def send_transaction_with_payload(
  rpc: rpc_client.QubiPy_RPC,
  seed: str,
@@ -111,7 +50,7 @@ def send_transaction_with_payload(
  latest_tick = rpc.get_latest_tick()
  target_tick = latest_tick + TARGET_TICK_OFFSET
  
- tx_bytes = build_tx_with_payload(
+ tx_bytes = default_signer().build(
  seed=seed,
  dest_identity=CONTRACT_ID,
  amount=AMOUNT_QU,
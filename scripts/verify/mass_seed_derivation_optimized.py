@@ -14,6 +14,7 @@ IMPORTANT: Set MOCK_MODE = False for real on-chain verification!
 from __future__ import annotations
 
 import json
+import sys
 import time
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -27,25 +28,12 @@ except ImportError:
  HAS_QUBIPY_RPC = False
  print("⚠️ QubiPy RPC nicht verfügbar - verwende Docker")
 
-# Use alternative implementation that doesn't require crypto.so
-try:
- from scripts.core.seed_candidate_scan import derive_identity_from_seed
- HAS_DERIVATION = True
-except ImportError:
- try:
- from analysis.utils.identity_tools import identity_from_body, checksum_letters
- HAS_DERIVATION = True
- # Fallback implementation
- def derive_identity_from_seed(seed: str):
- """Fallback derivation using identity_tools."""
- try:
- from scripts.core.seed_candidate_scan import derive_identity_from_seed as _derive
- return _derive(seed)
- except:
- return None
- except ImportError:
- HAS_DERIVATION = False
- print("⚠️ Seed derivation nicht verfügbar")
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Real Qubic chain: qubipy's native code when it loads, the portable implementation otherwise
+from scripts.core.seed_candidate_scan import derive_identity_from_seed
+HAS_DERIVATION = True
 
 OUTPUT_DIR = Path("outputs/derived")
 OUTPUT_JSON = OUTPUT_DIR / "mass_seed_derivation_optimized.json"
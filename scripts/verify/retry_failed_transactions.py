@@ -5,15 +5,16 @@ Retry failed transactions (Blocks 4-7) from Hypothesis 1 test.
 
 from __future__ import annotations
 
-import time
+import sys
+from pathlib import Path
+
 from qubipy.rpc import rpc_client
-from qubipy.tx.utils import (
- get_public_key_from_identity,
- get_subseed_from_seed,
- get_private_key_from_subseed,
- get_public_key_from_private_key,
-)
-from qubipy.crypto.utils import sign, kangaroo_twelve
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.qubic_transactions import TransactionSigner
+from scripts.core.tick_scheduler import ScheduledTx, TickScheduler
 
 CONTRACT_ID = "POCCZYCKTRQGHFIPWGSBLJTEQFDDVVBMNUHNCKMRACBGQOPBLURNRCBAFOBD"
 AMOUNT_QU = 50
@@ -51,87 +52,34 @@ RETRY_SEEDS = [
  },
 ]
 
-def build_tx_with_payload(
- seed: str,
- dest_identity: str,
- amount: int,
- target_tick: int,
- payload: str,
-) -> bytes:
- """Build transaction with payload."""
- seed_bytes = bytes(seed, 'utf-8')
- subseed = get_subseed_from_seed(seed_bytes)
- private_key = get_private_key_from_subseed(subseed)
- source_pubkey = get_public_key_from_private_key(private_key)
- dest_pubkey = get_public_key_from_identity(dest_identity)
- 
- built_data = bytearray()
- offset = 0
-
- built_data.extend(source_pubkey)
- offset += len(source_pubkey)
- built_data.extend(dest_pubkey)
- offset += len(dest_pubkey)
- built_data.extend(amount.to_bytes(8, byteorder='little'))
- offset += 8
- built_data.extend(target_tick.to_bytes(4, byteorder='little'))
- offset += 4
- built_data.extend((0).to_bytes(2, byteorder='little'))
- offset += 2
- 
- payload_bytes = payload.encode('utf-8')
- built_data.extend(len(payload_bytes).to_bytes(2, byteorder='little'))
- offset += 2
- built_data.extend(payload_bytes)
- offset += len(payload_bytes)
- 
- tx_digest = kangaroo_twelve(built_data, offset, 32)
- signature = sign(subseed, source_pubkey, tx_digest)
- built_data.extend(signature)
- 
- return bytes(built_data)
-
 def main():
  rpc = rpc_client.QubiPy_RPC()
+ signer = TransactionSigner()
  
  print("=" * 80)
  print("🔄 RETRYING FAILED TRANSACTIONS (Blocks 4-7)")
  print("=" * 80)
  print()
  
- current_tick = rpc.get_latest_tick()
- target_tick = current_tick + TARGET_TICK_OFFSET
- 
- print(f"Current tick: {current_tick}")
- print(f"Target tick: {target_tick}")
- print()
- 
+ scheduler = TickScheduler(rpc, signer, tick_offset=TARGET_TICK_OFFSET)
  for entry in RETRY_SEEDS:
- print(f"▶️ {entry['label']}")
- print(f" Payload: '{entry['payload']}'")
- 
- try:
- tx_bytes = build_tx_with_payload(
+ scheduler.submit(ScheduledTx(
+ label=entry['label'],
  seed=entry['seed'],
  dest_identity=CONTRACT_ID,
  amount=AMOUNT_QU,
- target_tick=target_tick,
  payload=entry['payload'],
- )
- 
- response = rpc.broadcast_transaction(tx_bytes)
- tx_id = response.get("txId", response.get("transactionHash", "UNKNOWN"))
- print(f" ✅ TX sent: {tx_id}")
- except Exception as e:
- print(f" ❌ ERROR: {e}")
+ source_identity=entry['identity'],
+ ))
  
- time.sleep(0.5) # Longer delay to avoid timeouts
- 
- print()
- print("=" * 80)
- print("Waiting 20 seconds for contract payout...")
- print("=" * 80)
- time.sleep(20)
+ # Broadcast just in time, wait for the target ticks to pass and re-send only expired ones
+ for tx in scheduler.run():
+ print(f"▶️ {tx.label}")
+ print(f" Payload: '{tx.payload}' | Target tick: {tx.target_tick} | Attempts: {tx.attempts}")
+ if tx.status == "confirmed":
+ print(f" ✅ TX included: {tx.tx_id}")
+ else:
+ print(f" ❌ {tx.status.upper()}: {tx.error or tx.tx_id}")
  
  print()
  print("Checking assets...")
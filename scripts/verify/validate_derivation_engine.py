@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Validate the portable derivation chain (scripts/core/qubic_crypto.py) against qubipy.
+
+- Fixture corpus (data/fixtures/derivation_vectors.json, generated with
+  qubipy's crypto.so): every stage of every vector - subseed, private key,
+  public key, identity - per seed and through the batched path, plus K12
+  vectors up to the tree-hashing sizes.
+- If qubipy's native library loads here: `--random N` fresh seeds are derived
+  by both chains and compared.
+- Throughput of each available engine.
+
+Exit code 1 on any mismatch.
+
+Usage:
+    python3 scripts/verify/validate_derivation_engine.py
+    python3 scripts/verify/validate_derivation_engine.py --random 5000
+    python3 scripts/verify/validate_derivation_engine.py --regenerate   # needs qubipy
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import string
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core import qubic_crypto
+from scripts.core.derivation_backends import _load_qubipy, qubipy_available
+
+FIXTURE_FILE = project_root / "data" / "fixtures" / "derivation_vectors.json"
+OUTPUT_JSON = project_root / "outputs" / "derived" / "derivation_engine_validation.json"
+
+FIXTURE_SEED = 20251122
+SPECIAL_SEEDS = ["a" * 55, "z" * 55, "abcdefghijklmnopqrstuvwxyz" * 2 + "abc"]
+K12_LENGTHS = [0, 1, 31, 32, 55, 167, 168, 169, 1000, 8191, 8192, 8193, 20000]
+
+def k12_message(length: int) -> bytes:
+    """Test pattern of the K12 specification: bytes 0x00..0xFA repeated."""
+    return bytes(i % 251 for i in range(length))
+
+def fixture_seeds(count: int) -> List[str]:
+    """Special seeds, then fixed-seed random ones."""
+    seeds = list(SPECIAL_SEEDS)
+    rng = random.Random(FIXTURE_SEED)
+    while len(seeds) < count:
+        seeds.append("".join(rng.choices(string.ascii_lowercase, k=55)))
+    return seeds
+
+def regenerate(count: int) -> Dict:
+    """Write the fixture corpus with qubipy's native chain."""
+    from qubipy.crypto.utils import kangaroo_twelve
+
+    fn = _load_qubipy()
+    vectors = []
+    for seed in fixture_seeds(count):
+        subseed = fn["subseed"](seed.encode("utf-8"))
+        private_key = fn["private_key"](subseed)
+        public_key = fn["public_key"](private_key)
+        vectors.append({
+            "seed": seed,
+            "subseed": subseed.hex(),
+            "private_key": private_key.hex(),
+            "public_key": public_key.hex(),
+            "identity": fn["identity"](public_key),
+        })
+    k12 = [
+        {"length": length, "output_length": 32, "digest": kangaroo_twelve(k12_message(length), length, 32).hex()}
+        for length in K12_LENGTHS
+    ]
+    from importlib.metadata import version
+
+    fixture = {
+        "generator": f"qubipy {version('qubipy')} crypto.so",
+        "k12_message": "bytes(i % 251 for i in range(length))",
+        "k12": k12,
+        "vectors": vectors,
+    }
+    FIXTURE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with FIXTURE_FILE.open("w") as f:
+        json.dump(fixture, f, indent=2)
+    return fixture
+
+def check_fixture(fixture: Dict) -> List[str]:
+    errors = []
+    for vector in fixture["k12"]:
+        digest = qubic_crypto.kangaroo_twelve(k12_message(vector["length"]), vector["output_length"])
+        if digest.hex() != vector["digest"]:
+            errors.append(f"K12 length {vector['length']}")
+    for vector in fixture["vectors"]:
+        seed = vector["seed"]
+        subseed = qubic_crypto.subseed_from_seed(seed)
+        private_key = qubic_crypto.private_key_from_subseed(subseed)
+        public_key = qubic_crypto.public_key_from_private_key(private_key)
+        stages = {
+            "subseed": subseed.hex(),
+            "private_key": private_key.hex(),
+            "public_key": public_key.hex(),
+            "identity": qubic_crypto.identity_from_public_key(public_key),
+        }
+        errors.extend(f"{stage} of {seed}" for stage, value in stages.items() if value != vector[stage])
+    batched = qubic_crypto.derive_identities([vector["seed"] for vector in fixture["vectors"]])
+    errors.extend(
+        f"batched identity of {vector['seed']}"
+        for vector, identity in zip(fixture["vectors"], batched)
+        if identity != vector["identity"]
+    )
+    return errors
+
+def cross_check(count: int) -> List[str]:
+    """Fresh random seeds through qubipy and the portable chain."""
+    fn = _load_qubipy()
+    rng = random.Random()
+    seeds = ["".join(rng.choices(string.ascii_lowercase, k=55)) for _ in range(count)]
+    portable = qubic_crypto.derive_identities(seeds)
+    errors = []
+    for seed, identity in zip(seeds, portable):
+        native = fn["identity"](fn["public_key"](fn["private_key"](fn["subseed"](seed.encode("utf-8")))))
+        if native != identity:
+            errors.append(f"random seed {seed}: {identity} != {native}")
+    return errors
+
+def throughput(count: int) -> Dict[str, float]:
+    """Seeds per second of each engine available here."""
+    from scripts.core.derivation_backends import make_backend
+
+    seeds = fixture_seeds(count)
+    qubic_crypto.scalar_mul_base(1)  # build the fixed-base table outside the timing
+    rates = {}
+    start = time.perf_counter()
+    for seed in seeds:
+        qubic_crypto.identity_from_seed(seed)
+    rates["portable_single"] = count / (time.perf_counter() - start)
+    start = time.perf_counter()
+    qubic_crypto.derive_identities(seeds)
+    rates["portable_batch" if qubic_crypto.numpy is not None else "portable_batch_no_numpy"] = (
+        count / (time.perf_counter() - start)
+    )
+    if qubipy_available():
+        backend = make_backend("qubipy")
+        start = time.perf_counter()
+        backend.derive_batch(seeds)
+        rates["qubipy"] = count / (time.perf_counter() - start)
+    return rates
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--random", type=int, default=1000, help="Random seeds to cross-check against qubipy.")
+    parser.add_argument("--bench", type=int, default=500, help="Seeds for the throughput measurement (0 = skip).")
+    parser.add_argument("--regenerate", type=int, nargs="?", const=64, default=0, metavar="N",
+                        help="Rewrite the fixture corpus with qubipy (N vectors, default 64).")
+    return parser.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    native = qubipy_available()
+    print(f"qubipy native library: {'✅ available' if native else '❌ not available (portable only)'}")
+    print(f"numpy batching: {'✅' if qubic_crypto.numpy is not None else '❌'}")
+
+    if args.regenerate:
+        if not native:
+            sys.exit("❌ --regenerate needs qubipy's native library")
+        regenerate(args.regenerate)
+        print(f"✅ fixture corpus rewritten -> {FIXTURE_FILE}")
+
+    with FIXTURE_FILE.open() as f:
+        fixture = json.load(f)
+    errors = check_fixture(fixture)
+    print(f"Fixture ({fixture['generator']}): {len(fixture['vectors'])} seeds, {len(fixture['k12'])} K12 vectors"
+          f" -> {'✅ all match' if not errors else f'❌ {len(errors)} mismatches'}")
+
+    if native and args.random:
+        random_errors = cross_check(args.random)
+        print(f"Random cross-check: {args.random} seeds -> "
+              f"{'✅ all match' if not random_errors else f'❌ {len(random_errors)} mismatches'}")
+        errors.extend(random_errors)
+
+    rates = throughput(args.bench) if args.bench else {}
+    for name, rate in rates.items():
+        print(f"  {name:<24} {rate:>10,.0f} seeds/s")
+
+    OUTPUT_JSON.parent.mkdir(parents=True, exist_ok=True)
+    with OUTPUT_JSON.open("w") as f:
+        json.dump({
+            "qubipy_native": native,
+            "numpy": qubic_crypto.numpy is not None,
+            "fixture_vectors": len(fixture["vectors"]),
+            "random_checked": args.random if native else 0,
+            "errors": errors,
+            "seeds_per_second": rates,
+        }, f, indent=2)
+
+    for error in errors[:20]:
+        print(f"  ❌ {error}")
+    sys.exit(1 if errors else 0)
+
+if __name__ == "__main__":
+    main()
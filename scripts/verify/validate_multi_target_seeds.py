@@ -14,6 +14,8 @@ from datetime import datetime
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.analysis.positional_index import load_layer_index
+
 LAYER3_FILE = project_root / "outputs" / "derived" / "layer3_derivation_23k_complete.json"
 OUTPUT_DIR = project_root / "outputs" / "derived"
 REPORTS_DIR = project_root / "outputs" / "reports"
@@ -33,53 +35,31 @@ def validate_multi_target_seeds(targets: Dict[int, str], sample_size: int = 100)
  print(f" Targets: {targets}")
  print()
  
- with LAYER3_FILE.open() as f:
- layer3_data = json.load(f)
- layer3_results = layer3_data.get("results", [])
+ # Bitmap-Index: Seeds mit allen Seed-Targets, davon die mit allen Identity-Targets
+ index = load_layer_index(LAYER3_FILE)
+ seed_rows = index.select([("seed", pos, char) for pos, char in targets.items() if pos < 55])
+ identity_rows = index.select({pos: char for pos, char in targets.items() if pos < 60}, within=seed_rows)
  
- matching_seeds = []
+ matching_seeds = index.values(seed_rows)
  errors = []
  
- for entry in layer3_results:
- identity = entry.get("layer3_identity", "")
- if len(identity) != 60:
- continue
- 
- seed = identity_to_seed(identity)
- if len(seed) < 55:
- continue
- 
- # Check ob Seed alle Targets erfüllt
- seed_matches = True
- for pos, target_char in targets.items():
- if pos < 55:
- if len(seed) > pos and seed[pos].lower() != target_char.lower():
- seed_matches = False
- break
- 
- if seed_matches:
- matching_seeds.append(identity)
- 
- # KRITISCH: Check ob Identity auch alle Targets erfüllt
- identity_matches = True
+ # KRITISCH: nur die Fehlerfälle werden einzeln geprüft und dokumentiert
+ for identity in index.values(seed_rows & ~identity_rows):
  error_details = []
- 
  for pos, target_char in targets.items():
  if len(identity) > pos:
  actual_char = identity[pos].upper()
  expected_char = target_char.upper()
  if actual_char != expected_char:
- identity_matches = False
  error_details.append({
  "position": pos,
  "expected": expected_char,
  "actual": actual_char
  })
  
- if not identity_matches:
  errors.append({
  "identity": identity,
- "seed": seed,
+ "seed": identity_to_seed(identity),
  "errors": error_details
  })
  
@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 """
 KRITISCHE VALIDIERUNG: Position 27 - Check alle möglichen Fehlerquellen
+
+Neben dem chi²-Test über die Block-Ende-Positionen: Permutationstest der
+Stabilität (Layer-3 -> Layer-4) an allen 60 Positionen, Paarung zufällig
+vertauscht, p-Werte family-wise korrigiert (max-T / min-P).
 """
 
 import json
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 from collections import Counter
@@ -12,12 +17,14 @@ from scipy.stats import chi2_contingency
 import numpy as np
 
 project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
 LAYER3_FILE = project_root / "outputs" / "derived" / "layer3_derivation_23k_complete.json"
 LAYER4_FILE = project_root / "outputs" / "derived" / "layer4_derivation_sample_5000.json"
 OUTPUT_DIR = project_root / "outputs" / "derived"
 REPORTS_DIR = project_root / "outputs" / "reports"
 
 BLOCK_END_POSITIONS = [13, 27, 41, 55]
+PERMUTATIONS = 10_000
 
 def load_all_pairs() -> Tuple[List[Dict], Dict]:
  """Load ALLE Paare und check Datenqualität."""
@@ -220,6 +227,31 @@ def test_statistical_significance(positions_data: Dict) -> Dict:
  "position_labels": [int(p) for p in position_labels]
  }
 
+def test_permutation_stability(pairs: List[Dict], n_permutations: int = PERMUTATIONS) -> Dict:
+ """Stabilität jeder Position vs. zufällige Layer-3/Layer-4-Paarung (alle 60 Positionen)."""
+ from scripts.analysis.permutation_tests import encode_positions, pairing_test
+ 
+ valid = [
+ pair for pair in pairs
+ if all(len(pair[key]) == 60 and pair[key].isalpha() and pair[key].isupper() for key in ("layer3", "layer4"))
+ ]
+ if not valid:
+ return {"error": "Keine gültigen Paare für den Permutationstest"}
+ 
+ first = encode_positions([pair["layer3"] for pair in valid], range(60))
+ second = encode_positions([pair["layer4"] for pair in valid], range(60))
+ result = pairing_test(first, second, n_permutations=n_permutations)
+ by_position = result.by_position()
+ 
+ return {
+ "n_pairs": result.n_rows,
+ "n_permutations": result.n_permutations,
+ "seed": result.seed,
+ "critical_value": result.critical_value(0.05),
+ "significant_positions": result.significant(0.05),
+ "block_end_positions": {str(pos): by_position[pos] for pos in BLOCK_END_POSITIONS},
+ }
+
 def main():
  """Hauptfunktion - Kritische Validierung."""
  print("=" * 80)
@@ -270,6 +302,16 @@ def main():
  print(f" ❌ {significance['error']}")
  print()
  
+ print("📊 Permutationstest (Stabilität, alle 60 Positionen)...")
+ permutation = test_permutation_stability(pairs)
+ if "error" not in permutation:
+ for pos_str, values in permutation["block_end_positions"].items():
+ print(f" Position {int(pos_str):2d}: p_raw={values['p_raw']:.6f} p_maxT={values['p_maxt']:.6f}")
+ print(f" Signifikant nach FWER-Korrektur: {permutation['significant_positions'] or 'keine'}")
+ else:
+ print(f" ❌ {permutation['error']}")
+ print()
+ 
  # 4. Vergleich Position 27 vs. andere
  pos27_data = positions_data.get("27", {})
  if pos27_data:
@@ -302,7 +344,8 @@ def main():
  }
  for k, v in positions_data.items()
  },
- "statistical_significance": significance
+ "statistical_significance": significance,
+ "permutation_test": permutation
  }
  
  output_file = OUTPUT_DIR / "position27_critical_validation.json"
@@ -351,6 +394,24 @@ def main():
  ""
  ])
  
+ if "error" not in permutation:
+ report_lines.extend([
+ "## Permutationstest (alle 60 Positionen)",
+ "",
+ f"- **Paare**: {permutation['n_pairs']}, **Permutationen**: {permutation['n_permutations']} (Seed {permutation['seed']})",
+ f"- **Kritische Stabilitätsrate (FWER, α=0.05)**: {permutation['critical_value'] * 100:.1f}%",
+ f"- **Signifikant nach max-T**: {permutation['significant_positions'] or 'keine'}",
+ "",
+ "| Position | Stabilität | p_raw | p_maxT | p_minP |",
+ "| --- | --- | --- | --- | --- |",
+ ])
+ for pos_str, values in permutation["block_end_positions"].items():
+ report_lines.append(
+ f"| {pos_str} | {values['observed'] * 100:.1f}% | {values['p_raw']:.6f} | "
+ f"{values['p_maxt']:.6f} | {values['p_minp']:.6f} |"
+ )
+ report_lines.append("")
+ 
  report_file = REPORTS_DIR / "position27_critical_validation_report.md"
  with report_file.open("w") as f:
  f.write("\n".join(report_lines) + "\n")
@@ -16,7 +16,6 @@ from pathlib import Path
 from typing import Dict, List, Optional
 from collections import defaultdict, Counter
 import numpy as np
-from scipy.stats import chi2_contingency
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
@@ -294,6 +293,7 @@ def run_statistical_tests(
  filtered_contingency.append(filtered_row)
  
  if len(filtered_contingency) >= 2 and len(filtered_contingency[0]) > 0:
+ from scipy.stats import chi2_contingency
  chi2, p_value, dof, expected = chi2_contingency(filtered_contingency)
  
  # Cramér's V
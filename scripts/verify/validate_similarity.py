@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Validate the vectorized sequence matching (analysis/utils/similarity.py) against
+plain Python references.
+
+- Banded edit distance: random letter strings of mixed lengths (including
+  empty ones and length differences beyond the band) against a full
+  Levenshtein DP, capped at band + 1 like the vectorized version.
+- Hamming over the common length (`hamming_matrix`) against a zip-based count.
+
+Exit code 1 on any mismatch.
+
+Usage:
+    python3 scripts/verify/validate_similarity.py
+    python3 scripts/verify/validate_similarity.py --cases 10000 --band 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from analysis.utils.similarity import banded_edit_distance, edit_distance_matrix, encode, hamming_matrix
+
+FIXED_CASES = [("CCAB", "CCB"), ("", ""), ("", "AB"), ("ABC", ""), ("ABCD", "ABCD"), ("KITTEN", "SITTING")]
+
+def levenshtein(a: str, b: str) -> int:
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        row = [i]
+        for j, cb in enumerate(b, 1):
+            row.append(min(prev[j - 1] + (ca != cb), prev[j] + 1, row[j - 1] + 1))
+        prev = row
+    return prev[-1]
+
+def hamming(a: str, b: str) -> int:
+    return sum(x != y for x, y in zip(a, b))
+
+def random_pairs(count: int, max_length: int, seed: int) -> List[Tuple[str, str]]:
+    """Small alphabet and related strings, so distances around the band are common."""
+    rng = random.Random(seed)
+    pairs = list(FIXED_CASES)
+    while len(pairs) < count:
+        a = "".join(rng.choices("ABCD", k=rng.randint(0, max_length)))
+        b = list(a)
+        for _ in range(rng.randint(0, 4)):
+            op = rng.randrange(3)
+            pos = rng.randint(0, len(b))
+            if op == 0:
+                b.insert(pos, rng.choice("ABCD"))
+            elif b and op == 1:
+                del b[min(pos, len(b) - 1)]
+            elif b:
+                b[min(pos, len(b) - 1)] = rng.choice("ABCD")
+        pairs.append((a, "".join(b)))
+    return pairs
+
+def check_edit_distance(pairs: List[Tuple[str, str]], band: int) -> List[str]:
+    width = max(max(len(a), len(b)) for a, b in pairs)
+    left = encode([a for a, _ in pairs], width)
+    right = encode([b for _, b in pairs], width)
+    got = banded_edit_distance(left, right, band)
+    errors = [
+        f"edit({a!r}, {b!r}) = {int(d)}, expected {min(levenshtein(a, b), band + 1)}"
+        for (a, b), d in zip(pairs, got)
+        if int(d) != min(levenshtein(a, b), band + 1)
+    ]
+    # Matrix form: a and b encoded with their own widths
+    lhs = [a for a, _ in pairs[:40]]
+    rhs = [b for _, b in pairs[:40]]
+    matrix = edit_distance_matrix(encode(lhs), encode(rhs), band)
+    errors.extend(
+        f"edit_distance_matrix[{i}][{j}] = {int(matrix[i, j])}, expected {min(levenshtein(a, b), band + 1)}"
+        for i, a in enumerate(lhs)
+        for j, b in enumerate(rhs)
+        if int(matrix[i, j]) != min(levenshtein(a, b), band + 1)
+    )
+    return errors
+
+def check_hamming(pairs: List[Tuple[str, str]]) -> List[str]:
+    lhs = [a for a, _ in pairs[:40]]
+    rhs = [b for _, b in pairs[:40]]
+    matrix = hamming_matrix(encode(lhs), encode(rhs))
+    return [
+        f"hamming_matrix[{i}][{j}] = {int(matrix[i, j])}, expected {hamming(a, b)}"
+        for i, a in enumerate(lhs)
+        for j, b in enumerate(rhs)
+        if int(matrix[i, j]) != hamming(a, b)
+    ]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", type=int, default=3000, help="Random string pairs.")
+    parser.add_argument("--max-length", type=int, default=12)
+    parser.add_argument("--band", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=20251122)
+    args = parser.parse_args()
+
+    pairs = random_pairs(args.cases, args.max_length, args.seed)
+    errors = []
+    for band in sorted({0, 1, args.band}):
+        band_errors = check_edit_distance(pairs, band)
+        print(f"Banded edit distance (band {band}, {len(pairs)} pairs): "
+              f"{'✅ all match' if not band_errors else f'❌ {len(band_errors)} mismatches'}")
+        errors.extend(band_errors)
+    hamming_errors = check_hamming(pairs)
+    print(f"Hamming matrix: {'✅ all match' if not hamming_errors else f'❌ {len(hamming_errors)} mismatches'}")
+    errors.extend(hamming_errors)
+
+    for error in errors[:20]:
+        print(f"  ❌ {error}")
+    sys.exit(1 if errors else 0)
+
+if __name__ == "__main__":
+    main()